@@ -13,6 +13,10 @@ client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
 recognizer = sr.Recognizer()
 microphone = sr.Microphone()
 
+# Ajusta para o ruído ambiente uma única vez (a calibração bloqueia por um segundo)
+with microphone as source:
+    recognizer.adjust_for_ambient_noise(source)
+
 # Inicializa o sintetizador de fala
 engine = pyttsx3.init()
 voices = engine.getProperty('voices')
@@ -33,7 +37,6 @@ def ouvir():
     """Ouve o áudio do microfone e converte para texto"""
     with microphone as source:
         print("\nFale agora...")
-        recognizer.adjust_for_ambient_noise(source)
         audio = recognizer.listen(source)
         
         try:
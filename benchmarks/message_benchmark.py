@@ -0,0 +1,119 @@
+"""Benchmark de memória e de serialização da entidade Message.
+
+Compara a Message atual (``__slots__`` com horário em microssegundos) com a
+dataclass anterior, reproduzida abaixo como referência.
+
+Uso:
+    python -m benchmarks.message_benchmark [--count 200000]
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List
+
+from src.domain.entities.message import Message, MessageRole
+from src.infrastructure.adapters import message_codec
+
+
+@dataclass
+class LegacyMessage:
+    """Message como era antes: dataclass com datetime."""
+    role: MessageRole
+    content: str
+    timestamp: datetime = None
+
+    def __post_init__(self):
+        if self.timestamp is None:
+            self.timestamp = datetime.now()
+
+    def to_dict(self) -> dict:
+        return {"role": self.role.value, "content": self.content, "timestamp": self.timestamp.isoformat()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LegacyMessage':
+        return cls(
+            role=MessageRole(data["role"]),
+            content=data["content"],
+            timestamp=datetime.fromisoformat(data["timestamp"]) if "timestamp" in data else None
+        )
+
+
+CONTENTS = [
+    "Qual o horário de atendimento?",
+    "Atendemos de segunda a sexta, das 8h às 18h.",
+    "Meu pedido 12345 ainda não chegou.",
+    "Vou verificar o status do seu pedido, um momento.",
+]
+ROLES = [MessageRole.USER, MessageRole.ASSISTANT]
+
+
+def measure_memory(factory: Callable[[int], object], count: int) -> float:
+    """Mede a memória alocada para criar ``count`` mensagens, em bytes por mensagem."""
+    gc.collect()
+    tracemalloc.start()
+    messages = [factory(i) for i in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Desconta a própria lista
+    per_message = (current - messages.__sizeof__()) / count
+    del messages
+    return per_message
+
+
+def throughput(function: Callable[[], object], count: int) -> float:
+    """Executa a função uma vez e retorna mensagens processadas por segundo."""
+    start = time.perf_counter()
+    function()
+    return count / (time.perf_counter() - start)
+
+
+def main(argv: List[str] = None) -> None:
+    """Executa o benchmark e imprime os resultados."""
+    parser = argparse.ArgumentParser(description="Benchmark da entidade Message")
+    parser.add_argument("--count", type=int, default=200_000, help="Quantidade de mensagens")
+    count = parser.parse_args(argv).count
+
+    # O conteúdo é compartilhado, como em mensagens lidas de um mesmo buffer;
+    # assim a medição isola o custo do objeto em si
+    legacy_memory = measure_memory(lambda i: LegacyMessage(ROLES[i % 2], CONTENTS[i % 4]), count)
+    compact_memory = measure_memory(lambda i: Message(ROLES[i % 2], CONTENTS[i % 4]), count)
+
+    print(f"=== Memória ({count} mensagens, extrapolado para 1 milhão) ===")
+    print(f"dataclass anterior: {legacy_memory:6.1f} bytes/mensagem  {legacy_memory:6.1f} MB/milhão")
+    print(f"Message compacta:   {compact_memory:6.1f} bytes/mensagem  {compact_memory:6.1f} MB/milhão")
+
+    legacy = [LegacyMessage(ROLES[i % 2], CONTENTS[i % 4]) for i in range(count)]
+    compact = [Message(ROLES[i % 2], CONTENTS[i % 4]) for i in range(count)]
+    legacy_dicts = [m.to_dict() for m in legacy]
+    compact_dicts = Message.to_dicts(compact)
+    legacy_json = json.dumps(legacy_dicts).encode("utf-8")
+    compact_encoded = message_codec.encode_messages(compact)
+
+    results = [
+        ("criação (dataclass anterior)", throughput(lambda: [LegacyMessage(ROLES[i % 2], CONTENTS[i % 4]) for i in range(count)], count)),
+        ("criação (Message compacta)", throughput(lambda: [Message(ROLES[i % 2], CONTENTS[i % 4]) for i in range(count)], count)),
+        ("to_dict (dataclass anterior)", throughput(lambda: [m.to_dict() for m in legacy], count)),
+        ("to_dict (Message compacta)", throughput(lambda: [m.to_dict() for m in compact], count)),
+        ("Message.to_dicts", throughput(lambda: Message.to_dicts(compact), count)),
+        ("from_dict (dataclass anterior)", throughput(lambda: [LegacyMessage.from_dict(d) for d in legacy_dicts], count)),
+        ("Message.from_dicts", throughput(lambda: Message.from_dicts(compact_dicts), count)),
+        ("JSON: json.dumps + to_dict (anterior)", throughput(lambda: json.dumps([m.to_dict() for m in legacy]).encode("utf-8"), count)),
+        ("JSON: encode_messages", throughput(lambda: message_codec.encode_messages(compact), count)),
+        ("JSON: json.loads + from_dict (anterior)", throughput(lambda: [LegacyMessage.from_dict(d) for d in json.loads(legacy_json)], count)),
+        ("JSON: decode_messages", throughput(lambda: message_codec.decode_messages(compact_encoded), count)),
+    ]
+
+    codec = "orjson" if message_codec.orjson is not None else "json"
+    print(f"\n=== Vazão (mensagens/s, codec JSON: {codec}) ===")
+    for name, value in results:
+        print(f"{name:42s} {value:12,.0f}")
+    print(f"\nTamanho em JSON: anterior {len(legacy_json) / count:.1f} bytes/mensagem, "
+          f"compacto {len(compact_encoded) / count:.1f} bytes/mensagem")
+
+
+if __name__ == "__main__":
+    main()
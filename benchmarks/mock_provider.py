@@ -0,0 +1,417 @@
+"""Servidor local que emula as APIs da OpenAI, do DeepSeek e do Ollama.
+
+Serve para medir o comportamento real dos adaptadores (rede, streaming,
+timeouts e fallback do SmartAIModel) sem chamar APIs pagas. Cada provedor
+tem um perfil com distribuição de latência até o primeiro byte, taxa de
+tokens, injeção de 429 (com Retry-After) e de 5xx e quedas de conexão no
+meio da resposta.
+
+Rotas:
+    POST /openai/v1/chat/completions    protocolo chat-completions (JSON ou SSE)
+    POST /deepseek/v1/chat/completions  idem, para o DeepSeek
+    POST /ollama/api/chat               protocolo do Ollama (JSON ou NDJSON)
+    GET  /ollama/api/tags               modelos disponíveis do Ollama
+    GET  /_mock/stats                   contadores por provedor
+    POST /_mock/{provedor}              altera o perfil do provedor (JSON com os campos de FaultProfile)
+
+Uso:
+    python -m benchmarks.mock_provider [--port 8900] [--latency-ms 200 --distribution lognormal]
+        [--tokens-per-second 30] [--rate-limit-rate 0.05 --retry-after 2] [--error-rate 0.05]
+        [--drop-rate 0.01]
+
+E, no .env da aplicação:
+    OPENAI_BASE_URL=http://127.0.0.1:8900/openai/v1
+    DEEPSEEK_BASE_URL=http://127.0.0.1:8900/deepseek/v1
+    OLLAMA_BASE_URL=http://127.0.0.1:8900/ollama
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+PROVIDERS = ("openai", "deepseek", "ollama")
+
+DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+}
+
+
+@dataclass
+class FaultProfile:
+    """Comportamento simulado de um provedor.
+
+    Attributes:
+        latency_ms: Latência média até o primeiro byte da resposta.
+        jitter_ms: Dispersão da latência (largura da uniforme ou desvio da lognormal).
+        distribution: "fixed", "uniform", "exponential" ou "lognormal".
+        tokens_per_second: Ritmo de geração dos tokens (0 = instantâneo).
+        rate_limit_rate: Fração das requisições respondidas com 429.
+        retry_after: Valor do cabeçalho Retry-After dos 429, em segundos.
+        error_rate: Fração das requisições respondidas com 500, 502 ou 503.
+        drop_rate: Fração das requisições em que a conexão cai no meio da resposta.
+        reply: Texto da resposta; vazio repete a última mensagem do usuário.
+    """
+    latency_ms: float = 50.0
+    jitter_ms: float = 0.0
+    distribution: str = "fixed"
+    tokens_per_second: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+    error_rate: float = 0.0
+    drop_rate: float = 0.0
+    reply: str = ""
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Sorteia a latência até o primeiro byte, em segundos."""
+        mean = max(self.latency_ms, 0.0)
+        if self.distribution == "uniform":
+            value = rng.uniform(mean - self.jitter_ms / 2, mean + self.jitter_ms / 2)
+        elif self.distribution == "exponential":
+            value = rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+        elif self.distribution == "lognormal" and mean > 0:
+            # Parâmetros da normal subjacente para a média e o desvio pedidos
+            sigma2 = math.log(1 + (self.jitter_ms / mean) ** 2)
+            value = rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+        else:
+            value = mean
+        return max(value, 0.0) / 1000.0
+
+
+@dataclass
+class ProviderStats:
+    """Contadores de um provedor simulado."""
+    requests: int = 0
+    completed: int = 0
+    rate_limited: int = 0
+    errors: int = 0
+    dropped: int = 0
+
+
+class MockProviderServer:
+    """Servidor asyncio que responde como os provedores de IA, com falhas configuráveis."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8900,
+        profiles: Optional[Dict[str, FaultProfile]] = None,
+        seed: Optional[int] = None
+    ):
+        """Inicializa o servidor.
+
+        Args:
+            host: Endereço em que o servidor escuta.
+            port: Porta em que o servidor escuta (0 escolhe uma porta livre).
+            profiles: Perfil por provedor; os ausentes usam FaultProfile().
+            seed: Semente do sorteio de latências e falhas (para execuções reproduzíveis).
+        """
+        self.host = host
+        self.port = port
+        self.profiles: Dict[str, FaultProfile] = {name: FaultProfile() for name in PROVIDERS}
+        self.profiles.update(profiles or {})
+        self.stats: Dict[str, ProviderStats] = {name: ProviderStats() for name in PROVIDERS}
+        self._rng = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._counter = 0
+
+    def base_url(self, provider: str) -> str:
+        """URL base a configurar no adaptador do provedor."""
+        suffix = "/ollama" if provider == "ollama" else f"/{provider}/v1"
+        return f"http://{self.host}:{self.port}{suffix}"
+
+    async def start(self) -> None:
+        """Começa a aceitar conexões."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Fecha o servidor."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    # HTTP
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, body = request
+                if not await self._route(method, path, body, writer):
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, bytes]]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        method, path, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length") or 0)
+        body = await reader.readexactly(length) if length else b""
+        return method, path.split("?", 1)[0], body
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: Any,
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        head = f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: application/json\r\n"
+        for name, value in (extra_headers or {}).items():
+            head += f"{name}: {value}\r\n"
+        head += f"Content-Length: {len(payload)}\r\n\r\n"
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
+
+    async def _start_chunked(self, writer: asyncio.StreamWriter, content_type: str) -> None:
+        writer.write((
+            f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\n"
+            "Cache-Control: no-cache\r\nTransfer-Encoding: chunked\r\n\r\n"
+        ).encode("latin-1"))
+        await writer.drain()
+
+    @staticmethod
+    async def _write_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        await writer.drain()
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> bool:
+        """Atende uma requisição.
+
+        Returns:
+            False se a conexão deve ser encerrada (ex.: queda simulada).
+        """
+        if path == "/_mock/stats" and method == "GET":
+            await self._respond(writer, 200, {name: asdict(stats) for name, stats in self.stats.items()})
+            return True
+        if path.startswith("/_mock/") and method == "POST":
+            return await self._configure(path[len("/_mock/"):], body, writer)
+        if path == "/ollama/api/tags" and method == "GET":
+            await self._respond(writer, 200, {"models": [{"name": "llama2:latest", "model": "llama2:latest"}]})
+            return True
+        if method == "POST" and path in ("/openai/v1/chat/completions", "/deepseek/v1/chat/completions"):
+            return await self._chat(path.split("/")[1], body, writer)
+        if method == "POST" and path == "/ollama/api/chat":
+            return await self._chat("ollama", body, writer)
+        await self._respond(writer, 404, {"error": {"message": f"Rota não encontrada: {method} {path}"}})
+        return True
+
+    async def _configure(self, provider: str, body: bytes, writer: asyncio.StreamWriter) -> bool:
+        if provider not in self.profiles:
+            await self._respond(writer, 404, {"error": {"message": f"Provedor desconhecido: {provider}"}})
+            return True
+        known = {field.name for field in fields(FaultProfile)}
+        try:
+            changes = {name: value for name, value in json.loads(body or b"{}").items() if name in known}
+            self.profiles[provider] = replace(self.profiles[provider], **changes)
+        except (ValueError, TypeError, AttributeError) as e:
+            await self._respond(writer, 400, {"error": {"message": str(e)}})
+            return True
+        await self._respond(writer, 200, asdict(self.profiles[provider]))
+        return True
+
+    # Conversa
+
+    async def _chat(self, provider: str, body: bytes, writer: asyncio.StreamWriter) -> bool:
+        profile = self.profiles[provider]
+        stats = self.stats[provider]
+        stats.requests += 1
+        try:
+            request = json.loads(body)
+            messages = request["messages"]
+        except (ValueError, KeyError, TypeError):
+            await self._respond(writer, 400, {"error": {"message": "Corpo inválido"}})
+            return True
+
+        # Sorteios feitos de uma vez, para que a sequência não dependa do agendamento
+        fault = self._rng.random()
+        latency = profile.sample_latency(self._rng)
+        status = self._rng.choice((500, 502, 503))
+
+        if fault < profile.rate_limit_rate:
+            stats.rate_limited += 1
+            await self._respond(
+                writer, 429,
+                {"error": {"message": "Rate limit reached", "type": "rate_limit_error", "code": "rate_limit_exceeded"}},
+                {"Retry-After": f"{profile.retry_after:g}"}
+            )
+            return True
+        await asyncio.sleep(latency)
+        if fault < profile.rate_limit_rate + profile.error_rate:
+            stats.errors += 1
+            await self._respond(writer, status, {"error": {"message": "Erro simulado", "type": "server_error"}})
+            return True
+        drop = fault < profile.rate_limit_rate + profile.error_rate + profile.drop_rate
+
+        tokens = self._tokens(profile, messages)
+        model = request.get("model", provider)
+        stream = request.get("stream", provider == "ollama")
+        if not stream:
+            if drop:
+                stats.dropped += 1
+                writer.transport.abort()
+                return False
+            await self._sleep_tokens(profile, len(tokens))
+            await self._respond(writer, 200, self._complete_body(provider, model, "".join(tokens), len(messages)))
+            stats.completed += 1
+            return True
+
+        ollama = provider == "ollama"
+        await self._start_chunked(writer, "application/x-ndjson" if ollama else "text/event-stream")
+        completion_id = self._next_id()
+        for index, token in enumerate(tokens):
+            if drop and index == len(tokens) // 2:
+                stats.dropped += 1
+                writer.transport.abort()
+                return False
+            await self._sleep_tokens(profile, 1)
+            chunk = self._ollama_chunk(model, token, False) if ollama else self._sse_chunk(completion_id, model, token, None)
+            await self._write_chunk(writer, chunk)
+        if ollama:
+            await self._write_chunk(writer, self._ollama_chunk(model, "", True))
+        else:
+            await self._write_chunk(writer, self._sse_chunk(completion_id, model, None, "stop"))
+            await self._write_chunk(writer, b"data: [DONE]\n\n")
+        await self._write_chunk(writer, b"")
+        stats.completed += 1
+        return True
+
+    def _tokens(self, profile: FaultProfile, messages: List[Dict[str, Any]]) -> List[str]:
+        """Divide a resposta em tokens (palavras com o espaço seguinte)."""
+        text = profile.reply
+        if not text:
+            question = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+            text = f"Resposta simulada para: {question}"
+        words = text.split(" ")
+        return [word + " " for word in words[:-1]] + [words[-1]]
+
+    @staticmethod
+    async def _sleep_tokens(profile: FaultProfile, count: int) -> None:
+        if profile.tokens_per_second > 0 and count:
+            await asyncio.sleep(count / profile.tokens_per_second)
+
+    def _next_id(self) -> str:
+        self._counter += 1
+        return f"chatcmpl-mock-{self._counter}"
+
+    def _complete_body(self, provider: str, model: str, text: str, prompt_messages: int) -> Dict[str, Any]:
+        if provider == "ollama":
+            return {
+                "model": model,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "message": {"role": "assistant", "content": text},
+                "done": True,
+            }
+        completion_tokens = len(text.split())
+        return {
+            "id": self._next_id(),
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_messages,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_messages + completion_tokens,
+            },
+        }
+
+    @staticmethod
+    def _sse_chunk(completion_id: str, model: str, token: Optional[str], finish_reason: Optional[str]) -> bytes:
+        delta = {"content": token} if token is not None else {}
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return b"data: " + json.dumps(chunk).encode("utf-8") + b"\n\n"
+
+    @staticmethod
+    def _ollama_chunk(model: str, token: str, done: bool) -> bytes:
+        chunk = {
+            "model": model,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "message": {"role": "assistant", "content": token},
+            "done": done,
+        }
+        return json.dumps(chunk).encode("utf-8") + b"\n"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    profile = FaultProfile(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        distribution=args.distribution,
+        tokens_per_second=args.tokens_per_second,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+    )
+    server = MockProviderServer(
+        args.host, args.port, profiles={name: replace(profile) for name in PROVIDERS}, seed=args.seed
+    )
+    await server.start()
+    print(f"Provedores simulados em http://{server.host}:{server.port}")
+    for name in PROVIDERS:
+        print(f"  {name.upper()}_BASE_URL={server.base_url(name)}")
+    await asyncio.Event().wait()
+
+
+def main() -> None:
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
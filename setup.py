@@ -18,10 +18,16 @@ setup(
     install_requires=[
         "openai>=1.3.0",
         "python-dotenv>=1.0.0",
+        "httpx>=0.25.0",
         "pyttsx3>=2.90",
         "SpeechRecognition>=3.10.0",
         "pyaudio>=0.2.13",
     ],
+    extras_require={
+        "semantic-cache": ["numpy>=1.21"],
+        "voice": ["numpy>=1.21"],
+        "fast-json": ["orjson>=3.8"],
+    },
     entry_points={
         "console_scripts": [
             "atendimento-ia=interface.cli.cli_app:main",
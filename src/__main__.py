@@ -1,6 +1,16 @@
 #!/usr/bin/env python3
-"""Ponto de entrada principal para execução do pacote."""
-from .interface.cli.cli_app import main
+"""Ponto de entrada principal para execução do pacote.
+
+Uso:
+    python -m src                              interface de linha de comando (voz/texto)
+    python -m src batch entrada.jsonl saida.jsonl  processamento em lote
+"""
+import sys
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from .interface.batch.batch_runner import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+
+    from .interface.cli.cli_app import main
     main()
@@ -1,7 +1,8 @@
 """Módulo que contém a entidade de mensagem."""
-from dataclasses import dataclass
+import time
 from datetime import datetime
 from enum import Enum
+from typing import Any, ClassVar, Dict, Iterable, List, Optional, Tuple
 
 
 class MessageRole(str, Enum):
@@ -11,24 +12,149 @@ class MessageRole(str, Enum):
     ASSISTANT = "assistant"
 
 
-@dataclass
+# Papéis por valor e por membro: como MessageRole herda de str, os dois têm o
+# mesmo hash e a busca devolve sempre o membro único (papel internado)
+_ROLES: Dict[str, MessageRole] = {role.value: role for role in MessageRole}
+
+_MICROSECONDS = 1_000_000
+
+
+# Conversões por segundo inteiro (horário local), reaproveitadas entre mensagens;
+# cada conversão custa uma chamada a localtime/mktime
+_SECOND_CACHE_SIZE = 4096
+_iso_by_second: Dict[int, str] = {}
+_second_by_iso: Dict[str, int] = {}
+
+
+def _to_epoch_us(timestamp: datetime) -> int:
+    """Converte um datetime em microssegundos desde a época, sem perda de precisão."""
+    seconds = int(timestamp.replace(microsecond=0).timestamp())
+    return seconds * _MICROSECONDS + timestamp.microsecond
+
+
+def _from_epoch_us(epoch_us: int) -> datetime:
+    """Converte microssegundos desde a época em um datetime local (sem fuso)."""
+    seconds, microseconds = divmod(epoch_us, _MICROSECONDS)
+    return datetime.fromtimestamp(seconds).replace(microsecond=microseconds)
+
+
+def _format_epoch_us(epoch_us: int) -> str:
+    """Formata o horário como datetime.isoformat() do horário local."""
+    seconds, microseconds = divmod(epoch_us, _MICROSECONDS)
+    prefix = _iso_by_second.get(seconds)
+    if prefix is None:
+        if len(_iso_by_second) >= _SECOND_CACHE_SIZE:
+            _iso_by_second.clear()
+        prefix = _iso_by_second[seconds] = datetime.fromtimestamp(seconds).isoformat()
+    return f"{prefix}.{microseconds:06d}" if microseconds else prefix
+
+
+def _parse_iso_to_epoch_us(raw: str) -> Optional[int]:
+    """Converte um horário local ISO 8601 sem fuso em microssegundos desde a época.
+
+    Returns:
+        None se o texto não estiver exatamente no formato de isoformat() sem fuso
+        (ex.: com "Z", fuso ou fração de outro tamanho); nesse caso, use fromisoformat.
+    """
+    if len(raw) == 19:
+        microseconds = 0
+    elif len(raw) == 26 and raw[19] == "." and raw[20:].isascii() and raw[20:].isdigit():
+        microseconds = int(raw[20:])
+    else:
+        return None
+    if raw[10] != "T" or raw[13] != ":" or raw[16] != ":":
+        return None
+    prefix = raw[:19]
+    seconds = _second_by_iso.get(prefix)
+    if seconds is None:
+        if len(_second_by_iso) >= _SECOND_CACHE_SIZE:
+            _second_by_iso.clear()
+        seconds = _second_by_iso[prefix] = int(datetime.fromisoformat(prefix).timestamp())
+    return seconds * _MICROSECONDS + microseconds
+
+
 class Message:
-    """Entidade que representa uma mensagem na conversa."""
-    role: MessageRole
-    content: str
-    timestamp: datetime = None
+    """Entidade que representa uma mensagem na conversa.
+
+    A mensagem usa ``__slots__`` e guarda o horário como microssegundos desde a
+    época (``epoch_us``); o ``datetime`` de ``timestamp`` só é montado quando
+    lido. Um datetime com fuso horário recebido na criação é mantido como veio.
+    """
+    __slots__ = ("role", "content", "epoch_us", "_timestamp")
+
+    def __init__(self, role: MessageRole, content: str, timestamp: Optional[datetime] = None):
+        """Inicializa a mensagem.
+
+        Args:
+            role: Papel da mensagem (membro de MessageRole ou o seu valor).
+            content: Conteúdo da mensagem.
+            timestamp: Momento da mensagem; se não for fornecido, usa o momento atual.
 
-    def __post_init__(self):
-        """Inicializa o timestamp com o momento atual se não for fornecido."""
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
+        Raises:
+            ValueError: Se o papel for inválido.
+        """
+        self.role = _intern_role(role)
+        self.content = content
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_epoch(cls, role: MessageRole, content: str, epoch_us: int) -> 'Message':
+        """Cria uma mensagem a partir do horário em microssegundos desde a época."""
+        message = cls.__new__(cls)
+        message.role = _intern_role(role)
+        message.content = content
+        message.epoch_us = epoch_us
+        message._timestamp = None
+        return message
+
+    @property
+    def timestamp(self) -> datetime:
+        """Momento da mensagem."""
+        if self._timestamp is not None:
+            return self._timestamp
+        return _from_epoch_us(self.epoch_us)
+
+    @timestamp.setter
+    def timestamp(self, value: Optional[datetime]) -> None:
+        if value is None:
+            self.epoch_us = time.time_ns() // 1000
+            self._timestamp = None
+        else:
+            self.epoch_us = _to_epoch_us(value)
+            self._timestamp = value if value.tzinfo is not None else None
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self.role is other.role
+            and self.content == other.content
+            and self.epoch_us == other.epoch_us
+        )
+
+    __hash__: ClassVar[None] = None  # type: ignore[assignment]  # mutável, como a dataclass anterior
+
+    def __repr__(self) -> str:
+        return (
+            f"Message(role=MessageRole.{self.role.name}, content={self.content!r}, "
+            f"timestamp={self.timestamp!r})"
+        )
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return (self.role.value, self.content, self.epoch_us, self._timestamp)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        role, self.content, self.epoch_us, self._timestamp = state
+        self.role = _ROLES[role]
 
     def to_dict(self) -> dict:
         """Converte a mensagem para um dicionário."""
         return {
             "role": self.role.value,
             "content": self.content,
-            "timestamp": self.timestamp.isoformat()
+            "timestamp": (
+                self._timestamp.isoformat() if self._timestamp is not None else _format_epoch_us(self.epoch_us)
+            )
         }
 
     @classmethod
@@ -39,3 +165,58 @@ class Message:
             content=data["content"],
             timestamp=datetime.fromisoformat(data["timestamp"]) if "timestamp" in data else None
         )
+
+    @staticmethod
+    def to_dicts(messages: Iterable['Message']) -> List[dict]:
+        """Converte várias mensagens para dicionários (mesmo formato de to_dict)."""
+        format_epoch = _format_epoch_us
+        return [
+            {
+                "role": message.role.value,
+                "content": message.content,
+                "timestamp": (
+                    message._timestamp.isoformat() if message._timestamp is not None
+                    else format_epoch(message.epoch_us)
+                )
+            }
+            for message in messages
+        ]
+
+    @classmethod
+    def from_dicts(cls, items: Iterable[dict]) -> List['Message']:
+        """Cria várias mensagens a partir de dicionários no formato de to_dict."""
+        roles = _ROLES
+        parse_epoch = _parse_iso_to_epoch_us
+        new = cls.__new__
+        now_us = time.time_ns() // 1000
+        result: List['Message'] = []
+        append = result.append
+        for data in items:
+            message = new(cls)
+            role = roles.get(data["role"])
+            message.role = role if role is not None else _intern_role(data["role"])
+            message.content = data["content"]
+            message._timestamp = None
+            raw = data.get("timestamp")
+            if raw is None:
+                message.epoch_us = now_us
+            else:
+                epoch_us = parse_epoch(raw)
+                if epoch_us is None:
+                    message.timestamp = datetime.fromisoformat(raw)
+                else:
+                    message.epoch_us = epoch_us
+            append(message)
+        return result
+
+
+def _intern_role(role: Any) -> MessageRole:
+    """Devolve o membro único de MessageRole correspondente ao papel.
+
+    Raises:
+        ValueError: Se o papel for inválido.
+    """
+    member = _ROLES.get(role) if isinstance(role, str) else None
+    if member is None:
+        raise ValueError(f"{role!r} is not a valid MessageRole")
+    return member
@@ -0,0 +1,53 @@
+"""Módulo que contém a entidade de sessão de conversa."""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional
+
+from .message import Message
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..services.prompt_builder import PromptBuilder
+
+
+@dataclass
+class ConversationSession:
+    """Entidade que representa o estado de uma conversa com um chamador."""
+    session_id: str
+    history: List[Message] = field(default_factory=list)
+    summary: Optional[str] = None
+    summary_covers: int = 0
+    preferred_provider: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    last_active: datetime = field(default_factory=datetime.now)
+    # Estado em memória, não persistido: prompt já convertido da conversa
+    prompt_builder: Optional["PromptBuilder"] = field(default=None, repr=False, compare=False)
+
+    def size_in_chars(self) -> int:
+        """Retorna o tamanho aproximado da sessão em memória, em caracteres de conteúdo."""
+        return sum(len(message.content) for message in self.history) + len(self.summary or "")
+
+    def to_dict(self) -> dict:
+        """Converte a sessão para um dicionário."""
+        return {
+            "session_id": self.session_id,
+            "history": Message.to_dicts(self.history),
+            "summary": self.summary,
+            "summary_covers": self.summary_covers,
+            "preferred_provider": self.preferred_provider,
+            "created_at": self.created_at.isoformat(),
+            "last_active": self.last_active.isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ConversationSession':
+        """Cria uma instância de ConversationSession a partir de um dicionário."""
+        created_at = datetime.fromisoformat(data["created_at"]) if "created_at" in data else datetime.now()
+        return cls(
+            session_id=data["session_id"],
+            history=Message.from_dicts(data.get("history", [])),
+            summary=data.get("summary"),
+            summary_covers=data.get("summary_covers", 0),
+            preferred_provider=data.get("preferred_provider"),
+            created_at=created_at,
+            last_active=datetime.fromisoformat(data["last_active"]) if "last_active" in data else created_at
+        )
@@ -0,0 +1 @@
+"""Módulo que contém os serviços de domínio."""
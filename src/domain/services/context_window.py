@@ -0,0 +1,137 @@
+"""Módulo que contém a janela de contexto limitada por orçamento de tokens."""
+import functools
+import re
+from typing import Dict, List
+
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+class Tokenizer:
+    """Interface para contadores de tokens."""
+
+    def count(self, text: str) -> int:
+        """Conta os tokens de um texto.
+
+        Args:
+            text: Texto a ser contado.
+
+        Returns:
+            Quantidade de tokens.
+        """
+        raise NotImplementedError
+
+
+class ApproximateTokenizer(Tokenizer):
+    """Contador de tokens aproximado, sem dependências, para uso offline.
+
+    Cada sinal de pontuação conta como um token e cada palavra como um token
+    a cada ``chars_per_token`` caracteres, o que acompanha de perto os
+    tokenizadores BPE em textos em português.
+    """
+
+    def __init__(self, chars_per_token: int = 4):
+        """Inicializa o contador.
+
+        Args:
+            chars_per_token: Caracteres de uma palavra que equivalem a um token.
+        """
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        """Conta os tokens de um texto de forma aproximada."""
+        total = 0
+        for token in _TOKEN_PATTERN.findall(text):
+            total += 1 + (len(token) - 1) // self.chars_per_token
+        return total
+
+
+class ContextWindow:
+    """Seleciona o histórico que cabe em um orçamento de tokens do prompt.
+
+    O prompt de sistema e a mensagem atual do usuário sempre entram; o
+    histórico é preenchido da mensagem mais recente para a mais antiga até
+    que a próxima não caiba mais. A contagem de cada conteúdo fica em cache,
+    de modo que a cada turno só as mensagens novas são tokenizadas.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Tokenizer,
+        per_message_overhead: int = 4,
+        reply_overhead: int = 3,
+        cache_size: int = 4096
+    ):
+        """Inicializa a janela de contexto.
+
+        Args:
+            tokenizer: Contador de tokens usado nas mensagens.
+            per_message_overhead: Tokens extras do formato de chat por mensagem (papel e delimitadores).
+            reply_overhead: Tokens extras que preparam a resposta do assistente.
+            cache_size: Quantidade máxima de contagens mantidas em cache.
+        """
+        self.tokenizer = tokenizer
+        self.per_message_overhead = per_message_overhead
+        self.reply_overhead = reply_overhead
+        self._count = functools.lru_cache(maxsize=cache_size)(tokenizer.count)
+
+    def count_message(self, message: Dict[str, str]) -> int:
+        """Conta os tokens de uma mensagem, incluindo o custo do formato de chat."""
+        return self._count(message["content"]) + self.per_message_overhead
+
+    def count_messages(self, messages: List[Dict[str, str]]) -> int:
+        """Conta os tokens de um prompt completo."""
+        return sum(self.count_message(message) for message in messages) + self.reply_overhead
+
+    def fit(
+        self,
+        system: List[Dict[str, str]],
+        history: List[Dict[str, str]],
+        current: Dict[str, str],
+        budget: int
+    ) -> List[Dict[str, str]]:
+        """Monta o prompt com o maior trecho recente do histórico que cabe no orçamento.
+
+        Args:
+            system: Mensagens de sistema, sempre incluídas.
+            history: Histórico da conversa, da mais antiga para a mais recente.
+            current: Mensagem atual do usuário, sempre incluída.
+            budget: Número máximo de tokens do prompt.
+
+        Returns:
+            Mensagens de sistema, histórico selecionado e mensagem atual.
+        """
+        start = self.fit_start(system, history, current, budget)
+        return system + history[start:] + [current]
+
+    def fit_start(
+        self,
+        system: List[Dict[str, str]],
+        history: List[Dict[str, str]],
+        current: Dict[str, str],
+        budget: int
+    ) -> int:
+        """Retorna a posição da mensagem mais antiga do histórico que cabe no orçamento.
+
+        Args:
+            system: Mensagens de sistema, sempre incluídas.
+            history: Histórico da conversa, da mais antiga para a mais recente.
+            current: Mensagem atual do usuário, sempre incluída.
+            budget: Número máximo de tokens do prompt.
+
+        Returns:
+            Índice em ``history`` a partir do qual as mensagens entram no prompt.
+        """
+        used = self.count_messages(system) + self.count_message(current)
+        start = len(history)
+        while start > 0:
+            cost = self.count_message(history[start - 1])
+            if used + cost > budget:
+                break
+            used += cost
+            start -= 1
+        return start
+
+    def cache_info(self) -> "functools._CacheInfo":
+        """Estatísticas do cache de contagens (acertos, faltas, tamanho)."""
+        return self._count.cache_info()
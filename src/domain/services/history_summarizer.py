@@ -0,0 +1,180 @@
+"""Módulo que contém o resumidor incremental do histórico da conversa."""
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, List, Optional, Set, Tuple
+
+from ..entities.message import Message, MessageRole
+from ..use_cases.process_message import AIModel, HistoryCompactor
+
+
+SPEAKER_LABELS = {
+    MessageRole.USER: "Cliente",
+    MessageRole.ASSISTANT: "Atendente",
+    MessageRole.SYSTEM: "Sistema",
+}
+
+SUMMARY_INSTRUCTIONS = (
+    "Você resume conversas de atendimento telefônico. Atualize o resumo anterior com as "
+    "novas falas, mantendo nomes, números de pedido ou protocolo, datas, valores, o problema "
+    "relatado e o que já foi combinado. Responda apenas com o resumo atualizado, em até {words} palavras."
+)
+
+
+class HistorySummarizer(HistoryCompactor):
+    """Resume, em segundo plano, as mensagens que saem da janela de contexto.
+
+    Os resumos ficam em cache pelo hash do prefixo do histórico que cobrem.
+    Cada novo resumo parte do maior prefixo já resumido e acrescenta só as
+    falas seguintes, então cada mensagem passa pelo modelo uma única vez.
+    Uma única thread de trabalho processa os pedidos em ordem. O caso de uso
+    também guarda o resumo na sessão e, quando ela é recarregada, o devolve
+    ao cache com restore.
+
+    Como o histórico só cresce, os hashes dos prefixos de cada conversa
+    também ficam em cache, com o estado do SHA-256: a cada turno, só as
+    mensagens novas são hasheadas.
+    """
+
+    def __init__(
+        self,
+        ai_model: AIModel,
+        max_words: int = 120,
+        max_tokens: int = 250,
+        cache_size: int = 256
+    ):
+        """Inicializa o resumidor.
+
+        Args:
+            ai_model: Modelo de IA usado para gerar os resumos.
+            max_words: Tamanho máximo (em palavras) pedido ao modelo para o resumo.
+            max_tokens: Limite de tokens da resposta do modelo.
+            cache_size: Quantidade máxima de resumos mantidos em cache.
+        """
+        self.ai_model = ai_model
+        self.max_words = max_words
+        self.max_tokens = max_tokens
+        self.cache_size = cache_size
+
+        self._lock = threading.Lock()
+        self._summaries: "OrderedDict[str, str]" = OrderedDict()
+        self._in_flight: Set[str] = set()
+        # Por conversa (id da primeira mensagem): (mensagens já hasheadas, hashes dos prefixos, estado do SHA-256)
+        self._prefixes: "OrderedDict[int, Tuple[List[Message], List[str], Any]]" = OrderedDict()
+        self._prefix_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resumo-historico")
+
+    def prefix_hashes(self, history: List[Message]) -> List[str]:
+        """Calcula o hash de cada prefixo do histórico, continuando do último prefixo já hasheado.
+
+        O cache guarda a primeira mensagem de cada conversa, então o id dela não
+        é reaproveitado enquanto a entrada existir; um prefixo só é reaproveitado
+        se a última mensagem em comum ainda for o mesmo objeto.
+
+        Returns:
+            Lista em que a posição k é o hash das k primeiras mensagens.
+        """
+        if not history:
+            return [hashlib.sha256().hexdigest()]
+        key = id(history[0])
+        with self._prefix_lock:
+            cached = self._prefixes.get(key)
+            if cached is not None:
+                known = min(len(cached[0]), len(history))
+                if cached[0][known - 1] is not history[known - 1]:
+                    cached = None
+            if cached is None:
+                cached = ([], [hashlib.sha256().hexdigest()], hashlib.sha256())
+            messages, hashes, digest = cached
+            new_messages = history[len(messages):]
+            for message in new_messages:
+                digest.update(message.role.value.encode("utf-8") + b"\x00")
+                digest.update(message.content.encode("utf-8") + b"\x01")
+                hashes.append(digest.copy().hexdigest())
+            messages.extend(new_messages)
+            self._prefixes[key] = cached
+            self._prefixes.move_to_end(key)
+            while len(self._prefixes) > self.cache_size:
+                self._prefixes.popitem(last=False)
+            return hashes[:len(history) + 1]
+
+    def lookup(self, history: List[Message]) -> Tuple[Optional[str], int]:
+        """Procura o resumo do maior prefixo do histórico já resumido."""
+        return self._longest_cached(self.prefix_hashes(history))
+
+    def schedule(self, history: List[Message], upto: int) -> Optional[Future]:
+        """Agenda o resumo de history[:upto] na thread de trabalho.
+
+        Returns:
+            O Future do resumo, ou None se ele já está em cache ou em andamento.
+        """
+        hashes = self.prefix_hashes(history[:upto])
+        key = hashes[-1]
+        with self._lock:
+            if upto <= 0 or key in self._summaries or key in self._in_flight:
+                return None
+            self._in_flight.add(key)
+        return self._executor.submit(self._run, list(history[:upto]), hashes)
+
+    def restore(self, history: List[Message], summary: str, covers: int) -> None:
+        """Guarda no cache um resumo vindo de fora (ex.: da sessão recarregada), como base dos próximos."""
+        if covers <= 0 or not summary:
+            return
+        self._cache(self.prefix_hashes(history[:covers])[-1], summary)
+
+    def summarize(self, history: List[Message]) -> str:
+        """Resume o histórico de forma síncrona, reaproveitando o maior resumo em cache."""
+        return self._summarize(history, self.prefix_hashes(history))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Encerra a thread de trabalho."""
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, prefix: List[Message], hashes: List[str]) -> Optional[str]:
+        """Executa um resumo agendado."""
+        try:
+            return self._summarize(prefix, hashes)
+        except Exception as e:
+            print(f"⚠️  Não foi possível resumir o histórico: {str(e)}")
+            return None
+        finally:
+            with self._lock:
+                self._in_flight.discard(hashes[-1])
+
+    def _summarize(self, history: List[Message], hashes: List[str]) -> str:
+        """Gera o resumo do histórico a partir do maior prefixo já resumido."""
+        previous, covered = self._longest_cached(hashes)
+        if covered == len(history) and previous is not None:
+            return previous
+
+        new_turns = "\n".join(
+            f"{SPEAKER_LABELS.get(message.role, message.role.value)}: {message.content}"
+            for message in history[covered:]
+        )
+        messages = [
+            {"role": "system", "content": SUMMARY_INSTRUCTIONS.format(words=self.max_words)},
+            {"role": "user", "content": f"Resumo anterior: {previous or '(vazio)'}\n\nNovas falas:\n{new_turns}"},
+        ]
+        summary = self.ai_model.generate_response(messages, max_tokens=self.max_tokens, temperature=0.2).strip()
+
+        self._cache(hashes[-1], summary)
+        return summary
+
+    def _cache(self, key: str, summary: str) -> None:
+        """Guarda o resumo do prefixo de hash key, descartando o usado há mais tempo."""
+        with self._lock:
+            self._summaries[key] = summary
+            self._summaries.move_to_end(key)
+            while len(self._summaries) > self.cache_size:
+                self._summaries.popitem(last=False)
+
+    def _longest_cached(self, hashes: List[str]) -> Tuple[Optional[str], int]:
+        """Procura, do maior para o menor, um prefixo com resumo em cache."""
+        with self._lock:
+            for length in range(len(hashes) - 1, 0, -1):
+                summary = self._summaries.get(hashes[length])
+                if summary is not None:
+                    self._summaries.move_to_end(hashes[length])
+                    return summary, length
+        return None, 0
@@ -0,0 +1,222 @@
+"""Módulo que contém o montador incremental de prompts de uma conversa."""
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..entities.message import Message
+
+# Conversão opcional de cada mensagem para o formato de um provedor
+Transform = Optional[Callable[[Dict[str, str]], Dict[str, str]]]
+
+
+def _default_encoder(obj: Any) -> bytes:
+    """Serializa em JSON compacto (UTF-8)."""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class WireEntry:
+    """Mensagem no formato de envio, com a serialização JSON guardada por formato."""
+    __slots__ = ("wire", "_encoded")
+
+    def __init__(self, wire: Dict[str, str]):
+        self.wire = wire
+        self._encoded: Optional[Dict[Transform, bytes]] = None
+
+    def encode(self, transform: Transform, encoder: Callable[[Any], bytes]) -> bytes:
+        """Serializa a mensagem (uma única vez por formato)."""
+        if self._encoded is None:
+            self._encoded = {}
+        data = self._encoded.get(transform)
+        if data is None:
+            data = self._encoded[transform] = encoder(transform(self.wire) if transform else self.wire)
+        return data
+
+
+class PromptMessages(list):
+    """Lista de mensagens do prompt que se serializa reaproveitando o cache do montador.
+
+    Para quem só lê, é uma lista comum de dicionários ``{"role", "content"}``.
+    Adaptadores que montam o corpo da requisição podem chamar ``encode`` para
+    obter o JSON da lista sem serializar de novo o histórico já enviado.
+    """
+
+    def __init__(
+        self,
+        builder: "PromptBuilder",
+        system: List[WireEntry],
+        start: int,
+        end: int,
+        current: WireEntry,
+        history: List[Dict[str, str]]
+    ):
+        super().__init__([entry.wire for entry in system] + history + [current.wire])
+        self._builder = builder
+        self._system = system
+        self._start = start
+        self._end = end
+        self._current = current
+        self._generation = builder.generation
+        self._size = len(self)
+
+    def encode(self, transform: Transform = None) -> bytes:
+        """Serializa a lista em JSON.
+
+        Args:
+            transform: Conversão opcional aplicada a cada mensagem (ex.: formato de um provedor).
+
+        Returns:
+            O array JSON das mensagens, em UTF-8.
+        """
+        encoder = self._builder.encoder
+        if len(self) != self._size or self._builder.generation != self._generation:
+            # A lista foi alterada ou o histórico da conversa recomeçou: serializa do zero
+            return encoder([transform(message) if transform else message for message in self])
+        parts = [entry.encode(transform, encoder) for entry in self._system]
+        history = self._builder.encode_history(self._start, self._end, transform)
+        if history:
+            parts.append(history)
+        parts.append(self._current.encode(transform, encoder))
+        return b"[" + b",".join(parts) + b"]"
+
+
+class PromptBuilder:
+    """Montador incremental do prompt de uma conversa.
+
+    As mensagens do histórico são convertidas para o formato de envio uma única
+    vez e mantidas em um buffer circular com as ``capacity`` mais recentes;
+    cada entrada guarda também o seu JSON. O JSON do trecho do histórico
+    enviado no último turno fica em cache, de modo que o turno seguinte só
+    serializa as mensagens novas e as concatena ao prefixo. O histórico é
+    tratado como só de acréscimo; se ele for encurtado ou substituído, o
+    montador recomeça.
+    """
+
+    def __init__(self, capacity: int = 256, encoder: Optional[Callable[[Any], bytes]] = None):
+        """Inicializa o montador.
+
+        Args:
+            capacity: Quantidade de mensagens recentes mantidas já convertidas.
+            encoder: Serializador JSON para bytes (ex.: o do orjson); por padrão, o módulo json.
+        """
+        self.capacity = capacity
+        self.encoder = encoder or _default_encoder
+        self.generation = 0
+
+        self._lock = threading.Lock()
+        self._ring: List[Optional[WireEntry]] = [None] * capacity
+        self._synced = 0
+        self._history: List[Message] = []
+        self._last: Optional[Message] = None
+        self._system: Dict[str, WireEntry] = {}
+        self._prefix: Dict[Transform, Tuple[int, int, bytes]] = {}
+        self._converted = 0
+        self._reused = 0
+
+    def wire(self, history: List[Message], start: int = 0) -> List[Dict[str, str]]:
+        """Retorna history[start:] no formato de envio, convertendo só as mensagens novas."""
+        with self._lock:
+            self._sync(history)
+            return [self._entry(index).wire for index in range(start, len(history))]
+
+    def build(
+        self,
+        history: List[Message],
+        system: List[Dict[str, str]],
+        start: int,
+        current: Dict[str, str]
+    ) -> PromptMessages:
+        """Monta o prompt com as mensagens de sistema, history[start:] e a mensagem atual.
+
+        Args:
+            history: Histórico completo da conversa.
+            system: Mensagens de sistema.
+            start: Posição da mensagem mais antiga do histórico que entra no prompt.
+            current: Mensagem atual do usuário.
+
+        Returns:
+            A lista de mensagens, pronta para ser enviada ao modelo.
+        """
+        with self._lock:
+            self._sync(history)
+            end = len(history)
+            entries = [self._entry(index) for index in range(start, end)]
+            system_entries = [self._system_entry(message) for message in system]
+        return PromptMessages(
+            self, system_entries, start, end, WireEntry(current), [entry.wire for entry in entries]
+        )
+
+    def encode_history(self, start: int, end: int, transform: Transform = None) -> bytes:
+        """Serializa history[start:end] (sem colchetes), estendendo o prefixo em cache.
+
+        Returns:
+            As mensagens em JSON separadas por vírgula, ou b"" se o trecho for vazio.
+        """
+        with self._lock:
+            cached = self._prefix.get(transform)
+            if cached is not None and cached[0] == start and cached[1] <= end:
+                _, cached_end, data = cached
+                self._reused += cached_end - start
+            else:
+                cached_end, data = start, b""
+            parts = [data] if data else []
+            parts.extend(self._entry(index).encode(transform, self.encoder) for index in range(cached_end, end))
+            data = b",".join(parts)
+            self._prefix[transform] = (start, end, data)
+            return data
+
+    def reset(self) -> None:
+        """Descarta as conversões e o prefixo em cache."""
+        with self._lock:
+            self._reset()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna as estatísticas do montador.
+
+        Returns:
+            Dicionário com mensagens sincronizadas, convertidas e reaproveitadas do prefixo.
+        """
+        with self._lock:
+            return {
+                "synced": self._synced,
+                "converted": self._converted,
+                "reused": self._reused,
+                "generation": self.generation,
+            }
+
+    def _reset(self) -> None:
+        self._ring = [None] * self.capacity
+        self._synced = 0
+        self._last = None
+        self._prefix.clear()
+        self.generation += 1
+
+    def _sync(self, history: List[Message]) -> None:
+        """Converte as mensagens acrescentadas desde a última sincronização."""
+        synced = self._synced
+        if synced > len(history) or (synced and history[synced - 1] is not self._last):
+            self._reset()
+            synced = 0
+        for index in range(synced, len(history)):
+            message = history[index]
+            self._ring[index % self.capacity] = WireEntry({"role": message.role.value, "content": message.content})
+        self._converted += len(history) - synced
+        self._synced = len(history)
+        self._history = history
+        self._last = history[-1] if history else None
+
+    def _entry(self, index: int) -> WireEntry:
+        """Entrada da posição index do histórico; fora do buffer, converte sem guardar."""
+        if index >= self._synced - self.capacity:
+            return self._ring[index % self.capacity]
+        message = self._history[index]
+        return WireEntry({"role": message.role.value, "content": message.content})
+
+    def _system_entry(self, message: Dict[str, str]) -> WireEntry:
+        """Entrada de uma mensagem de sistema, reaproveitada enquanto o conteúdo não mudar."""
+        key = message["role"] + "\x00" + message["content"]
+        entry = self._system.get(key)
+        if entry is None:
+            if len(self._system) >= 8:
+                self._system.clear()
+            entry = self._system[key] = WireEntry(dict(message))
+        return entry
@@ -0,0 +1,147 @@
+"""Módulo que contém o segmentador incremental de frases em português."""
+import re
+from typing import List, Optional
+
+
+# Abreviações que nunca encerram uma frase (ex.: "Sr. João", "Av. Paulista")
+ABBREVIATIONS = frozenset({
+    "sr", "sra", "srta", "dr", "dra", "prof", "profa", "exmo", "exma", "ilmo", "ilma",
+    "v.sa", "v.exa", "av", "al", "pç", "rod", "nº", "n", "num",
+    "tel", "cel", "fax", "pág", "pag", "p", "pp", "art", "arts", "cap",
+    "inc", "ed", "vol", "obs", "ref", "aprox",
+    "cia", "depto", "dept", "adm",
+    "eng", "gen", "cmte", "pe", "sto", "sta", "vs", "p.ex", "ex",
+})
+
+# Unidades, meses e dias que também são fim de frase comum ("São 3,5 km. Chegue
+# cedo."): só são abreviações quando seguidas de minúscula ou número ("até 15 jan. 2025")
+CONTEXTUAL_ABBREVIATIONS = frozenset({
+    "km", "min", "máx", "mín", "max",
+    "jan", "fev", "abr", "jun", "jul", "ago", "nov",
+    "qua", "qui", "sáb",
+})
+
+# Abreviações que podem encerrar a frase quando seguidas de letra maiúscula
+SENTENCE_FINAL_ABBREVIATIONS = frozenset({"etc", "ltda", "s.a", "s/a", "eireli"})
+
+_BOUNDARY_PATTERN = re.compile(r"([.!?…]+)([\"'”’»)\]]*)\s+(?=\S)")
+_CLAUSE_PATTERN = re.compile(r"[,;:]\s+")
+_INITIALISM_PATTERN = re.compile(r"^(?:\w\.)+\w$")
+
+
+class SentenceSegmenter:
+    """Divide um texto recebido em trechos (streaming) em frases completas.
+    
+    Uma fronteira só é confirmada quando o caractere seguinte à pontuação já
+    chegou, o que permite distinguir "Sr. Silva" ou "1. Acesse" de um fim de
+    frase real. Frases sem pontuação que ultrapassam ``max_chars`` são
+    quebradas na última vírgula (ou espaço) para não atrasar a síntese de voz.
+    """
+    
+    def __init__(self, max_chars: int = 200):
+        """Inicializa o segmentador.
+        
+        Args:
+            max_chars: Tamanho máximo de um trecho sem fronteira de frase antes
+                de forçar a quebra em uma pausa natural.
+        """
+        self.max_chars = max_chars
+        self._buffer = ""
+        self._scan_from = 0
+    
+    def feed(self, delta: str) -> List[str]:
+        """Acrescenta um trecho de texto e retorna as frases concluídas.
+        
+        Args:
+            delta: Novo trecho de texto recebido do modelo.
+            
+        Returns:
+            Lista (possivelmente vazia) de frases completas, na ordem do texto.
+        """
+        self._buffer += delta
+        sentences = []
+        
+        while True:
+            sentence = self._next_sentence()
+            if sentence is None:
+                break
+            if sentence:
+                sentences.append(sentence)
+        
+        return sentences
+    
+    def flush(self) -> Optional[str]:
+        """Retorna o texto restante no buffer ao fim do streaming.
+        
+        Returns:
+            O trecho final pendente, ou None se não houver texto.
+        """
+        remaining = self._buffer.strip()
+        self._buffer = ""
+        self._scan_from = 0
+        return remaining or None
+    
+    def _next_sentence(self) -> Optional[str]:
+        """Extrai a próxima frase do buffer, se houver uma fronteira confirmada."""
+        for match in _BOUNDARY_PATTERN.finditer(self._buffer, self._scan_from):
+            if self._is_boundary(match):
+                return self._cut(match.end(2), match.end())
+            self._scan_from = match.end()
+        
+        if len(self._buffer) > self.max_chars:
+            return self._soft_split()
+        return None
+    
+    def _cut(self, sentence_end: int, next_start: int) -> str:
+        """Remove a frase do início do buffer e a retorna."""
+        sentence = self._buffer[:sentence_end].strip()
+        self._buffer = self._buffer[next_start:]
+        self._scan_from = 0
+        return sentence
+    
+    def _soft_split(self) -> Optional[str]:
+        """Quebra um trecho longo na última pausa natural dentro do limite."""
+        window = self._buffer[:self.max_chars]
+        clauses = list(_CLAUSE_PATTERN.finditer(window))
+        if clauses:
+            last = clauses[-1]
+            return self._cut(last.start() + 1, last.end())
+        
+        space = window.rfind(" ")
+        if space > 0:
+            return self._cut(space, space + 1)
+        return None
+    
+    def _is_boundary(self, match: "re.Match") -> bool:
+        """Decide se a pontuação encontrada encerra de fato uma frase."""
+        punctuation = match.group(1)
+        if punctuation != ".":
+            # "!", "?", "…" e reticências sempre encerram a frase
+            return True
+        
+        next_char = self._buffer[match.end()]
+        if next_char.islower():
+            # "aprox. dez minutos", "ex. cartão"
+            return False
+        
+        before = self._buffer[:match.start()]
+        word_match = re.search(r"(\S+)$", before)
+        if not word_match:
+            return True
+        word = word_match.group(1).lstrip("([\"'“«")
+        lowered = word.lower()
+        
+        if lowered in ABBREVIATIONS:
+            return False
+        if lowered in CONTEXTUAL_ABBREVIATIONS:
+            # Minúscula já foi tratada acima; resta o número
+            return not next_char.isdigit()
+        if lowered in SENTENCE_FINAL_ABBREVIATIONS or _INITIALISM_PATTERN.match(word):
+            return next_char.isupper()
+        if len(word) == 1 and word.isupper():
+            # Iniciais de nomes: "J. Silva"
+            return False
+        if word.isdigit() and not before[:word_match.start()].strip():
+            # Marcador de lista no início do trecho: "1. Acesse o site"
+            return False
+        return True
@@ -0,0 +1,281 @@
+"""Módulo que contém o gerenciador de sessões de conversa simultâneas."""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from ..entities.message import Message
+from ..entities.session import ConversationSession
+
+
+class SessionStore:
+    """Interface para armazenamentos das sessões despejadas da memória."""
+
+    def save(self, session: ConversationSession) -> None:
+        """Grava o estado completo de uma sessão.
+
+        Args:
+            session: Sessão a ser gravada.
+        """
+        raise NotImplementedError
+
+    def load(self, session_id: str) -> Optional[ConversationSession]:
+        """Carrega uma sessão gravada.
+
+        Args:
+            session_id: Identificador da sessão.
+
+        Returns:
+            A sessão, ou None se ela não foi gravada.
+        """
+        raise NotImplementedError
+
+    def append(self, session_id: str, messages: List[Message]) -> None:
+        """Registra mensagens novas de uma sessão assim que são acrescentadas.
+
+        Armazenamentos que só gravam no despejo não precisam sobrescrever.
+
+        Args:
+            session_id: Identificador da sessão.
+            messages: Mensagens acrescentadas, em ordem.
+        """
+
+    def delete(self, session_id: str) -> None:
+        """Remove uma sessão gravada.
+
+        Args:
+            session_id: Identificador da sessão.
+        """
+        raise NotImplementedError
+
+
+class SessionManager:
+    """Mantém em memória as sessões ativas, com limite de uso e despejo LRU/TTL.
+
+    Sessões ociosas por mais de ``idle_ttl`` segundos, ou as usadas há mais
+    tempo quando o número de sessões ou o total de caracteres em memória passa
+    do limite, são despejadas: gravadas no ``store`` (se houver), repassadas
+    ao gancho ``on_evict`` e removidas da memória. Uma sessão despejada é
+    recarregada do ``store`` no próximo acesso.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        max_total_chars: int = 5_000_000,
+        idle_ttl: float = 1800.0,
+        store: Optional[SessionStore] = None,
+        on_evict: Optional[Callable[[ConversationSession], None]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Inicializa o gerenciador.
+
+        Args:
+            max_sessions: Número máximo de sessões mantidas em memória.
+            max_total_chars: Total máximo de caracteres de conteúdo em memória.
+            idle_ttl: Tempo (em segundos) sem atividade após o qual a sessão é despejada.
+            store: Armazenamento para onde as sessões despejadas vão e de onde voltam.
+            on_evict: Gancho chamado com cada sessão despejada.
+            clock: Relógio monotônico (substituível em testes).
+        """
+        self.max_sessions = max_sessions
+        self.max_total_chars = max_total_chars
+        self.idle_ttl = idle_ttl
+        self.store = store
+        self.on_evict = on_evict
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        self._last_seen: Dict[str, float] = {}
+        self._sizes: Dict[str, int] = {}
+        self._total_chars = 0
+        self._created = 0
+        self._reloaded = 0
+        self._evicted = 0
+
+    def get(self, session_id: str) -> ConversationSession:
+        """Retorna a sessão, recarregando-a do armazenamento ou criando uma nova.
+
+        Args:
+            session_id: Identificador da sessão (ex.: id da chamada).
+
+        Returns:
+            A sessão em memória.
+        """
+        return self._get(session_id, create=True)
+
+    def find(self, session_id: str) -> Optional[ConversationSession]:
+        """Retorna a sessão se ela existir (em memória ou no armazenamento), sem criá-la.
+
+        Args:
+            session_id: Identificador da sessão.
+
+        Returns:
+            A sessão, ou None se ela não existir.
+        """
+        return self._get(session_id, create=False)
+
+    def append(self, session_id: str, *messages: Message) -> ConversationSession:
+        """Acrescenta mensagens ao histórico da sessão.
+
+        Args:
+            session_id: Identificador da sessão.
+            *messages: Mensagens a acrescentar, em ordem.
+
+        Returns:
+            A sessão atualizada.
+        """
+        session = self.get(session_id)
+        with self._lock:
+            session.history.extend(messages)
+            if session_id in self._sessions:
+                # Recalcula tudo: o turno também pode ter atualizado o resumo da sessão
+                self._set_size(session)
+            evicted = self._collect_evictions(keep=session_id)
+        if self.store is not None:
+            self.store.append(session_id, list(messages))
+        self._spill(evicted)
+        return session
+
+    def refresh_size(self, session_id: str) -> None:
+        """Recalcula o tamanho da sessão após alterações feitas diretamente nela."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._set_size(session)
+
+    def close(self, session_id: str) -> None:
+        """Encerra a sessão: grava-a no armazenamento e libera a memória."""
+        with self._lock:
+            session = self._pop(session_id)
+        if session is not None and self.store is not None:
+            self.store.save(session)
+
+    def delete(self, session_id: str) -> None:
+        """Remove a sessão da memória e do armazenamento."""
+        with self._lock:
+            self._pop(session_id)
+        if self.store is not None:
+            self.store.delete(session_id)
+
+    def evict_idle(self) -> int:
+        """Despeja as sessões ociosas há mais de idle_ttl segundos.
+
+        Returns:
+            Quantidade de sessões despejadas.
+        """
+        with self._lock:
+            evicted = self._collect_evictions()
+        self._spill(evicted)
+        return len(evicted)
+
+    def flush(self) -> None:
+        """Grava todas as sessões em memória no armazenamento (ex.: ao encerrar o processo)."""
+        if self.store is None:
+            return
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            self.store.save(session)
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna as estatísticas do gerenciador.
+
+        Returns:
+            Dicionário com sessões em memória, caracteres em memória, sessões
+            criadas, recarregadas do armazenamento e despejadas.
+        """
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "total_chars": self._total_chars,
+                "created": self._created,
+                "reloaded": self._reloaded,
+                "evicted": self._evicted,
+            }
+
+    def _get(self, session_id: str, create: bool) -> Optional[ConversationSession]:
+        """Busca a sessão em memória, depois no armazenamento e, se create, cria uma nova."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._touch(session)
+                return session
+
+        loaded = self.store.load(session_id) if self.store is not None else None
+        if loaded is None and not create:
+            return None
+
+        with self._lock:
+            # Outra thread pode ter carregado a mesma sessão enquanto o armazenamento era lido
+            session = self._sessions.get(session_id)
+            if session is None:
+                if loaded is not None:
+                    session = loaded
+                    self._reloaded += 1
+                else:
+                    session = ConversationSession(session_id=session_id)
+                    self._created += 1
+                self._sessions[session_id] = session
+                self._set_size(session)
+            self._touch(session)
+            evicted = self._collect_evictions(keep=session_id)
+        self._spill(evicted)
+        return session
+
+    def _touch(self, session: ConversationSession) -> None:
+        """Marca a sessão como a usada mais recentemente."""
+        self._sessions.move_to_end(session.session_id)
+        self._last_seen[session.session_id] = self._clock()
+        session.last_active = datetime.now()
+
+    def _set_size(self, session: ConversationSession) -> None:
+        """Atualiza a contabilidade de caracteres de uma sessão."""
+        size = session.size_in_chars()
+        self._total_chars += size - self._sizes.get(session.session_id, 0)
+        self._sizes[session.session_id] = size
+
+    def _pop(self, session_id: str) -> Optional[ConversationSession]:
+        """Remove a sessão da memória e da contabilidade."""
+        session = self._sessions.pop(session_id, None)
+        self._last_seen.pop(session_id, None)
+        self._total_chars -= self._sizes.pop(session_id, 0)
+        return session
+
+    def _collect_evictions(self, keep: Optional[str] = None) -> List[ConversationSession]:
+        """Retira da memória as sessões expiradas e as excedentes (da menos recente para a mais recente)."""
+        evicted = []
+        now = self._clock()
+        for session_id in list(self._sessions):
+            if session_id == keep or now - self._last_seen[session_id] < self.idle_ttl:
+                break
+            evicted.append(self._pop(session_id))
+
+        while len(self._sessions) > 1 and (
+            len(self._sessions) > self.max_sessions or self._total_chars > self.max_total_chars
+        ):
+            session_id = next(iter(self._sessions))
+            if session_id == keep:
+                break
+            evicted.append(self._pop(session_id))
+
+        self._evicted += len(evicted)
+        return evicted
+
+    def _spill(self, sessions: List[ConversationSession]) -> None:
+        """Grava as sessões despejadas e chama o gancho, fora da trava."""
+        for session in sessions:
+            if self.store is not None:
+                self.store.save(session)
+            if self.on_evict is not None:
+                self.on_evict(session)
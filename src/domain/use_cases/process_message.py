@@ -1,8 +1,30 @@
 """Módulo que contém o caso de uso para processar mensagens com IA."""
-from typing import List, Optional
+import asyncio
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 
 from ..entities.message import Message, MessageRole
+from ..entities.session import ConversationSession
+from ..services.context_window import ApproximateTokenizer, ContextWindow
+from ..services.prompt_builder import PromptBuilder
+
+
+# Sessão do turno em andamento, para adaptadores com estado por sessão
+# (ex.: o provedor preferido do SmartAIModel)
+current_session: ContextVar[Optional[ConversationSession]] = ContextVar("current_session", default=None)
+
+
+@contextmanager
+def session_scope(session: Optional[ConversationSession]):
+    """Define a sessão do turno em andamento (ver current_session) durante o bloco."""
+    token = current_session.set(session)
+    try:
+        yield session
+    finally:
+        current_session.reset(token)
 
 
 class AIModel:
@@ -19,6 +41,130 @@ class AIModel:
             A resposta gerada pelo modelo.
         """
         raise NotImplementedError
+    
+    def stream_response(self, messages: List[dict], **kwargs) -> Iterator[str]:
+        """Gera a resposta de forma incremental, em trechos de texto.
+        
+        A implementação padrão produz a resposta completa de uma só vez;
+        adaptadores com suporte a streaming devem sobrescrever este método
+        para entregar cada trecho assim que ele chega do provedor.
+        
+        Args:
+            messages: Lista de mensagens no formato esperado pelo modelo.
+            **kwargs: Argumentos adicionais para o modelo.
+            
+        Yields:
+            Trechos (deltas) de texto da resposta, na ordem em que são gerados.
+        """
+        yield self.generate_response(messages, **kwargs)
+    
+    async def agenerate_response(self, messages: List[dict], **kwargs) -> str:
+        """Versão assíncrona de generate_response.
+        
+        A implementação padrão executa generate_response em uma thread do
+        executor padrão do loop; adaptadores com cliente HTTP assíncrono devem
+        sobrescrever este método para não ocupar uma thread por requisição.
+        
+        Args:
+            messages: Lista de mensagens no formato esperado pelo modelo.
+            **kwargs: Argumentos adicionais para o modelo.
+            
+        Returns:
+            A resposta gerada pelo modelo.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.generate_response, messages, **kwargs)
+        )
+    
+    async def astream_response(self, messages: List[dict], **kwargs) -> AsyncIterator[str]:
+        """Versão assíncrona de stream_response.
+        
+        A implementação padrão produz a resposta completa de agenerate_response
+        em um único trecho.
+        
+        Args:
+            messages: Lista de mensagens no formato esperado pelo modelo.
+            **kwargs: Argumentos adicionais para o modelo.
+            
+        Yields:
+            Trechos (deltas) de texto da resposta, na ordem em que são gerados.
+        """
+        yield await self.agenerate_response(messages, **kwargs)
+    
+    def context_budget(self) -> Optional[int]:
+        """Orçamento de tokens do prompt para o provedor que atenderá a próxima requisição.
+        
+        Returns:
+            Número máximo de tokens do prompt, ou None para usar o limite de
+            mensagens (max_history) em vez de um orçamento de tokens.
+        """
+        return None
+
+
+class AnswerCache:
+    """Interface para caches de respostas consultados antes de chamar o modelo.
+    
+    A chave é só a mensagem do usuário, por isso o caso de uso consulta e
+    alimenta o cache apenas nos turnos sem histórico: no meio da conversa,
+    a mesma mensagem ("sim", "pode ser") depende do que veio antes.
+    """
+    
+    def lookup(self, question: str) -> Optional[str]:
+        """Procura uma resposta já dada para a pergunta (ou uma equivalente).
+        
+        Args:
+            question: Mensagem atual do usuário.
+            
+        Returns:
+            A resposta em cache, ou None se não houver.
+        """
+        raise NotImplementedError
+    
+    def store(self, question: str, answer: str) -> None:
+        """Guarda a resposta dada a uma pergunta.
+        
+        Args:
+            question: Mensagem do usuário.
+            answer: Resposta completa do modelo.
+        """
+        raise NotImplementedError
+
+
+class HistoryCompactor:
+    """Interface para compactadores do histórico que saiu da janela de contexto."""
+    
+    def lookup(self, history: List[Message]) -> Tuple[Optional[str], int]:
+        """Procura o resumo do maior prefixo do histórico já compactado.
+        
+        Args:
+            history: Histórico completo da conversa.
+            
+        Returns:
+            Tupla (resumo, quantidade de mensagens do início do histórico que ele
+            cobre); (None, 0) se nenhum prefixo foi compactado.
+        """
+        raise NotImplementedError
+    
+    def schedule(self, history: List[Message], upto: int) -> None:
+        """Agenda a compactação de history[:upto] sem bloquear o chamador.
+        
+        Args:
+            history: Histórico completo da conversa.
+            upto: Quantidade de mensagens iniciais que saíram da janela de contexto.
+        """
+        raise NotImplementedError
+    
+    def restore(self, history: List[Message], summary: str, covers: int) -> None:
+        """Reaproveita um resumo guardado fora do compactador (ex.: na sessão recarregada).
+        
+        Compactadores sem estado próprio não precisam sobrescrever.
+        
+        Args:
+            history: Histórico completo da conversa.
+            summary: Resumo de history[:covers].
+            covers: Quantidade de mensagens do início do histórico que o resumo cobre.
+        """
 
 
 @dataclass
@@ -28,6 +174,9 @@ class ProcessMessageInput:
     conversation_history: List[Message]
     max_history: int = 4
     model_kwargs: Optional[dict] = None
+    max_prompt_tokens: Optional[int] = None
+    prompt_builder: Optional[PromptBuilder] = None
+    session: Optional[ConversationSession] = None
 
 
 @dataclass
@@ -41,46 +190,143 @@ class ProcessMessageOutput:
 class ProcessMessageUseCase:
     """Caso de uso para processar mensagens com IA."""
     
-    def __init__(self, ai_model: AIModel):
+    SYSTEM_PROMPT = "Você é um assistente virtual de atendimento telefônico. Seja prestativo e objetivo."
+    
+    def __init__(
+        self,
+        ai_model: AIModel,
+        answer_cache: Optional[AnswerCache] = None,
+        context_window: Optional[ContextWindow] = None,
+        history_compactor: Optional[HistoryCompactor] = None
+    ):
         """Inicializa o caso de uso com o modelo de IA.
         
         Args:
             ai_model: Instância do modelo de IA que implementa a interface AIModel.
+            answer_cache: Cache opcional consultado antes do modelo; um acerto
+                responde o turno sem chamar a IA.
+            context_window: Janela de contexto usada quando há orçamento de tokens.
+                Se não for fornecida, usa a contagem aproximada de tokens.
+            history_compactor: Compactador opcional; as mensagens que saem da janela
+                de contexto entram em um resumo enviado no lugar delas.
         """
         self.ai_model = ai_model
+        self.answer_cache = answer_cache
+        self.context_window = context_window or ContextWindow(ApproximateTokenizer())
+        self.history_compactor = history_compactor
+        self._system_prompt_message = {"role": "system", "content": self.SYSTEM_PROMPT}
     
-    def execute(self, input_data: ProcessMessageInput) -> ProcessMessageOutput:
-        """Executa o processamento da mensagem.
+    def _cached_answer(self, input_data: ProcessMessageInput) -> Optional[str]:
+        """Consulta o cache de respostas, se configurado e o turno não tiver histórico."""
+        if self.answer_cache is None or input_data.conversation_history:
+            return None
+        return self.answer_cache.lookup(input_data.user_message)
+    
+    def _remember(self, input_data: ProcessMessageInput, response: str) -> None:
+        """Guarda a resposta gerada no cache, se configurado e o turno não tiver histórico."""
+        if self.answer_cache is not None and response and not input_data.conversation_history:
+            self.answer_cache.store(input_data.user_message, response)
+    
+    def _system_messages(self, history: List[Message], session: Optional[ConversationSession] = None) -> Tuple[List[dict], int]:
+        """Monta as mensagens de sistema, incluindo o resumo do histórico compactado.
+        
+        O resumo da sessão (que sobrevive ao despejo e à recarga) e o do
+        compactador são comparados; o que cobre mais mensagens é usado e
+        guardado nos dois.
+        
+        Returns:
+            Tupla (mensagens de sistema, quantidade de mensagens do histórico cobertas pelo resumo).
+        """
+        messages = [self._system_prompt_message]
+        if self.history_compactor is None:
+            return messages, 0
+        summary, covered = self.history_compactor.lookup(history)
+        if session is not None:
+            if session.summary and covered < session.summary_covers <= len(history):
+                summary, covered = session.summary, session.summary_covers
+                self.history_compactor.restore(history, summary, covered)
+            elif summary and covered > session.summary_covers:
+                session.summary, session.summary_covers = summary, covered
+        if summary:
+            messages.append({"role": "system", "content": f"Resumo da conversa até aqui: {summary}"})
+        return messages, covered
+    
+    def _window_start(
+        self,
+        history: List[Message],
+        covered: int,
+        system: List[dict],
+        current: dict,
+        input_data: ProcessMessageInput
+    ) -> int:
+        """Retorna a posição da mensagem mais antiga de history[covered:] que entra no prompt.
+        
+        Com orçamento de tokens (max_prompt_tokens ou o do provedor), o histórico
+        é o trecho mais recente que cabe nele; sem orçamento, são as últimas
+        max_history trocas.
+        """
+        recent = len(history) - covered
+        budget = input_data.max_prompt_tokens or self.ai_model.context_budget()
+        if budget:
+            if input_data.prompt_builder is not None:
+                wire = input_data.prompt_builder.wire(history, covered)
+            else:
+                wire = [{"role": msg.role.value, "content": msg.content} for msg in history[covered:]]
+            return self.context_window.fit_start(system, wire, current, budget)
+        return recent - min(recent, input_data.max_history * 2)
+    
+    def _build_messages(self, input_data: ProcessMessageInput) -> List[dict]:
+        """Monta a lista de mensagens enviada ao modelo.
+        
+        Com um PromptBuilder na entrada, só as mensagens novas do histórico são
+        convertidas (e serializadas) neste turno.
         
         Args:
             input_data: Dados de entrada para o processamento.
             
         Returns:
-            Os dados de saída com a resposta processada.
+            Prompt de sistema (com o resumo do histórico compactado, se houver),
+            histórico recente e mensagem atual do usuário.
         """
-        # Cria a mensagem do usuário
-        user_message = Message(
-            role=MessageRole.USER,
-            content=input_data.user_message
-        )
+        history = input_data.conversation_history
+        messages, covered = self._system_messages(history, input_data.session)
+        current = {"role": "user", "content": input_data.user_message}
         
-        # Prepara o histórico de mensagens para o modelo
-        messages = [
-            {"role": "system", "content": "Você é um assistente virtual de atendimento telefônico. Seja prestativo e objetivo."}
-        ]
-        
-        # Adiciona o histórico da conversa (limitado pelo max_history)
-        for msg in input_data.conversation_history[-(input_data.max_history * 2):]:
+        # Adiciona o histórico recente que cabe na janela de contexto
+        start = covered + self._window_start(history, covered, messages, current, input_data)
+        if input_data.prompt_builder is not None:
+            return input_data.prompt_builder.build(history, messages, start, current)
+        for msg in history[start:]:
             messages.append({"role": msg.role.value, "content": msg.content})
         
         # Adiciona a mensagem atual do usuário
-        messages.append({"role": "user", "content": input_data.user_message})
-        
-        # Gera a resposta usando o modelo de IA
-        model_kwargs = input_data.model_kwargs or {}
-        response = self.ai_model.generate_response(messages, **model_kwargs)
+        messages.append(current)
+        return messages
+    
+    def _schedule_compaction(self, input_data: ProcessMessageInput, output: ProcessMessageOutput) -> None:
+        """Agenda o resumo das mensagens que ficarão fora da janela no próximo turno.
         
-        # Cria a mensagem do assistente
+        O compactador trabalha em segundo plano, no tempo ocioso após a resposta
+        (por exemplo, enquanto ela é falada), de modo que o próximo turno já
+        encontra o resumo pronto.
+        """
+        if self.history_compactor is None:
+            return
+        history = list(input_data.conversation_history) + [output.user_message, output.assistant_message]
+        system, covered = self._system_messages(history, input_data.session)
+        next_turn = {"role": "user", "content": ""}
+        start = self._window_start(history, covered, system, next_turn, input_data)
+        if start > 0:
+            self.history_compactor.schedule(history, covered + start)
+    
+    def _complete(self, input_data: ProcessMessageInput, user_message: Message, response: str) -> ProcessMessageOutput:
+        """Cria os dados de saída e agenda a compactação do histórico."""
+        output = self._build_output(user_message, response)
+        self._schedule_compaction(input_data, output)
+        return output
+    
+    def _build_output(self, user_message: Message, response: str) -> ProcessMessageOutput:
+        """Cria os dados de saída a partir da resposta do modelo."""
         assistant_message = Message(
             role=MessageRole.ASSISTANT,
             content=response
@@ -91,3 +337,134 @@ class ProcessMessageUseCase:
             user_message=user_message,
             assistant_message=assistant_message
         )
+    
+    def execute(self, input_data: ProcessMessageInput) -> ProcessMessageOutput:
+        """Executa o processamento da mensagem.
+        
+        Args:
+            input_data: Dados de entrada para o processamento.
+            
+        Returns:
+            Os dados de saída com a resposta processada.
+        """
+        with session_scope(input_data.session):
+            # Cria a mensagem do usuário
+            user_message = Message(
+                role=MessageRole.USER,
+                content=input_data.user_message
+            )
+        
+            # Perguntas já respondidas não precisam do modelo
+            cached = self._cached_answer(input_data)
+            if cached is not None:
+                return self._complete(input_data, user_message, cached)
+        
+            # Prepara o histórico de mensagens para o modelo
+            messages = self._build_messages(input_data)
+        
+            # Gera a resposta usando o modelo de IA
+            model_kwargs = input_data.model_kwargs or {}
+            response = self.ai_model.generate_response(messages, **model_kwargs)
+            self._remember(input_data, response)
+        
+            return self._complete(input_data, user_message, response)
+    
+    async def aexecute(self, input_data: ProcessMessageInput) -> ProcessMessageOutput:
+        """Versão assíncrona de execute, para uso em um loop de eventos.
+        
+        Args:
+            input_data: Dados de entrada para o processamento.
+            
+        Returns:
+            Os dados de saída com a resposta processada.
+        """
+        with session_scope(input_data.session):
+            user_message = Message(
+                role=MessageRole.USER,
+                content=input_data.user_message
+            )
+        
+            cached = self._cached_answer(input_data)
+            if cached is not None:
+                return self._complete(input_data, user_message, cached)
+        
+            messages = self._build_messages(input_data)
+            model_kwargs = input_data.model_kwargs or {}
+            response = await self.ai_model.agenerate_response(messages, **model_kwargs)
+            self._remember(input_data, response)
+        
+            return self._complete(input_data, user_message, response)
+    
+    def execute_streaming(
+        self,
+        input_data: ProcessMessageInput,
+        on_delta: Callable[[str], None]
+    ) -> ProcessMessageOutput:
+        """Executa o processamento entregando a resposta à medida que é gerada.
+        
+        Args:
+            input_data: Dados de entrada para o processamento.
+            on_delta: Função chamada com cada trecho de texto assim que ele chega.
+            
+        Returns:
+            Os dados de saída com a resposta completa, após o fim do streaming.
+        """
+        with session_scope(input_data.session):
+            user_message = Message(
+                role=MessageRole.USER,
+                content=input_data.user_message
+            )
+        
+            cached = self._cached_answer(input_data)
+            if cached is not None:
+                on_delta(cached)
+                return self._complete(input_data, user_message, cached)
+        
+            messages = self._build_messages(input_data)
+            model_kwargs = input_data.model_kwargs or {}
+        
+            parts = []
+            for delta in self.ai_model.stream_response(messages, **model_kwargs):
+                parts.append(delta)
+                on_delta(delta)
+        
+            response = "".join(parts).strip()
+            self._remember(input_data, response)
+            return self._complete(input_data, user_message, response)
+    
+    async def aexecute_streaming(
+        self,
+        input_data: ProcessMessageInput,
+        on_delta: Callable[[str], Awaitable[None]]
+    ) -> ProcessMessageOutput:
+        """Versão assíncrona de execute_streaming, para uso em um loop de eventos.
+        
+        Args:
+            input_data: Dados de entrada para o processamento.
+            on_delta: Corrotina chamada com cada trecho de texto assim que ele chega.
+            
+        Returns:
+            Os dados de saída com a resposta completa, após o fim do streaming.
+        """
+        with session_scope(input_data.session):
+            user_message = Message(
+                role=MessageRole.USER,
+                content=input_data.user_message
+            )
+        
+            cached = self._cached_answer(input_data)
+            if cached is not None:
+                await on_delta(cached)
+                return self._complete(input_data, user_message, cached)
+        
+            messages = self._build_messages(input_data)
+            model_kwargs = input_data.model_kwargs or {}
+        
+            parts = []
+            async for delta in self.ai_model.astream_response(messages, **model_kwargs):
+                parts.append(delta)
+                await on_delta(delta)
+        
+            response = "".join(parts).strip()
+            self._remember(input_data, response)
+            return self._complete(input_data, user_message, response)
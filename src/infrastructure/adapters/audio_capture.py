@@ -0,0 +1,226 @@
+"""Módulo que contém a captura contínua do microfone em um buffer circular.
+
+Reabrir o stream do PyAudio a cada fala custa tempo e perde o início do que
+é dito. Na captura contínua, uma thread mantém o stream aberto e grava os
+trechos lidos em um buffer circular pré-alocado; cada escuta começa na hora,
+a partir de um ponto um pouco anterior ao pedido (pré-roll), de modo que a
+primeira sílaba não é cortada.
+
+O buffer tem um único escritor (a thread de captura) e leitores que apenas
+acompanham a posição publicada por ele, sem trava: o escritor copia os
+dados e só depois avança o total gravado. As leituras devolvem memoryviews
+do próprio buffer, sem cópia; elas continuam válidas até o escritor dar a
+volta no buffer, então quem precisa guardar o áudio por mais tempo deve
+copiá-lo.
+"""
+import threading
+from typing import List, Optional, Tuple
+
+import speech_recognition as sr
+
+
+class AudioRingBuffer:
+    """Buffer circular de bytes com um escritor e leitores independentes, sem trava."""
+
+    def __init__(self, capacity: int):
+        """Inicializa o buffer.
+
+        Args:
+            capacity: Tamanho do buffer, em bytes.
+        """
+        if capacity < 1:
+            raise ValueError("capacity deve ser maior que zero")
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        # Total de bytes já gravados (posição absoluta do próximo byte)
+        self.written = 0
+        self._data_ready = threading.Event()
+        self.closed = False
+
+    def write(self, data: bytes) -> None:
+        """Grava os dados (chamado apenas pela thread de captura)."""
+        size = len(data)
+        if size > self.capacity:
+            data = memoryview(data)[size - self.capacity:]
+            self.written += size - self.capacity
+            size = self.capacity
+        start = self.written % self.capacity
+        first = min(size, self.capacity - start)
+        self._view[start:start + first] = data[:first]
+        if first < size:
+            self._view[:size - first] = data[first:]
+        # Publica a nova posição só depois da cópia
+        self.written += size
+        self._data_ready.set()
+
+    def oldest(self) -> int:
+        """Posição absoluta do dado mais antigo ainda disponível."""
+        return max(0, self.written - self.capacity)
+
+    def read(self, position: int, size: int) -> Tuple[List[memoryview], int]:
+        """Lê até size bytes a partir de uma posição absoluta, sem copiar.
+
+        Se o leitor ficou para trás mais que a capacidade, a leitura pula
+        para o dado mais antigo disponível.
+
+        Returns:
+            Tupla (um ou dois memoryviews com os dados, nova posição).
+        """
+        position = max(position, self.oldest())
+        end = min(self.written, position + size)
+        if end <= position:
+            return [], position
+        start = position % self.capacity
+        length = end - position
+        first = min(length, self.capacity - start)
+        views = [self._view[start:start + first]]
+        if first < length:
+            views.append(self._view[:length - first])
+        return views, end
+
+    def wait(self, position: int, timeout: Optional[float] = None) -> bool:
+        """Espera até haver dados além de position.
+
+        Returns:
+            True se há dados; False em caso de timeout ou buffer fechado.
+        """
+        while self.written <= position and not self.closed:
+            self._data_ready.clear()
+            if self.written > position:
+                break
+            if not self._data_ready.wait(timeout):
+                return False
+        return self.written > position
+
+    def close(self) -> None:
+        """Acorda os leitores que estão esperando (fim da captura)."""
+        self.closed = True
+        self._data_ready.set()
+
+
+class CaptureReader:
+    """Leitor da captura contínua com a interface de leitura de um stream do PyAudio."""
+
+    def __init__(self, ring: AudioRingBuffer, position: int, frame_bytes: int, timeout: float = 1.0):
+        """Inicializa o leitor.
+
+        Args:
+            ring: Buffer da captura.
+            position: Posição absoluta inicial.
+            frame_bytes: Bytes por amostra (as leituras são múltiplos deste valor).
+            timeout: Espera máxima por novos dados antes de considerar o microfone parado.
+        """
+        self.ring = ring
+        self.position = position
+        self.frame_bytes = frame_bytes
+        self.timeout = timeout
+
+    def read_view(self, frames: int) -> memoryview:
+        """Lê exatamente frames amostras, esperando a captura se preciso, sem copiar quando possível.
+
+        Raises:
+            OSError: Se a captura parar de produzir áudio.
+        """
+        size = frames * self.frame_bytes
+        parts: List[memoryview] = []
+        missing = size
+        while missing:
+            if not self.ring.wait(self.position, self.timeout):
+                raise OSError("A captura do microfone parou de produzir áudio")
+            views, self.position = self.ring.read(self.position, missing)
+            parts.extend(views)
+            missing -= sum(len(view) for view in views)
+        if len(parts) == 1:
+            return parts[0]
+        return memoryview(b"".join(parts))
+
+    def read(self, frames: int) -> bytes:
+        """Lê exatamente frames amostras, como cópia (para quem guarda os trechos)."""
+        return bytes(self.read_view(frames))
+
+
+class CapturedAudioSource(sr.AudioSource):
+    """Fonte de áudio do speech_recognition alimentada pela captura contínua."""
+
+    def __init__(self, reader: CaptureReader, sample_rate: int, sample_width: int, chunk: int):
+        self.stream = reader
+        self.SAMPLE_RATE = sample_rate
+        self.SAMPLE_WIDTH = sample_width
+        self.CHUNK = chunk
+
+    def __enter__(self) -> "CapturedAudioSource":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        return None
+
+
+class MicrophoneCapture:
+    """Mantém o microfone aberto e grava o áudio continuamente em um AudioRingBuffer."""
+
+    def __init__(self, microphone: sr.Microphone, buffer_seconds: float = 10.0):
+        """Inicializa a captura (o microfone só é aberto em start).
+
+        Args:
+            microphone: Microfone do speech_recognition.
+            buffer_seconds: Duração de áudio mantida no buffer.
+        """
+        self.microphone = microphone
+        self.buffer_seconds = buffer_seconds
+        self.sample_rate = microphone.SAMPLE_RATE
+        self.sample_width = microphone.SAMPLE_WIDTH
+        self.chunk = microphone.CHUNK
+        self.ring = AudioRingBuffer(int(buffer_seconds * self.sample_rate) * self.sample_width)
+        self.error: Optional[Exception] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Abre o microfone e inicia a thread de captura."""
+        if self.running:
+            return
+        source = self.microphone.__enter__()
+        self.ring.closed = False
+        self.error = None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._capture, args=(source,), name="microphone-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Para a captura e fecha o microfone."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def reader(self, preroll: float = 0.0) -> CaptureReader:
+        """Cria um leitor que começa preroll segundos antes do momento atual.
+
+        Args:
+            preroll: Segundos de áudio já capturado incluídos no início da leitura.
+        """
+        back = int(preroll * self.sample_rate) * self.sample_width
+        position = max(self.ring.written - back, self.ring.oldest())
+        position -= position % self.sample_width
+        return CaptureReader(self.ring, position, self.sample_width)
+
+    def source(self, preroll: float = 0.0) -> CapturedAudioSource:
+        """Fonte de áudio para o speech_recognition (ex.: Recognizer.listen) sobre a captura."""
+        return CapturedAudioSource(self.reader(preroll), self.sample_rate, self.sample_width, self.chunk)
+
+    def _capture(self, source: sr.Microphone) -> None:
+        """Laço da thread: lê o stream aberto e grava no buffer."""
+        try:
+            while not self._stop.is_set():
+                self.ring.write(source.stream.read(self.chunk))
+        except Exception as e:
+            self.error = e
+        finally:
+            self.ring.close()
+            self.microphone.__exit__(None, None, None)
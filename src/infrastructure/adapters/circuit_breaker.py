@@ -0,0 +1,146 @@
+"""Módulo que contém o circuit breaker usado na seleção de provedores de IA."""
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict
+
+
+class CircuitState:
+    """Estados possíveis de um circuit breaker."""
+    CLOSED = "fechado"
+    OPEN = "aberto"
+    HALF_OPEN = "meio-aberto"
+
+
+class CircuitBreaker:
+    """Circuit breaker com taxa de falhas em janela deslizante e sondas meio-abertas.
+
+    - Fechado: as requisições passam e cada resultado entra na janela; se a
+      taxa de falhas da janela atingir o limite, o circuito abre.
+    - Aberto: as requisições são recusadas até ``open_seconds`` se passarem.
+    - Meio-aberto: uma requisição de sonda é liberada; sucesso fecha o
+      circuito (com a janela zerada), falha o reabre.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 5,
+        open_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Inicializa o circuit breaker.
+
+        Args:
+            failure_rate_threshold: Fração de falhas (0 a 1) na janela que abre o circuito.
+            window_size: Quantidade de resultados recentes considerados.
+            min_calls: Quantidade mínima de resultados na janela antes de avaliar a taxa.
+            open_seconds: Tempo (em segundos) que o circuito fica aberto antes da sonda.
+            clock: Relógio monotônico (substituível em testes).
+        """
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._results: Deque[bool] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Estado atual, já considerando a expiração do período aberto."""
+        with self._lock:
+            return self._current_state()
+
+    def is_available(self) -> bool:
+        """Indica, sem reservar a sonda, se uma requisição seria liberada agora."""
+        with self._lock:
+            state = self._current_state()
+            return state == CircuitState.CLOSED or (
+                state == CircuitState.HALF_OPEN and not self._probe_in_flight
+            )
+
+    def allow_request(self) -> bool:
+        """Decide se uma requisição pode ser feita; no estado meio-aberto reserva a sonda."""
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitState.CLOSED:
+                return True
+            if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+                self._state = CircuitState.HALF_OPEN
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Registra uma requisição bem-sucedida."""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._state = CircuitState.CLOSED
+                self._results.clear()
+                self._probe_in_flight = False
+            self._results.append(True)
+
+    def record_failure(self) -> None:
+        """Registra uma falha; abre o circuito se a taxa de falhas atingir o limite."""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._open()
+                return
+            self._results.append(False)
+            if len(self._results) >= self.min_calls and self._failure_rate() >= self.failure_rate_threshold:
+                self._open()
+
+    def trip(self) -> None:
+        """Abre o circuito imediatamente (ex.: quota excedida)."""
+        with self._lock:
+            self._open()
+
+    def release_probe(self) -> None:
+        """Libera a sonda reservada sem registrar resultado (ex.: requisição cancelada)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def reset(self) -> None:
+        """Fecha o circuito e descarta o histórico."""
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._results.clear()
+            self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retorna o estado do circuito para inspeção."""
+        with self._lock:
+            state = self._current_state()
+            reopen_in = 0.0
+            if state == CircuitState.OPEN:
+                reopen_in = max(0.0, self._opened_at + self.open_seconds - self._clock())
+            return {
+                "state": state,
+                "failure_rate": self._failure_rate(),
+                "calls": len(self._results),
+                "times_opened": self._times_opened,
+                "reopen_in": reopen_in,
+            }
+
+    def _current_state(self) -> str:
+        if self._state == CircuitState.OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def _failure_rate(self) -> float:
+        if not self._results:
+            return 0.0
+        return self._results.count(False) / len(self._results)
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+        self._times_opened += 1
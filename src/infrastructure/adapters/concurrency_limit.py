@@ -0,0 +1,179 @@
+"""Módulo que contém o limite de requisições simultâneas a um provedor de IA."""
+import asyncio
+import threading
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+from ...domain.use_cases.process_message import AIModel
+
+
+class ConcurrencyLimitedModel(AIModel):
+    """Decorador de AIModel que limita as requisições simultâneas ao modelo real.
+
+    Serve para respeitar o limite de concorrência de cada provedor (ex.: a cota
+    de requisições paralelas de uma API ou a capacidade de um Ollama local)
+    quando muitos turnos são processados ao mesmo tempo. As chamadas síncronas
+    e assíncronas disputam as mesmas vagas; um streaming ocupa a vaga até o
+    último trecho ser entregue.
+
+    As vagas são um contador protegido por trava, com uma fila única (por
+    ordem de chegada) de quem espera: threads esperam um Event e corrotinas,
+    um Future do próprio loop, sem ocupar threads do executor. Ao liberar, a
+    vaga passa direto para o primeiro da fila.
+    """
+
+    def __init__(self, model: AIModel, max_concurrency: int):
+        """Inicializa o decorador.
+
+        Args:
+            model: Modelo de IA real.
+            max_concurrency: Número máximo de requisições simultâneas ao modelo.
+
+        Raises:
+            ValueError: Se max_concurrency for menor que 1.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency deve ser maior que zero")
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self._available = max_concurrency
+        self._waiters: Deque[Union[threading.Event, Tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = deque()
+        self._in_flight = 0
+        self._peak = 0
+        self._waits = 0
+
+    def generate_response(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Gera uma resposta assim que houver uma vaga livre."""
+        self._acquire()
+        try:
+            return self.model.generate_response(messages, **kwargs)
+        finally:
+            self._release()
+
+    async def agenerate_response(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Versão assíncrona de generate_response."""
+        await self._aacquire()
+        try:
+            return await self.model.agenerate_response(messages, **kwargs)
+        finally:
+            self._release()
+
+    def stream_response(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        """Gera a resposta em streaming, ocupando uma vaga até o fim.
+
+        Yields:
+            Trechos de texto da resposta.
+        """
+        self._acquire()
+        try:
+            yield from self.model.stream_response(messages, **kwargs)
+        finally:
+            self._release()
+
+    async def astream_response(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """Versão assíncrona de stream_response."""
+        await self._aacquire()
+        try:
+            async for delta in self.model.astream_response(messages, **kwargs):
+                yield delta
+        finally:
+            self._release()
+
+    def context_budget(self) -> Optional[int]:
+        """Repassa o orçamento de tokens do modelo real."""
+        return self.model.context_budget()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna as estatísticas do limite.
+
+        Returns:
+            Dicionário com o limite, as requisições em andamento, o pico e quantas esperaram por vaga.
+        """
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                "peak": self._peak,
+                "waits": self._waits,
+            }
+
+    def __getattr__(self, name: str) -> Any:
+        # Repassa atributos específicos do modelo real (ex.: health_monitor)
+        if name == "model":
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    def _acquire(self) -> None:
+        """Ocupa uma vaga, bloqueando a thread enquanto não houver."""
+        with self._lock:
+            waiter = None
+            if self._available and not self._waiters:
+                self._available -= 1
+            else:
+                waiter = threading.Event()
+                self._waiters.append(waiter)
+                self._waits += 1
+        if waiter is not None:
+            waiter.wait()
+        self._enter()
+
+    async def _aacquire(self) -> None:
+        """Ocupa uma vaga sem bloquear o loop de eventos nem ocupar threads do executor."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            future = None
+            if self._available and not self._waiters:
+                self._available -= 1
+            else:
+                future = loop.create_future()
+                waiter = (loop, future)
+                self._waiters.append(waiter)
+                self._waits += 1
+        if future is not None:
+            try:
+                await future
+            except asyncio.CancelledError:
+                with self._lock:
+                    queued = waiter in self._waiters
+                    if queued:
+                        self._waiters.remove(waiter)
+                if not queued and not future.cancelled():
+                    # A vaga chegou junto com o cancelamento: passa adiante
+                    self._pass_slot()
+                raise
+        self._enter()
+
+    def _grant(self, future: asyncio.Future) -> None:
+        """Entrega a vaga a uma corrotina (no loop dela); se ela desistiu, passa adiante."""
+        if future.cancelled():
+            self._pass_slot()
+        else:
+            future.set_result(None)
+
+    def _pass_slot(self) -> None:
+        """Passa uma vaga livre ao primeiro da fila ou a devolve ao contador."""
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if isinstance(waiter, threading.Event):
+                    waiter.set()
+                    return
+                loop, future = waiter
+                try:
+                    loop.call_soon_threadsafe(self._grant, future)
+                    return
+                except RuntimeError:
+                    # Loop já encerrado: ninguém mais espera nesse Future
+                    continue
+            self._available += 1
+
+    def _enter(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+            self._peak = max(self._peak, self._in_flight)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._pass_slot()
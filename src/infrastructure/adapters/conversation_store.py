@@ -0,0 +1,510 @@
+"""Módulo que contém o armazenamento persistente de conversas em segmentos JSONL."""
+import itertools
+import os
+import re
+import threading
+import time
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from ...domain.entities.message import Message
+from ...domain.entities.session import ConversationSession
+from ...domain.services.session_manager import SessionStore
+from .message_codec import dumps, loads, message_from_row, message_row
+
+SEGMENT_PATTERN = re.compile(r"^segment-(\d{6})\.jsonl$")
+
+# Posição de um registro: (número do segmento, deslocamento em bytes)
+Location = Tuple[int, int]
+
+
+def _segment_name(number: int) -> str:
+    """Nome do arquivo de um segmento."""
+    return f"segment-{number:06d}.jsonl"
+
+
+def _message_record(session_id: str, message: Message) -> Dict[str, Any]:
+    """Registro de uma mensagem nova, no formato compacto do message_codec."""
+    return {"op": "message", "session_id": session_id, "m": message_row(message)}
+
+
+def _record_message(record: Dict[str, Any]) -> Message:
+    """Mensagem de um registro (compacto, ou no formato de to_dict dos segmentos antigos)."""
+    if "m" in record:
+        return message_from_row(record["m"])
+    return Message.from_dict(record["message"])
+
+
+class JsonlConversationStore(SessionStore):
+    """Armazenamento de conversas só de acréscimo, com gravação em lotes.
+
+    Cada evento (mensagem nova, metadados, retrato completo ou remoção de uma
+    sessão) vira uma linha JSON no segmento ativo; as mensagens usam a linha
+    compacta ``[papel, conteúdo, epoch_us]`` do message_codec. As gravações vão para um
+    buffer e uma thread as grava em lotes, com um único write (e fsync) por
+    lote, fora do caminho da requisição. Um índice em memória guarda, por
+    sessão, a posição dos seus registros desde o último retrato, de modo que
+    carregar uma sessão ou o final do seu histórico lê só as linhas dela;
+    as leituras combinam o disco com o buffer, sem forçar a gravação do lote.
+    Segmentos passam a um novo arquivo ao atingir ``max_segment_bytes`` e,
+    acima de ``compact_after_segments``, são compactados em um retrato por
+    sessão.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        batch_size: int = 64,
+        flush_interval: float = 0.05,
+        max_segment_bytes: int = 8 * 1024 * 1024,
+        compact_after_segments: int = 8,
+        fsync: bool = True
+    ):
+        """Inicializa o armazenamento, indexando os segmentos existentes.
+
+        Args:
+            directory: Diretório dos segmentos.
+            batch_size: Quantidade de registros que dispara a gravação imediata do lote.
+            flush_interval: Tempo máximo (em segundos) que um registro espera no buffer.
+            max_segment_bytes: Tamanho a partir do qual um novo segmento é iniciado.
+            compact_after_segments: Número de segmentos que dispara a compactação.
+            fsync: Se True, força a gravação em disco a cada lote.
+        """
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_segment_bytes = max_segment_bytes
+        self.compact_after_segments = compact_after_segments
+        self.fsync = fsync
+
+        # _lock protege o buffer e o que já foi enfileirado; _io_lock, os arquivos e o índice;
+        # _compact_lock impede duas compactações ao mesmo tempo (adquirido antes de _io_lock)
+        self._lock = threading.Lock()
+        self._has_pending = threading.Condition(self._lock)
+        self._io_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        self._queued_counts: Dict[str, int] = {}
+        self._queued_meta: Dict[str, Tuple[Any, ...]] = {}
+        self._index: Dict[str, List[Location]] = {}
+        self._segments: List[int] = []
+        self._active: BinaryIO  # aberto por _open_segment, ainda neste construtor
+        self._active_number = 0
+        self._active_size = 0
+        self._closed = False
+        self._batches_written = 0
+        self._records_written = 0
+        self._compactions = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+        self._open_segment(self._segments[-1] if self._segments else 1)
+
+        self._writer = threading.Thread(target=self._write_loop, name="gravador-conversas", daemon=True)
+        self._writer.start()
+
+    def append(self, session_id: str, messages: List[Message]) -> None:
+        """Enfileira mensagens novas de uma sessão."""
+        with self._lock:
+            if session_id not in self._queued_counts:
+                self._queued_counts[session_id] = 0
+            for message in messages:
+                self._enqueue(_message_record(session_id, message))
+
+    def save(self, session: ConversationSession) -> None:
+        """Enfileira o que mudou na sessão desde a última gravação.
+
+        Grava só as mensagens ainda não registradas e os metadados, se mudaram;
+        um retrato completo é gravado quando a sessão é nova para o
+        armazenamento ou quando o histórico foi encurtado (ex.: limpo).
+        """
+        with self._lock:
+            count = self._queued_counts.get(session.session_id)
+            if count is None or count > len(session.history):
+                self._enqueue({"op": "snapshot", "session": session.to_dict()})
+                return
+            for message in session.history[count:]:
+                self._enqueue(_message_record(session.session_id, message))
+            if self._queued_meta.get(session.session_id) != self._meta_of(session):
+                self._enqueue({
+                    "op": "meta",
+                    "session_id": session.session_id,
+                    "summary": session.summary,
+                    "summary_covers": session.summary_covers,
+                    "preferred_provider": session.preferred_provider
+                })
+
+    def load(self, session_id: str) -> Optional[ConversationSession]:
+        """Carrega uma sessão, lendo apenas os registros dela (no disco e ainda no buffer)."""
+        with self._lock:
+            if session_id not in self._queued_counts:
+                # Sessão desconhecida (ex.: nova): responde sem tocar no disco
+                return None
+        with self._io_lock:
+            pending = self._pending_for(session_id)
+            records = self._read_records(list(self._index.get(session_id, []))) + pending
+        sessions: Dict[str, ConversationSession] = {}
+        for record in records:
+            self._apply_record(sessions, record)
+        return sessions.get(session_id)
+
+    def tail(self, session_id: str, count: int) -> List[Message]:
+        """Retorna as últimas mensagens de uma sessão, lendo o índice de trás para frente.
+
+        Args:
+            session_id: Identificador da sessão.
+            count: Quantidade máxima de mensagens.
+
+        Returns:
+            As mensagens, da mais antiga para a mais recente.
+        """
+        messages: List[Message] = []
+        with self._io_lock:
+            pending = self._pending_for(session_id)
+            locations = self._index.get(session_id, [])
+            # Do mais recente para o mais antigo: primeiro o buffer, depois o disco
+            records = itertools.chain(
+                reversed(pending),
+                (self._read_records([location])[0] for location in reversed(locations))
+            )
+            for record in records:
+                if len(messages) >= count or record["op"] == "delete":
+                    break
+                if record["op"] == "message":
+                    messages.append(_record_message(record))
+                elif record["op"] == "snapshot":
+                    history = record["session"].get("history", [])
+                    missing = count - len(messages)
+                    messages.extend(Message.from_dict(data) for data in reversed(history[-missing:]))
+                    break
+        messages.reverse()
+        return messages
+
+    def load_all(self) -> List[ConversationSession]:
+        """Carrega todas as sessões com uma leitura sequencial dos segmentos (ex.: na inicialização)."""
+        with self._io_lock:
+            with self._lock:
+                pending = list(self._pending)
+            sessions = self._read_all_sessions(self._segments)
+        for record in pending:
+            self._apply_record(sessions, record)
+        return list(sessions.values())
+
+    def session_ids(self) -> List[str]:
+        """Retorna os identificadores das sessões gravadas (ou com gravação pendente)."""
+        with self._lock:
+            return list(self._queued_counts)
+
+    def delete(self, session_id: str) -> None:
+        """Enfileira a remoção de uma sessão."""
+        with self._lock:
+            self._enqueue({"op": "delete", "session_id": session_id})
+
+    def flush(self) -> None:
+        """Grava imediatamente os registros do buffer."""
+        self._write_pending()
+
+    def compact(self) -> None:
+        """Reescreve os segmentos como um retrato por sessão, descartando o histórico de eventos."""
+        self.flush()
+        with self._compact_lock:
+            self._compact()
+
+    def close(self) -> None:
+        """Grava o buffer, encerra a thread de gravação e fecha o segmento ativo."""
+        with self._lock:
+            self._closed = True
+            self._has_pending.notify()
+        self._writer.join()
+        self.flush()
+        with self._io_lock:
+            self._active.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna as estatísticas do armazenamento.
+
+        Returns:
+            Dicionário com sessões, segmentos, registros no buffer, lotes e
+            registros gravados e compactações.
+        """
+        with self._io_lock, self._lock:
+            return {
+                "sessions": len(self._index),
+                "segments": len(self._segments),
+                "pending": len(self._pending),
+                "batches_written": self._batches_written,
+                "records_written": self._records_written,
+                "compactions": self._compactions,
+            }
+
+    @staticmethod
+    def _meta_of(session: ConversationSession) -> Tuple[Any, ...]:
+        """Metadados da sessão que, se mudarem, precisam ser gravados."""
+        return (session.summary, session.summary_covers, session.preferred_provider)
+
+    def _pending_for(self, session_id: str) -> List[Dict[str, Any]]:
+        """Registros da sessão ainda no buffer (com _io_lock adquirido, nenhum lote está em gravação)."""
+        with self._lock:
+            return [record for record in self._pending if self._session_of(record) == session_id]
+
+    @staticmethod
+    def _session_of(record: Dict[str, Any]) -> str:
+        """Identificador da sessão de um registro."""
+        if record["op"] == "snapshot":
+            return str(record["session"]["session_id"])
+        return str(record["session_id"])
+
+    def _enqueue(self, record: Dict[str, Any]) -> None:
+        """Coloca um registro no buffer (com _lock adquirido)."""
+        self._track(record, self._queued_counts, self._queued_meta)
+        self._pending.append(record)
+        self._has_pending.notify()
+
+    @staticmethod
+    def _track(record: Dict[str, Any], counts: Dict[str, int], meta: Dict[str, Tuple[Any, ...]]) -> None:
+        """Atualiza a contagem de mensagens e os metadados conhecidos de cada sessão."""
+        op = record["op"]
+        if op == "snapshot":
+            session = record["session"]
+            counts[session["session_id"]] = len(session.get("history", []))
+            meta[session["session_id"]] = (
+                session.get("summary"), session.get("summary_covers", 0), session.get("preferred_provider")
+            )
+        elif op == "message":
+            counts[record["session_id"]] = counts.get(record["session_id"], 0) + 1
+        elif op == "meta":
+            counts.setdefault(record["session_id"], 0)
+            meta[record["session_id"]] = (
+                record["summary"], record["summary_covers"], record["preferred_provider"]
+            )
+        elif op == "delete":
+            counts.pop(record["session_id"], None)
+            meta.pop(record["session_id"], None)
+
+    def _index_record(self, record: Dict[str, Any], location: Location) -> None:
+        """Atualiza o índice com um registro gravado (com _io_lock adquirido)."""
+        op = record["op"]
+        if op == "snapshot":
+            self._index[record["session"]["session_id"]] = [location]
+        elif op == "delete":
+            self._index.pop(record["session_id"], None)
+        else:
+            self._index.setdefault(record["session_id"], []).append(location)
+
+    @staticmethod
+    def _apply_record(sessions: Dict[str, ConversationSession], record: Dict[str, Any]) -> None:
+        """Aplica um registro ao estado reconstruído das sessões."""
+        op = record["op"]
+        if op == "snapshot":
+            restored = ConversationSession.from_dict(record["session"])
+            sessions[restored.session_id] = restored
+            return
+        if op == "delete":
+            sessions.pop(record["session_id"], None)
+            return
+
+        session_id = record["session_id"]
+        session = sessions.get(session_id)
+        if session is None:
+            session = sessions[session_id] = ConversationSession(session_id=session_id)
+        if op == "message":
+            session.history.append(_record_message(record))
+        elif op == "meta":
+            session.summary = record["summary"]
+            session.summary_covers = record["summary_covers"]
+            session.preferred_provider = record["preferred_provider"]
+
+    def _segment_path(self, number: int) -> str:
+        """Caminho do arquivo de um segmento."""
+        return os.path.join(self.directory, _segment_name(number))
+
+    def _iter_segment(self, number: int) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Percorre as linhas de um segmento, gerando (deslocamento, registro).
+
+        Linhas corrompidas (ex.: gravação interrompida) são ignoradas.
+        """
+        offset = 0
+        with open(self._segment_path(number), "rb") as file:
+            for line in file:
+                try:
+                    record = loads(line)
+                except ValueError:
+                    record = None
+                if record is not None:
+                    yield offset, record
+                offset += len(line)
+
+    def _scan(self) -> None:
+        """Reconstrói o índice lendo os segmentos existentes em sequência."""
+        for name in sorted(os.listdir(self.directory)):
+            match = SEGMENT_PATTERN.match(name)
+            if match:
+                self._segments.append(int(match.group(1)))
+        for number in self._segments:
+            for offset, record in self._iter_segment(number):
+                self._index_record(record, (number, offset))
+                self._track(record, self._queued_counts, self._queued_meta)
+
+    def _read_all_sessions(self, segments: List[int]) -> Dict[str, ConversationSession]:
+        """Reconstrói todas as sessões a partir dos segmentos indicados.
+
+        Com _io_lock adquirido, ou sobre segmentos fechados durante a compactação.
+        """
+        sessions: Dict[str, ConversationSession] = {}
+        for number in segments:
+            for _, record in self._iter_segment(number):
+                self._apply_record(sessions, record)
+        return sessions
+
+    def _read_records(self, locations: List[Location]) -> List[Dict[str, Any]]:
+        """Lê os registros das posições indicadas, abrindo cada segmento uma única vez."""
+        files: Dict[int, BinaryIO] = {}
+        try:
+            records = []
+            for number, offset in locations:
+                file = files.get(number)
+                if file is None:
+                    file = files[number] = open(self._segment_path(number), "rb")
+                file.seek(offset)
+                records.append(loads(file.readline()))
+            return records
+        finally:
+            for file in files.values():
+                file.close()
+
+    def _open_segment(self, number: int) -> None:
+        """Abre (ou cria) um segmento para acréscimo e o torna o ativo."""
+        if number not in self._segments:
+            self._segments.append(number)
+        self._active_number = number
+        self._active = open(self._segment_path(number), "ab")
+        self._active_size = self._active.tell()
+
+    def _write_loop(self) -> None:
+        """Thread de gravação: espera encher um lote ou passar flush_interval e grava."""
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._has_pending.wait()
+                if self._closed:
+                    return
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._pending) < self.batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._has_pending.wait(remaining)
+            try:
+                self._write_pending()
+            except Exception as e:
+                print(f"⚠️  Erro ao gravar conversas: {str(e)}")
+                time.sleep(self.flush_interval)
+
+    def _write_pending(self) -> None:
+        """Grava o buffer no segmento ativo com um único write."""
+        with self._io_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                if self._active_size >= self.max_segment_bytes:
+                    self._active.close()
+                    self._open_segment(self._active_number + 1)
+
+                lines = [dumps(record) + b"\n" for record in batch]
+                self._active.write(b"".join(lines))
+                self._active.flush()
+                if self.fsync:
+                    os.fsync(self._active.fileno())
+            except Exception:
+                # Devolve o lote ao início do buffer para a próxima tentativa
+                with self._lock:
+                    self._pending[:0] = batch
+                self._discard_partial_write()
+                raise
+
+            offset = self._active_size
+            for record, line in zip(batch, lines):
+                self._index_record(record, (self._active_number, offset))
+                offset += len(line)
+            self._active_size = offset
+            self._batches_written += 1
+            self._records_written += len(batch)
+            should_compact = len(self._segments) > self.compact_after_segments
+
+        # Fora de _io_lock, para não bloquear as leituras; se já houver uma compactação, segue sem esperar
+        if should_compact and self._compact_lock.acquire(blocking=False):
+            try:
+                self._compact()
+            finally:
+                self._compact_lock.release()
+
+    def _discard_partial_write(self) -> None:
+        """Descarta os bytes que um lote com falha deixou no segmento ativo (com _io_lock adquirido).
+
+        Sem isso, os deslocamentos indexados depois apontariam para dentro da
+        gravação incompleta.
+        """
+        try:
+            self._active.close()
+        except Exception:
+            pass
+        path = self._segment_path(self._active_number)
+        try:
+            os.truncate(path, self._active_size)
+            self._active = open(path, "ab")
+        except OSError:
+            # Sem como truncar, continua em um segmento novo; a linha incompleta é ignorada na leitura
+            self._open_segment(self._active_number + 1)
+
+    def _compact(self) -> None:
+        """Grava um retrato por sessão no lugar dos segmentos fechados (com _compact_lock adquirido).
+
+        Só a troca de segmento e a do índice acontecem com _io_lock; a leitura e
+        a reescrita dos segmentos antigos não bloqueiam load e tail. O retrato
+        recebe o número entre o último segmento antigo e o ativo, para que os
+        registros gravados durante a compactação continuem valendo depois dele.
+        """
+        with self._io_lock:
+            old_segments = list(self._segments)
+            compacted_number = self._active_number + 1
+            self._active.close()
+            self._open_segment(self._active_number + 2)
+
+        sessions = self._read_all_sessions(old_segments)
+        snapshots = []
+        lines = []
+        offset = 0
+        for session in sessions.values():
+            record = {"op": "snapshot", "session": session.to_dict()}
+            line = dumps(record) + b"\n"
+            snapshots.append((record, offset))
+            lines.append(line)
+            offset += len(line)
+        compacted_path = self._segment_path(compacted_number)
+        with open(compacted_path + ".tmp", "wb") as file:
+            file.write(b"".join(lines))
+            file.flush()
+            if self.fsync:
+                os.fsync(file.fileno())
+
+        with self._io_lock:
+            os.replace(compacted_path + ".tmp", compacted_path)
+            newer = [number for number in self._segments if number > compacted_number]
+            self._index = {}
+            for record, record_offset in snapshots:
+                self._index_record(record, (compacted_number, record_offset))
+            if newer == [self._active_number] and self._active_size == 0:
+                # Nada foi gravado durante a compactação: o retrato vira o segmento ativo
+                self._active.close()
+                os.remove(self._segment_path(self._active_number))
+                self._segments = []
+                self._open_segment(compacted_number)
+            else:
+                self._segments = [compacted_number] + newer
+                for number in newer:
+                    for record_offset, record in self._iter_segment(number):
+                        self._index_record(record, (number, record_offset))
+            for number in old_segments:
+                os.remove(self._segment_path(number))
+            self._compactions += 1
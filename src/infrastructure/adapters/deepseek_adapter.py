@@ -1,24 +1,58 @@
 """Módulo que contém o adaptador para a API do DeepSeek."""
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, AsyncIterator
 import os
-import requests
+import json
+import httpx
 from ...domain.use_cases.process_message import AIModel
+from .http_transport import HttpTransport, get_shared_transport
+from .message_codec import encode_payload
+from ..metrics.instruments import LLM_DURATION, stream_timer
 
 
 class DeepSeekModel(AIModel):
     """Implementação do modelo de IA usando a API do DeepSeek."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        transport: Optional[HttpTransport] = None,
+        base_url: str = "https://api.deepseek.com/v1"
+    ):
         """Inicializa o adaptador do DeepSeek.
         
         Args:
             api_key: Chave da API do DeepSeek. Se não for fornecida, será usada a variável de ambiente DEEPSEEK_API_KEY.
+            transport: Transporte HTTP com pool de conexões. Se não for fornecido, usa o compartilhado do processo.
+            base_url: URL base da API (ex.: um servidor local que emula o DeepSeek).
         """
         self.api_key = api_key or os.getenv("DEEPSEEK_API_KEY")
         if not self.api_key:
             raise ValueError("A chave da API do DeepSeek não foi fornecida e não foi encontrada nas variáveis de ambiente.")
         
-        self.base_url = "https://api.deepseek.com/v1/chat/completions"
+        self.base_url = base_url.rstrip("/")
+        self.api_url = f"{self.base_url}/chat/completions"
+        self.transport = transport or get_shared_transport()
+    
+    def _build_payload(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Monta o corpo da requisição, aplicando os valores padrão."""
+        # Configura os parâmetros padrão
+        default_kwargs = {
+            "model": "deepseek-chat",
+            "messages": messages,
+            "max_tokens": 150,
+            "temperature": 0.7,
+        }
+        
+        # Atualiza com os argumentos fornecidos, se houver
+        default_kwargs.update(kwargs)
+        return default_kwargs
+    
+    def _build_headers(self) -> Dict[str, str]:
+        """Monta os headers de autenticação."""
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
     
     def generate_response(self, messages: List[Dict[str, str]], **kwargs) -> str:
         """Gera uma resposta usando a API do DeepSeek.
@@ -34,30 +68,17 @@ class DeepSeekModel(AIModel):
             Exception: Em caso de erro na chamada à API.
         """
         try:
-            # Configura os parâmetros padrão
-            default_kwargs = {
-                "model": "deepseek-chat",
-                "messages": messages,
-                "max_tokens": 150,
-                "temperature": 0.7,
-            }
-            
-            # Atualiza com os argumentos fornecidos, se houver
-            default_kwargs.update(kwargs)
-            
-            # Headers para autenticação
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
+            default_kwargs = self._build_payload(messages, kwargs)
             
             # Chama a API
-            response = requests.post(
-                self.base_url,
-                headers=headers,
-                json=default_kwargs,
-                timeout=30
-            )
+            with LLM_DURATION.labels("deepseek").time():
+                response = self.transport.request(
+                    "POST",
+                    self.api_url,
+                    headers=self._build_headers(),
+                    content=encode_payload(default_kwargs),
+                    read_timeout=30
+                )
             
             # Verifica se a resposta foi bem-sucedida
             response.raise_for_status()
@@ -66,7 +87,153 @@ class DeepSeekModel(AIModel):
             response_data = response.json()
             return response_data["choices"][0]["message"]["content"].strip()
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
+            raise Exception(f"Erro ao chamar a API do DeepSeek: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Erro inesperado na API do DeepSeek: {str(e)}")
+    
+    async def agenerate_response(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Gera uma resposta de forma assíncrona usando a API do DeepSeek.
+        
+        Args:
+            messages: Lista de mensagens no formato esperado pela API do DeepSeek.
+            **kwargs: Argumentos adicionais para a API do DeepSeek.
+            
+        Returns:
+            O conteúdo da resposta gerada pelo modelo.
+            
+        Raises:
+            Exception: Em caso de erro na chamada à API.
+        """
+        try:
+            with LLM_DURATION.labels("deepseek").time():
+                response = await self.transport.arequest(
+                    "POST",
+                    self.api_url,
+                    headers=self._build_headers(),
+                    content=encode_payload(self._build_payload(messages, kwargs)),
+                    read_timeout=30
+                )
+            response.raise_for_status()
+            
+            response_data = response.json()
+            return response_data["choices"][0]["message"]["content"].strip()
+            
+        except httpx.HTTPError as e:
+            raise Exception(f"Erro ao chamar a API do DeepSeek: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Erro inesperado na API do DeepSeek: {str(e)}")
+    
+    def stream_response(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        """Gera a resposta em streaming usando a API do DeepSeek (Server-Sent Events).
+        
+        Args:
+            messages: Lista de mensagens no formato esperado pela API do DeepSeek.
+            **kwargs: Argumentos adicionais para a API do DeepSeek.
+            
+        Yields:
+            Trechos de texto da resposta, assim que chegam da API.
+            
+        Raises:
+            Exception: Em caso de erro na chamada à API.
+        """
+        try:
+            payload = self._build_payload(messages, kwargs)
+            payload["stream"] = True
+            
+            timer = stream_timer("deepseek")
+            with self.transport.stream(
+                "POST",
+                self.api_url,
+                headers=self._build_headers(),
+                content=encode_payload(payload),
+                read_timeout=30
+            ) as response:
+                response.raise_for_status()
+                
+                for line in response.iter_lines():
+                    data = self._parse_sse_line(line)
+                    if data is None:
+                        continue
+                    if data == "[DONE]":
+                        break
+                    
+                    delta = self._extract_delta(json.loads(data))
+                    if delta:
+                        timer.token()
+                        yield delta
+                timer.done()
+                
+        except httpx.HTTPError as e:
+            raise Exception(f"Erro ao chamar a API do DeepSeek: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Erro inesperado na API do DeepSeek: {str(e)}")
+    
+    async def astream_response(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """Versão assíncrona de stream_response (Server-Sent Events).
+        
+        Args:
+            messages: Lista de mensagens no formato esperado pela API do DeepSeek.
+            **kwargs: Argumentos adicionais para a API do DeepSeek.
+            
+        Yields:
+            Trechos de texto da resposta, assim que chegam da API.
+            
+        Raises:
+            Exception: Em caso de erro na chamada à API.
+        """
+        try:
+            payload = self._build_payload(messages, kwargs)
+            payload["stream"] = True
+            
+            timer = stream_timer("deepseek")
+            async with self.transport.astream(
+                "POST",
+                self.api_url,
+                headers=self._build_headers(),
+                content=encode_payload(payload),
+                read_timeout=30
+            ) as response:
+                response.raise_for_status()
+                
+                async for line in response.aiter_lines():
+                    data = self._parse_sse_line(line)
+                    if data is None:
+                        continue
+                    if data == "[DONE]":
+                        break
+                    
+                    delta = self._extract_delta(json.loads(data))
+                    if delta:
+                        timer.token()
+                        yield delta
+                timer.done()
+                
+        except httpx.HTTPError as e:
             raise Exception(f"Erro ao chamar a API do DeepSeek: {str(e)}")
         except Exception as e:
-            raise Exception(f"Erro inesperado na API do DeepSeek: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"Erro inesperado na API do DeepSeek: {str(e)}")
+    
+    @staticmethod
+    def _parse_sse_line(line: Optional[str]) -> Optional[str]:
+        """Extrai o conteúdo de uma linha "data:" de um fluxo SSE.
+        
+        Returns:
+            O conteúdo do campo data, ou None para linhas vazias, comentários
+            e demais campos do protocolo.
+        """
+        if not line:
+            return None
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.startswith("data:"):
+            return None
+        return line[len("data:"):].strip()
+    
+    @staticmethod
+    def _extract_delta(event: Dict[str, Any]) -> str:
+        """Retorna o texto incremental contido em um evento de streaming."""
+        choices = event.get("choices") or []
+        if not choices:
+            return ""
+        return (choices[0].get("delta") or {}).get("content") or ""
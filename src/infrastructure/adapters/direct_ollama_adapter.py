@@ -1,22 +1,55 @@
 """Módulo que contém o adaptador para usar Ollama diretamente."""
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Iterator, AsyncIterator
 from ...domain.use_cases.process_message import AIModel
-from .ollama_adapter import OllamaModel
+from .ollama_adapter import OllamaModel, OllamaConnectionError
+from .ollama_health import OllamaHealthMonitor
+from .http_transport import HttpTransport
 
 
 class DirectOllamaModel(AIModel):
     """Adaptador que usa Ollama diretamente quando configurado."""
     
-    def __init__(self, model_name: str = "llama2", base_url: str = "http://localhost:11434"):
+    def __init__(
+        self,
+        model_name: str = "llama2",
+        base_url: str = "http://localhost:11434",
+        transport: Optional[HttpTransport] = None,
+        health_ttl: float = 10.0,
+        health_refresh_interval: float = 5.0,
+        context_budget: Optional[int] = None
+    ):
         """Inicializa o adaptador direto do Ollama.
         
         Args:
             model_name: Nome do modelo Ollama a ser utilizado.
             base_url: URL base do servidor Ollama.
+            transport: Transporte HTTP com pool de conexões.
+            health_ttl: Validade (em segundos) do estado de saúde em cache.
+            health_refresh_interval: Intervalo (em segundos) da renovação em segundo
+                plano, ativa após start_health_monitor().
+            context_budget: Orçamento de tokens do prompt; None usa o limite de mensagens.
         """
-        self.ollama_model = OllamaModel(model_name=model_name, base_url=base_url)
+        self.ollama_model = OllamaModel(model_name=model_name, base_url=base_url, transport=transport)
+        self.health_monitor = OllamaHealthMonitor(
+            self.ollama_model,
+            ttl=health_ttl,
+            refresh_interval=health_refresh_interval
+        )
         self.model_name = model_name
         self.base_url = base_url
+        self._context_budget = context_budget
+    
+    def context_budget(self) -> Optional[int]:
+        """Orçamento de tokens do prompt configurado para o Ollama."""
+        return self._context_budget
+    
+    def start_health_monitor(self) -> None:
+        """Inicia a renovação do estado de saúde em segundo plano."""
+        self.health_monitor.start()
+    
+    def stop_health_monitor(self) -> None:
+        """Interrompe a renovação do estado de saúde em segundo plano."""
+        self.health_monitor.stop()
     
     def generate_response(self, messages: List[Dict[str, str]], **kwargs) -> str:
         """Gera uma resposta usando o Ollama local.
@@ -33,27 +66,107 @@ class DirectOllamaModel(AIModel):
         """
         try:
             # Verifica se o Ollama está disponível
-            if not self.ollama_model.is_available():
+            if not self.health_monitor.is_available():
                 raise Exception("Ollama não está disponível. Verifique se o servidor está rodando.")
             
             # Usa o modelo Ollama
             return self.ollama_model.generate_response(messages, **kwargs)
             
+        except OllamaConnectionError as e:
+            self.health_monitor.invalidate()
+            raise Exception(f"Erro ao usar Ollama diretamente: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Erro ao usar Ollama diretamente: {str(e)}")
+    
+    async def agenerate_response(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Gera uma resposta de forma assíncrona usando o Ollama local.
+        
+        Args:
+            messages: Lista de mensagens no formato esperado.
+            **kwargs: Argumentos adicionais para o modelo.
+            
+        Returns:
+            O conteúdo da resposta gerada pelo modelo.
+            
+        Raises:
+            Exception: Em caso de erro na chamada ao Ollama.
+        """
+        try:
+            if not await self.health_monitor.ais_available():
+                raise Exception("Ollama não está disponível. Verifique se o servidor está rodando.")
+            
+            return await self.ollama_model.agenerate_response(messages, **kwargs)
+            
+        except OllamaConnectionError as e:
+            self.health_monitor.invalidate()
+            raise Exception(f"Erro ao usar Ollama diretamente: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Erro ao usar Ollama diretamente: {str(e)}")
+    
+    def stream_response(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        """Gera a resposta em streaming usando o Ollama local.
+        
+        Args:
+            messages: Lista de mensagens no formato esperado.
+            **kwargs: Argumentos adicionais para o modelo.
+            
+        Yields:
+            Trechos de texto da resposta, assim que são gerados.
+            
+        Raises:
+            Exception: Em caso de erro na chamada ao Ollama.
+        """
+        try:
+            # Verifica se o Ollama está disponível
+            if not self.health_monitor.is_available():
+                raise Exception("Ollama não está disponível. Verifique se o servidor está rodando.")
+            
+            yield from self.ollama_model.stream_response(messages, **kwargs)
+            
+        except OllamaConnectionError as e:
+            self.health_monitor.invalidate()
+            raise Exception(f"Erro ao usar Ollama diretamente: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Erro ao usar Ollama diretamente: {str(e)}")
+    
+    async def astream_response(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """Versão assíncrona de stream_response.
+        
+        Args:
+            messages: Lista de mensagens no formato esperado.
+            **kwargs: Argumentos adicionais para o modelo.
+            
+        Yields:
+            Trechos de texto da resposta, assim que são gerados.
+            
+        Raises:
+            Exception: Em caso de erro na chamada ao Ollama.
+        """
+        try:
+            if not await self.health_monitor.ais_available():
+                raise Exception("Ollama não está disponível. Verifique se o servidor está rodando.")
+            
+            async for delta in self.ollama_model.astream_response(messages, **kwargs):
+                yield delta
+                
+        except OllamaConnectionError as e:
+            self.health_monitor.invalidate()
+            raise Exception(f"Erro ao usar Ollama diretamente: {str(e)}")
         except Exception as e:
             raise Exception(f"Erro ao usar Ollama diretamente: {str(e)}")
     
     def is_available(self) -> bool:
-        """Verifica se o Ollama está disponível."""
-        return self.ollama_model.is_available()
+        """Verifica se o Ollama está disponível (estado em cache)."""
+        return self.health_monitor.is_available()
     
     def get_available_models(self) -> List[str]:
-        """Retorna lista de modelos disponíveis."""
-        return self.ollama_model.get_available_models()
+        """Retorna lista de modelos disponíveis (estado em cache)."""
+        return self.health_monitor.get_available_models()
     
     def get_status(self) -> str:
         """Retorna o status do Ollama."""
-        if self.is_available():
-            models = self.get_available_models()
-            return f"Ollama funcionando. Modelos disponíveis: {', '.join(models)}"
+        health = self.health_monitor.get_health()
+        if health.available:
+            return f"Ollama funcionando. Modelos disponíveis: {', '.join(health.models)}"
         else:
-            return "Ollama não está disponível" 
\ No newline at end of file
+            return "Ollama não está disponível"
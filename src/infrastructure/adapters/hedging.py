@@ -0,0 +1,210 @@
+"""Módulo que contém a política de requisições hedged entre provedores de IA."""
+import math
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Any
+
+
+class HedgingPolicy:
+    """Decide quando disparar uma requisição de reserva (hedge) e coleta estatísticas.
+
+    O atraso do hedge é o percentil configurado do tempo até o primeiro token
+    (TTFT) observado recentemente para o provedor primário (quando ele perde a
+    corrida, o tempo esperado até a vitória do outro entra como limite
+    inferior). Enquanto não há amostras suficientes, usa-se um atraso inicial fixo.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.05,
+        max_delay: float = 10.0,
+        window_size: int = 200,
+        min_samples: int = 20,
+    ):
+        """Inicializa a política.
+
+        Args:
+            percentile: Percentil do TTFT usado como atraso do hedge (0 a 100).
+            initial_delay: Atraso (em segundos) usado enquanto há poucas amostras.
+            min_delay: Atraso mínimo (em segundos) do hedge.
+            max_delay: Atraso máximo (em segundos) do hedge.
+            window_size: Quantidade de amostras recentes de TTFT mantidas por provedor.
+            min_samples: Quantidade mínima de amostras para usar o percentil.
+        """
+        if not 0 < percentile <= 100:
+            raise ValueError("O percentil do hedge deve estar entre 0 e 100.")
+
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.window_size = window_size
+        self.min_samples = min_samples
+
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._requests = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+        self._wins: Dict[str, int] = {}
+
+    def record_first_token(self, provider: str, seconds: float) -> None:
+        """Registra o tempo até o primeiro token de um provedor."""
+        with self._lock:
+            samples = self._samples.get(provider)
+            if samples is None:
+                samples = self._samples[provider] = deque(maxlen=self.window_size)
+            samples.append(seconds)
+
+    def hedge_delay(self, provider: str) -> float:
+        """Retorna quanto esperar pelo primeiro token antes de disparar o hedge."""
+        with self._lock:
+            samples = sorted(self._samples.get(provider) or ())
+
+        if len(samples) < self.min_samples:
+            delay = self.initial_delay
+        else:
+            # Percentil pelo método do posto mais próximo
+            rank = max(1, math.ceil(self.percentile / 100 * len(samples)))
+            delay = samples[rank - 1]
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    def record_outcome(self, primary: str, winner: Optional[str], hedged: bool) -> None:
+        """Registra o resultado de uma requisição (hedged ou não)."""
+        with self._lock:
+            self._requests += 1
+            if hedged:
+                self._hedged += 1
+            if winner is not None:
+                self._wins[winner] = self._wins.get(winner, 0) + 1
+                if hedged and winner != primary:
+                    self._hedge_wins += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna as estatísticas de hedge.
+
+        Returns:
+            Dicionário com total de requisições, hedges disparados, taxa de hedge,
+            vitórias do hedge e vitórias por provedor.
+        """
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "hedged": self._hedged,
+                "hedge_rate": self._hedged / self._requests if self._requests else 0.0,
+                "hedge_wins": self._hedge_wins,
+                "wins": dict(self._wins),
+            }
+
+
+class HedgedRace:
+    """Estado de uma corrida entre provedores para uma única resposta em streaming.
+
+    A classe não faz I/O: os adaptadores síncrono (threads) e assíncrono
+    (tasks) informam os eventos de cada provedor e executam as ações que ela
+    devolve (disparar o próximo provedor, entregar um trecho, encerrar).
+    """
+
+    def __init__(self, policy: HedgingPolicy, chain: List[str]):
+        """Inicializa a corrida.
+
+        Args:
+            policy: Política de hedge que fornece o atraso e recebe as estatísticas.
+            chain: Provedores na ordem de preferência; o primeiro é o primário.
+        """
+        self.policy = policy
+        self.chain = chain
+        self.launched: List[str] = []
+        self.finished: List[str] = []
+        self.errors: List[str] = []
+        self.winner: Optional[str] = None
+        self.hedged = False
+        self._started_at: Dict[str, float] = {}
+        self._hedge_at = 0.0
+
+    @property
+    def primary(self) -> str:
+        """Provedor primário da corrida."""
+        return self.chain[0]
+
+    def start(self, now: float) -> str:
+        """Inicia a corrida e retorna o provedor primário a disparar."""
+        self._hedge_at = now + self.policy.hedge_delay(self.primary)
+        return self._launch_next(now)
+
+    def wait_timeout(self, now: float) -> Optional[float]:
+        """Tempo máximo de espera pelo próximo evento antes de disparar o hedge."""
+        if self.winner is not None or self.hedged or not self._has_next():
+            return None
+        return max(0.0, self._hedge_at - now)
+
+    def on_timeout(self, now: float) -> Optional[str]:
+        """O primário não produziu o primeiro token a tempo: dispara o hedge."""
+        if self.winner is not None or self.hedged or not self._has_next():
+            return None
+        self.hedged = True
+        return self._launch_next(now)
+
+    def on_delta(self, name: str, now: float) -> bool:
+        """Processa um trecho de um provedor; retorna True se ele deve ser entregue."""
+        if self.winner is None:
+            self.winner = name
+            self.policy.record_first_token(name, now - self._started_at[name])
+            # Quem perdeu ainda não deu o primeiro token: o tempo até aqui é um limite
+            # inferior do TTFT dele. Sem essa amostra, o primário lento que perde para o
+            # hedge nunca é registrado, o percentil cai e o hedge dispara cada vez mais cedo
+            for loser in self.launched:
+                if loser != name and loser not in self.finished:
+                    self.policy.record_first_token(loser, now - self._started_at[loser])
+        return name == self.winner
+
+    def on_done(self, name: str) -> bool:
+        """Processa o fim do fluxo de um provedor; retorna True se a corrida terminou."""
+        self.finished.append(name)
+        if self.winner is None:
+            # Resposta vazia: ainda assim é a primeira resposta válida
+            self.winner = name
+        return name == self.winner
+
+    def on_error(self, name: str, error: Exception, now: float) -> Optional[str]:
+        """Processa a falha de um provedor.
+
+        Returns:
+            O próximo provedor a disparar, se houver.
+
+        Raises:
+            Exception: Se a falha for do vencedor ou se todos os provedores falharam.
+        """
+        if name == self.winner:
+            raise error
+        if self.winner is not None:
+            return None
+
+        self.finished.append(name)
+        self.errors.append(f"{name.upper()}: {error}")
+        if self._has_next():
+            return self._launch_next(now)
+        if len(self.finished) == len(self.launched):
+            if len(self.errors) == 1:
+                raise error
+            raise Exception(f"Todos os modelos falharam. {', '.join(self.errors)}")
+        return None
+
+    def losers(self) -> List[str]:
+        """Provedores disparados que não venceram a corrida."""
+        return [name for name in self.launched if name != self.winner]
+
+    def finish(self) -> None:
+        """Registra o resultado da corrida nas estatísticas da política."""
+        self.policy.record_outcome(self.primary, self.winner, self.hedged)
+
+    def _has_next(self) -> bool:
+        return len(self.launched) < len(self.chain)
+
+    def _launch_next(self, now: float) -> str:
+        name = self.chain[len(self.launched)]
+        self.launched.append(name)
+        self._started_at[name] = now
+        return name
@@ -0,0 +1,259 @@
+"""Módulo que contém o transporte HTTP compartilhado pelos adaptadores de IA."""
+import asyncio
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+import httpx
+
+
+@dataclass
+class HostPoolStats:
+    """Estatísticas do pool de conexões de um host."""
+    in_use: int = 0
+    idle: int = 0
+    handshakes: int = 0
+    tls_handshakes: int = 0
+    requests: int = 0
+
+
+def _host_key(scheme: str, host: str, port: Optional[int]) -> str:
+    """Normaliza a identificação de um host como "esquema://host:porta"."""
+    if port is None:
+        port = 443 if scheme == "https" else 80
+    return f"{scheme}://{host}:{port}"
+
+
+class HttpTransport:
+    """Transporte HTTP com pools de conexões keep-alive por host.
+
+    Um único cliente síncrono e um cliente assíncrono por loop de eventos são
+    compartilhados por todos os adaptadores, de modo que cada turno reaproveita
+    conexões TCP/TLS já abertas em vez de pagar um novo handshake.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 60.0,
+        transport: Optional[httpx.BaseTransport] = None,
+        async_transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """Inicializa o transporte.
+
+        Args:
+            max_connections: Número máximo de conexões simultâneas (por cliente).
+            max_keepalive_connections: Número máximo de conexões ociosas mantidas abertas.
+            keepalive_expiry: Tempo (em segundos) que uma conexão ociosa é mantida.
+            connect_timeout: Tempo máximo (em segundos) para estabelecer a conexão.
+            read_timeout: Tempo máximo padrão (em segundos) de espera por dados.
+            transport: Transporte httpx síncrono alternativo (ex.: para testes).
+            async_transport: Transporte httpx assíncrono alternativo (ex.: para testes).
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._transport = transport
+        self._async_transport = async_transport
+
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._counters: Dict[str, HostPoolStats] = {}
+
+    def timeout(self, read_timeout: Optional[float] = None) -> httpx.Timeout:
+        """Monta o timeout com limites separados de conexão e leitura.
+
+        Args:
+            read_timeout: Timeout de leitura específico; usa o padrão se None.
+        """
+        read = self.read_timeout if read_timeout is None else read_timeout
+        return httpx.Timeout(read, connect=self.connect_timeout)
+
+    @property
+    def client(self) -> httpx.Client:
+        """Cliente síncrono compartilhado, criado no primeiro uso."""
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    limits=self.limits,
+                    timeout=self.timeout(),
+                    transport=self._transport,
+                    event_hooks={"request": [self._on_request]},
+                )
+            return self._client
+
+    def async_client(self) -> httpx.AsyncClient:
+        """Cliente assíncrono compartilhado pelo loop de eventos em execução.
+
+        Conexões assíncronas pertencem ao loop em que foram abertas, por isso
+        cada loop recebe o seu próprio cliente (e o seu próprio pool).
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    limits=self.limits,
+                    timeout=self.timeout(),
+                    transport=self._async_transport,
+                    event_hooks={"request": [self._on_async_request]},
+                )
+                self._async_clients[loop] = client
+            return client
+
+    def request(self, method: str, url: str, read_timeout: Optional[float] = None, **kwargs: Any) -> httpx.Response:
+        """Executa uma requisição síncrona e lê a resposta completa."""
+        return self.client.request(method, url, timeout=self.timeout(read_timeout), **kwargs)
+
+    @contextmanager
+    def stream(self, method: str, url: str, read_timeout: Optional[float] = None, **kwargs: Any) -> Iterator[httpx.Response]:
+        """Executa uma requisição síncrona cujo corpo é lido em streaming."""
+        with self.client.stream(method, url, timeout=self.timeout(read_timeout), **kwargs) as response:
+            yield response
+
+    async def arequest(self, method: str, url: str, read_timeout: Optional[float] = None, **kwargs: Any) -> httpx.Response:
+        """Executa uma requisição assíncrona e lê a resposta completa."""
+        return await self.async_client().request(method, url, timeout=self.timeout(read_timeout), **kwargs)
+
+    @asynccontextmanager
+    async def astream(self, method: str, url: str, read_timeout: Optional[float] = None, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """Executa uma requisição assíncrona cujo corpo é lido em streaming."""
+        async with self.async_client().stream(method, url, timeout=self.timeout(read_timeout), **kwargs) as response:
+            yield response
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Retorna as estatísticas dos pools de conexões, por host.
+
+        Returns:
+            Dicionário "esquema://host:porta" -> contadores de conexões em uso,
+            ociosas, handshakes TCP/TLS realizados e requisições enviadas.
+        """
+        with self._lock:
+            stats = {
+                host: HostPoolStats(
+                    handshakes=counters.handshakes,
+                    tls_handshakes=counters.tls_handshakes,
+                    requests=counters.requests,
+                )
+                for host, counters in self._counters.items()
+            }
+            clients = [self._client] + list(self._async_clients.values())
+
+        for client in clients:
+            for host, idle in self._iter_pool_connections(client):
+                host_stats = stats.setdefault(host, HostPoolStats())
+                if idle:
+                    host_stats.idle += 1
+                else:
+                    host_stats.in_use += 1
+
+        return {host: asdict(host_stats) for host, host_stats in sorted(stats.items())}
+
+    def close(self) -> None:
+        """Fecha o cliente síncrono e descarta os clientes assíncronos."""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+            self._async_clients = weakref.WeakKeyDictionary()
+
+    async def aclose(self) -> None:
+        """Fecha o cliente assíncrono do loop em execução."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def _counters_for(self, url: httpx.URL) -> HostPoolStats:
+        """Retorna (criando se necessário) os contadores de um host."""
+        key = _host_key(url.scheme, url.host, url.port)
+        with self._lock:
+            counters = self._counters.get(key)
+            if counters is None:
+                counters = self._counters[key] = HostPoolStats()
+            return counters
+
+    def _record_trace(self, counters: HostPoolStats, event_name: str) -> None:
+        """Contabiliza os handshakes a partir dos eventos de trace do httpcore."""
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                counters.handshakes += 1
+        elif event_name == "connection.start_tls.complete":
+            with self._lock:
+                counters.tls_handshakes += 1
+
+    def _on_request(self, request: httpx.Request) -> None:
+        """Hook síncrono: conta a requisição e instala o trace de conexões."""
+        counters = self._counters_for(request.url)
+        with self._lock:
+            counters.requests += 1
+
+        def trace(event_name: str, info: Dict[str, Any]) -> None:
+            self._record_trace(counters, event_name)
+
+        request.extensions["trace"] = trace
+
+    async def _on_async_request(self, request: httpx.Request) -> None:
+        """Hook assíncrono: conta a requisição e instala o trace de conexões."""
+        counters = self._counters_for(request.url)
+        with self._lock:
+            counters.requests += 1
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            self._record_trace(counters, event_name)
+
+        request.extensions["trace"] = trace
+
+    @staticmethod
+    def _iter_pool_connections(client: Optional[Any]) -> Iterator[tuple]:
+        """Percorre as conexões abertas no pool do httpcore de um cliente.
+
+        Yields:
+            Tuplas (host, ociosa) para cada conexão aberta. Transportes que não
+            expõem um pool (ex.: httpx.MockTransport) não produzem nada.
+        """
+        if client is None or client.is_closed:
+            return
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        for connection in list(getattr(pool, "connections", None) or []):
+            try:
+                if connection.is_closed():
+                    continue
+                origin = connection._origin
+                host = _host_key(origin.scheme.decode(), origin.host.decode(), origin.port)
+                yield host, connection.is_idle()
+            except Exception:
+                continue
+
+
+_shared_transport: Optional[HttpTransport] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_transport() -> HttpTransport:
+    """Retorna o transporte HTTP compartilhado do processo, criando-o se necessário."""
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = HttpTransport()
+        return _shared_transport
+
+
+def set_shared_transport(transport: HttpTransport) -> None:
+    """Define o transporte HTTP compartilhado do processo (ex.: a partir das configurações)."""
+    global _shared_transport
+    with _shared_lock:
+        _shared_transport = transport
@@ -0,0 +1,79 @@
+"""Módulo que contém a codificação JSON rápida de mensagens e registros."""
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+from ...domain.entities.message import Message, MessageRole
+from ...domain.services.prompt_builder import PromptMessages
+
+_ROLE_CODES = {MessageRole.SYSTEM: "s", MessageRole.USER: "u", MessageRole.ASSISTANT: "a"}
+_CODE_ROLES = {code: role for role, code in _ROLE_CODES.items()}
+
+
+def dumps(obj: Any) -> bytes:
+    """Serializa um objeto em JSON compacto (UTF-8), usando o orjson se instalado."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """Desserializa JSON, usando o orjson se instalado."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def message_row(message: Message) -> List[Any]:
+    """Converte uma mensagem no formato compacto ``[papel, conteúdo, epoch_us]``.
+
+    O papel vira uma letra e o horário fica como inteiro, sem formatar datas
+    (um horário com fuso é gravado como o instante correspondente).
+    """
+    return [_ROLE_CODES[message.role], message.content, message.epoch_us]
+
+
+def message_from_row(row: List[Any]) -> Message:
+    """Reconstrói uma mensagem a partir de message_row."""
+    code, content, epoch_us = row
+    return Message.from_epoch(_CODE_ROLES[code], content, epoch_us)
+
+
+def encode_messages(messages: Iterable[Message]) -> bytes:
+    """Codifica mensagens como uma lista JSON de linhas compactas (ver message_row)."""
+    return dumps([message_row(m) for m in messages])
+
+
+def decode_messages(data: bytes) -> List[Message]:
+    """Decodifica mensagens gravadas por encode_messages."""
+    return [message_from_row(row) for row in loads(data)]
+
+
+def encode_payload(
+    payload: Dict[str, Any],
+    transform: Optional[Callable[[Dict[str, str]], Dict[str, str]]] = None
+) -> bytes:
+    """Serializa o corpo de uma requisição de chat com o campo "messages".
+
+    Se as mensagens vierem do PromptBuilder, o JSON do histórico já enviado é
+    reaproveitado e só as mensagens novas são serializadas.
+
+    Args:
+        payload: Corpo da requisição.
+        transform: Conversão opcional aplicada a cada mensagem (formato do provedor).
+
+    Returns:
+        O corpo em JSON (UTF-8).
+    """
+    messages = payload["messages"]
+    if isinstance(messages, PromptMessages):
+        encoded_messages = messages.encode(transform)
+    else:
+        encoded_messages = dumps([transform(message) for message in messages] if transform else messages)
+    head = dumps({key: value for key, value in payload.items() if key != "messages"})
+    separator = b"," if len(head) > 2 else b""
+    return head[:-1] + separator + b'"messages":' + encoded_messages + b"}"
@@ -1,23 +1,63 @@
 """Módulo que contém o adaptador para o Ollama (IA local)."""
-from typing import List, Optional, Dict, Any
-import requests
+from typing import List, Optional, Dict, Any, Iterator, AsyncIterator, Tuple
+import httpx
 import json
 from ...domain.use_cases.process_message import AIModel
+from .http_transport import HttpTransport, get_shared_transport
+from .message_codec import encode_payload
+from ..metrics.instruments import LLM_DURATION, stream_timer
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class OllamaConnectionError(Exception):
+    """Erro de conexão com o servidor Ollama (servidor fora do ar ou inacessível)."""
+
+
+def to_ollama_message(message: Dict[str, str]) -> Dict[str, str]:
+    """Converte uma mensagem para o formato do Ollama."""
+    if message["role"] == "system":
+        # Ollama não tem role "system", convertemos para "user"
+        return {"role": "user", "content": f"Instrução do sistema: {message['content']}"}
+    return message
 
 
 class OllamaModel(AIModel):
     """Implementação do modelo de IA usando Ollama local."""
     
-    def __init__(self, model_name: str = "llama2", base_url: str = "http://localhost:11434"):
+    def __init__(
+        self,
+        model_name: str = "llama2",
+        base_url: str = "http://localhost:11434",
+        transport: Optional[HttpTransport] = None
+    ):
         """Inicializa o adaptador do Ollama.
         
         Args:
             model_name: Nome do modelo Ollama a ser utilizado.
             base_url: URL base do servidor Ollama.
+            transport: Transporte HTTP com pool de conexões. Se não for fornecido, usa o compartilhado do processo.
         """
         self.model_name = model_name
         self.base_url = base_url
         self.api_url = f"{base_url}/api/chat"
+        self.transport = transport or get_shared_transport()
+    
+    def _build_payload(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any], stream: bool) -> Dict[str, Any]:
+        """Prepara o corpo da requisição para /api/chat.
+        
+        As mensagens são convertidas para o formato do Ollama na serialização
+        (encode_payload), que reaproveita o histórico já convertido do PromptBuilder.
+        """
+        return {
+            "model": self.model_name,
+            "messages": messages,
+            "stream": stream,
+            "options": {
+                "temperature": kwargs.get("temperature", 0.7),
+                "num_predict": kwargs.get("max_tokens", 150)
+            }
+        }
     
     def generate_response(self, messages: List[Dict[str, str]], **kwargs) -> str:
         """Gera uma resposta usando o Ollama local.
@@ -33,35 +73,17 @@ class OllamaModel(AIModel):
             Exception: Em caso de erro na chamada ao Ollama.
         """
         try:
-            # Converte mensagens para o formato do Ollama
-            ollama_messages = []
-            for msg in messages:
-                if msg["role"] == "system":
-                    # Ollama não tem role "system", convertemos para "user"
-                    ollama_messages.append({
-                        "role": "user",
-                        "content": f"Instrução do sistema: {msg['content']}"
-                    })
-                else:
-                    ollama_messages.append(msg)
-            
-            # Prepara a requisição
-            payload = {
-                "model": self.model_name,
-                "messages": ollama_messages,
-                "stream": False,
-                "options": {
-                    "temperature": kwargs.get("temperature", 0.7),
-                    "num_predict": kwargs.get("max_tokens", 150)
-                }
-            }
+            payload = self._build_payload(messages, kwargs, stream=False)
             
             # Chama a API do Ollama
-            response = requests.post(
-                self.api_url,
-                json=payload,
-                timeout=60  # Ollama pode ser mais lento
-            )
+            with LLM_DURATION.labels("ollama").time():
+                response = self.transport.request(
+                    "POST",
+                    self.api_url,
+                    content=encode_payload(payload, to_ollama_message),
+                    headers=JSON_HEADERS,
+                    read_timeout=60  # Ollama pode ser mais lento
+                )
             
             # Verifica se a resposta foi bem-sucedida
             response.raise_for_status()
@@ -70,28 +92,178 @@ class OllamaModel(AIModel):
             response_data = response.json()
             return response_data["message"]["content"].strip()
             
-        except requests.exceptions.ConnectionError:
-            raise Exception("Erro de conexão com Ollama. Verifique se o servidor está rodando.")
-        except requests.exceptions.RequestException as e:
+        except httpx.ConnectError:
+            raise OllamaConnectionError("Erro de conexão com Ollama. Verifique se o servidor está rodando.")
+        except httpx.HTTPError as e:
+            raise Exception(f"Erro ao chamar o Ollama: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Erro inesperado no Ollama: {str(e)}")
+    
+    async def agenerate_response(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Gera uma resposta de forma assíncrona usando o Ollama local.
+        
+        Args:
+            messages: Lista de mensagens no formato esperado.
+            **kwargs: Argumentos adicionais para o modelo.
+            
+        Returns:
+            O conteúdo da resposta gerada pelo modelo.
+            
+        Raises:
+            Exception: Em caso de erro na chamada ao Ollama.
+        """
+        try:
+            with LLM_DURATION.labels("ollama").time():
+                response = await self.transport.arequest(
+                    "POST",
+                    self.api_url,
+                    content=encode_payload(self._build_payload(messages, kwargs, stream=False), to_ollama_message),
+                    headers=JSON_HEADERS,
+                    read_timeout=60
+                )
+            response.raise_for_status()
+            
+            response_data = response.json()
+            return response_data["message"]["content"].strip()
+            
+        except httpx.ConnectError:
+            raise OllamaConnectionError("Erro de conexão com Ollama. Verifique se o servidor está rodando.")
+        except httpx.HTTPError as e:
             raise Exception(f"Erro ao chamar o Ollama: {str(e)}")
         except Exception as e:
             raise Exception(f"Erro inesperado no Ollama: {str(e)}")
     
+    def stream_response(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        """Gera a resposta em streaming usando o Ollama local.
+        
+        O Ollama responde com uma linha JSON (NDJSON) por trecho gerado,
+        encerrando com um objeto em que "done" é verdadeiro.
+        
+        Args:
+            messages: Lista de mensagens no formato esperado.
+            **kwargs: Argumentos adicionais para o modelo.
+            
+        Yields:
+            Trechos de texto da resposta, assim que são gerados.
+            
+        Raises:
+            Exception: Em caso de erro na chamada ao Ollama.
+        """
+        try:
+            timer = stream_timer("ollama")
+            with self.transport.stream(
+                "POST",
+                self.api_url,
+                content=encode_payload(self._build_payload(messages, kwargs, stream=True), to_ollama_message),
+                headers=JSON_HEADERS,
+                read_timeout=60  # Ollama pode ser mais lento
+            ) as response:
+                response.raise_for_status()
+                
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise Exception(chunk["error"])
+                    
+                    delta = (chunk.get("message") or {}).get("content")
+                    if delta:
+                        timer.token()
+                        yield delta
+                    if chunk.get("done"):
+                        break
+                timer.done()
+                
+        except httpx.ConnectError:
+            raise OllamaConnectionError("Erro de conexão com Ollama. Verifique se o servidor está rodando.")
+        except httpx.HTTPError as e:
+            raise Exception(f"Erro ao chamar o Ollama: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Erro inesperado no Ollama: {str(e)}")
+    
+    async def astream_response(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """Versão assíncrona de stream_response (NDJSON).
+        
+        Args:
+            messages: Lista de mensagens no formato esperado.
+            **kwargs: Argumentos adicionais para o modelo.
+            
+        Yields:
+            Trechos de texto da resposta, assim que são gerados.
+            
+        Raises:
+            Exception: Em caso de erro na chamada ao Ollama.
+        """
+        try:
+            timer = stream_timer("ollama")
+            async with self.transport.astream(
+                "POST",
+                self.api_url,
+                content=encode_payload(self._build_payload(messages, kwargs, stream=True), to_ollama_message),
+                headers=JSON_HEADERS,
+                read_timeout=60
+            ) as response:
+                response.raise_for_status()
+                
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise Exception(chunk["error"])
+                    
+                    delta = (chunk.get("message") or {}).get("content")
+                    if delta:
+                        timer.token()
+                        yield delta
+                    if chunk.get("done"):
+                        break
+                timer.done()
+                
+        except httpx.ConnectError:
+            raise OllamaConnectionError("Erro de conexão com Ollama. Verifique se o servidor está rodando.")
+        except httpx.HTTPError as e:
+            raise Exception(f"Erro ao chamar o Ollama: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Erro inesperado no Ollama: {str(e)}")
+    
+    def check_health(self) -> Tuple[bool, List[str]]:
+        """Consulta /api/tags uma única vez.
+        
+        Returns:
+            Tupla (disponível, modelos instalados).
+        """
+        try:
+            response = self.transport.request("GET", f"{self.base_url}/api/tags", read_timeout=5)
+            return self._parse_tags(response)
+        except Exception:
+            return False, []
+    
+    async def acheck_health(self) -> Tuple[bool, List[str]]:
+        """Versão assíncrona de check_health."""
+        try:
+            response = await self.transport.arequest("GET", f"{self.base_url}/api/tags", read_timeout=5)
+            return self._parse_tags(response)
+        except Exception:
+            return False, []
+    
+    @staticmethod
+    def _parse_tags(response: httpx.Response) -> Tuple[bool, List[str]]:
+        """Extrai a disponibilidade e os modelos da resposta de /api/tags."""
+        if response.status_code != 200:
+            return False, []
+        data = response.json()
+        return True, [model["name"] for model in data.get("models", [])]
+    
     def is_available(self) -> bool:
         """Verifica se o Ollama está disponível."""
-        try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+        return self.check_health()[0]
     
     def get_available_models(self) -> List[str]:
         """Retorna lista de modelos disponíveis."""
-        try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                return [model["name"] for model in data.get("models", [])]
-            return []
-        except:
-            return [] 
\ No newline at end of file
+        return self.check_health()[1]
+    
+    async def ais_available(self) -> bool:
+        """Verifica, de forma assíncrona, se o Ollama está disponível."""
+        return (await self.acheck_health())[0]
@@ -0,0 +1,125 @@
+"""Módulo que contém o monitor de saúde do servidor Ollama."""
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from .ollama_adapter import OllamaModel
+
+
+@dataclass
+class OllamaHealth:
+    """Resultado de uma verificação de saúde do Ollama."""
+    available: bool
+    models: List[str] = field(default_factory=list)
+    checked_at: float = 0.0
+
+
+class OllamaHealthMonitor:
+    """Mantém em cache a disponibilidade e os modelos do Ollama.
+
+    A verificação (um GET em /api/tags) sai do caminho de cada geração: o
+    resultado é reaproveitado enquanto estiver dentro do TTL e, se o monitor
+    for iniciado, uma thread em segundo plano o renova periodicamente. Um erro
+    de conexão durante uma geração invalida o cache na hora.
+    """
+
+    def __init__(
+        self,
+        ollama_model: OllamaModel,
+        ttl: float = 10.0,
+        refresh_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Inicializa o monitor.
+
+        Args:
+            ollama_model: Adaptador do Ollama usado nas verificações.
+            ttl: Tempo (em segundos) em que um resultado em cache é considerado válido.
+            refresh_interval: Intervalo (em segundos) entre renovações em segundo plano.
+            clock: Relógio monotônico (substituível em testes).
+        """
+        self.ollama_model = ollama_model
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._health: Optional[OllamaHealth] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def get_health(self) -> OllamaHealth:
+        """Retorna o estado em cache, verificando o servidor só se ele expirou."""
+        health = self._cached()
+        if health is None:
+            health = self.refresh()
+        return health
+
+    async def aget_health(self) -> OllamaHealth:
+        """Versão assíncrona de get_health."""
+        health = self._cached()
+        if health is None:
+            available, models = await self.ollama_model.acheck_health()
+            health = self._store(available, models)
+        return health
+
+    def is_available(self) -> bool:
+        """Indica se o Ollama está disponível (resultado em cache)."""
+        return self.get_health().available
+
+    async def ais_available(self) -> bool:
+        """Versão assíncrona de is_available."""
+        return (await self.aget_health()).available
+
+    def get_available_models(self) -> List[str]:
+        """Retorna os modelos instalados no Ollama (resultado em cache)."""
+        return list(self.get_health().models)
+
+    def refresh(self) -> OllamaHealth:
+        """Consulta o servidor agora e atualiza o cache."""
+        available, models = self.ollama_model.check_health()
+        return self._store(available, models)
+
+    def invalidate(self) -> None:
+        """Descarta o resultado em cache (ex.: após um erro de conexão)."""
+        with self._lock:
+            self._health = None
+
+    def start(self) -> None:
+        """Inicia a renovação periódica em segundo plano."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="ollama-health", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Interrompe a renovação em segundo plano."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=self.refresh_interval)
+        self._thread = None
+
+    def _run(self) -> None:
+        """Laço da thread de renovação."""
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.refresh_interval)
+
+    def _cached(self) -> Optional[OllamaHealth]:
+        """Retorna o resultado em cache, se ainda estiver dentro do TTL."""
+        with self._lock:
+            health = self._health
+        if health is not None and self._clock() - health.checked_at < self.ttl:
+            return health
+        return None
+
+    def _store(self, available: bool, models: List[str]) -> OllamaHealth:
+        """Guarda um novo resultado no cache."""
+        health = OllamaHealth(available=available, models=models, checked_at=self._clock())
+        with self._lock:
+            self._health = health
+        return health
@@ -1,27 +1,64 @@
 """Módulo que contém o adaptador para a API da OpenAI."""
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, AsyncIterator
 import os
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 
 from ...domain.use_cases.process_message import AIModel
+from .http_transport import HttpTransport, get_shared_transport
+from ..metrics.instruments import LLM_DURATION, stream_timer
 
 
 class OpenAIModel(AIModel):
     """Implementação do modelo de IA usando a API da OpenAI."""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt-3.5-turbo",
+        transport: Optional[HttpTransport] = None,
+        base_url: Optional[str] = None
+    ):
         """Inicializa o adaptador da OpenAI.
         
         Args:
             api_key: Chave da API da OpenAI. Se não for fornecida, será usada a variável de ambiente OPENAI_API_KEY.
             model: Nome do modelo da OpenAI a ser utilizado.
+            transport: Transporte HTTP com pool de conexões. Se não for fornecido, usa o compartilhado do processo.
+            base_url: URL base da API (ex.: um servidor local que emula a OpenAI). Se não for fornecida, usa a oficial.
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("A chave da API da OpenAI não foi fornecida e não foi encontrada nas variáveis de ambiente.")
         
         self.model = model
-        self.client = OpenAI(api_key=self.api_key)
+        self.base_url = base_url
+        self.transport = transport or get_shared_transport()
+        self.client = OpenAI(api_key=self.api_key, base_url=base_url, http_client=self.transport.client)
+        self._async_client: Optional[AsyncOpenAI] = None
+        self._async_http_client: Optional[Any] = None
+    
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Cliente assíncrono da OpenAI sobre o pool do loop de eventos em execução."""
+        http_client = self.transport.async_client()
+        if self._async_client is None or self._async_http_client is not http_client:
+            self._async_client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, http_client=http_client)
+            self._async_http_client = http_client
+        return self._async_client
+    
+    def _build_request_kwargs(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Monta os parâmetros da chamada à API, aplicando os valores padrão."""
+        # Configura os parâmetros padrão
+        default_kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": 150,
+            "temperature": 0.7,
+        }
+        
+        # Atualiza com os argumentos fornecidos, se houver
+        default_kwargs.update(kwargs)
+        return default_kwargs
     
     def generate_response(self, messages: List[Dict[str, str]], **kwargs) -> str:
         """Gera uma resposta usando a API da OpenAI.
@@ -37,19 +74,11 @@ class OpenAIModel(AIModel):
             Exception: Em caso de erro na chamada à API.
         """
         try:
-            # Configura os parâmetros padrão
-            default_kwargs = {
-                "model": self.model,
-                "messages": messages,
-                "max_tokens": 150,
-                "temperature": 0.7,
-            }
-            
-            # Atualiza com os argumentos fornecidos, se houver
-            default_kwargs.update(kwargs)
-            
             # Chama a API
-            response = self.client.chat.completions.create(**default_kwargs)
+            with LLM_DURATION.labels("openai").time():
+                response = self.client.chat.completions.create(
+                    **self._build_request_kwargs(messages, kwargs)
+                )
             
             # Retorna o conteúdo da resposta
             return response.choices[0].message.content.strip()
@@ -57,3 +86,88 @@ class OpenAIModel(AIModel):
         except Exception as e:
             # Log do erro pode ser implementado aqui
             raise Exception(f"Erro ao chamar a API da OpenAI: {str(e)}")
+    
+    async def agenerate_response(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Gera uma resposta de forma assíncrona usando a API da OpenAI.
+        
+        Args:
+            messages: Lista de mensagens no formato esperado pela API da OpenAI.
+            **kwargs: Argumentos adicionais para a API da OpenAI.
+            
+        Returns:
+            O conteúdo da resposta gerada pelo modelo.
+            
+        Raises:
+            Exception: Em caso de erro na chamada à API.
+        """
+        try:
+            with LLM_DURATION.labels("openai").time():
+                response = await self.async_client.chat.completions.create(
+                    **self._build_request_kwargs(messages, kwargs)
+                )
+            return response.choices[0].message.content.strip()
+            
+        except Exception as e:
+            raise Exception(f"Erro ao chamar a API da OpenAI: {str(e)}")
+    
+    def stream_response(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        """Gera a resposta em streaming usando a API da OpenAI.
+        
+        Args:
+            messages: Lista de mensagens no formato esperado pela API da OpenAI.
+            **kwargs: Argumentos adicionais para a API da OpenAI.
+            
+        Yields:
+            Trechos de texto da resposta, assim que chegam da API.
+            
+        Raises:
+            Exception: Em caso de erro na chamada à API.
+        """
+        try:
+            request_kwargs = self._build_request_kwargs(messages, kwargs)
+            request_kwargs["stream"] = True
+            timer = stream_timer("openai")
+            
+            # Cada chunk traz apenas o delta gerado desde o anterior
+            for chunk in self.client.chat.completions.create(**request_kwargs):
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    timer.token()
+                    yield delta
+            timer.done()
+                    
+        except Exception as e:
+            raise Exception(f"Erro ao chamar a API da OpenAI: {str(e)}")
+    
+    async def astream_response(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """Versão assíncrona de stream_response.
+        
+        Args:
+            messages: Lista de mensagens no formato esperado pela API da OpenAI.
+            **kwargs: Argumentos adicionais para a API da OpenAI.
+            
+        Yields:
+            Trechos de texto da resposta, assim que chegam da API.
+            
+        Raises:
+            Exception: Em caso de erro na chamada à API.
+        """
+        try:
+            request_kwargs = self._build_request_kwargs(messages, kwargs)
+            request_kwargs["stream"] = True
+            timer = stream_timer("openai")
+            
+            stream = await self.async_client.chat.completions.create(**request_kwargs)
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    timer.token()
+                    yield delta
+            timer.done()
+                    
+        except Exception as e:
+            raise Exception(f"Erro ao chamar a API da OpenAI: {str(e)}")
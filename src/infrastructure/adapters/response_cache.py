@@ -0,0 +1,397 @@
+"""Módulo que contém o cache de respostas em camadas (memória + disco) para modelos de IA."""
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ...domain.use_cases.process_message import AIModel
+from ..metrics.instruments import CACHE_LOOKUPS
+
+
+def make_cache_key(messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> str:
+    """Gera a chave do cache a partir das mensagens e dos argumentos de geração.
+
+    O conteúdo é normalizado (espaços colapsados e sem diferença de caixa) para
+    que variações triviais da mesma pergunta caiam na mesma entrada.
+
+    Args:
+        messages: Lista de mensagens enviada ao modelo.
+        kwargs: Argumentos adicionais de geração (temperatura, max_tokens...).
+
+    Returns:
+        Hash SHA-256 em hexadecimal.
+    """
+    normalized = {
+        "messages": [
+            [message.get("role", ""), " ".join(message.get("content", "").split()).casefold()]
+            for message in messages
+        ],
+        "kwargs": kwargs,
+    }
+    payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryLRUCache:
+    """Cache em memória com limite de entradas (LRU) e tempo de vida (TTL)."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Inicializa o cache.
+
+        Args:
+            max_entries: Número máximo de entradas mantidas.
+            ttl: Tempo de vida (em segundos) de cada entrada.
+            clock: Relógio monotônico (substituível em testes).
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """Retorna o valor da chave, ou None se não existir ou tiver expirado."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """Guarda um valor, descartando a entrada usada há mais tempo se necessário."""
+        with self._lock:
+            self._entries[key] = (value, self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        """Remove uma entrada; retorna True se ela existia."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteResponseStore:
+    """Armazenamento persistente de respostas em um arquivo SQLite.
+
+    Usa o relógio de parede (time.time) para que o TTL continue valendo entre
+    reinicializações do processo.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 86400.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Inicializa o armazenamento, criando o arquivo e a tabela se necessário.
+
+        Args:
+            path: Caminho do arquivo SQLite (":memory:" para um banco temporário).
+            ttl: Tempo de vida (em segundos) de cada entrada.
+            clock: Relógio de parede (substituível em testes).
+        """
+        self.path = path
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.expirations = 0
+
+        directory = os.path.dirname(path)
+        if path != ":memory:" and directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " response TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        """Retorna a resposta da chave, ou None se não existir ou tiver expirado."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT response, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, expires_at = row
+            if self._clock() >= expires_at:
+                with self._connection:
+                    self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.expirations += 1
+                return None
+            return response
+
+    def set(self, key: str, value: str) -> None:
+        """Guarda (ou substitui) uma resposta."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, response, expires_at) VALUES (?, ?, ?)",
+                (key, value, self._clock() + self.ttl),
+            )
+
+    def delete(self, key: str) -> bool:
+        """Remove uma entrada; retorna True se ela existia."""
+        with self._lock, self._connection:
+            cursor = self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return cursor.rowcount > 0
+
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def purge_expired(self) -> int:
+        """Remove as entradas expiradas e retorna quantas foram removidas."""
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM responses WHERE expires_at <= ?", (self._clock(),)
+            )
+            return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._connection.close()
+
+
+class CachedAIModel(AIModel):
+    """Decorador de AIModel que responde perguntas repetidas a partir do cache.
+
+    A consulta passa primeiro pelo LRU em memória e depois pelo armazenamento
+    em disco (se configurado); um acerto no disco é promovido para a memória.
+    Só respostas completas e não vazias são guardadas.
+    """
+
+    def __init__(
+        self,
+        model: AIModel,
+        memory: Optional[MemoryLRUCache] = None,
+        store: Optional[SQLiteResponseStore] = None,
+    ):
+        """Inicializa o decorador.
+
+        Args:
+            model: Modelo de IA real, chamado nas faltas do cache.
+            memory: Camada em memória. Se não for fornecida, usa um MemoryLRUCache padrão.
+            store: Camada persistente opcional.
+        """
+        self.model = model
+        self.memory = memory or MemoryLRUCache()
+        self.store = store
+        self._lock = threading.Lock()
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    def lookup(self, messages: List[Dict[str, str]], **kwargs) -> Optional[str]:
+        """Procura a resposta em cache para as mensagens, sem chamar o modelo."""
+        return self._lookup(make_cache_key(messages, kwargs))
+
+    def generate_response(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Gera uma resposta, usando o cache quando possível.
+
+        Args:
+            messages: Lista de mensagens no formato esperado.
+            **kwargs: Argumentos adicionais para o modelo.
+
+        Returns:
+            O conteúdo da resposta (em cache ou gerada pelo modelo).
+        """
+        key = make_cache_key(messages, kwargs)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = self.model.generate_response(messages, **kwargs)
+        self._store(key, response)
+        return response
+
+    async def agenerate_response(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Versão assíncrona de generate_response.
+
+        Só o LRU em memória é consultado no laço de eventos; o acesso ao
+        SQLite roda no executor padrão.
+        """
+        key = make_cache_key(messages, kwargs)
+        cached = await self._alookup(key)
+        if cached is not None:
+            return cached
+        response = await self.model.agenerate_response(messages, **kwargs)
+        await self._astore(key, response)
+        return response
+
+    def stream_response(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        """Gera a resposta em streaming; um acerto no cache é entregue de uma vez.
+
+        Yields:
+            Trechos de texto da resposta.
+        """
+        key = make_cache_key(messages, kwargs)
+        cached = self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+        parts: List[str] = []
+        for delta in self.model.stream_response(messages, **kwargs):
+            parts.append(delta)
+            yield delta
+        self._store(key, "".join(parts).strip())
+
+    async def astream_response(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """Versão assíncrona de stream_response (SQLite no executor, como em agenerate_response)."""
+        key = make_cache_key(messages, kwargs)
+        cached = await self._alookup(key)
+        if cached is not None:
+            yield cached
+            return
+        parts: List[str] = []
+        async for delta in self.model.astream_response(messages, **kwargs):
+            parts.append(delta)
+            yield delta
+        await self._astore(key, "".join(parts).strip())
+
+    def context_budget(self) -> Optional[int]:
+        """Repassa o orçamento de tokens do modelo real."""
+        return self.model.context_budget()
+
+    def invalidate(self, messages: List[Dict[str, str]], **kwargs) -> bool:
+        """Remove a entrada correspondente às mensagens de todas as camadas.
+
+        Returns:
+            True se alguma camada tinha a entrada.
+        """
+        return self.invalidate_key(make_cache_key(messages, kwargs))
+
+    def invalidate_key(self, key: str) -> bool:
+        """Remove uma entrada, pela chave, de todas as camadas."""
+        removed = self.memory.delete(key)
+        if self.store is not None:
+            removed = self.store.delete(key) or removed
+        return removed
+
+    def clear(self) -> None:
+        """Esvazia todas as camadas do cache."""
+        self.memory.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna as estatísticas do cache.
+
+        Returns:
+            Dicionário com acertos (memória e disco), faltas, taxa de acerto,
+            descartes por LRU, expirações e tamanho de cada camada.
+        """
+        with self._lock:
+            hits = self._memory_hits + self._disk_hits
+            total = hits + self._misses
+            stats = {
+                "hits": hits,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": hits / total if total else 0.0,
+            }
+        stats["evictions"] = self.memory.evictions
+        stats["expirations"] = self.memory.expirations + (self.store.expirations if self.store else 0)
+        stats["memory_size"] = len(self.memory)
+        stats["disk_size"] = len(self.store) if self.store is not None else 0
+        return stats
+
+    def __getattr__(self, name: str) -> Any:
+        # Repassa métodos específicos do modelo real (ex.: get_current_model_info)
+        if name == "model":
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    def _lookup(self, key: str) -> Optional[str]:
+        """Consulta as camadas em ordem, promovendo acertos do disco para a memória."""
+        value = self._lookup_memory(key)
+        if value is None:
+            value = self._lookup_store(key)
+        return value
+
+    async def _alookup(self, key: str) -> Optional[str]:
+        """Versão assíncrona de _lookup: a consulta ao disco roda no executor padrão."""
+        value = self._lookup_memory(key)
+        if value is None:
+            loop = asyncio.get_running_loop()
+            value = await loop.run_in_executor(None, self._lookup_store, key)
+        return value
+
+    def _lookup_memory(self, key: str) -> Optional[str]:
+        """Consulta o LRU em memória; uma falta aqui ainda não é contabilizada."""
+        value = self.memory.get(key)
+        if value is not None:
+            with self._lock:
+                self._memory_hits += 1
+            CACHE_LOOKUPS.labels("response", "memory_hit").inc()
+        return value
+
+    def _lookup_store(self, key: str) -> Optional[str]:
+        """Consulta o disco (depois de uma falta na memória) e contabiliza o resultado."""
+        if self.store is not None:
+            value = self.store.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+                with self._lock:
+                    self._disk_hits += 1
+                CACHE_LOOKUPS.labels("response", "disk_hit").inc()
+                return value
+        with self._lock:
+            self._misses += 1
+        CACHE_LOOKUPS.labels("response", "miss").inc()
+        return None
+
+    def _store(self, key: str, response: str) -> None:
+        """Guarda uma resposta completa em todas as camadas."""
+        if not response:
+            return
+        self.memory.set(key, response)
+        if self.store is not None:
+            self.store.set(key, response)
+
+    async def _astore(self, key: str, response: str) -> None:
+        """Versão assíncrona de _store: a gravação no disco roda no executor padrão."""
+        if not response:
+            return
+        self.memory.set(key, response)
+        if self.store is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, functools.partial(self.store.set, key, response))
@@ -0,0 +1,344 @@
+"""Módulo que contém o cache semântico de respostas para perguntas parecidas."""
+import math
+import os
+import re
+import threading
+import unicodedata
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependência opcional
+    np = None
+
+from ...domain.use_cases.process_message import AnswerCache
+from ..metrics.instruments import CACHE_LOOKUPS
+
+# Palavras muito comuns que não ajudam a distinguir perguntas
+STOPWORDS = {
+    "a", "o", "as", "os", "um", "uma", "de", "do", "da", "dos", "das", "em", "no",
+    "na", "nos", "nas", "por", "para", "pra", "com", "que", "e", "ou", "se", "eu",
+    "voce", "voces", "me", "meu", "minha", "seu", "sua", "qual", "quais", "como",
+    "ao", "aos", "isso", "esse", "essa", "gostaria", "saber", "favor",
+}
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def _require_numpy() -> None:
+    """Garante que o NumPy está instalado."""
+    if np is None:
+        raise ImportError("O cache semântico requer o NumPy. Instale com: pip install numpy")
+
+
+def normalize_text(text: str) -> str:
+    """Remove acentos e diferenças de caixa de um texto."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class Embedder:
+    """Interface para geradores de vetores (embeddings) de texto."""
+
+    dimensions: int
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        """Gera os vetores normalizados (norma L2 = 1) dos textos.
+
+        Args:
+            texts: Textos a converter.
+
+        Returns:
+            Matriz (len(texts), dimensions) em float32.
+        """
+        raise NotImplementedError
+
+
+class HashingEmbedder(Embedder):
+    """Embedder local, sem modelo treinado, baseado em hashing de características.
+
+    Cada texto vira um saco de palavras, pares de palavras e n-gramas de
+    caracteres, espalhados em um vetor de tamanho fixo pelo hash CRC32 com
+    sinal, e ponderados por frequência sublinear.
+
+    Só aproxima quase-duplicatas: variações de acento, caixa, pontuação,
+    palavras vazias ("como eu faço pra cancelar um pedido" ≈ "Como faço para
+    cancelar meu pedido?") ou uma palavra a mais. Paráfrases com outras
+    palavras ("que horas vocês abrem" / "qual o horário de abertura") ficam
+    bem abaixo do limite padrão; para elas, use um Embedder baseado em um
+    modelo de embeddings treinado.
+    """
+
+    def __init__(self, dimensions: int = 1024, char_ngram_sizes: Tuple[int, ...] = (3, 4)):
+        """Inicializa o embedder.
+
+        Args:
+            dimensions: Tamanho dos vetores gerados.
+            char_ngram_sizes: Tamanhos dos n-gramas de caracteres extraídos de cada palavra.
+        """
+        _require_numpy()
+        self.dimensions = dimensions
+        self.char_ngram_sizes = char_ngram_sizes
+
+    def _features(self, text: str) -> Counter:
+        """Extrai as características de um texto."""
+        words = [word for word in _WORD_PATTERN.findall(normalize_text(text)) if word not in STOPWORDS]
+        features: Counter = Counter()
+        for word in words:
+            features["w:" + word] += 1
+            padded = f"<{word}>"
+            for size in self.char_ngram_sizes:
+                for start in range(len(padded) - size + 1):
+                    features["c:" + padded[start:start + size]] += 1
+        for first, second in zip(words, words[1:]):
+            features[f"b:{first} {second}"] += 1
+        return features
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        """Gera os vetores normalizados dos textos."""
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in self._features(text).items():
+                digest = zlib.crc32(feature.encode("utf-8"))
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                vectors[row, digest % self.dimensions] += sign * (1.0 + math.log(count))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class VectorIndex:
+    """Índice de vetores em memória com busca por similaridade de cosseno.
+
+    Os vetores ficam em uma única matriz pré-alocada, de modo que a busca é
+    um produto matriz-vetor do NumPy. Quando o índice enche, a entrada usada
+    há mais tempo é substituída.
+    """
+
+    def __init__(self, dimensions: int, max_entries: int = 1000):
+        """Inicializa o índice.
+
+        Args:
+            dimensions: Tamanho dos vetores.
+            max_entries: Número máximo de entradas.
+        """
+        _require_numpy()
+        self.dimensions = dimensions
+        self.max_entries = max_entries
+        self._vectors = np.zeros((max_entries, dimensions), dtype=np.float32)
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._tick = 0
+        self.questions: List[str] = []
+        self.answers: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def search(self, vector: "np.ndarray") -> Tuple[int, float]:
+        """Encontra a entrada mais parecida com o vetor (já normalizado).
+
+        Returns:
+            Tupla (posição, similaridade); posição -1 se o índice estiver vazio.
+        """
+        size = len(self)
+        if size == 0:
+            return -1, 0.0
+        scores = self._vectors[:size] @ vector
+        position = int(np.argmax(scores))
+        return position, float(scores[position])
+
+    def touch(self, position: int) -> None:
+        """Marca uma entrada como usada agora."""
+        self._tick += 1
+        self._last_used[position] = self._tick
+
+    def add(self, vector: "np.ndarray", question: str, answer: str) -> bool:
+        """Adiciona uma entrada.
+
+        Returns:
+            True se uma entrada antiga precisou ser descartada.
+        """
+        size = len(self)
+        evicted = size >= self.max_entries
+        if evicted:
+            position = int(np.argmin(self._last_used[:size]))
+            self.questions[position] = question
+            self.answers[position] = answer
+        else:
+            position = size
+            self.questions.append(question)
+            self.answers.append(answer)
+        self._vectors[position] = vector
+        self.touch(position)
+        return evicted
+
+    def snapshot(self) -> Dict[str, "np.ndarray"]:
+        """Copia as entradas atuais, para gravá-las sem segurar quem altera o índice."""
+        size = len(self)
+        return {
+            "vectors": self._vectors[:size].copy(),
+            "last_used": self._last_used[:size].copy(),
+            "questions": np.array(self.questions, dtype=str),
+            "answers": np.array(self.answers, dtype=str),
+        }
+
+    def save(self, path: str) -> None:
+        """Grava o índice em um arquivo .npz (de forma atômica)."""
+        write_snapshot(path, self.snapshot())
+
+    def load(self, path: str) -> bool:
+        """Carrega as entradas de um arquivo gravado por save.
+
+        Returns:
+            False se o arquivo não existir ou for de vetores de outro tamanho.
+        """
+        if not os.path.exists(path):
+            return False
+        with np.load(path, allow_pickle=False) as data:
+            vectors = data["vectors"]
+            if vectors.ndim != 2 or (len(vectors) and vectors.shape[1] != self.dimensions):
+                return False
+            last_used = data["last_used"]
+            questions = [str(question) for question in data["questions"]]
+            answers = [str(answer) for answer in data["answers"]]
+
+        # Mantém as mais recentes se o arquivo tiver mais entradas que o limite
+        keep = np.argsort(last_used)[-self.max_entries:]
+        size = len(keep)
+        self._vectors[:size] = vectors[keep]
+        self._last_used[:size] = last_used[keep]
+        self._tick = int(last_used.max()) if len(last_used) else 0
+        self.questions = [questions[i] for i in keep]
+        self.answers = [answers[i] for i in keep]
+        return True
+
+
+def write_snapshot(path: str, snapshot: Dict[str, "np.ndarray"]) -> None:
+    """Grava uma cópia do índice (de VectorIndex.snapshot) em um arquivo .npz, de forma atômica."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        np.savez(
+            file,
+            vectors=snapshot["vectors"],
+            last_used=snapshot["last_used"],
+            questions=snapshot["questions"],
+            answers=snapshot["answers"],
+        )
+    os.replace(temp_path, path)
+
+
+class SemanticResponseCache(AnswerCache):
+    """Cache que reaproveita respostas de perguntas semanticamente parecidas.
+
+    A última mensagem do usuário é convertida em vetor e comparada com as
+    perguntas já respondidas; acima do limite de similaridade, a resposta
+    guardada é devolvida sem chamar o modelo. Com o HashingEmbedder padrão,
+    os acertos são perguntas quase idênticas, não paráfrases.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        threshold: float = 0.85,
+        max_entries: int = 1000,
+        path: Optional[str] = None,
+        autosave_every: int = 10,
+    ):
+        """Inicializa o cache.
+
+        Args:
+            embedder: Gerador de vetores. Se não for fornecido, usa o HashingEmbedder.
+            threshold: Similaridade de cosseno mínima (0 a 1) para um acerto.
+            max_entries: Número máximo de perguntas guardadas.
+            path: Arquivo .npz de persistência; None mantém o cache só em memória.
+            autosave_every: Grava o arquivo a cada N novas respostas guardadas
+                (em uma thread própria, fora do caminho da requisição).
+        """
+        _require_numpy()
+        self.embedder = embedder or HashingEmbedder()
+        self.threshold = threshold
+        self.path = path
+        self.autosave_every = autosave_every
+        self.index = VectorIndex(self.embedder.dimensions, max_entries=max_entries)
+        if path is not None:
+            self.index.load(path)
+
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-semantico")
+        self._pending_writes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def lookup(self, question: str) -> Optional[str]:
+        """Procura a resposta de uma pergunta parecida."""
+        vector = self.embedder.embed([question])[0]
+        with self._lock:
+            position, score = self.index.search(vector)
+            if position >= 0 and score >= self.threshold:
+                self.index.touch(position)
+                self._hits += 1
+                answer = self.index.answers[position]
+            else:
+                self._misses += 1
+                answer = None
+        CACHE_LOOKUPS.labels("semantic", "hit" if answer is not None else "miss").inc()
+        return answer
+
+    def store(self, question: str, answer: str) -> None:
+        """Guarda a resposta; substitui a de uma pergunta equivalente, se houver."""
+        vector = self.embedder.embed([question])[0]
+        with self._lock:
+            position, score = self.index.search(vector)
+            if position >= 0 and score >= self.threshold:
+                self.index.answers[position] = answer
+                self.index.touch(position)
+            elif self.index.add(vector, question, answer):
+                self._evictions += 1
+            self._pending_writes += 1
+            snapshot = None
+            if self.path is not None and self._pending_writes >= self.autosave_every:
+                snapshot = self.index.snapshot()
+                self._pending_writes = 0
+        if self.path is not None and snapshot is not None:
+            self._writer.submit(self._write, self.path, snapshot)
+
+    def save(self) -> None:
+        """Grava o cache no arquivo de persistência, se configurado, e espera a gravação terminar."""
+        if self.path is None:
+            return
+        with self._lock:
+            snapshot = self.index.snapshot()
+            self._pending_writes = 0
+        # Passa pela mesma thread das gravações automáticas, para manter a ordem
+        self._writer.submit(self._write, self.path, snapshot).result()
+
+    def _write(self, path: str, snapshot: Dict[str, "np.ndarray"]) -> None:
+        """Grava uma cópia do índice no arquivo de persistência (na thread de gravação)."""
+        try:
+            write_snapshot(path, snapshot)
+        except Exception as e:
+            print(f"⚠️  Não foi possível gravar o cache semântico: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna as estatísticas do cache semântico.
+
+        Returns:
+            Dicionário com entradas, acertos, faltas, taxa de acerto, descartes e limite.
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entries": len(self.index),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "evictions": self._evictions,
+                "threshold": self.threshold,
+            }
@@ -1,33 +1,99 @@
 """Módulo que contém um adaptador inteligente que alterna entre diferentes modelos de IA."""
-from typing import List, Optional, Dict, Any
-from ...domain.use_cases.process_message import AIModel
+import asyncio
+import queue
+import threading
+import time
+from typing import List, Optional, Dict, Any, Iterator, AsyncIterator, NoReturn
+from ...domain.use_cases.process_message import AIModel, current_session
 from .openai_adapter import OpenAIModel
 from .deepseek_adapter import DeepSeekModel
 from .ollama_adapter import OllamaModel
+from .http_transport import HttpTransport
+from .hedging import HedgingPolicy, HedgedRace
+from .circuit_breaker import CircuitBreaker, CircuitState
+from .concurrency_limit import ConcurrencyLimitedModel
+from ..metrics.instruments import LLM_ERRORS, LLM_FALLBACKS
+
+MODEL_SEQUENCE = ["openai", "deepseek", "ollama"]
+
+MODEL_DISPLAY_NAMES = {
+    "openai": "OpenAI",
+    "deepseek": "DeepSeek",
+    "ollama": "Ollama (local)",
+}
+
+
+def _url_kwargs(urls: Dict[str, str], name: str) -> Dict[str, str]:
+    """Argumento base_url do adaptador, se houver uma URL configurada para o provedor."""
+    return {"base_url": urls[name]} if name in urls else {}
 
 
 class SmartAIModel(AIModel):
-    """Adaptador inteligente que alterna automaticamente entre OpenAI e DeepSeek."""
+    """Adaptador inteligente que alterna automaticamente entre OpenAI, DeepSeek e Ollama.
+    
+    Cada provedor tem um circuit breaker. A cada requisição, o provedor mais
+    rápido (na ordem OpenAI -> DeepSeek -> Ollama) cujo circuito está fechado
+    é usado; circuitos abertos são pulados até o período de espera expirar,
+    quando uma requisição de sonda decide se o provedor volta a ser usado.
+    
+    Durante um turno com sessão (ver session_scope), o provedor preferido da
+    sessão é tentado primeiro e, após um fallback, passa a ser o que
+    respondeu; assim, cada conversa mantém o seu provedor sem depender do
+    estado global current_model.
+    """
     
-    def __init__(self, openai_api_key: Optional[str] = None, deepseek_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        openai_api_key: Optional[str] = None,
+        deepseek_api_key: Optional[str] = None,
+        transport: Optional[HttpTransport] = None,
+        hedging_policy: Optional[HedgingPolicy] = None,
+        breakers: Optional[Dict[str, CircuitBreaker]] = None,
+        context_budgets: Optional[Dict[str, int]] = None,
+        concurrency_limits: Optional[Dict[str, int]] = None,
+        base_urls: Optional[Dict[str, str]] = None
+    ):
         """Inicializa o adaptador inteligente.
         
         Args:
             openai_api_key: Chave da API da OpenAI.
             deepseek_api_key: Chave da API do DeepSeek.
+            transport: Transporte HTTP compartilhado pelos três provedores.
+            hedging_policy: Se fornecida, ativa o modo hedged: quando o modelo atual
+                não produz o primeiro token dentro do atraso da política, o próximo
+                modelo da sequência é disparado em paralelo e a primeira resposta vence.
+            breakers: Circuit breakers por provedor ("openai", "deepseek", "ollama").
+                Provedores ausentes recebem um CircuitBreaker com os valores padrão.
+            context_budgets: Orçamento de tokens do prompt por provedor. Provedores
+                ausentes usam o limite de mensagens (max_history).
+            concurrency_limits: Máximo de requisições simultâneas por provedor.
+                Provedores ausentes não têm limite.
+            base_urls: URL base por provedor (ex.: um servidor local que emula as APIs).
+                Provedores ausentes usam o endereço padrão.
         """
-        self.openai_model = OpenAIModel(api_key=openai_api_key)
-        self.deepseek_model = DeepSeekModel(api_key=deepseek_api_key)
-        self.ollama_model = OllamaModel()
-        self.current_model = "openai"  # Começa com OpenAI
-        self.fallback_triggered = False
+        urls = {name: url for name, url in (base_urls or {}).items() if url}
+        self.openai_model = OpenAIModel(api_key=openai_api_key, transport=transport, **_url_kwargs(urls, "openai"))
+        self.deepseek_model = DeepSeekModel(api_key=deepseek_api_key, transport=transport, **_url_kwargs(urls, "deepseek"))
+        self.ollama_model = OllamaModel(transport=transport, **_url_kwargs(urls, "ollama"))
+        limits = concurrency_limits or {}
+        for name in MODEL_SEQUENCE:
+            if limits.get(name):
+                attribute = f"{name}_model"
+                setattr(self, attribute, ConcurrencyLimitedModel(getattr(self, attribute), limits[name]))
+        self.current_model = "openai"  # Último modelo que respondeu
         self.fallback_count = 0
+        self.hedging_policy = hedging_policy
+        breakers = breakers or {}
+        self.breakers: Dict[str, CircuitBreaker] = {
+            name: breakers.get(name) or CircuitBreaker() for name in MODEL_SEQUENCE
+        }
+        self.context_budgets: Dict[str, int] = dict(context_budgets or {})
     
     def _is_quota_error(self, error_message: str) -> bool:
         """Verifica se o erro é relacionado a quota excedida."""
         quota_indicators = [
             "quota",
-            "insufficient_quota", 
+            "insufficient_quota",
             "rate_limit",
             "billing",
             "payment",
@@ -35,79 +101,446 @@ class SmartAIModel(AIModel):
         ]
         return any(indicator.lower() in error_message.lower() for indicator in quota_indicators)
     
+    def _get_model(self, name: str) -> AIModel:
+        """Retorna o adaptador correspondente ao nome do modelo."""
+        if name == "openai":
+            return self.openai_model
+        elif name == "deepseek":
+            return self.deepseek_model
+        return self.ollama_model
+    
+    def context_budget(self) -> Optional[int]:
+        """Orçamento de tokens do primeiro provedor candidato com o circuito disponível.
+        
+        Se esse provedor falhar, o próximo da sequência recebe o mesmo prompt.
+        """
+        for name in self._candidates():
+            if self.breakers[name].is_available():
+                return self.context_budgets.get(name)
+        return None
+    
+    def _candidates(self) -> List[str]:
+        """Ordem de tentativa dos provedores: o preferido da sessão em andamento primeiro."""
+        session = current_session.get()
+        preferred = session.preferred_provider if session is not None else None
+        if preferred not in MODEL_SEQUENCE:
+            return MODEL_SEQUENCE
+        return [preferred] + [name for name in MODEL_SEQUENCE if name != preferred]
+    
+    def _acquire(self, name: str, errors: List[str]) -> bool:
+        """Consulta o circuito do provedor antes de uma tentativa.
+        
+        Returns:
+            True se o provedor pode ser chamado agora.
+        """
+        if not self.breakers[name].allow_request():
+            return False
+        if errors:
+            self.fallback_count += 1
+            LLM_FALLBACKS.labels(name).inc()
+            print(f"🔄 Alternando para {MODEL_DISPLAY_NAMES[name]}...")
+        return True
+    
+    def _record_success(self, name: str) -> None:
+        """Registra o sucesso de um provedor e o torna o modelo atual (e o preferido da sessão)."""
+        self.breakers[name].record_success()
+        if MODEL_SEQUENCE.index(name) < MODEL_SEQUENCE.index(self.current_model):
+            print(f"✅ {name.upper()} disponível novamente. Voltando a usá-lo.")
+        self.current_model = name
+        session = current_session.get()
+        if session is not None:
+            session.preferred_provider = name
+    
+    def _record_failure(self, name: str, error: Exception, errors: List[str]) -> None:
+        """Registra a falha de um provedor no seu circuito.
+        
+        Erros de quota abrem o circuito imediatamente; os demais entram na
+        taxa de falhas da janela.
+        """
+        error_message = str(error)
+        errors.append(f"{name.upper()}: {error_message}")
+        LLM_ERRORS.labels(name).inc()
+        breaker = self.breakers[name]
+        if self._is_quota_error(error_message):
+            breaker.trip()
+            print(f"⚠️  Erro de quota detectado no {name.upper()}. Tentando próximo modelo...")
+        else:
+            breaker.record_failure()
+            print(f"⚠️  Falha no {name.upper()}. Tentando próximo modelo...")
+    
+    def _raise_all_failed(self, errors: List[str], last_error: Optional[Exception]) -> NoReturn:
+        """Levanta o erro final quando nenhum provedor conseguiu responder."""
+        if last_error is None:
+            raise Exception(f"Nenhum modelo disponível: todos os circuitos estão abertos. {self._describe_breakers()}")
+        if len(errors) == 1:
+            raise last_error
+        raise Exception(f"Todos os modelos falharam. {', '.join(errors)}")
+    
     def generate_response(self, messages: List[Dict[str, str]], **kwargs) -> str:
-        """Gera uma resposta usando o modelo atual, com fallback automático.
+        """Gera uma resposta usando o provedor disponível mais rápido, com fallback automático.
         
         Args:
             messages: Lista de mensagens no formato esperado.
             **kwargs: Argumentos adicionais para o modelo.
-            
+        
         Returns:
             O conteúdo da resposta gerada pelo modelo.
-            
+        
         Raises:
-            Exception: Em caso de erro em todos os modelos.
+            Exception: Em caso de erro em todos os modelos disponíveis.
         """
-        # Primeira tentativa com o modelo atual
-        try:
-            if self.current_model == "openai":
-                return self.openai_model.generate_response(messages, **kwargs)
-            elif self.current_model == "deepseek":
-                return self.deepseek_model.generate_response(messages, **kwargs)
+        if self.hedging_policy is not None:
+            return "".join(self._hedged_stream(messages, kwargs)).strip()
+        
+        errors: List[str] = []
+        last_error: Optional[Exception] = None
+        for name in self._candidates():
+            if not self._acquire(name, errors):
+                continue
+            try:
+                response = self._get_model(name).generate_response(messages, **kwargs)
+            except Exception as e:
+                self._record_failure(name, e, errors)
+                last_error = e
+                continue
+            self._record_success(name)
+            return response
+        
+        self._raise_all_failed(errors, last_error)
+    
+    async def agenerate_response(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Gera uma resposta de forma assíncrona, com o mesmo fallback de generate_response.
+        
+        Args:
+            messages: Lista de mensagens no formato esperado.
+            **kwargs: Argumentos adicionais para o modelo.
+        
+        Returns:
+            O conteúdo da resposta gerada pelo modelo.
+        
+        Raises:
+            Exception: Em caso de erro em todos os modelos disponíveis.
+        """
+        if self.hedging_policy is not None:
+            parts = [delta async for delta in self._ahedged_stream(messages, kwargs)]
+            return "".join(parts).strip()
+        
+        errors: List[str] = []
+        last_error: Optional[Exception] = None
+        for name in self._candidates():
+            if not self._acquire(name, errors):
+                continue
+            try:
+                response = await self._get_model(name).agenerate_response(messages, **kwargs)
+            except asyncio.CancelledError:
+                self.breakers[name].release_probe()
+                raise
+            except Exception as e:
+                self._record_failure(name, e, errors)
+                last_error = e
+                continue
+            self._record_success(name)
+            return response
+        
+        self._raise_all_failed(errors, last_error)
+    
+    def stream_response(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        """Gera a resposta em streaming usando o provedor disponível mais rápido.
+        
+        O fallback só é possível enquanto nenhum trecho foi entregue ao chamador;
+        um erro no meio do streaming é propagado, pois o texto já emitido não pode
+        ser substituído pela resposta de outro modelo. O primeiro trecho recebido
+        já conta como sucesso para o circuito do provedor.
+        
+        Args:
+            messages: Lista de mensagens no formato esperado.
+            **kwargs: Argumentos adicionais para o modelo.
+        
+        Yields:
+            Trechos de texto da resposta, assim que são gerados.
+        
+        Raises:
+            Exception: Em caso de erro em todos os modelos disponíveis.
+        """
+        if self.hedging_policy is not None:
+            yield from self._hedged_stream(messages, kwargs)
+            return
+        
+        errors: List[str] = []
+        last_error: Optional[Exception] = None
+        for name in self._candidates():
+            if not self._acquire(name, errors):
+                continue
+            emitted = False
+            try:
+                for delta in self._get_model(name).stream_response(messages, **kwargs):
+                    if not emitted:
+                        emitted = True
+                        self._record_success(name)
+                    yield delta
+            except Exception as e:
+                if emitted:
+                    self.breakers[name].record_failure()
+                    LLM_ERRORS.labels(name).inc()
+                    raise
+                self._record_failure(name, e, errors)
+                last_error = e
+                continue
+            finally:
+                if not emitted:
+                    # Encerrado pelo chamador antes do primeiro trecho: libera a sonda
+                    self.breakers[name].release_probe()
+            if not emitted:
+                self._record_success(name)
+            return
+        
+        self._raise_all_failed(errors, last_error)
+    
+    async def astream_response(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """Versão assíncrona de stream_response, com o mesmo fallback.
+        
+        Args:
+            messages: Lista de mensagens no formato esperado.
+            **kwargs: Argumentos adicionais para o modelo.
+        
+        Yields:
+            Trechos de texto da resposta, assim que são gerados.
+        
+        Raises:
+            Exception: Em caso de erro em todos os modelos disponíveis.
+        """
+        if self.hedging_policy is not None:
+            async for delta in self._ahedged_stream(messages, kwargs):
+                yield delta
+            return
+        
+        errors: List[str] = []
+        last_error: Optional[Exception] = None
+        for name in self._candidates():
+            if not self._acquire(name, errors):
+                continue
+            emitted = False
+            try:
+                async for delta in self._get_model(name).astream_response(messages, **kwargs):
+                    if not emitted:
+                        emitted = True
+                        self._record_success(name)
+                    yield delta
+            except Exception as e:
+                if emitted:
+                    self.breakers[name].record_failure()
+                    LLM_ERRORS.labels(name).inc()
+                    raise
+                self._record_failure(name, e, errors)
+                last_error = e
+                continue
+            finally:
+                if not emitted:
+                    self.breakers[name].release_probe()
+            if not emitted:
+                self._record_success(name)
+            return
+        
+        self._raise_all_failed(errors, last_error)
+    
+    def _hedge_chain(self) -> List[str]:
+        """Reserva os provedores disponíveis para a corrida hedged, na ordem de preferência.
+        
+        Raises:
+            Exception: Se todos os circuitos estiverem abertos.
+        """
+        chain = [name for name in self._candidates() if self.breakers[name].allow_request()]
+        if not chain:
+            self._raise_all_failed([], None)
+        return chain
+    
+    def _settle_race(self, race: HedgedRace, settled: List[str]) -> None:
+        """Libera as sondas reservadas por provedores da corrida sem resultado registrado."""
+        for name in race.chain:
+            if name not in settled:
+                self.breakers[name].release_probe()
+    
+    def _on_race_error(self, race: HedgedRace, name: str, error: Exception, settled: List[str]) -> Optional[str]:
+        """Registra a falha de um provedor da corrida e repassa o evento para ela."""
+        LLM_ERRORS.labels(name).inc()
+        if race.winner is None or name == race.winner:
+            if self._is_quota_error(str(error)):
+                self.breakers[name].trip()
             else:
-                return self.ollama_model.generate_response(messages, **kwargs)
-                
-        except Exception as e:
-            error_message = str(e)
+                self.breakers[name].record_failure()
+            settled.append(name)
+        return race.on_error(name, error, time.monotonic())
+    
+    def _on_race_winner(self, name: str, settled: List[str]) -> None:
+        """Registra o vencedor da corrida como sucesso."""
+        self._record_success(name)
+        settled.append(name)
+    
+    def _hedged_stream(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> Iterator[str]:
+        """Executa a corrida hedged com uma thread por provedor disparado.
+        
+        Threads não podem ser interrompidas: o perdedor é sinalizado e encerra
+        o seu fluxo (fechando a conexão) ao receber o próximo trecho.
+        """
+        race = HedgedRace(self.hedging_policy, self._hedge_chain())
+        settled: List[str] = []
+        events: "queue.Queue[tuple]" = queue.Queue()
+        cancel_events: Dict[str, threading.Event] = {}
+        
+        def launch(name: str) -> None:
+            cancelled = cancel_events[name] = threading.Event()
             
-            # Se for erro de quota e ainda não tentamos todos os fallbacks
-            if self._is_quota_error(error_message) and self.fallback_count < 2:
-                print(f"⚠️  Erro de quota detectado no {self.current_model.upper()}. Tentando próximo modelo...")
-                
-                # Sequência de fallback: OpenAI -> DeepSeek -> Ollama
-                if self.current_model == "openai":
-                    self.current_model = "deepseek"
-                    print("🔄 Alternando para DeepSeek...")
-                elif self.current_model == "deepseek":
-                    self.current_model = "ollama"
-                    print("🔄 Alternando para Ollama (local)...")
-                
-                self.fallback_count += 1
-                
-                # Segunda tentativa com o modelo alternativo
+            def run() -> None:
+                stream = self._get_model(name).stream_response(messages, **kwargs)
                 try:
-                    if self.current_model == "openai":
-                        return self.openai_model.generate_response(messages, **kwargs)
-                    elif self.current_model == "deepseek":
-                        return self.deepseek_model.generate_response(messages, **kwargs)
-                    else:
-                        return self.ollama_model.generate_response(messages, **kwargs)
-                        
-                except Exception as fallback_error:
-                    # Se o segundo modelo falhar, tenta o terceiro
-                    if self.fallback_count < 2:
-                        if self.current_model == "deepseek":
-                            self.current_model = "ollama"
-                            print("🔄 Alternando para Ollama (local)...")
-                            self.fallback_count += 1
-                            
-                            try:
-                                return self.ollama_model.generate_response(messages, **kwargs)
-                            except Exception as ollama_error:
-                                raise Exception(f"Todos os modelos falharam. OpenAI: {error_message}, DeepSeek: {str(fallback_error)}, Ollama: {str(ollama_error)}")
-                        else:
-                            raise Exception(f"Todos os modelos falharam. OpenAI: {error_message}, DeepSeek: {str(fallback_error)}, Ollama: {str(fallback_error)}")
-                    else:
-                        raise Exception(f"Todos os modelos falharam. OpenAI: {error_message}, DeepSeek: {str(fallback_error)}")
+                    for delta in stream:
+                        if cancelled.is_set():
+                            return
+                        events.put((name, "delta", delta))
+                    events.put((name, "done", None))
+                except Exception as e:
+                    events.put((name, "error", e))
+                finally:
+                    close = getattr(stream, "close", None)
+                    if close is not None:
+                        close()
             
-            # Se não for erro de quota ou já tentamos todos os fallbacks, propaga o erro
-            raise e
+            threading.Thread(target=run, name=f"hedge-{name}", daemon=True).start()
+        
+        launch(race.start(time.monotonic()))
+        try:
+            while True:
+                try:
+                    name, kind, value = events.get(timeout=race.wait_timeout(time.monotonic()))
+                except queue.Empty:
+                    hedge = race.on_timeout(time.monotonic())
+                    if hedge is not None:
+                        print(f"⏱️  {race.primary.upper()} sem resposta a tempo. Disparando hedge no {hedge.upper()}...")
+                        launch(hedge)
+                    continue
+                
+                if kind == "delta":
+                    first = race.winner is None
+                    if race.on_delta(name, time.monotonic()):
+                        if first:
+                            self._on_race_winner(name, settled)
+                            for loser in race.losers():
+                                cancel_events[loser].set()
+                        yield value
+                elif kind == "done":
+                    first = race.winner is None
+                    if race.on_done(name):
+                        if first:
+                            self._on_race_winner(name, settled)
+                        return
+                else:
+                    next_model = self._on_race_error(race, name, value, settled)
+                    if next_model is not None:
+                        launch(next_model)
+        finally:
+            for cancelled in cancel_events.values():
+                cancelled.set()
+            self._settle_race(race, settled)
+            race.finish()
+    
+    async def _ahedged_stream(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> AsyncIterator[str]:
+        """Executa a corrida hedged com uma task por provedor; o perdedor é cancelado."""
+        race = HedgedRace(self.hedging_policy, self._hedge_chain())
+        settled: List[str] = []
+        events: "asyncio.Queue[tuple]" = asyncio.Queue()
+        tasks: Dict[str, "asyncio.Task[None]"] = {}
+        
+        async def run(name: str) -> None:
+            try:
+                async for delta in self._get_model(name).astream_response(messages, **kwargs):
+                    await events.put((name, "delta", delta))
+                await events.put((name, "done", None))
+            except Exception as e:
+                await events.put((name, "error", e))
+        
+        def launch(name: str) -> None:
+            tasks[name] = asyncio.ensure_future(run(name))
+        
+        launch(race.start(time.monotonic()))
+        try:
+            while True:
+                try:
+                    name, kind, value = await asyncio.wait_for(
+                        events.get(), timeout=race.wait_timeout(time.monotonic())
+                    )
+                except asyncio.TimeoutError:
+                    hedge = race.on_timeout(time.monotonic())
+                    if hedge is not None:
+                        print(f"⏱️  {race.primary.upper()} sem resposta a tempo. Disparando hedge no {hedge.upper()}...")
+                        launch(hedge)
+                    continue
+                
+                if kind == "delta":
+                    first = race.winner is None
+                    if race.on_delta(name, time.monotonic()):
+                        if first:
+                            self._on_race_winner(name, settled)
+                            for loser in race.losers():
+                                tasks[loser].cancel()
+                        yield value
+                elif kind == "done":
+                    first = race.winner is None
+                    if race.on_done(name):
+                        if first:
+                            self._on_race_winner(name, settled)
+                        return
+                else:
+                    next_model = self._on_race_error(race, name, value, settled)
+                    if next_model is not None:
+                        launch(next_model)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            self._settle_race(race, settled)
+            race.finish()
+    
+    def get_hedging_stats(self) -> Optional[Dict[str, Any]]:
+        """Retorna as estatísticas de hedge, ou None se o modo hedged estiver desativado."""
+        if self.hedging_policy is None:
+            return None
+        return self.hedging_policy.get_stats()
+    
+    def get_breaker_states(self) -> Dict[str, Dict[str, Any]]:
+        """Retorna o estado do circuit breaker de cada provedor.
+        
+        Returns:
+            Dicionário provedor -> estado, taxa de falhas, chamadas na janela,
+            vezes em que o circuito abriu e segundos até a próxima sonda.
+        """
+        return {name: self.breakers[name].snapshot() for name in MODEL_SEQUENCE}
+    
+    def _describe_breakers(self) -> str:
+        """Resume o estado dos circuitos em uma linha."""
+        parts = []
+        for name, snapshot in self.get_breaker_states().items():
+            description = f"{name.upper()}: {snapshot['state']}"
+            if snapshot["state"] == CircuitState.OPEN:
+                description += f" (sonda em {snapshot['reopen_in']:.0f}s)"
+            elif snapshot["calls"]:
+                description += f" ({snapshot['failure_rate']:.0%} de falhas)"
+            parts.append(description)
+        return "Circuitos: " + ", ".join(parts)
     
     def get_current_model_info(self) -> str:
-        """Retorna informações sobre o modelo atual."""
-        return f"Modelo atual: {self.current_model.upper()}, Fallbacks usados: {self.fallback_count}/2"
+        """Retorna informações sobre o modelo atual e o estado dos circuitos."""
+        info = f"Modelo atual: {self.current_model.upper()}, Fallbacks: {self.fallback_count}"
+        info += f" | {self._describe_breakers()}"
+        stats = self.get_hedging_stats()
+        if stats is not None:
+            info += (
+                f" | Hedges: {stats['hedged']}/{stats['requests']} ({stats['hedge_rate']:.0%}),"
+                f" vitórias do hedge: {stats['hedge_wins']}"
+            )
+        return info
     
     def reset_fallback(self) -> None:
-        """Reseta o estado de fallback."""
+        """Reseta o estado de fallback e fecha todos os circuitos."""
         self.current_model = "openai"
-        self.fallback_count = 0 
\ No newline at end of file
+        self.fallback_count = 0
+        for breaker in self.breakers.values():
+            breaker.reset()
@@ -0,0 +1,325 @@
+"""Módulo que contém os mecanismos de reconhecimento de fala (ASR) do VoiceInputAdapter.
+
+O reconhecimento do Google exige uma ida e volta pela internet (com o envio
+do áudio) a cada fala e falha sem rede. Os mecanismos locais (Vosk e
+whisper.cpp) reconhecem no próprio computador, com o modelo carregado uma
+única vez.
+
+Além do reconhecimento de uma fala completa (``recognize``), cada mecanismo
+abre uma sessão de streaming (``start_stream``) que recebe o áudio à medida
+que é capturado e devolve transcrições parciais. O Vosk decodifica de fato
+em streaming; os demais acumulam o áudio e só reconhecem no fim.
+"""
+import json
+import os
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+import speech_recognition as sr
+
+try:
+    import vosk
+except ImportError:  # pragma: no cover - dependência opcional
+    vosk = None
+
+# Taxa de amostragem esperada pelos modelos locais
+LOCAL_SAMPLE_RATE = 16000
+
+
+@dataclass
+class Transcript:
+    """Transcrição de uma fala: parcial (ainda em andamento) ou final."""
+    text: str
+    final: bool = False
+
+
+class SpeechStream:
+    """Sessão de reconhecimento em streaming de uma fala."""
+
+    def accept(self, chunk: bytes) -> Optional[str]:
+        """Recebe mais um trecho de áudio (PCM de 16 bits, mono).
+
+        Returns:
+            A transcrição parcial, se ela mudou com este trecho; senão None.
+        """
+        raise NotImplementedError
+
+    def finish(self) -> str:
+        """Encerra a fala e devolve a transcrição final.
+
+        Raises:
+            sr.UnknownValueError: Se a fala não puder ser entendida.
+            sr.RequestError: Se o mecanismo de reconhecimento falhar.
+        """
+        raise NotImplementedError
+
+
+class BufferedSpeechStream(SpeechStream):
+    """Sessão para mecanismos sem streaming: acumula o áudio e reconhece tudo no fim."""
+
+    def __init__(self, recognizer: "SpeechRecognizer", sample_rate: int, sample_width: int, language: str):
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.language = language
+        self._audio = bytearray()
+
+    def accept(self, chunk: bytes) -> Optional[str]:
+        self._audio += chunk
+        return None
+
+    def finish(self) -> str:
+        audio = sr.AudioData(bytes(self._audio), self.sample_rate, self.sample_width)
+        return self.recognizer.recognize(audio, self.language)
+
+
+class SpeechRecognizer:
+    """Interface para mecanismos de reconhecimento de fala."""
+
+    name = "base"
+
+    def start_stream(self, sample_rate: int, sample_width: int, language: str) -> SpeechStream:
+        """Abre uma sessão de reconhecimento em streaming para uma fala.
+
+        A implementação padrão não produz parciais: acumula o áudio e chama
+        recognize no fim.
+
+        Args:
+            sample_rate: Taxa de amostragem do áudio, em Hz.
+            sample_width: Bytes por amostra.
+            language: Idioma da fala (ex.: 'pt-BR').
+        """
+        return BufferedSpeechStream(self, sample_rate, sample_width, language)
+
+    def recognize(self, audio: sr.AudioData, language: str) -> str:
+        """Converte o áudio em texto.
+
+        Args:
+            audio: Áudio capturado do microfone.
+            language: Idioma da fala (ex.: 'pt-BR').
+
+        Returns:
+            O texto reconhecido.
+
+        Raises:
+            sr.UnknownValueError: Se a fala não puder ser entendida.
+            sr.RequestError: Se o mecanismo de reconhecimento falhar.
+        """
+        raise NotImplementedError
+
+
+class GoogleSpeechRecognizer(SpeechRecognizer):
+    """Reconhecimento pela API web do Google (requer internet)."""
+
+    name = "google"
+
+    def __init__(self, recognizer: Optional[sr.Recognizer] = None):
+        """Inicializa o mecanismo.
+
+        Args:
+            recognizer: Reconhecedor do speech_recognition a usar (padrão: um novo).
+        """
+        self.recognizer = recognizer or sr.Recognizer()
+
+    def recognize(self, audio: sr.AudioData, language: str) -> str:
+        return self.recognizer.recognize_google(audio, language=language)
+
+
+class VoskSpeechRecognizer(SpeechRecognizer):
+    """Reconhecimento local com o Vosk (o modelo define o idioma)."""
+
+    name = "vosk"
+
+    def __init__(self, model_path: str):
+        """Carrega o modelo do Vosk.
+
+        Args:
+            model_path: Diretório do modelo (ex.: vosk-model-small-pt-0.3).
+
+        Raises:
+            ImportError: Se o vosk não estiver instalado.
+            FileNotFoundError: Se o modelo não existir.
+        """
+        if vosk is None:
+            raise ImportError("O reconhecimento local com Vosk requer o vosk. Instale com: pip install vosk")
+        if not os.path.isdir(model_path):
+            raise FileNotFoundError(f"Modelo do Vosk não encontrado: {model_path}")
+        vosk.SetLogLevel(-1)
+        self.model = vosk.Model(model_path)
+
+    def recognize(self, audio: sr.AudioData, language: str) -> str:
+        recognizer = vosk.KaldiRecognizer(self.model, LOCAL_SAMPLE_RATE)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=LOCAL_SAMPLE_RATE, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get("text", "").strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+    def start_stream(self, sample_rate: int, sample_width: int, language: str) -> SpeechStream:
+        if sample_width != 2:
+            return super().start_stream(sample_rate, sample_width, language)
+        return _VoskSpeechStream(vosk.KaldiRecognizer(self.model, sample_rate))
+
+
+class _VoskSpeechStream(SpeechStream):
+    """Sessão de streaming do Vosk: segmentos já fechados mais a hipótese parcial atual."""
+
+    def __init__(self, recognizer):
+        self._recognizer = recognizer
+        self._segments: List[str] = []
+        self._last = ""
+
+    def accept(self, chunk: bytes) -> Optional[str]:
+        if self._recognizer.AcceptWaveform(bytes(chunk)):
+            segment = json.loads(self._recognizer.Result()).get("text", "").strip()
+            if segment:
+                self._segments.append(segment)
+            partial = ""
+        else:
+            partial = json.loads(self._recognizer.PartialResult()).get("partial", "").strip()
+        current = " ".join(self._segments + ([partial] if partial else []))
+        if not current or current == self._last:
+            return None
+        self._last = current
+        return current
+
+    def finish(self) -> str:
+        segment = json.loads(self._recognizer.FinalResult()).get("text", "").strip()
+        text = " ".join(self._segments + ([segment] if segment else []))
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class WhisperCppSpeechRecognizer(SpeechRecognizer):
+    """Reconhecimento local com o executável do whisper.cpp."""
+
+    name = "whispercpp"
+
+    def __init__(self, binary: str, model_path: str, threads: int = 4, timeout: float = 30.0):
+        """Inicializa o mecanismo.
+
+        Args:
+            binary: Caminho (ou nome no PATH) do executável do whisper.cpp.
+            model_path: Arquivo do modelo ggml.
+            threads: Threads usadas na transcrição.
+            timeout: Tempo máximo de uma transcrição, em segundos.
+        """
+        self.binary = binary
+        self.model_path = model_path
+        self.threads = threads
+        self.timeout = timeout
+
+    def recognize(self, audio: sr.AudioData, language: str) -> str:
+        wav = audio.get_wav_data(convert_rate=LOCAL_SAMPLE_RATE, convert_width=2)
+        handle, path = tempfile.mkstemp(suffix=".wav")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                file.write(wav)
+            result = subprocess.run(
+                [
+                    self.binary, "-m", self.model_path, "-l", language.split("-")[0],
+                    "-t", str(self.threads), "-nt", "-np", "-f", path
+                ],
+                capture_output=True,
+                timeout=self.timeout
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise sr.RequestError(f"Erro ao executar o whisper.cpp: {str(e)}")
+        finally:
+            os.unlink(path)
+
+        if result.returncode != 0:
+            stderr = result.stderr.decode("utf-8", "replace").strip()
+            raise sr.RequestError(f"O whisper.cpp terminou com código {result.returncode}: {stderr}")
+        text = " ".join(result.stdout.decode("utf-8", "replace").split())
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class ScriptedSpeechRecognizer(SpeechRecognizer):
+    """Mecanismo determinístico que devolve textos pré-definidos, em ordem (para testes e demonstrações).
+
+    Em streaming, revela uma palavra a cada ``seconds_per_word`` de áudio recebido.
+    """
+
+    name = "fake"
+
+    def __init__(self, transcripts: Iterable[str] = (), seconds_per_word: float = 0.25):
+        """Inicializa o mecanismo.
+
+        Args:
+            transcripts: Textos devolvidos, um por fala; texto vazio ou fim da
+                lista equivalem a fala não entendida.
+            seconds_per_word: Áudio necessário para revelar cada palavra da parcial.
+        """
+        self._transcripts = iter(list(transcripts))
+        self.seconds_per_word = seconds_per_word
+
+    def recognize(self, audio: sr.AudioData, language: str) -> str:
+        text = next(self._transcripts, "")
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+    def start_stream(self, sample_rate: int, sample_width: int, language: str) -> SpeechStream:
+        bytes_per_word = max(1, int(self.seconds_per_word * sample_rate) * sample_width)
+        return _ScriptedSpeechStream(next(self._transcripts, ""), bytes_per_word)
+
+
+class _ScriptedSpeechStream(SpeechStream):
+    """Sessão do mecanismo falso: a parcial cresce uma palavra a cada bytes_per_word."""
+
+    def __init__(self, text: str, bytes_per_word: int):
+        self._text = text
+        self._words = text.split()
+        self._bytes_per_word = bytes_per_word
+        self._received = 0
+        self._revealed = 0
+
+    def accept(self, chunk: bytes) -> Optional[str]:
+        self._received += len(chunk)
+        revealed = min(len(self._words), self._received // self._bytes_per_word)
+        if revealed == self._revealed:
+            return None
+        self._revealed = revealed
+        return " ".join(self._words[:revealed])
+
+    def finish(self) -> str:
+        if not self._text:
+            raise sr.UnknownValueError()
+        return self._text
+
+
+def create_speech_recognizer(
+    kind: str = "google",
+    vosk_model_path: str = "",
+    whispercpp_binary: str = "whisper-cli",
+    whispercpp_model: str = ""
+) -> SpeechRecognizer:
+    """Cria o mecanismo de reconhecimento de fala configurado.
+
+    Args:
+        kind: "google", "vosk", "whispercpp" ou "fake".
+        vosk_model_path: Diretório do modelo do Vosk.
+        whispercpp_binary: Executável do whisper.cpp.
+        whispercpp_model: Arquivo do modelo do whisper.cpp.
+
+    Returns:
+        O mecanismo de reconhecimento.
+
+    Raises:
+        ValueError: Se o tipo não for conhecido.
+    """
+    if kind == "google":
+        return GoogleSpeechRecognizer()
+    if kind == "vosk":
+        return VoskSpeechRecognizer(vosk_model_path)
+    if kind == "whispercpp":
+        return WhisperCppSpeechRecognizer(whispercpp_binary, whispercpp_model)
+    if kind == "fake":
+        return ScriptedSpeechRecognizer()
+    raise ValueError(f"Mecanismo de reconhecimento de fala desconhecido: {kind}")
@@ -0,0 +1,49 @@
+"""Módulo que contém o contador de tokens exato baseado no tiktoken."""
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - dependência opcional
+    tiktoken = None
+
+from ...domain.services.context_window import ApproximateTokenizer, Tokenizer
+
+
+class TiktokenTokenizer(Tokenizer):
+    """Contador de tokens exato para modelos OpenAI/DeepSeek, via tiktoken."""
+
+    def __init__(self, encoding_name: str = "cl100k_base"):
+        """Inicializa o contador.
+
+        Args:
+            encoding_name: Nome da codificação BPE do tiktoken.
+
+        Raises:
+            ImportError: Se o tiktoken não estiver instalado.
+        """
+        if tiktoken is None:
+            raise ImportError("O contador exato de tokens requer o tiktoken. Instale com: pip install tiktoken")
+        self.encoding = tiktoken.get_encoding(encoding_name)
+
+    def count(self, text: str) -> int:
+        """Conta os tokens de um texto."""
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+
+def create_tokenizer(kind: str = "auto") -> Tokenizer:
+    """Cria o contador de tokens configurado.
+
+    Args:
+        kind: "tiktoken" (exato), "approx" (aproximado) ou "auto" (tiktoken se
+            estiver instalado e a codificação puder ser carregada).
+
+    Returns:
+        O contador de tokens.
+    """
+    if kind == "approx":
+        return ApproximateTokenizer()
+    if kind == "tiktoken":
+        return TiktokenTokenizer()
+    try:
+        return TiktokenTokenizer()
+    except Exception:
+        # Sem o pacote ou sem acesso aos arquivos da codificação
+        return ApproximateTokenizer()
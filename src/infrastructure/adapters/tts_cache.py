@@ -0,0 +1,185 @@
+"""Módulo que contém o cache em disco do áudio sintetizado (TTS).
+
+Frases fixas (boas-vindas, despedida, mensagens de erro) e respostas que se
+repetem são sintetizadas uma única vez para um arquivo WAV; as próximas
+vezes, o arquivo é tocado direto, sem esperar a síntese. Cada arquivo é
+endereçado pelo hash de (texto, voz, velocidade, volume), de modo que mudar a
+voz ou a velocidade não reaproveita um áudio antigo. O tamanho total no disco
+é limitado, descartando os arquivos usados há mais tempo.
+"""
+import hashlib
+import json
+import os
+import threading
+import wave
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+try:
+    import pyaudio
+except ImportError:  # pragma: no cover - dependência opcional
+    pyaudio = None
+
+AUDIO_SUFFIX = ".wav"
+
+
+def make_speech_key(text: str, voice: Any, rate: Any, volume: Any) -> str:
+    """Gera a chave do áudio a partir do texto e dos parâmetros da voz.
+
+    Returns:
+        Hash SHA-256 em hexadecimal.
+    """
+    payload = json.dumps([text, voice, rate, volume], ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SpeechAudioCache:
+    """Cache de arquivos de áudio endereçados por conteúdo, com limite de tamanho (LRU)."""
+
+    def __init__(self, directory: str, max_bytes: int = 50 * 1024 * 1024):
+        """Inicializa o cache, indexando os arquivos já existentes no diretório.
+
+        Args:
+            directory: Diretório dos arquivos de áudio.
+            max_bytes: Tamanho máximo ocupado no disco.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        os.makedirs(directory, exist_ok=True)
+
+        # Os usados há mais tempo primeiro (pela data de modificação)
+        found = []
+        for name in os.listdir(directory):
+            if name.endswith(AUDIO_SUFFIX):
+                stat = os.stat(os.path.join(directory, name))
+                found.append((stat.st_mtime, name[:-len(AUDIO_SUFFIX)], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        with self._lock:
+            self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def path_for(self, key: str) -> str:
+        """Caminho do arquivo de áudio da chave."""
+        return os.path.join(self.directory, key + AUDIO_SUFFIX)
+
+    def get(self, key: str) -> Optional[str]:
+        """Retorna o caminho do áudio da chave, ou None se não estiver no cache."""
+        path = self.path_for(key)
+        with self._lock:
+            if key not in self._entries:
+                return None
+            if not os.path.exists(path):
+                self._total_bytes -= self._entries.pop(key)
+                return None
+            self._entries.move_to_end(key)
+        try:
+            # Marca o uso no disco, para a ordem de descarte sobreviver a reinícios
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def put(self, key: str, render: Callable[[str], None]) -> Optional[str]:
+        """Gera o áudio da chave com render e o guarda no cache.
+
+        O arquivo é gravado com outro nome e só então renomeado, de modo que
+        um áudio incompleto nunca é tocado.
+
+        Args:
+            key: Chave do áudio (ver make_speech_key).
+            render: Função que grava o áudio no caminho recebido.
+
+        Returns:
+            O caminho do áudio, ou None se nada foi gerado.
+        """
+        path = self.path_for(key)
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            render(temporary)
+            size = os.path.getsize(temporary) if os.path.exists(temporary) else 0
+            if not size:
+                return None
+            os.replace(temporary, path)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict()
+            return path if key in self._entries else None
+
+    def _evict(self) -> None:
+        """Descarta os arquivos usados há mais tempo até caber no limite (chamado com a trava)."""
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self.path_for(key))
+            except OSError:
+                pass
+
+
+class WavPlayer:
+    """Toca arquivos WAV na saída de áudio padrão, reaproveitando uma única instância do PyAudio.
+
+    Iniciar o PortAudio leva dezenas a centenas de milissegundos; ele é
+    iniciado no primeiro uso e mantido até close, e cada reprodução abre só
+    um stream. Deve ser usado por uma única thread (ex.: a do SpeechWorker).
+    """
+
+    def __init__(self, chunk_frames: int = 1024):
+        """Inicializa o reprodutor (o PyAudio só é iniciado na primeira reprodução).
+
+        Args:
+            chunk_frames: Quadros escritos por vez na saída de áudio.
+        """
+        self.chunk_frames = chunk_frames
+        self._audio: Optional["pyaudio.PyAudio"] = None
+
+    def play(self, path: str, stop: Optional[threading.Event] = None) -> None:
+        """Toca o arquivo (bloqueia até o fim ou até stop ser sinalizado).
+
+        Raises:
+            ImportError: Se o PyAudio não estiver instalado.
+            wave.Error: Se o arquivo não for um WAV válido.
+        """
+        if pyaudio is None:
+            raise ImportError("A reprodução do áudio em cache requer o PyAudio. Instale com: pip install pyaudio")
+        with wave.open(path, "rb") as source:
+            if self._audio is None:
+                self._audio = pyaudio.PyAudio()
+            stream = self._audio.open(
+                format=self._audio.get_format_from_width(source.getsampwidth()),
+                channels=source.getnchannels(),
+                rate=source.getframerate(),
+                output=True
+            )
+            try:
+                data = source.readframes(self.chunk_frames)
+                while data and not (stop is not None and stop.is_set()):
+                    stream.write(data)
+                    data = source.readframes(self.chunk_frames)
+            finally:
+                stream.stop_stream()
+                stream.close()
+
+    def close(self) -> None:
+        """Encerra o PyAudio, se tiver sido iniciado."""
+        if self._audio is not None:
+            self._audio.terminate()
+            self._audio = None
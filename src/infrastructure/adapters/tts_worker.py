@@ -0,0 +1,184 @@
+"""Módulo que contém a thread dedicada à síntese de fala (TTS).
+
+O motor do pyttsx3 bloqueia quem chama ``runAndWait`` até o fim do áudio e
+não pode ser usado por duas threads ao mesmo tempo. O SpeechWorker cria o
+motor na sua própria thread e executa ali, um por vez, os trabalhos
+recebidos (falar, tocar um áudio do cache, gravar em arquivo), na ordem de
+prioridade: mensagens de erro e confirmações de interrupção passam na frente
+do texto normal, que passa na frente da pré-renderização do cache. Cada
+trabalho devolve um Future, de modo que a interface pode preparar o próximo
+turno enquanto o áudio ainda toca.
+"""
+import itertools
+import queue
+import threading
+from concurrent.futures import Future
+from enum import IntEnum
+from typing import Any, Callable, Optional
+
+
+class SpeechPriority(IntEnum):
+    """Prioridade de um trabalho de síntese (menor passa na frente)."""
+    URGENT = 0
+    NORMAL = 10
+    BACKGROUND = 20
+
+
+class SpeechWorker:
+    """Thread dona do motor de síntese, com fila de prioridade e Futures de conclusão."""
+
+    def __init__(self, engine_factory: Callable[[], Any], name: str = "tts-worker"):
+        """Cria o motor na thread do worker e aguarda que ele esteja pronto.
+
+        Args:
+            engine_factory: Função que cria o motor (ex.: pyttsx3.init).
+            name: Nome da thread.
+
+        Raises:
+            Exception: O erro da criação do motor, se houver.
+        """
+        self.engine: Any = None
+        # Sinaliza ao trabalho em andamento que ele deve parar (ex.: reprodução do cache)
+        self.interrupted = threading.Event()
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._idle = threading.Condition()
+        self._pending = 0
+        self._current_priority: Optional[int] = None
+        self._closed = False
+
+        ready = threading.Event()
+        startup_error = []
+
+        def run() -> None:
+            try:
+                self.engine = engine_factory()
+            except Exception as e:
+                startup_error.append(e)
+                return
+            finally:
+                ready.set()
+            self._loop()
+
+        self._thread = threading.Thread(target=run, name=name, daemon=True)
+        self._thread.start()
+        ready.wait()
+        if startup_error:
+            raise startup_error[0]
+
+    def submit(
+        self,
+        job: Callable[[Any], Any],
+        priority: int = SpeechPriority.NORMAL,
+        preempt: bool = False
+    ) -> Future:
+        """Agenda um trabalho que recebe o motor.
+
+        Args:
+            job: Função executada na thread do worker com o motor como argumento.
+            priority: Prioridade (ver SpeechPriority).
+            preempt: Se True, interrompe o trabalho em andamento caso ele tenha prioridade menor.
+
+        Returns:
+            Future com o resultado do trabalho.
+
+        Raises:
+            RuntimeError: Se o worker já foi encerrado.
+        """
+        future: Future = Future()
+        with self._idle:
+            if self._closed:
+                raise RuntimeError("O worker de síntese de fala foi encerrado")
+            self._pending += 1
+            self._queue.put((int(priority), next(self._sequence), future, job))
+            # Decide e interrompe com a trava: o trabalho em andamento não pode
+            # terminar nem dar lugar ao próximo (inclusive a este) no meio do caminho
+            current = self._current_priority
+            if preempt and current is not None and current > priority:
+                self._interrupt()
+        return future
+
+    def call(self, job: Callable[[Any], Any], priority: int = SpeechPriority.URGENT) -> Any:
+        """Executa um trabalho e aguarda o resultado (ex.: ler ou alterar uma propriedade do motor)."""
+        if threading.current_thread() is self._thread:
+            return job(self.engine)
+        return self.submit(job, priority).result()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda até a fila esvaziar e o trabalho em andamento terminar.
+
+        Returns:
+            True se ficou ocioso; False em caso de timeout.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def cancel(self, interrupt: bool = True) -> int:
+        """Descarta os trabalhos na fila e, opcionalmente, interrompe o que está em andamento.
+
+        Returns:
+            Quantos trabalhos da fila foram cancelados.
+        """
+        cancelled = 0
+        while True:
+            try:
+                _, _, future, job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                # Mantém o pedido de encerramento
+                self._queue.put((int(SpeechPriority.BACKGROUND) + 1, next(self._sequence), future, job))
+                break
+            future.cancel()
+            cancelled += 1
+            self._done()
+        if interrupt:
+            with self._idle:
+                if self._current_priority is not None:
+                    self._interrupt()
+        return cancelled
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Cancela os trabalhos pendentes e encerra a thread."""
+        with self._idle:
+            if self._closed:
+                return
+            self._closed = True
+        self.cancel()
+        self._queue.put((int(SpeechPriority.BACKGROUND) + 1, next(self._sequence), None, None))
+        self._thread.join(timeout)
+
+    def _loop(self) -> None:
+        """Laço da thread: executa os trabalhos em ordem de prioridade."""
+        while True:
+            priority, _, future, job = self._queue.get()
+            if job is None:
+                return
+            if not future.set_running_or_notify_cancel():
+                self._done()
+                continue
+            with self._idle:
+                self._current_priority = priority
+                self.interrupted.clear()
+            try:
+                future.set_result(job(self.engine))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._idle:
+                    self._current_priority = None
+                self._done()
+
+    def _interrupt(self) -> None:
+        """Interrompe o trabalho em andamento (fala do motor ou reprodução do cache; com _idle adquirido)."""
+        self.interrupted.set()
+        try:
+            self.engine.stop()
+        except Exception:
+            pass
+
+    def _done(self) -> None:
+        with self._idle:
+            self._pending -= 1
+            if self._pending == 0:
+                self._idle.notify_all()
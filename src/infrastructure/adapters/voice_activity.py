@@ -0,0 +1,228 @@
+"""Módulo que contém a detecção de atividade de voz (VAD) e o fim de fala.
+
+O áudio bruto do microfone (PCM de 16 bits) é dividido em quadros curtos e,
+para todos os quadros de um trecho de uma só vez, são calculadas com NumPy a
+energia, a taxa de cruzamentos por zero e a planura espectral. Um quadro é
+considerado fala quando a energia está acima do ruído de fundo (estimado
+continuamente) e o quadro é sonoro: espectro que não é plano como o de um
+chiado ou poucos cruzamentos por zero. Consoantes surdas no meio da fala
+contam como silêncio ambíguo e não encerram a fala sozinhas.
+
+O fim da fala é decidido por evidência acumulada: cada quadro de silêncio
+claro (energia perto do ruído de fundo) conta em dobro, cada quadro ambíguo
+conta uma vez, e a fala termina quando a evidência cobre o tempo de espera
+(``hangover_ms``). Assim, num ambiente silencioso o fim é reportado na metade
+do tempo, e uma pausa curta entre palavras não encerra a fala.
+"""
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependência opcional
+    np = None
+
+# Piso absoluto de energia (dBFS) abaixo do qual nenhum quadro é fala
+MIN_SPEECH_DB = -55.0
+
+# Teto da estimativa inicial do ruído de fundo (dBFS), para o caso de a fala
+# começar já no primeiro trecho
+MAX_INITIAL_NOISE_DB = -45.0
+
+
+def vad_available() -> bool:
+    """Indica se a detecção de atividade de voz pode ser usada (NumPy instalado)."""
+    return np is not None
+
+
+def _require_numpy() -> None:
+    """Garante que o NumPy está instalado."""
+    if np is None:
+        raise ImportError('A detecção de atividade de voz requer o NumPy. Instale com: pip install -e ".[voice]"')
+
+
+def frame_features(frames: "np.ndarray", window: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Calcula as características de vários quadros de uma vez.
+
+    Args:
+        frames: Matriz (quadros x amostras) com amostras em [-1, 1].
+        window: Janela aplicada antes da FFT (mesmo tamanho do quadro).
+
+    Returns:
+        Tupla (energia em dBFS, taxa de cruzamentos por zero, planura espectral),
+        cada uma com um valor por quadro.
+    """
+    power = np.mean(frames * frames, axis=1)
+    energy_db = 10.0 * np.log10(power + 1e-10)
+    signs = np.signbit(frames)
+    zero_crossings = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frames.shape[1] - 1)
+    spectrum = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2 + 1e-12
+    flatness = np.exp(np.mean(np.log(spectrum), axis=1)) / np.mean(spectrum, axis=1)
+    return energy_db, zero_crossings, flatness
+
+
+class SpeechEndpointer:
+    """Detecta o início e o fim de uma fala em áudio PCM de 16 bits entregue aos trechos.
+
+    Uso::
+
+        endpointer = SpeechEndpointer(16000)
+        while not endpointer.feed(stream.read(1024)):
+            pass
+        audio = endpointer.audio()
+
+    O áudio devolvido começa ``preroll_ms`` antes do início detectado (o
+    silêncio anterior é descartado) e termina ``tail_ms`` depois do último
+    quadro de fala.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        frame_ms: int = 20,
+        hangover_ms: int = 600,
+        onset_ms: int = 60,
+        preroll_ms: int = 200,
+        tail_ms: int = 100,
+        margin_db: float = 9.0,
+        flatness_max: float = 0.5,
+        noise_db: Optional[float] = None,
+        no_speech_timeout: float = 5.0,
+        max_speech: float = 15.0
+    ):
+        """Inicializa o detector.
+
+        Args:
+            sample_rate: Taxa de amostragem do áudio, em Hz.
+            frame_ms: Duração de cada quadro analisado.
+            hangover_ms: Espera máxima após a fala (silêncio ambíguo) antes de reportar o fim.
+            onset_ms: Fala contínua necessária para considerar que a fala começou.
+            preroll_ms: Áudio mantido antes do início detectado (para não cortar a primeira sílaba).
+            tail_ms: Áudio mantido depois do último quadro de fala.
+            margin_db: Quanto a energia precisa superar o ruído de fundo para ser fala.
+            flatness_max: Planura espectral máxima de um quadro de fala (ruído branco tende a 1).
+            noise_db: Ruído de fundo inicial (ex.: o estimado na fala anterior); se None, usa os primeiros quadros.
+            no_speech_timeout: Segundos sem fala até desistir.
+            max_speech: Duração máxima de uma fala, em segundos.
+        """
+        _require_numpy()
+        self.sample_rate = sample_rate
+        self.frame_samples = max(1, sample_rate * frame_ms // 1000)
+        self.margin_db = margin_db
+        self.flatness_max = flatness_max
+        self.noise_db = noise_db
+        self.speech_detected = False
+        self.timed_out = False
+        self.done = False
+
+        frames_per_ms = 1.0 / frame_ms
+        self._frame_bytes = self.frame_samples * 2
+        self._window = np.hanning(self.frame_samples).astype(np.float32)
+        self._hangover = max(1, round(hangover_ms * frames_per_ms))
+        self._onset_frames = max(1, round(onset_ms * frames_per_ms))
+        self._tail_bytes = round(tail_ms * frames_per_ms) * self._frame_bytes
+        self._no_speech_frames = round(no_speech_timeout * 1000 * frames_per_ms)
+        self._max_speech_frames = round(max_speech * 1000 * frames_per_ms)
+
+        self._pending = bytearray()
+        self._preroll: Deque[bytes] = deque(maxlen=max(self._onset_frames, round(preroll_ms * frames_per_ms)))
+        self._audio = bytearray()
+        self._frames_seen = 0
+        self._onset = 0
+        self._speech_frames = 0
+        self._silence = 0
+        self._speech_end = 0
+        self._drained = 0
+
+    def feed(self, chunk: bytes) -> bool:
+        """Analisa mais um trecho de áudio.
+
+        Args:
+            chunk: Amostras PCM de 16 bits, little-endian, mono.
+
+        Returns:
+            True quando a fala terminou (ou não houve fala até o limite de espera).
+        """
+        if self.done:
+            return True
+        self._pending += chunk
+        usable = len(self._pending) - len(self._pending) % self._frame_bytes
+        if not usable:
+            return False
+        data = bytes(self._pending[:usable])
+        del self._pending[:usable]
+
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+        frames = samples.reshape(-1, self.frame_samples)
+        energy_db, zero_crossings, flatness = frame_features(frames, self._window)
+        if self.noise_db is None:
+            self.noise_db = min(float(np.min(energy_db)), MAX_INITIAL_NOISE_DB)
+
+        # Classificação vetorizada, com o ruído de fundo do início do trecho
+        loud = (energy_db > self.noise_db + self.margin_db) & (energy_db > MIN_SPEECH_DB)
+        voiced = (flatness < self.flatness_max) | (zero_crossings < 0.25)
+        speech = loud & voiced
+        clear_silence = energy_db < self.noise_db + self.margin_db / 2
+
+        frame_bytes = self._frame_bytes
+        for index in range(len(frames)):
+            frame = data[index * frame_bytes:(index + 1) * frame_bytes]
+            if self._step(frame, bool(speech[index]), bool(clear_silence[index])):
+                self.done = True
+                break
+
+        self._update_noise(energy_db[~speech])
+        return self.done
+
+    def audio(self) -> bytes:
+        """Áudio da fala detectada (vazio se não houve fala)."""
+        return bytes(self._audio)
+
+    def drain(self) -> bytes:
+        """Áudio da fala acumulado desde a última chamada (para reconhecimento em streaming).
+
+        O trecho de silêncio depois da fala já entregue não é removido; no fim,
+        o reconhecedor recebe no máximo o tempo de espera a mais.
+        """
+        data = bytes(self._audio[self._drained:])
+        self._drained = max(self._drained, len(self._audio))
+        return data
+
+    def _step(self, frame: bytes, speech: bool, clear_silence: bool) -> bool:
+        """Avança a máquina de estados com um quadro; True quando a fala terminou."""
+        self._frames_seen += 1
+        if not self.speech_detected:
+            self._preroll.append(frame)
+            self._onset = self._onset + 1 if speech else 0
+            if self._onset >= self._onset_frames:
+                self.speech_detected = True
+                self._audio.extend(b"".join(self._preroll))
+                self._preroll.clear()
+                self._speech_frames = self._onset
+                self._speech_end = len(self._audio)
+            elif self._frames_seen >= self._no_speech_frames:
+                self.timed_out = True
+                return True
+            return False
+
+        self._audio.extend(frame)
+        self._speech_frames += 1
+        if speech:
+            self._silence = 0
+            self._speech_end = len(self._audio)
+        else:
+            self._silence += 2 if clear_silence else 1
+        if self._silence >= self._hangover or self._speech_frames >= self._max_speech_frames:
+            del self._audio[self._speech_end + self._tail_bytes:]
+            return True
+        return False
+
+    def _update_noise(self, silence_db: "np.ndarray") -> None:
+        """Acompanha o ruído de fundo: desce rápido, sobe devagar."""
+        if not len(silence_db):
+            return
+        level = float(np.mean(silence_db))
+        if level < self.noise_db:
+            self.noise_db = level
+        else:
+            self.noise_db += 0.05 * (level - self.noise_db)
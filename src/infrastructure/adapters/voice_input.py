@@ -1,6 +1,11 @@
 """Módulo que contém o adaptador para entrada de voz."""
 import speech_recognition as sr
-from typing import Optional, Tuple
+from typing import Iterator, Optional, Tuple, Union
+
+from ..metrics.instruments import ASR_DURATION, ASR_RESULTS
+from .audio_capture import CapturedAudioSource, MicrophoneCapture
+from .speech_recognizer import GoogleSpeechRecognizer, SpeechRecognizer, SpeechStream, Transcript
+from .voice_activity import SpeechEndpointer, vad_available
 
 
 class VoiceInputError(Exception):
@@ -11,25 +16,60 @@ class VoiceInputError(Exception):
 class VoiceInputAdapter:
     """Adaptador para captura de áudio do microfone e reconhecimento de fala."""
     
-    def __init__(self, language: str = 'pt-BR', energy_threshold: int = 300, pause_threshold: float = 0.8):
+    def __init__(
+        self,
+        language: str = 'pt-BR',
+        energy_threshold: int = 300,
+        pause_threshold: float = 0.8,
+        endpointer: str = "energy",
+        vad_hangover_ms: int = 600,
+        speech_recognizer: Optional[SpeechRecognizer] = None,
+        persistent_capture: bool = False,
+        capture_preroll: float = 0.3,
+        capture_buffer_seconds: float = 10.0
+    ):
         """Inicializa o adaptador de entrada de voz.
         
         Args:
             language: Idioma para reconhecimento de fala (padrão: 'pt-BR').
             energy_threshold: Limiar de energia para detecção de fala.
             pause_threshold: Tempo de pausa (em segundos) para considerar o fim da fala.
+            endpointer: Como detectar o fim da fala: "energy" (limiar de energia e
+                pause_threshold do speech_recognition) ou "vad" (SpeechEndpointer;
+                sem o NumPy instalado, usa "energy" com um aviso).
+            vad_hangover_ms: Espera máxima após a fala no modo "vad".
+            speech_recognizer: Mecanismo que converte o áudio em texto (padrão: Google).
+            persistent_capture: Se True, mantém o microfone aberto numa thread de captura,
+                de modo que cada escuta começa na hora (ver MicrophoneCapture).
+            capture_preroll: Segundos de áudio anteriores ao início da escuta incluídos
+                na captura contínua (para não cortar a primeira sílaba).
+            capture_buffer_seconds: Duração do buffer circular da captura contínua.
         """
         self.recognizer = sr.Recognizer()
         self.microphone = sr.Microphone()
         self.language = language
+        if endpointer == "vad" and not vad_available():
+            print("⚠️  O detector de voz (vad) requer o NumPy. Usando o detector por energia.")
+            endpointer = "energy"
+        self.endpointer = endpointer
+        self.vad_hangover_ms = vad_hangover_ms
+        self.speech_recognizer = speech_recognizer or GoogleSpeechRecognizer(self.recognizer)
+        # Ruído de fundo estimado na última fala (modo "vad")
+        self._noise_db: Optional[float] = None
         
         # Configura os parâmetros do reconhecedor
         self.recognizer.energy_threshold = energy_threshold
         self.recognizer.pause_threshold = pause_threshold
         
-        # Ajusta para o ruído ambiente
+        # Ajusta para o ruído ambiente (uma única vez)
         with self.microphone as source:
             self.recognizer.adjust_for_ambient_noise(source)
+
+        self.capture_preroll = capture_preroll
+        self.capture: Optional[MicrophoneCapture] = None
+        if persistent_capture:
+            self.capture = MicrophoneCapture(self.microphone, buffer_seconds=capture_buffer_seconds)
+            self.capture.start()
     
     def listen(self) -> Tuple[bool, str]:
         """Ouve o áudio do microfone e converte para texto.
@@ -39,19 +79,31 @@ class VoiceInputAdapter:
             Em caso de falha, o texto contém a mensagem de erro.
         """
         try:
-            with self.microphone as source:
+            with self._audio_source() as source:
                 print("\nOuvindo... (fale agora)")
-                audio = self.recognizer.listen(source)
+                if self.endpointer == "vad":
+                    audio = self._listen_vad(source)
+                else:
+                    audio = self.recognizer.listen(source)
                 
             print("Processando áudio...")
-            text = self.recognizer.recognize_google(audio, language=self.language)
+            backend = self.speech_recognizer.name
+            with ASR_DURATION.labels(backend).time():
+                text = self.speech_recognizer.recognize(audio, self.language)
+            ASR_RESULTS.labels(backend, "ok").inc()
             print(f"Você disse: {text}")
             return True, text
             
         except sr.UnknownValueError:
+            ASR_RESULTS.labels(self.speech_recognizer.name, "unknown").inc()
             return False, "Não foi possível entender o áudio"
             
+        except sr.WaitTimeoutError:
+            ASR_RESULTS.labels(self.speech_recognizer.name, "no_speech").inc()
+            return False, "Nenhuma fala detectada"
+            
         except sr.RequestError as e:
+            ASR_RESULTS.labels(self.speech_recognizer.name, "error").inc()
             error_msg = f"Erro ao acessar o serviço de reconhecimento de fala: {e}"
             print(error_msg)
             return False, error_msg
@@ -60,3 +112,112 @@ class VoiceInputAdapter:
             error_msg = f"Erro inesperado ao processar áudio: {str(e)}"
             print(error_msg)
             return False, error_msg
+
+    def listen_stream(self) -> Iterator[Transcript]:
+        """Ouve o microfone e produz transcrições parciais enquanto a pessoa ainda fala.
+
+        Com o detector "vad", o áudio de fala é entregue ao mecanismo de
+        reconhecimento à medida que é capturado, e cada mudança da transcrição
+        parcial é produzida na hora (o Vosk produz parciais; mecanismos sem
+        streaming produzem só a final). Com o detector "energy", só a
+        transcrição final é produzida.
+
+        Yields:
+            Transcrições parciais (final=False) e, por último, a final (final=True).
+
+        Raises:
+            VoiceInputError: Se não houver fala, ela não for entendida ou o reconhecimento falhar.
+        """
+        backend = self.speech_recognizer.name
+        try:
+            with self._audio_source() as source:
+                print("\nOuvindo... (fale agora)")
+                stream = self.speech_recognizer.start_stream(source.SAMPLE_RATE, source.SAMPLE_WIDTH, self.language)
+                if self.endpointer == "vad":
+                    for partial in self._stream_vad(source, stream):
+                        yield Transcript(partial)
+                else:
+                    stream.accept(self.recognizer.listen(source).get_raw_data())
+
+            with ASR_DURATION.labels(backend).time():
+                text = stream.finish()
+        except sr.UnknownValueError:
+            ASR_RESULTS.labels(backend, "unknown").inc()
+            raise VoiceInputError("Não foi possível entender o áudio")
+        except sr.WaitTimeoutError:
+            ASR_RESULTS.labels(backend, "no_speech").inc()
+            raise VoiceInputError("Nenhuma fala detectada")
+        except sr.RequestError as e:
+            ASR_RESULTS.labels(backend, "error").inc()
+            raise VoiceInputError(f"Erro ao acessar o serviço de reconhecimento de fala: {e}")
+        except VoiceInputError:
+            raise
+        except Exception as e:
+            raise VoiceInputError(f"Erro inesperado ao processar áudio: {str(e)}")
+
+        ASR_RESULTS.labels(backend, "ok").inc()
+        yield Transcript(text, final=True)
+
+    def close(self) -> None:
+        """Encerra a captura contínua do microfone, se estiver ativa."""
+        if self.capture is not None:
+            self.capture.stop()
+
+    def _audio_source(self) -> Union[sr.Microphone, CapturedAudioSource]:
+        """Fonte da próxima escuta: a captura contínua (reaberta se tiver parado) ou o microfone."""
+        if self.capture is None:
+            return self.microphone
+        if not self.capture.running:
+            self.capture.start()
+        return self.capture.source(self.capture_preroll)
+
+    def _listen_vad(self, source: Union[sr.Microphone, CapturedAudioSource]) -> "sr.AudioData":
+        """Captura uma fala lendo o microfone diretamente e detectando o fim com SpeechEndpointer.
+
+        Raises:
+            sr.WaitTimeoutError: Se nenhuma fala for detectada.
+        """
+        endpointer = SpeechEndpointer(
+            source.SAMPLE_RATE,
+            hangover_ms=self.vad_hangover_ms,
+            noise_db=self._noise_db
+        )
+        # Na captura contínua, os trechos chegam como memoryviews do buffer, sem cópia
+        read = source.stream.read_view if isinstance(source, CapturedAudioSource) else source.stream.read
+        while not endpointer.feed(read(source.CHUNK)):
+            pass
+        self._noise_db = endpointer.noise_db
+        if not endpointer.speech_detected:
+            raise sr.WaitTimeoutError("Nenhuma fala detectada")
+        return sr.AudioData(endpointer.audio(), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
+    def _stream_vad(
+        self,
+        source: Union[sr.Microphone, CapturedAudioSource],
+        stream: SpeechStream
+    ) -> Iterator[str]:
+        """Entrega a fala ao reconhecimento em streaming enquanto o SpeechEndpointer não detecta o fim.
+
+        Yields:
+            As transcrições parciais, quando mudam.
+
+        Raises:
+            sr.WaitTimeoutError: Se nenhuma fala for detectada.
+        """
+        endpointer = SpeechEndpointer(
+            source.SAMPLE_RATE,
+            hangover_ms=self.vad_hangover_ms,
+            noise_db=self._noise_db
+        )
+        read = source.stream.read_view if isinstance(source, CapturedAudioSource) else source.stream.read
+        done = False
+        while not done:
+            done = endpointer.feed(read(source.CHUNK))
+            speech = endpointer.drain()
+            if speech:
+                partial = stream.accept(speech)
+                if partial:
+                    yield partial
+        self._noise_db = endpointer.noise_db
+        if not endpointer.speech_detected:
+            raise sr.WaitTimeoutError("Nenhuma fala detectada")
@@ -1,6 +1,14 @@
 """Módulo que contém o adaptador para saída de voz."""
+import functools
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Iterable, Optional, List, Dict, Any
+
 import pyttsx3
-from typing import Optional, List, Dict, Any
+
+from ..metrics.instruments import CACHE_LOOKUPS, TTS_DURATION
+from .tts_cache import SpeechAudioCache, WavPlayer, make_speech_key
+from .tts_worker import SpeechPriority, SpeechWorker
 
 
 class VoiceOutputError(Exception):
@@ -9,38 +17,70 @@ class VoiceOutputError(Exception):
 
 
 class VoiceOutputAdapter:
-    """Adaptador para síntese de fala."""
+    """Adaptador para síntese de fala.
+    
+    O motor do pyttsx3 pertence a uma thread dedicada (SpeechWorker): speak
+    continua bloqueando até o fim da fala, enquanto speak_async apenas agenda
+    a fala e devolve um Future, liberando quem chamou para preparar o próximo
+    turno enquanto o áudio toca.
+    """
     
-    def __init__(self, rate: int = 150, volume: float = 0.9, voice_id: Optional[str] = None):
+    def __init__(
+        self,
+        rate: int = 150,
+        volume: float = 0.9,
+        voice_id: Optional[str] = None,
+        audio_cache: Optional[SpeechAudioCache] = None,
+        player: Optional[Callable[[str], None]] = None,
+        max_cached_chars: int = 300
+    ):
         """Inicializa o adaptador de saída de voz.
         
         Args:
             rate: Velocidade de fala em palavras por minuto.
             volume: Volume da fala (0.0 a 1.0).
             voice_id: ID da voz a ser utilizada. Se None, usa a voz padrão do sistema.
+            audio_cache: Cache do áudio sintetizado. Frases pré-renderizadas (prerender)
+                e as que se repetem são tocadas do cache, sem esperar a síntese.
+            player: Função que toca um arquivo de áudio do cache (bloqueante; padrão: um WavPlayer
+                com o PyAudio iniciado uma única vez).
+            max_cached_chars: Tamanho máximo de um texto guardado no cache por repetição.
         """
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', rate)
-        self.engine.setProperty('volume', volume)
+        self.audio_cache = audio_cache
+        self.max_cached_chars = max_cached_chars
+        # Textos já falados uma vez (o segundo uso vai para o cache)
+        self._spoken: "OrderedDict[str, None]" = OrderedDict()
+        self.worker = SpeechWorker(pyttsx3.init)
+        self.engine = self.worker.engine
+        self._wav_player = WavPlayer()
+        self.player = player or functools.partial(self._wav_player.play, stop=self.worker.interrupted)
         
-        # Configura a voz, se especificada
-        if voice_id:
-            self.set_voice(voice_id)
-        else:
-            # Tenta encontrar uma voz em português por padrão
-            self._set_portuguese_voice()
+        def configure(engine: Any) -> None:
+            engine.setProperty('rate', rate)
+            engine.setProperty('volume', volume)
+            # Configura a voz, se especificada
+            if voice_id:
+                self.set_voice(voice_id)
+            else:
+                # Tenta encontrar uma voz em português por padrão
+                self._set_portuguese_voice()
+        
+        self.worker.call(configure)
     
     def _set_portuguese_voice(self):
         """Tenta configurar uma voz em português, se disponível."""
-        voices = self.engine.getProperty('voices')
-        for voice in voices:
-            if 'portuguese' in (voice.languages or []) or 'pt' in (voice.languages or []):
-                self.engine.setProperty('voice', voice.id)
-                return
+        def select(engine: Any) -> None:
+            voices = engine.getProperty('voices')
+            for voice in voices:
+                if 'portuguese' in (voice.languages or []) or 'pt' in (voice.languages or []):
+                    engine.setProperty('voice', voice.id)
+                    return
+            
+            # Se não encontrar uma voz em português, usa a voz padrão
+            if voices:
+                engine.setProperty('voice', voices[0].id)
         
-        # Se não encontrar uma voz em português, usa a voz padrão
-        if voices:
-            self.engine.setProperty('voice', voices[0].id)
+        self.worker.call(select)
     
     def set_voice(self, voice_id: str) -> bool:
         """Define a voz a ser utilizada.
@@ -51,12 +91,15 @@ class VoiceOutputAdapter:
         Returns:
             True se a voz foi definida com sucesso, False caso contrário.
         """
-        voices = self.engine.getProperty('voices')
-        for voice in voices:
-            if voice.id == voice_id:
-                self.engine.setProperty('voice', voice_id)
-                return True
-        return False
+        def select(engine: Any) -> bool:
+            voices = engine.getProperty('voices')
+            for voice in voices:
+                if voice.id == voice_id:
+                    engine.setProperty('voice', voice_id)
+                    return True
+            return False
+        
+        return self.worker.call(select)
     
     def get_available_voices(self) -> List[Dict[str, Any]]:
         """Retorna uma lista de vozes disponíveis.
@@ -64,7 +107,7 @@ class VoiceOutputAdapter:
         Returns:
             Lista de dicionários com informações sobre as vozes disponíveis.
         """
-        voices = self.engine.getProperty('voices')
+        voices = self.worker.call(lambda engine: engine.getProperty('voices'))
         return [
             {
                 'id': voice.id,
@@ -76,7 +119,7 @@ class VoiceOutputAdapter:
         ]
     
     def speak(self, text: str) -> None:
-        """Fala o texto fornecido.
+        """Fala o texto fornecido e aguarda o fim da fala.
         
         Args:
             text: Texto a ser falado.
@@ -85,15 +128,151 @@ class VoiceOutputAdapter:
             VoiceOutputError: Se ocorrer um erro ao tentar falar o texto.
         """
         try:
-            print(f"IA: {text}")
-            self.engine.say(text)
-            self.engine.runAndWait()
+            self.speak_async(text).result()
         except Exception as e:
             raise VoiceOutputError(f"Erro ao tentar falar o texto: {str(e)}")
     
+    def speak_async(
+        self,
+        text: str,
+        priority: int = SpeechPriority.NORMAL,
+        preempt: bool = False
+    ) -> Future:
+        """Agenda a fala do texto sem bloquear.
+        
+        Args:
+            text: Texto a ser falado.
+            priority: Prioridade na fila (SpeechPriority.URGENT para erros e
+                confirmações de interrupção, que passam na frente do texto normal).
+            preempt: Se True, interrompe a fala em andamento de prioridade menor.
+            
+        Returns:
+            Future que termina com True quando a fala termina, ou False se ela
+            for interrompida; em caso de erro, o Future carrega a exceção.
+        """
+        print(f"IA: {text}")
+        return self.worker.submit(functools.partial(self._speak_now, text), priority, preempt)
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda o fim de todas as falas agendadas.
+        
+        Returns:
+            True se todas terminaram; False em caso de timeout.
+        """
+        return self.worker.flush(timeout)
+    
+    def cancel(self) -> int:
+        """Interrompe a fala atual e descarta as agendadas.
+        
+        Returns:
+            Quantas falas agendadas foram descartadas.
+        """
+        return self.worker.cancel()
+
+    def render(self, text: str) -> Optional[str]:
+        """Sintetiza o texto para o cache de áudio (sem tocar), se ainda não estiver lá.
+
+        Returns:
+            O caminho do áudio em cache, ou None se não houver cache ou a síntese não gerar arquivo.
+        """
+        if self.audio_cache is None:
+            return None
+        return self.worker.call(functools.partial(self._render_now, text), SpeechPriority.BACKGROUND)
+
+    def prerender(self, texts: Iterable[str]) -> List[Future]:
+        """Agenda a síntese de frases fixas para o cache, com prioridade baixa.
+
+        As falas agendadas depois passam na frente; a pré-renderização ocupa o
+        motor apenas entre uma fala e outra.
+
+        Returns:
+            Os Futures de cada frase (com o caminho do áudio), ou lista vazia se não houver cache.
+        """
+        if self.audio_cache is None:
+            return []
+        futures = []
+        for text in texts:
+            if text:
+                future = self.worker.submit(functools.partial(self._render_now, text), SpeechPriority.BACKGROUND)
+                future.add_done_callback(_warn_prerender_failure)
+                futures.append(future)
+        return futures
+
+    def close(self) -> None:
+        """Descarta as falas pendentes, encerra a thread de síntese e libera a saída de áudio."""
+        self.worker.close()
+        self._wav_player.close()
+
+    def _speak_now(self, text: str, engine: Any) -> bool:
+        """Fala o texto na thread do worker (do cache, se houver, ou sintetizando)."""
+        with TTS_DURATION.labels().time():
+            if not self._play_cached(text, engine):
+                engine.say(text)
+                engine.runAndWait()
+                self._remember(text)
+        return not self.worker.interrupted.is_set()
+
+    def _render_now(self, text: str, engine: Any) -> Optional[str]:
+        """Grava o áudio do texto no cache, na thread do worker."""
+        key = self._speech_key(text, engine)
+        path = self.audio_cache.get(key)
+        if path is not None:
+            return path
+
+        def save(destination: str) -> None:
+            engine.save_to_file(text, destination)
+            engine.runAndWait()
+
+        return self.audio_cache.put(key, save)
+
+    def _speech_key(self, text: str, engine: Any) -> str:
+        return make_speech_key(
+            text,
+            engine.getProperty('voice'),
+            engine.getProperty('rate'),
+            engine.getProperty('volume')
+        )
+
+    def _play_cached(self, text: str, engine: Any) -> bool:
+        """Toca o áudio do texto a partir do cache; False se não houver (ou não puder ser tocado)."""
+        if self.audio_cache is None:
+            return False
+        path = self.audio_cache.get(self._speech_key(text, engine))
+        CACHE_LOOKUPS.labels("tts", "hit" if path else "miss").inc()
+        if path is None:
+            return False
+        try:
+            self.player(path)
+        except Exception:
+            # Formato ou saída de áudio não suportados: sintetiza normalmente
+            return False
+        return True
+
+    def _remember(self, text: str) -> None:
+        """Agenda a gravação no cache dos textos curtos falados pela segunda vez."""
+        if self.audio_cache is None or len(text) > self.max_cached_chars:
+            return
+        if text in self._spoken:
+            del self._spoken[text]
+            try:
+                self.prerender([text])
+            except RuntimeError:
+                # Worker encerrado durante a fala
+                pass
+            return
+        self._spoken[text] = None
+        if len(self._spoken) > 256:
+            self._spoken.popitem(last=False)
+    
     def __del__(self):
         """Libera recursos ao destruir o objeto."""
         try:
-            self.engine.stop()
+            self.close()
         except:
             pass
+
+
+def _warn_prerender_failure(future: Future) -> None:
+    """Avisa sobre uma frase que não pôde ser pré-renderizada."""
+    if not future.cancelled() and future.exception() is not None:
+        print(f"⚠️  Não foi possível pré-renderizar a frase: {str(future.exception())}")
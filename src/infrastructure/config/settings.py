@@ -17,23 +17,104 @@ class Settings:
         self.OPENAI_MODEL: str = self._get_env_variable("OPENAI_MODEL", "gpt-3.5-turbo")
         self.OPENAI_MAX_TOKENS: int = int(self._get_env_variable("OPENAI_MAX_TOKENS", "150"))
         self.OPENAI_TEMPERATURE: float = float(self._get_env_variable("OPENAI_TEMPERATURE", "0.7"))
+        self.OPENAI_BASE_URL: str = self._get_env_variable("OPENAI_BASE_URL", "")
         
         # Configurações da API do DeepSeek
         self.DEEPSEEK_API_KEY: str = self._get_env_variable("DEEPSEEK_API_KEY", "")
+        self.DEEPSEEK_BASE_URL: str = self._get_env_variable("DEEPSEEK_BASE_URL", "https://api.deepseek.com/v1")
+        
+        # Requisições hedged no fallback inteligente
+        self.HEDGING_ENABLED: bool = self._get_env_variable("HEDGING_ENABLED", "False").lower() == "true"
+        self.HEDGING_PERCENTILE: float = float(self._get_env_variable("HEDGING_PERCENTILE", "95"))
+        self.HEDGING_INITIAL_DELAY: float = float(self._get_env_variable("HEDGING_INITIAL_DELAY", "1.0"))
+        
+        # Circuit breakers por provedor no fallback inteligente
+        self.CIRCUIT_FAILURE_THRESHOLD: float = float(self._get_env_variable("CIRCUIT_FAILURE_THRESHOLD", "0.5"))
+        self.CIRCUIT_WINDOW_SIZE: int = int(self._get_env_variable("CIRCUIT_WINDOW_SIZE", "20"))
+        self.CIRCUIT_MIN_CALLS: int = int(self._get_env_variable("CIRCUIT_MIN_CALLS", "5"))
+        self.CIRCUIT_OPEN_SECONDS: float = float(self._get_env_variable("CIRCUIT_OPEN_SECONDS", "30"))
+        
+        # Janela de contexto por orçamento de tokens (0 = usa o limite de mensagens)
+        self.CONTEXT_TOKENIZER: str = self._get_env_variable("CONTEXT_TOKENIZER", "auto")
+        self.CONTEXT_BUDGET_OPENAI: int = int(self._get_env_variable("CONTEXT_BUDGET_OPENAI", "0"))
+        self.CONTEXT_BUDGET_DEEPSEEK: int = int(self._get_env_variable("CONTEXT_BUDGET_DEEPSEEK", "0"))
+        self.CONTEXT_BUDGET_OLLAMA: int = int(self._get_env_variable("CONTEXT_BUDGET_OLLAMA", "0"))
+        
+        # Máximo de requisições simultâneas por provedor (0 = sem limite)
+        self.PROVIDER_CONCURRENCY_OPENAI: int = int(self._get_env_variable("PROVIDER_CONCURRENCY_OPENAI", "0"))
+        self.PROVIDER_CONCURRENCY_DEEPSEEK: int = int(self._get_env_variable("PROVIDER_CONCURRENCY_DEEPSEEK", "0"))
+        self.PROVIDER_CONCURRENCY_OLLAMA: int = int(self._get_env_variable("PROVIDER_CONCURRENCY_OLLAMA", "0"))
+        
+        # Resumo em segundo plano das mensagens que saem da janela de contexto
+        self.HISTORY_SUMMARY_ENABLED: bool = self._get_env_variable("HISTORY_SUMMARY_ENABLED", "False").lower() == "true"
+        self.HISTORY_SUMMARY_MAX_WORDS: int = int(self._get_env_variable("HISTORY_SUMMARY_MAX_WORDS", "120"))
+        
+        # Sessões de conversa em memória
+        self.SESSION_MAX_SESSIONS: int = int(self._get_env_variable("SESSION_MAX_SESSIONS", "1000"))
+        self.SESSION_MAX_TOTAL_CHARS: int = int(self._get_env_variable("SESSION_MAX_TOTAL_CHARS", "5000000"))
+        self.SESSION_IDLE_TTL: float = float(self._get_env_variable("SESSION_IDLE_TTL", "1800"))
+        
+        # Armazenamento persistente das conversas (segmentos JSONL gravados em lotes)
+        self.CONVERSATION_STORE_ENABLED: bool = self._get_env_variable("CONVERSATION_STORE_ENABLED", "False").lower() == "true"
+        self.CONVERSATION_STORE_PATH: str = self._get_env_variable("CONVERSATION_STORE_PATH", "data/conversations")
+        self.CONVERSATION_STORE_BATCH_SIZE: int = int(self._get_env_variable("CONVERSATION_STORE_BATCH_SIZE", "64"))
+        self.CONVERSATION_STORE_FLUSH_INTERVAL: float = float(self._get_env_variable("CONVERSATION_STORE_FLUSH_INTERVAL", "0.05"))
+        
+        # Servidor HTTP/WebSocket (python -m src.interface.server)
+        self.SERVER_HOST: str = self._get_env_variable("SERVER_HOST", "127.0.0.1")
+        self.SERVER_PORT: int = int(self._get_env_variable("SERVER_PORT", "8080"))
+        
+        # Modo em lote (python -m src batch)
+        self.BATCH_WORKERS: int = int(self._get_env_variable("BATCH_WORKERS", "8"))
+        
+        # Cache de respostas (memória + SQLite)
+        self.RESPONSE_CACHE_ENABLED: bool = self._get_env_variable("RESPONSE_CACHE_ENABLED", "False").lower() == "true"
+        self.RESPONSE_CACHE_MAX_ENTRIES: int = int(self._get_env_variable("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+        self.RESPONSE_CACHE_TTL: float = float(self._get_env_variable("RESPONSE_CACHE_TTL", "86400"))
+        self.RESPONSE_CACHE_PATH: str = self._get_env_variable("RESPONSE_CACHE_PATH", "data/response_cache.sqlite3")
+        
+        # Cache semântico (perguntas parecidas reaproveitam a resposta)
+        self.SEMANTIC_CACHE_ENABLED: bool = self._get_env_variable("SEMANTIC_CACHE_ENABLED", "False").lower() == "true"
+        self.SEMANTIC_CACHE_THRESHOLD: float = float(self._get_env_variable("SEMANTIC_CACHE_THRESHOLD", "0.85"))
+        self.SEMANTIC_CACHE_MAX_ENTRIES: int = int(self._get_env_variable("SEMANTIC_CACHE_MAX_ENTRIES", "1000"))
+        self.SEMANTIC_CACHE_PATH: str = self._get_env_variable("SEMANTIC_CACHE_PATH", "data/semantic_cache.npz")
         
         # Configurações do Ollama
         self.OLLAMA_ENABLED: bool = self._get_env_variable("OLLAMA_ENABLED", "False").lower() == "true"
         self.OLLAMA_MODEL: str = self._get_env_variable("OLLAMA_MODEL", "llama2")
         self.OLLAMA_BASE_URL: str = self._get_env_variable("OLLAMA_BASE_URL", "http://localhost:11434")
+        self.OLLAMA_HEALTH_TTL: float = float(self._get_env_variable("OLLAMA_HEALTH_TTL", "10"))
+        self.OLLAMA_HEALTH_REFRESH_INTERVAL: float = float(self._get_env_variable("OLLAMA_HEALTH_REFRESH_INTERVAL", "5"))
+        
+        # Configurações do transporte HTTP compartilhado pelos provedores
+        self.HTTP_MAX_CONNECTIONS: int = int(self._get_env_variable("HTTP_MAX_CONNECTIONS", "20"))
+        self.HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(self._get_env_variable("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+        self.HTTP_KEEPALIVE_EXPIRY: float = float(self._get_env_variable("HTTP_KEEPALIVE_EXPIRY", "30"))
+        self.HTTP_CONNECT_TIMEOUT: float = float(self._get_env_variable("HTTP_CONNECT_TIMEOUT", "5"))
+        self.HTTP_READ_TIMEOUT: float = float(self._get_env_variable("HTTP_READ_TIMEOUT", "60"))
         
         # Configurações de voz
         self.VOICE_RATE: int = int(self._get_env_variable("VOICE_RATE", "150"))
         self.VOICE_VOLUME: float = float(self._get_env_variable("VOICE_VOLUME", "0.9"))
         self.VOICE_LANGUAGE: str = self._get_env_variable("VOICE_LANGUAGE", "pt-BR")
+        self.VOICE_STREAMING: bool = self._get_env_variable("VOICE_STREAMING", "True").lower() == "true"
+        self.TTS_CACHE_ENABLED: bool = self._get_env_variable("TTS_CACHE_ENABLED", "True").lower() == "true"
+        self.TTS_CACHE_DIR: str = self._get_env_variable("TTS_CACHE_DIR", "data/tts_cache")
+        self.TTS_CACHE_MAX_MB: float = float(self._get_env_variable("TTS_CACHE_MAX_MB", "50"))
+        self.TTS_PRERENDER_PROMPTS: str = self._get_env_variable("TTS_PRERENDER_PROMPTS", "")
         
         # Configurações do reconhecimento de fala
         self.SPEECH_ENERGY_THRESHOLD: int = int(self._get_env_variable("SPEECH_ENERGY_THRESHOLD", "300"))
         self.SPEECH_PAUSE_THRESHOLD: float = float(self._get_env_variable("SPEECH_PAUSE_THRESHOLD", "0.8"))
+        self.SPEECH_ENDPOINTER: str = self._get_env_variable("SPEECH_ENDPOINTER", "energy")
+        self.SPEECH_VAD_HANGOVER_MS: int = int(self._get_env_variable("SPEECH_VAD_HANGOVER_MS", "600"))
+        self.SPEECH_PERSISTENT_CAPTURE: bool = self._get_env_variable("SPEECH_PERSISTENT_CAPTURE", "True").lower() == "true"
+        self.SPEECH_CAPTURE_PREROLL_MS: int = int(self._get_env_variable("SPEECH_CAPTURE_PREROLL_MS", "300"))
+        self.SPEECH_CAPTURE_BUFFER_SECONDS: float = float(self._get_env_variable("SPEECH_CAPTURE_BUFFER_SECONDS", "10"))
+        self.ASR_BACKEND: str = self._get_env_variable("ASR_BACKEND", "google")
+        self.ASR_VOSK_MODEL_PATH: str = self._get_env_variable("ASR_VOSK_MODEL_PATH", "models/vosk-model-small-pt-0.3")
+        self.ASR_WHISPERCPP_BINARY: str = self._get_env_variable("ASR_WHISPERCPP_BINARY", "whisper-cli")
+        self.ASR_WHISPERCPP_MODEL: str = self._get_env_variable("ASR_WHISPERCPP_MODEL", "models/ggml-base.bin")
         
         # Configurações da aplicação
         self.APP_NAME: str = self._get_env_variable("APP_NAME", "Atendimento IA")
@@ -69,23 +150,104 @@ class Settings:
             "OPENAI_MODEL": self.OPENAI_MODEL,
             "OPENAI_MAX_TOKENS": self.OPENAI_MAX_TOKENS,
             "OPENAI_TEMPERATURE": self.OPENAI_TEMPERATURE,
+            "OPENAI_BASE_URL": self.OPENAI_BASE_URL,
             
             # DeepSeek
             "DEEPSEEK_API_KEY": "***" if self.DEEPSEEK_API_KEY else "Não configurado",
+            "DEEPSEEK_BASE_URL": self.DEEPSEEK_BASE_URL,
+            
+            # Hedging
+            "HEDGING_ENABLED": self.HEDGING_ENABLED,
+            "HEDGING_PERCENTILE": self.HEDGING_PERCENTILE,
+            "HEDGING_INITIAL_DELAY": self.HEDGING_INITIAL_DELAY,
+            
+            # Circuit breakers
+            "CIRCUIT_FAILURE_THRESHOLD": self.CIRCUIT_FAILURE_THRESHOLD,
+            "CIRCUIT_WINDOW_SIZE": self.CIRCUIT_WINDOW_SIZE,
+            "CIRCUIT_MIN_CALLS": self.CIRCUIT_MIN_CALLS,
+            "CIRCUIT_OPEN_SECONDS": self.CIRCUIT_OPEN_SECONDS,
+            
+            # Janela de contexto
+            "CONTEXT_TOKENIZER": self.CONTEXT_TOKENIZER,
+            "CONTEXT_BUDGET_OPENAI": self.CONTEXT_BUDGET_OPENAI,
+            "CONTEXT_BUDGET_DEEPSEEK": self.CONTEXT_BUDGET_DEEPSEEK,
+            "CONTEXT_BUDGET_OLLAMA": self.CONTEXT_BUDGET_OLLAMA,
+            
+            # Concorrência por provedor
+            "PROVIDER_CONCURRENCY_OPENAI": self.PROVIDER_CONCURRENCY_OPENAI,
+            "PROVIDER_CONCURRENCY_DEEPSEEK": self.PROVIDER_CONCURRENCY_DEEPSEEK,
+            "PROVIDER_CONCURRENCY_OLLAMA": self.PROVIDER_CONCURRENCY_OLLAMA,
+            
+            # Resumo do histórico
+            "HISTORY_SUMMARY_ENABLED": self.HISTORY_SUMMARY_ENABLED,
+            "HISTORY_SUMMARY_MAX_WORDS": self.HISTORY_SUMMARY_MAX_WORDS,
+            
+            # Sessões
+            "SESSION_MAX_SESSIONS": self.SESSION_MAX_SESSIONS,
+            "SESSION_MAX_TOTAL_CHARS": self.SESSION_MAX_TOTAL_CHARS,
+            "SESSION_IDLE_TTL": self.SESSION_IDLE_TTL,
+            
+            # Armazenamento das conversas
+            "CONVERSATION_STORE_ENABLED": self.CONVERSATION_STORE_ENABLED,
+            "CONVERSATION_STORE_PATH": self.CONVERSATION_STORE_PATH,
+            "CONVERSATION_STORE_BATCH_SIZE": self.CONVERSATION_STORE_BATCH_SIZE,
+            "CONVERSATION_STORE_FLUSH_INTERVAL": self.CONVERSATION_STORE_FLUSH_INTERVAL,
+            
+            # Servidor
+            "SERVER_HOST": self.SERVER_HOST,
+            "SERVER_PORT": self.SERVER_PORT,
+            
+            # Modo em lote
+            "BATCH_WORKERS": self.BATCH_WORKERS,
+            
+            # Cache de respostas
+            "RESPONSE_CACHE_ENABLED": self.RESPONSE_CACHE_ENABLED,
+            "RESPONSE_CACHE_MAX_ENTRIES": self.RESPONSE_CACHE_MAX_ENTRIES,
+            "RESPONSE_CACHE_TTL": self.RESPONSE_CACHE_TTL,
+            "RESPONSE_CACHE_PATH": self.RESPONSE_CACHE_PATH,
+            
+            # Cache semântico
+            "SEMANTIC_CACHE_ENABLED": self.SEMANTIC_CACHE_ENABLED,
+            "SEMANTIC_CACHE_THRESHOLD": self.SEMANTIC_CACHE_THRESHOLD,
+            "SEMANTIC_CACHE_MAX_ENTRIES": self.SEMANTIC_CACHE_MAX_ENTRIES,
+            "SEMANTIC_CACHE_PATH": self.SEMANTIC_CACHE_PATH,
             
             # Ollama
             "OLLAMA_ENABLED": self.OLLAMA_ENABLED,
             "OLLAMA_MODEL": self.OLLAMA_MODEL,
             "OLLAMA_BASE_URL": self.OLLAMA_BASE_URL,
+            "OLLAMA_HEALTH_TTL": self.OLLAMA_HEALTH_TTL,
+            "OLLAMA_HEALTH_REFRESH_INTERVAL": self.OLLAMA_HEALTH_REFRESH_INTERVAL,
+            
+            # Transporte HTTP
+            "HTTP_MAX_CONNECTIONS": self.HTTP_MAX_CONNECTIONS,
+            "HTTP_MAX_KEEPALIVE_CONNECTIONS": self.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            "HTTP_KEEPALIVE_EXPIRY": self.HTTP_KEEPALIVE_EXPIRY,
+            "HTTP_CONNECT_TIMEOUT": self.HTTP_CONNECT_TIMEOUT,
+            "HTTP_READ_TIMEOUT": self.HTTP_READ_TIMEOUT,
             
             # Voz
             "VOICE_RATE": self.VOICE_RATE,
             "VOICE_VOLUME": self.VOICE_VOLUME,
             "VOICE_LANGUAGE": self.VOICE_LANGUAGE,
+            "VOICE_STREAMING": self.VOICE_STREAMING,
+            "TTS_CACHE_ENABLED": self.TTS_CACHE_ENABLED,
+            "TTS_CACHE_DIR": self.TTS_CACHE_DIR,
+            "TTS_CACHE_MAX_MB": self.TTS_CACHE_MAX_MB,
+            "TTS_PRERENDER_PROMPTS": self.TTS_PRERENDER_PROMPTS,
             
             # Reconhecimento de fala
             "SPEECH_ENERGY_THRESHOLD": self.SPEECH_ENERGY_THRESHOLD,
             "SPEECH_PAUSE_THRESHOLD": self.SPEECH_PAUSE_THRESHOLD,
+            "SPEECH_ENDPOINTER": self.SPEECH_ENDPOINTER,
+            "SPEECH_VAD_HANGOVER_MS": self.SPEECH_VAD_HANGOVER_MS,
+            "SPEECH_PERSISTENT_CAPTURE": self.SPEECH_PERSISTENT_CAPTURE,
+            "SPEECH_CAPTURE_PREROLL_MS": self.SPEECH_CAPTURE_PREROLL_MS,
+            "SPEECH_CAPTURE_BUFFER_SECONDS": self.SPEECH_CAPTURE_BUFFER_SECONDS,
+            "ASR_BACKEND": self.ASR_BACKEND,
+            "ASR_VOSK_MODEL_PATH": self.ASR_VOSK_MODEL_PATH,
+            "ASR_WHISPERCPP_BINARY": self.ASR_WHISPERCPP_BINARY,
+            "ASR_WHISPERCPP_MODEL": self.ASR_WHISPERCPP_MODEL,
             
             # Aplicação
             "APP_NAME": self.APP_NAME,
@@ -0,0 +1 @@
+"""Módulo que contém as métricas de desempenho da aplicação."""
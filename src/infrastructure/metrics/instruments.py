@@ -0,0 +1,39 @@
+"""Módulo que declara as métricas registradas pelos adaptadores."""
+from typing import Dict
+
+from .registry import StreamTimer, metrics
+
+LLM_DURATION = metrics.histogram(
+    "llm_request_duration_seconds", "Duração das chamadas ao modelo de IA, por provedor", ("provider",)
+)
+LLM_FIRST_TOKEN = metrics.histogram(
+    "llm_time_to_first_token_seconds", "Tempo até o primeiro trecho da resposta em streaming", ("provider",)
+)
+LLM_ERRORS = metrics.counter("llm_errors_total", "Chamadas ao modelo de IA que falharam", ("provider",))
+LLM_FALLBACKS = metrics.counter(
+    "llm_fallbacks_total", "Trocas para o próximo provedor após falha do anterior", ("provider",)
+)
+ASR_DURATION = metrics.histogram(
+    "asr_duration_seconds", "Duração do reconhecimento de fala, por mecanismo", ("backend",)
+)
+ASR_RESULTS = metrics.counter(
+    "asr_requests_total", "Reconhecimentos de fala, por mecanismo e resultado", ("backend", "result")
+)
+TTS_DURATION = metrics.histogram("tts_duration_seconds", "Duração da síntese e reprodução da fala")
+CACHE_LOOKUPS = metrics.counter("cache_lookups_total", "Consultas aos caches, por resultado", ("cache", "result"))
+
+
+def cache_hit_rates() -> Dict[str, float]:
+    """Taxa de acerto de cada cache (acertos / consultas), a partir de cache_lookups_total."""
+    totals: Dict[str, float] = {}
+    hits: Dict[str, float] = {}
+    for (cache, result), counter in CACHE_LOOKUPS.series():
+        totals[cache] = totals.get(cache, 0.0) + counter.value
+        if result != "miss":
+            hits[cache] = hits.get(cache, 0.0) + counter.value
+    return {cache: hits.get(cache, 0.0) / total for cache, total in totals.items() if total}
+
+
+def stream_timer(provider: str) -> StreamTimer:
+    """Cronômetro de um streaming do provedor (tempo até o primeiro trecho e duração)."""
+    return StreamTimer(LLM_FIRST_TOKEN.labels(provider), LLM_DURATION.labels(provider))
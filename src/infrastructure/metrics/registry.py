@@ -0,0 +1,345 @@
+"""Módulo que contém o registro de métricas (contadores, medidores e histogramas).
+
+As métricas são declaradas uma vez, no carregamento dos módulos que as
+registram, e cada série (combinação de rótulos) é resolvida com ``labels``
+(uma busca em dicionário). Registrar uma amostra custa uma trava e
+algumas operações aritméticas, sem alocação, de modo que o custo no caminho
+de uma requisição é desprezível perto de uma chamada de rede.
+
+Os histogramas usam baldes log-lineares no estilo HDR: cada potência de 2 é
+dividida em ``SUB_BUCKETS`` baldes iguais, o que dá erro relativo de no
+máximo 1/SUB_BUCKETS em qualquer percentil, de microssegundos a minutos,
+com poucos baldes ocupados.
+"""
+import bisect
+import itertools
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+SUB_BUCKETS = 16
+
+# Limites (em segundos) dos baldes exportados no formato do Prometheus
+PROMETHEUS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _bucket_index(value: float) -> int:
+    """Índice do balde log-linear do valor (valores não positivos ficam no menor balde)."""
+    if value <= 0:
+        return -(1 << 30)
+    mantissa, exponent = math.frexp(value)
+    return exponent * SUB_BUCKETS + int((mantissa - 0.5) * 2 * SUB_BUCKETS)
+
+
+def _bucket_upper(index: int) -> float:
+    """Limite superior do balde de índice index."""
+    if index == -(1 << 30):
+        return 0.0
+    exponent, sub = divmod(index, SUB_BUCKETS)
+    return math.ldexp(0.5 + (sub + 1) / (2 * SUB_BUCKETS), exponent)
+
+
+class Counter:
+    """Série de um contador (só cresce)."""
+    __slots__ = ("_lock", "_value")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Soma amount ao contador."""
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Gauge:
+    """Série de um medidor (valor instantâneo), opcionalmente calculado na leitura."""
+    __slots__ = ("_lock", "_value", "_function")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        """Define o valor do medidor."""
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Soma amount ao medidor."""
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Subtrai amount do medidor."""
+        self.inc(-amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Calcula o valor na leitura (sem custo no caminho da requisição)."""
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        if self._function is not None:
+            return float(self._function())
+        return self._value
+
+
+class Histogram:
+    """Série de um histograma log-linear (estilo HDR).
+
+    Além dos baldes log-lineares (usados nos percentis), conta as amostras
+    pelos limites exatos de PROMETHEUS_BUCKETS: um balde log-linear pode
+    atravessar um desses limites, e contá-lo pelo limite superior jogaria
+    amostras como 0,0049 s no balde seguinte.
+    """
+    __slots__ = ("_lock", "_buckets", "_exported", "count", "sum", "min", "max")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: Dict[int, int] = {}
+        self._exported = [0] * (len(PROMETHEUS_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Registra uma amostra."""
+        index = _bucket_index(value)
+        exported = bisect.bisect_left(PROMETHEUS_BUCKETS, value)
+        with self._lock:
+            self._buckets[index] = self._buckets.get(index, 0) + 1
+            self._exported[exported] += 1
+            self.count += 1
+            self.sum += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def time(self) -> "_Timer":
+        """Gerenciador de contexto que registra a duração do bloco, em segundos."""
+        return _Timer(self)
+
+    def percentile(self, percent: float) -> float:
+        """Percentil (0 a 100) estimado pelo limite superior do balde, limitado ao máximo observado."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, math.ceil(percent / 100 * self.count))
+            seen = 0
+            for index in sorted(self._buckets):
+                seen += self._buckets[index]
+                if seen >= rank:
+                    return min(_bucket_upper(index), self.max)
+            return self.max
+
+    def cumulative(self) -> List[int]:
+        """Contagens acumuladas até cada limite de PROMETHEUS_BUCKETS (amostra <= limite)."""
+        with self._lock:
+            exported = self._exported[:-1]
+        return list(itertools.accumulate(exported))
+
+
+class _Timer:
+    """Mede a duração de um bloco e a registra no histograma."""
+    __slots__ = ("_histogram", "_started")
+
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        if exc_type is None:
+            self._histogram.observe(time.perf_counter() - self._started)
+
+
+class StreamTimer:
+    """Mede o tempo até o primeiro trecho e a duração total de um streaming.
+
+    O relógio começa na criação; ``token`` é chamado a cada trecho entregue e
+    ``done`` ao final do streaming.
+    """
+    __slots__ = ("_first_token", "_duration", "_started", "_waiting")
+
+    def __init__(self, first_token: Histogram, duration: Histogram):
+        self._first_token = first_token
+        self._duration = duration
+        self._started = time.perf_counter()
+        self._waiting = True
+
+    def token(self) -> None:
+        """Registra o tempo até o primeiro trecho (as chamadas seguintes não custam nada)."""
+        if self._waiting:
+            self._waiting = False
+            self._first_token.observe(time.perf_counter() - self._started)
+
+    def done(self) -> None:
+        """Registra a duração total."""
+        self._duration.observe(time.perf_counter() - self._started)
+
+
+# Tipo das séries de uma métrica
+M = TypeVar("M", Counter, Gauge, Histogram)
+
+
+class MetricFamily(Generic[M]):
+    """Métrica com nome, descrição e rótulos; cada combinação de rótulos é uma série."""
+
+    def __init__(self, kind: str, name: str, description: str, label_names: Sequence[str], factory: Callable[[], M]):
+        self.kind = kind
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._factory: Callable[[], M] = factory
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], M] = {}
+
+    def labels(self, *values: str) -> M:
+        """Série com os valores de rótulo informados, na ordem de label_names.
+
+        Raises:
+            ValueError: Se a quantidade de valores não corresponder aos rótulos.
+        """
+        series = self._series.get(values)
+        if series is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"A métrica {self.name} espera os rótulos {self.label_names}")
+            with self._lock:
+                series = self._series.setdefault(values, self._factory())
+        return series
+
+    def series(self) -> List[Tuple[Tuple[str, ...], M]]:
+        """Séries registradas, em ordem de rótulos."""
+        with self._lock:
+            return sorted(self._series.items())
+
+
+class MetricsRegistry:
+    """Registro das métricas do processo, exportável no formato de texto do Prometheus."""
+
+    def __init__(self, namespace: str = "atendimento"):
+        """Inicializa o registro.
+
+        Args:
+            namespace: Prefixo dos nomes exportados.
+        """
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._families: Dict[str, MetricFamily[Any]] = {}
+
+    def counter(self, name: str, description: str, labels: Sequence[str] = ()) -> MetricFamily[Counter]:
+        """Declara (ou retorna, se já declarado) um contador."""
+        return self._family("counter", name, description, labels, Counter)
+
+    def gauge(self, name: str, description: str, labels: Sequence[str] = ()) -> MetricFamily[Gauge]:
+        """Declara (ou retorna, se já declarado) um medidor."""
+        return self._family("gauge", name, description, labels, Gauge)
+
+    def histogram(self, name: str, description: str, labels: Sequence[str] = ()) -> MetricFamily[Histogram]:
+        """Declara (ou retorna, se já declarado) um histograma."""
+        return self._family("histogram", name, description, labels, Histogram)
+
+    def families(self) -> List[MetricFamily[Any]]:
+        """Métricas registradas, em ordem de nome."""
+        with self._lock:
+            return [self._families[name] for name in sorted(self._families)]
+
+    def reset(self) -> None:
+        """Descarta as séries registradas (as declarações são mantidas)."""
+        with self._lock:
+            for family in self._families.values():
+                with family._lock:
+                    family._series.clear()
+
+    def summary_lines(self) -> List[str]:
+        """Resumo legível das métricas: percentis dos histogramas e valores dos demais."""
+        lines = []
+        for family in self.families():
+            for values, series in family.series():
+                labels = ", ".join(f"{name}={value}" for name, value in zip(family.label_names, values))
+                name = f"{family.name}{{{labels}}}" if labels else family.name
+                if isinstance(series, Histogram):
+                    if not series.count:
+                        continue
+                    lines.append(
+                        f"{name}: n={series.count} "
+                        f"p50={_format_ms(series.percentile(50))} p90={_format_ms(series.percentile(90))} "
+                        f"p99={_format_ms(series.percentile(99))} máx={_format_ms(series.max)}"
+                    )
+                else:
+                    lines.append(f"{name}: {_format_value(series.value)}")
+        return lines
+
+    def to_prometheus(self) -> str:
+        """Exporta as métricas no formato de texto do Prometheus (versão 0.0.4)."""
+        lines: List[str] = []
+        for family in self.families():
+            name = f"{self.namespace}_{family.name}"
+            lines.append(f"# HELP {name} {_escape_help(family.description)}")
+            lines.append(f"# TYPE {name} {family.kind}")
+            for values, series in family.series():
+                labels = list(zip(family.label_names, values))
+                if isinstance(series, Histogram):
+                    counts = series.cumulative()
+                    for bound, count in zip(PROMETHEUS_BUCKETS, counts):
+                        lines.append(f"{name}_bucket{_format_labels(labels + [('le', repr(bound))])} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(labels + [('le', '+Inf')])} {series.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(series.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {series.count}")
+                else:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(series.value)}")
+        return "\n".join(lines) + "\n"
+
+    def _family(
+        self,
+        kind: str,
+        name: str,
+        description: str,
+        labels: Sequence[str],
+        factory: Callable[[], M]
+    ) -> MetricFamily[M]:
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = MetricFamily(kind, name, description, labels, factory)
+            elif family.kind != kind or family.label_names != tuple(labels):
+                raise ValueError(f"A métrica {name} já foi registrada com outro tipo ou rótulos")
+            return family
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    parts = [f'{name}="{_escape_label(value)}"' for name, value in labels]
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}ms"
+
+
+def _format_value(value: float) -> str:
+    if math.isfinite(value) and value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+# Registro global do processo
+metrics = MetricsRegistry()
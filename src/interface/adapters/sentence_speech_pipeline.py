@@ -0,0 +1,95 @@
+"""Módulo que contém o pipeline de fala por frases durante a geração da resposta."""
+import queue
+import threading
+from typing import Callable, Dict, Any, TypeVar
+
+from ...domain.services.sentence_segmenter import SentenceSegmenter
+
+
+T = TypeVar("T")
+
+_END = object()
+
+
+class SpeechPipelineCancelled(Exception):
+    """Exceção usada para interromper a geração quando a fala é abortada."""
+    pass
+
+
+class SentenceSpeechPipeline:
+    """Fala cada frase da resposta assim que ela é concluída pelo modelo.
+    
+    A geração roda em uma thread produtora, que divide o texto em frases e as
+    coloca em uma fila; a thread chamadora consome a fila e entrega cada
+    frase a ``speak`` enquanto o modelo continua gerando as próximas. Se
+    ``speak`` apenas agendar a frase (por exemplo, no worker de fala), a
+    execução termina junto com a geração e o áudio segue tocando depois.
+    """
+    
+    def __init__(
+        self,
+        speak: Callable[[str], None],
+        segmenter_factory: Callable[[], SentenceSegmenter] = SentenceSegmenter
+    ):
+        """Inicializa o pipeline.
+        
+        Args:
+            speak: Função que fala uma frase, bloqueando até o fim ou apenas agendando-a.
+            segmenter_factory: Fábrica do segmentador de frases usado a cada execução.
+        """
+        self.speak = speak
+        self.segmenter_factory = segmenter_factory
+    
+    def run(self, produce: Callable[[Callable[[str], None]], T]) -> T:
+        """Executa a geração e fala as frases à medida que ficam prontas.
+        
+        Args:
+            produce: Função que gera a resposta, chamando o callback recebido
+                com cada trecho de texto, e retorna o resultado final.
+                
+        Returns:
+            O valor retornado por ``produce``.
+            
+        Raises:
+            Exception: O erro da geração (depois de falar as frases já concluídas)
+                ou o erro da síntese de voz.
+        """
+        sentences: "queue.Queue[Any]" = queue.Queue()
+        segmenter = self.segmenter_factory()
+        cancelled = threading.Event()
+        outcome: Dict[str, Any] = {}
+        
+        def on_delta(delta: str) -> None:
+            if cancelled.is_set():
+                raise SpeechPipelineCancelled("Fala interrompida durante a geração.")
+            for sentence in segmenter.feed(delta):
+                sentences.put(sentence)
+        
+        def producer() -> None:
+            try:
+                outcome["value"] = produce(on_delta)
+                tail = segmenter.flush()
+                if tail:
+                    sentences.put(tail)
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                sentences.put(_END)
+        
+        thread = threading.Thread(target=producer, name="sentence-speech-producer", daemon=True)
+        thread.start()
+        
+        try:
+            while True:
+                sentence = sentences.get()
+                if sentence is _END:
+                    break
+                self.speak(sentence)
+        except BaseException:
+            cancelled.set()
+            raise
+        
+        thread.join()
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["value"]
@@ -0,0 +1 @@
+"""Módulo que contém o processamento em lote de conversas."""
@@ -0,0 +1,250 @@
+"""Módulo que contém o processamento em lote de conversas gravadas.
+
+Cada linha do arquivo de entrada (JSONL) é uma conversa::
+
+    {"id": "c1", "turns": ["Qual o horário?", "E no sábado?"]}
+    {"id": "c2", "message": "Como emito a segunda via?"}
+    {"id": "c3", "history": [{"role": "user", "content": "..."}], "turns": ["..."]}
+
+Os turnos de uma conversa são respondidos em ordem, com o histórico
+acumulado; conversas diferentes são processadas em paralelo. Cada linha de
+saída traz o número da linha de entrada, o id, as respostas e o erro (se houver)::
+
+    {"line": 1, "id": "c1", "answers": ["...", "..."], "error": null}
+
+A saída é gravada na ordem da entrada, linha a linha, e serve também de
+ponto de retomada: com ``--resume``, as linhas já respondidas são puladas.
+"""
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from ...domain.entities.message import Message
+from ...domain.services.prompt_builder import PromptBuilder
+from ...domain.use_cases.process_message import ProcessMessageInput, ProcessMessageUseCase
+from ...infrastructure.adapters.message_codec import dumps, loads
+from ...infrastructure.config.settings import settings
+from ..bootstrap import AppServices, new_prompt_builder
+
+
+@dataclass
+class BatchConversation:
+    """Conversa lida de uma linha do arquivo de entrada."""
+    line: int
+    conversation_id: Optional[str]
+    turns: List[str] = field(default_factory=list)
+    history: List[Message] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def parse_conversation(line: int, raw: bytes) -> BatchConversation:
+    """Interpreta uma linha do arquivo de entrada.
+
+    Linhas inválidas viram uma conversa com o erro preenchido, para que
+    apareçam na saída em vez de interromper o lote.
+
+    Args:
+        line: Número da linha (a partir de 1).
+        raw: Conteúdo da linha.
+
+    Returns:
+        A conversa a processar.
+    """
+    try:
+        data = loads(raw)
+    except ValueError as e:
+        return BatchConversation(line, None, error=f"JSON inválido: {str(e)}")
+    if not isinstance(data, dict):
+        return BatchConversation(line, None, error="A linha deve ser um objeto JSON")
+
+    conversation_id = data.get("id")
+    conversation_id = str(conversation_id) if conversation_id is not None else str(line)
+    turns = data.get("turns")
+    if turns is None and "message" in data:
+        turns = [data["message"]]
+    if not isinstance(turns, list) or not turns or not all(isinstance(turn, str) for turn in turns):
+        return BatchConversation(line, conversation_id, error="Campo 'turns' (lista de textos) ou 'message' obrigatório")
+    try:
+        history = Message.from_dicts(data.get("history") or [])
+    except (KeyError, TypeError, ValueError) as e:
+        return BatchConversation(line, conversation_id, error=f"Histórico inválido: {str(e)}")
+    return BatchConversation(line, conversation_id, turns, history)
+
+
+def read_checkpoint(output_path: str) -> int:
+    """Descobre até que linha da entrada a saída já foi gravada.
+
+    Uma última linha incompleta (gravação interrompida) é descartada do arquivo.
+
+    Returns:
+        O número da última linha de entrada respondida, ou 0 se não houver saída.
+    """
+    if not os.path.exists(output_path):
+        return 0
+    with open(output_path, "rb+") as output:
+        data = output.read()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            output.truncate(complete)
+    lines = data[:complete].splitlines()
+    return int(loads(lines[-1])["line"]) if lines else 0
+
+
+class BatchRunner:
+    """Processa conversas de um arquivo JSONL com um conjunto limitado de workers.
+
+    Até ``workers`` conversas são processadas ao mesmo tempo; a leitura da
+    entrada avança no máximo ``window`` conversas à frente da última gravada,
+    de modo que a memória fica limitada mesmo para arquivos grandes. O limite
+    de cada provedor é aplicado pelo modelo de IA (ConcurrencyLimitedModel).
+    """
+
+    def __init__(
+        self,
+        use_case: ProcessMessageUseCase,
+        workers: int = 8,
+        window: Optional[int] = None,
+        model_kwargs: Optional[dict] = None,
+        prompt_builder_factory: Optional[Callable[[], PromptBuilder]] = None,
+        progress_every: int = 100
+    ):
+        """Inicializa o processador.
+
+        Args:
+            use_case: Caso de uso que responde cada turno.
+            workers: Número de conversas processadas em paralelo.
+            window: Máximo de conversas lidas e ainda não gravadas (padrão: 4 x workers).
+            model_kwargs: Parâmetros do modelo (ex.: max_tokens, temperature).
+            prompt_builder_factory: Cria o montador de prompt de cada conversa.
+            progress_every: Intervalo, em conversas, entre mensagens de progresso (0 desativa).
+        """
+        self.use_case = use_case
+        self.workers = max(1, workers)
+        self.window = window or self.workers * 4
+        self.model_kwargs = model_kwargs or {}
+        self.prompt_builder_factory = prompt_builder_factory
+        self.progress_every = progress_every
+
+    def process(self, conversation: BatchConversation) -> Dict[str, Any]:
+        """Responde os turnos de uma conversa, em ordem.
+
+        Returns:
+            O registro de saída; em caso de erro, com as respostas obtidas até ali.
+        """
+        answers: List[str] = []
+        error = conversation.error
+        if error is None:
+            history = list(conversation.history)
+            builder = self.prompt_builder_factory() if self.prompt_builder_factory else None
+            for turn in conversation.turns:
+                try:
+                    output = self.use_case.execute(ProcessMessageInput(
+                        user_message=turn,
+                        conversation_history=history,
+                        model_kwargs=self.model_kwargs,
+                        prompt_builder=builder
+                    ))
+                except Exception as e:
+                    error = str(e)
+                    break
+                answers.append(output.response)
+                history.extend((output.user_message, output.assistant_message))
+        return {"line": conversation.line, "id": conversation.conversation_id, "answers": answers, "error": error}
+
+    def run(self, input_path: str, output_path: str, resume: bool = False) -> Dict[str, Any]:
+        """Processa o arquivo de entrada e grava as respostas na ordem da entrada.
+
+        Args:
+            input_path: Arquivo JSONL com as conversas.
+            output_path: Arquivo JSONL de saída.
+            resume: Se True, continua uma execução anterior a partir da saída já gravada.
+
+        Returns:
+            Dicionário com conversas processadas, com erro, puladas e a duração.
+        """
+        start_after = read_checkpoint(output_path) if resume else 0
+        stats = {"processed": 0, "failed": 0, "skipped": 0, "elapsed": 0.0}
+        started = time.perf_counter()
+
+        pending: Deque[Future] = deque()
+        mode = "ab" if resume else "wb"
+        with open(output_path, mode) as output, ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for conversation in self._read(input_path):
+                if conversation.line <= start_after:
+                    stats["skipped"] += 1
+                    continue
+                pending.append(executor.submit(self.process, conversation))
+                if len(pending) >= self.window:
+                    self._write(output, pending.popleft().result(), stats)
+            while pending:
+                self._write(output, pending.popleft().result(), stats)
+            output.flush()
+            os.fsync(output.fileno())
+
+        stats["elapsed"] = time.perf_counter() - started
+        return stats
+
+    def _read(self, input_path: str) -> Iterator[BatchConversation]:
+        """Lê as conversas da entrada uma a uma, pulando linhas em branco."""
+        with open(input_path, "rb") as source:
+            for line, raw in enumerate(source, start=1):
+                if raw.strip():
+                    yield parse_conversation(line, raw)
+
+    def _write(self, output: Any, record: Dict[str, Any], stats: Dict[str, Any]) -> None:
+        """Grava um registro de saída (a linha fica completa no arquivo antes da próxima)."""
+        output.write(dumps(record) + b"\n")
+        output.flush()
+        stats["processed"] += 1
+        if record["error"] is not None:
+            stats["failed"] += 1
+        if self.progress_every and stats["processed"] % self.progress_every == 0:
+            print(f"… {stats['processed']} conversas processadas (linha {record['line']})")
+
+
+def parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    """Interpreta os argumentos do subcomando batch."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src batch",
+        description="Processa em lote conversas gravadas em JSONL."
+    )
+    parser.add_argument("input", help="arquivo JSONL com as conversas")
+    parser.add_argument("output", help="arquivo JSONL de saída com as respostas")
+    parser.add_argument("--workers", type=int, default=settings.BATCH_WORKERS,
+                        help="conversas processadas em paralelo (padrão: BATCH_WORKERS)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continua a partir da saída de uma execução interrompida")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Função principal do modo em lote."""
+    args = parse_args(argv)
+    services = AppServices()
+    runner = BatchRunner(
+        services.process_message_use_case,
+        workers=args.workers,
+        model_kwargs={
+            "max_tokens": settings.OPENAI_MAX_TOKENS,
+            "temperature": settings.OPENAI_TEMPERATURE
+        },
+        prompt_builder_factory=new_prompt_builder
+    )
+    try:
+        stats = runner.run(args.input, args.output, resume=args.resume)
+    except KeyboardInterrupt:
+        print("\nLote interrompido; use --resume para continuar.")
+        return 130
+    finally:
+        services.close()
+
+    rate = stats["processed"] / stats["elapsed"] if stats["elapsed"] else 0.0
+    print(
+        f"✅ {stats['processed']} conversas processadas em {stats['elapsed']:.1f}s "
+        f"({rate:.1f}/s), {stats['failed']} com erro, {stats['skipped']} já respondidas"
+    )
+    return 1 if stats["failed"] else 0
@@ -0,0 +1,172 @@
+"""Módulo que monta os serviços compartilhados pelas interfaces (CLI e servidor)."""
+from typing import Optional
+
+from ..domain.use_cases.process_message import AIModel, AnswerCache, ProcessMessageUseCase
+from ..domain.services.context_window import ContextWindow
+from ..domain.services.history_summarizer import HistorySummarizer
+from ..domain.services.prompt_builder import PromptBuilder
+from ..domain.services.session_manager import SessionManager
+from ..infrastructure.adapters.smart_ai_adapter import SmartAIModel, MODEL_SEQUENCE
+from ..infrastructure.adapters.circuit_breaker import CircuitBreaker
+from ..infrastructure.adapters.concurrency_limit import ConcurrencyLimitedModel
+from ..infrastructure.adapters.direct_ollama_adapter import DirectOllamaModel
+from ..infrastructure.adapters.http_transport import HttpTransport, set_shared_transport
+from ..infrastructure.adapters.hedging import HedgingPolicy
+from ..infrastructure.adapters.tiktoken_tokenizer import create_tokenizer
+from ..infrastructure.adapters.conversation_store import JsonlConversationStore
+from ..infrastructure.adapters.message_codec import dumps as encode_json
+from ..infrastructure.adapters.response_cache import CachedAIModel, MemoryLRUCache, SQLiteResponseStore
+from ..infrastructure.config.settings import settings
+
+
+class AppServices:
+    """Serviços da aplicação montados a partir das configurações."""
+
+    def __init__(self):
+        """Monta o transporte HTTP, o modelo de IA, os caches, as sessões e o caso de uso."""
+        # Transporte HTTP com pool de conexões compartilhado por todos os provedores
+        self.http_transport = HttpTransport(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            connect_timeout=settings.HTTP_CONNECT_TIMEOUT,
+            read_timeout=settings.HTTP_READ_TIMEOUT
+        )
+        set_shared_transport(self.http_transport)
+
+        self.ai_model = self._build_ai_model()
+
+        self.answer_cache: Optional[AnswerCache] = None
+        if settings.SEMANTIC_CACHE_ENABLED:
+            from ..infrastructure.adapters.semantic_cache import SemanticResponseCache
+            print("🧠 Cache semântico ativado.")
+            self.answer_cache = SemanticResponseCache(
+                threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+                max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+                path=settings.SEMANTIC_CACHE_PATH
+            )
+
+        self.history_summarizer: Optional[HistorySummarizer] = None
+        if settings.HISTORY_SUMMARY_ENABLED:
+            self.history_summarizer = HistorySummarizer(
+                self.ai_model,
+                max_words=settings.HISTORY_SUMMARY_MAX_WORDS
+            )
+
+        self.process_message_use_case = ProcessMessageUseCase(
+            ai_model=self.ai_model,
+            answer_cache=self.answer_cache,
+            context_window=ContextWindow(create_tokenizer(settings.CONTEXT_TOKENIZER)),
+            history_compactor=self.history_summarizer
+        )
+
+        self.conversation_store: Optional[JsonlConversationStore] = None
+        if settings.CONVERSATION_STORE_ENABLED:
+            self.conversation_store = JsonlConversationStore(
+                settings.CONVERSATION_STORE_PATH,
+                batch_size=settings.CONVERSATION_STORE_BATCH_SIZE,
+                flush_interval=settings.CONVERSATION_STORE_FLUSH_INTERVAL
+            )
+
+        self.session_manager = SessionManager(
+            max_sessions=settings.SESSION_MAX_SESSIONS,
+            max_total_chars=settings.SESSION_MAX_TOTAL_CHARS,
+            idle_ttl=settings.SESSION_IDLE_TTL,
+            store=self.conversation_store
+        )
+
+    def _build_ai_model(self) -> AIModel:
+        """Cria o modelo de IA conforme a configuração."""
+        if settings.OLLAMA_ENABLED:
+            print("🦙 Usando Ollama diretamente...")
+            ai_model = DirectOllamaModel(
+                model_name=settings.OLLAMA_MODEL,
+                base_url=settings.OLLAMA_BASE_URL,
+                transport=self.http_transport,
+                health_ttl=settings.OLLAMA_HEALTH_TTL,
+                health_refresh_interval=settings.OLLAMA_HEALTH_REFRESH_INTERVAL,
+                context_budget=settings.CONTEXT_BUDGET_OLLAMA or None
+            )
+            ai_model.start_health_monitor()
+            if settings.PROVIDER_CONCURRENCY_OLLAMA > 0:
+                ai_model = ConcurrencyLimitedModel(ai_model, settings.PROVIDER_CONCURRENCY_OLLAMA)
+        else:
+            print("🤖 Usando sistema de fallback inteligente...")
+            hedging_policy = None
+            if settings.HEDGING_ENABLED:
+                hedging_policy = HedgingPolicy(
+                    percentile=settings.HEDGING_PERCENTILE,
+                    initial_delay=settings.HEDGING_INITIAL_DELAY
+                )
+            breakers = {
+                name: CircuitBreaker(
+                    failure_rate_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+                    window_size=settings.CIRCUIT_WINDOW_SIZE,
+                    min_calls=settings.CIRCUIT_MIN_CALLS,
+                    open_seconds=settings.CIRCUIT_OPEN_SECONDS
+                )
+                for name in MODEL_SEQUENCE
+            }
+            ai_model = SmartAIModel(
+                openai_api_key=settings.OPENAI_API_KEY,
+                deepseek_api_key=settings.DEEPSEEK_API_KEY,
+                transport=self.http_transport,
+                hedging_policy=hedging_policy,
+                breakers=breakers,
+                context_budgets={
+                    name: budget
+                    for name, budget in (
+                        ("openai", settings.CONTEXT_BUDGET_OPENAI),
+                        ("deepseek", settings.CONTEXT_BUDGET_DEEPSEEK),
+                        ("ollama", settings.CONTEXT_BUDGET_OLLAMA),
+                    )
+                    if budget > 0
+                },
+                base_urls={
+                    "openai": settings.OPENAI_BASE_URL,
+                    "deepseek": settings.DEEPSEEK_BASE_URL,
+                    "ollama": settings.OLLAMA_BASE_URL,
+                },
+                concurrency_limits={
+                    "openai": settings.PROVIDER_CONCURRENCY_OPENAI,
+                    "deepseek": settings.PROVIDER_CONCURRENCY_DEEPSEEK,
+                    "ollama": settings.PROVIDER_CONCURRENCY_OLLAMA,
+                }
+            )
+
+        if settings.RESPONSE_CACHE_ENABLED:
+            print("🗃️  Cache de respostas ativado.")
+            ai_model = CachedAIModel(
+                ai_model,
+                memory=MemoryLRUCache(
+                    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+                    ttl=settings.RESPONSE_CACHE_TTL
+                ),
+                store=SQLiteResponseStore(settings.RESPONSE_CACHE_PATH, ttl=settings.RESPONSE_CACHE_TTL)
+            )
+        return ai_model
+
+    def is_ready(self) -> bool:
+        """Indica se há algum provedor de IA em condições de atender."""
+        monitor = getattr(self.ai_model, "health_monitor", None)
+        if monitor is not None:
+            return monitor.is_available()
+        breakers = getattr(self.ai_model, "breakers", None)
+        if breakers:
+            return any(breaker.is_available() for breaker in breakers.values())
+        return True
+
+    def close(self) -> None:
+        """Grava o que está pendente e encerra os serviços em segundo plano."""
+        if self.conversation_store is not None:
+            self.session_manager.flush()
+            self.conversation_store.close()
+        if self.answer_cache is not None:
+            self.answer_cache.save()
+        if self.history_summarizer is not None:
+            self.history_summarizer.shutdown(wait=False)
+
+
+def new_prompt_builder() -> PromptBuilder:
+    """Cria o montador de prompt de uma sessão, com o codec JSON mais rápido disponível."""
+    return PromptBuilder(encoder=encode_json)
@@ -1,15 +1,31 @@
 """Módulo que contém a interface de linha de comando da aplicação."""
 import sys
 import time
+from concurrent.futures import Future
 from typing import List, Optional
 
 from ...domain.entities.message import Message, MessageRole
-from ...domain.use_cases.process_message import ProcessMessageUseCase, ProcessMessageInput
-from ...infrastructure.adapters.smart_ai_adapter import SmartAIModel
-from ...infrastructure.adapters.direct_ollama_adapter import DirectOllamaModel
+from ...domain.use_cases.process_message import ProcessMessageInput
+from ...infrastructure.adapters.speech_recognizer import create_speech_recognizer
+from ...infrastructure.adapters.tts_cache import SpeechAudioCache
+from ...infrastructure.adapters.tts_worker import SpeechPriority
 from ...infrastructure.adapters.voice_input import VoiceInputAdapter
 from ...infrastructure.adapters.voice_output import VoiceOutputAdapter
 from ...infrastructure.config.settings import settings
+from ...infrastructure.metrics.instruments import cache_hit_rates
+from ...infrastructure.metrics.registry import metrics
+from ..adapters.sentence_speech_pipeline import SentenceSpeechPipeline
+from ..bootstrap import AppServices, new_prompt_builder
+
+# Frases fixas faladas pela aplicação (pré-renderizadas no cache de áudio)
+WELCOME_PROMPT = "Bem-vindo ao assistente de atendimento por voz. Como posso ajudar?"
+FAREWELL_PROMPT = "Obrigado por utilizar nosso atendimento. Até mais!"
+INTERRUPTED_PROMPT = "Atendimento interrompido."
+MESSAGE_ERROR_PROMPT = "Desculpe, ocorreu um erro ao processar sua mensagem."
+UNEXPECTED_ERROR_PROMPT = "Desculpe, ocorreu um erro inesperado."
+FIXED_PROMPTS = (
+    WELCOME_PROMPT, FAREWELL_PROMPT, INTERRUPTED_PROMPT, MESSAGE_ERROR_PROMPT, UNEXPECTED_ERROR_PROMPT
+)
 
 
 class CLIApp:
@@ -17,37 +33,65 @@ class CLIApp:
     
     def __init__(self):
         """Inicializa a aplicação com as dependências necessárias."""
-        # Inicializa o modelo de IA baseado na configuração
-        if settings.OLLAMA_ENABLED:
-            print("🦙 Usando Ollama diretamente...")
-            self.ai_model = DirectOllamaModel(
-                model_name=settings.OLLAMA_MODEL,
-                base_url=settings.OLLAMA_BASE_URL
-            )
-        else:
-            print("🤖 Usando sistema de fallback inteligente...")
-            self.ai_model = SmartAIModel(
-                openai_api_key=settings.OPENAI_API_KEY,
-                deepseek_api_key=settings.DEEPSEEK_API_KEY
-            )
-        
-        # Inicializa o caso de uso
-        self.process_message_use_case = ProcessMessageUseCase(ai_model=self.ai_model)
+        # Serviços compartilhados (modelo de IA, caches, sessões e caso de uso)
+        self.services = AppServices()
+        self.http_transport = self.services.http_transport
+        self.ai_model = self.services.ai_model
+        self.answer_cache = self.services.answer_cache
+        self.history_summarizer = self.services.history_summarizer
+        self.process_message_use_case = self.services.process_message_use_case
+        self.conversation_store = self.services.conversation_store
+        self.session_manager = self.services.session_manager
         
         # Inicializa os adaptadores de entrada/saída de voz
         self.voice_input = VoiceInputAdapter(
             language=settings.VOICE_LANGUAGE,
             energy_threshold=settings.SPEECH_ENERGY_THRESHOLD,
-            pause_threshold=settings.SPEECH_PAUSE_THRESHOLD
+            pause_threshold=settings.SPEECH_PAUSE_THRESHOLD,
+            endpointer=settings.SPEECH_ENDPOINTER,
+            vad_hangover_ms=settings.SPEECH_VAD_HANGOVER_MS,
+            speech_recognizer=create_speech_recognizer(
+                settings.ASR_BACKEND,
+                vosk_model_path=settings.ASR_VOSK_MODEL_PATH,
+                whispercpp_binary=settings.ASR_WHISPERCPP_BINARY,
+                whispercpp_model=settings.ASR_WHISPERCPP_MODEL
+            ),
+            persistent_capture=settings.SPEECH_PERSISTENT_CAPTURE,
+            capture_preroll=settings.SPEECH_CAPTURE_PREROLL_MS / 1000,
+            capture_buffer_seconds=settings.SPEECH_CAPTURE_BUFFER_SECONDS
         )
         
+        audio_cache = None
+        if settings.TTS_CACHE_ENABLED:
+            audio_cache = SpeechAudioCache(
+                settings.TTS_CACHE_DIR,
+                max_bytes=int(settings.TTS_CACHE_MAX_MB * 1024 * 1024)
+            )
         self.voice_output = VoiceOutputAdapter(
             rate=settings.VOICE_RATE,
-            volume=settings.VOICE_VOLUME
+            volume=settings.VOICE_VOLUME,
+            audio_cache=audio_cache
         )
+        # Pré-renderiza as frases fixas enquanto a aplicação inicia
+        extra_prompts = [prompt.strip() for prompt in settings.TTS_PRERENDER_PROMPTS.split("|")]
+        self.voice_output.prerender([*FIXED_PROMPTS, *extra_prompts])
         
-        # Histórico da conversa
-        self.conversation_history: List[Message] = []
+        # Pipeline que agenda cada frase no worker de fala enquanto o modelo gera as seguintes
+        self.speech_pipeline = SentenceSpeechPipeline(speak=self.speak_sentence)
+        
+        # A CLI atende um único chamador, na sessão "cli"
+        self.session_id = "cli"
+    
+    @property
+    def conversation_history(self) -> List[Message]:
+        """Histórico da conversa da sessão atual."""
+        return self.session_manager.get(self.session_id).history
+    
+    @conversation_history.setter
+    def conversation_history(self, history: List[Message]) -> None:
+        # Recomeça a sessão, para que o armazenamento também descarte o histórico anterior
+        self.session_manager.delete(self.session_id)
+        self.session_manager.append(self.session_id, *history)
     
     def print_banner(self) -> None:
         """Exibe o banner de boas-vindas da aplicação."""
@@ -69,6 +113,7 @@ class CLIApp:
         - texto: Digitar uma mensagem
         - historico: Ver histórico da conversa
         - limpar: Limpar o histórico da conversa
+        - metricas: Ver métricas de desempenho (latências, erros e caches)
         - ajuda: Mostrar esta ajuda
         - sair: Encerrar o atendimento
         """
@@ -94,6 +139,8 @@ class CLIApp:
     
     def process_voice_command(self) -> Optional[str]:
         """Processa um comando de voz do usuário."""
+        # Espera a fala anterior terminar, para o microfone não captar a própria resposta
+        self.voice_output.flush()
         print("Ouvindo... (pressione Ctrl+C para cancelar)")
         try:
             success, text = self.voice_input.listen()
@@ -120,20 +167,43 @@ class CLIApp:
             print(f"{i}. [{role}] {msg.content}")
         print("===========================\n")
     
+    def show_metrics(self) -> None:
+        """Exibe as métricas de desempenho coletadas desde o início do atendimento."""
+        lines = metrics.summary_lines()
+        if not lines:
+            print("Nenhuma métrica coletada ainda.")
+            return
+
+        print("\n=== Métricas de Desempenho ===")
+        for line in lines:
+            print(line)
+        for cache, rate in sorted(cache_hit_rates().items()):
+            print(f"Taxa de acerto do cache {cache}: {rate:.1%}")
+        print("==============================\n")
+
     def clear_conversation_history(self) -> None:
         """Limpa o histórico da conversa."""
-        self.conversation_history.clear()
+        self.conversation_history = []
         print("Histórico da conversa limpo com sucesso!")
     
+    def speak_sentence(self, sentence: str) -> None:
+        """Agenda a fala de uma frase da resposta sem esperar o áudio terminar."""
+        self.voice_output.speak_async(sentence).add_done_callback(_warn_speech_failure)
+    
     def process_user_message(self, user_message: str) -> None:
         """Processa uma mensagem do usuário e obtém uma resposta da IA."""
         if not user_message:
             return
             
         # Prepara a entrada para o caso de uso
+        session = self.session_manager.get(self.session_id)
+        if session.prompt_builder is None:
+            session.prompt_builder = new_prompt_builder()
         input_data = ProcessMessageInput(
             user_message=user_message,
-            conversation_history=self.conversation_history,
+            conversation_history=session.history,
+            prompt_builder=session.prompt_builder,
+            session=session,
             model_kwargs={
                 "max_tokens": settings.OPENAI_MAX_TOKENS,
                 "temperature": settings.OPENAI_TEMPERATURE
@@ -141,32 +211,38 @@ class CLIApp:
         )
         
         try:
-            # Executa o caso de uso
-            output = self.process_message_use_case.execute(input_data)
-            
-            # Adiciona as mensagens ao histórico
-            self.conversation_history.append(output.user_message)
-            self.conversation_history.append(output.assistant_message)
+            if settings.VOICE_STREAMING:
+                # Executa o caso de uso falando cada frase assim que é gerada
+                output = self.speech_pipeline.run(
+                    lambda on_delta: self.process_message_use_case.execute_streaming(input_data, on_delta)
+                )
+            else:
+                # Executa o caso de uso e agenda a fala da resposta completa;
+                # o próximo comando é lido enquanto o áudio toca
+                output = self.process_message_use_case.execute(input_data)
+                self.voice_output.speak_async(output.response)
             
-            # Fala a resposta
-            self.voice_output.speak(output.response)
+            # Adiciona as mensagens ao histórico da sessão
+            self.session_manager.append(self.session_id, output.user_message, output.assistant_message)
             
         except Exception as e:
             error_msg = f"Desculpe, ocorreu um erro ao processar sua mensagem: {str(e)}"
             print(f"Erro: {error_msg}")
-            self.voice_output.speak("Desculpe, ocorreu um erro ao processar sua mensagem.")
+            # Descarta as frases já agendadas da resposta que falhou
+            self.voice_output.cancel()
+            self.voice_output.speak_async(MESSAGE_ERROR_PROMPT, SpeechPriority.URGENT, preempt=True)
     
     def run(self) -> None:
         """Executa o loop principal da aplicação."""
         self.print_banner()
-        self.voice_output.speak("Bem-vindo ao assistente de atendimento por voz. Como posso ajudar?")
+        self.voice_output.speak_async(WELCOME_PROMPT)
         
         while True:
             try:
                 command = self.listen_for_command()
                 
                 if command == "sair" or command == "exit" or command == "quit":
-                    self.voice_output.speak("Obrigado por utilizar nosso atendimento. Até mais!")
+                    self.voice_output.speak(FAREWELL_PROMPT)
                     print("Atendimento encerrado.")
                     break
                     
@@ -188,6 +264,9 @@ class CLIApp:
                     
                 elif command == "limpar" or command == "clear" or command == "limpar historico":
                     self.clear_conversation_history()
+
+                elif command == "metricas" or command == "métricas" or command == "metrics":
+                    self.show_metrics()
                     
                 elif command:
                     print(f"Comando não reconhecido: {command}")
@@ -195,7 +274,8 @@ class CLIApp:
                 
             except KeyboardInterrupt:
                 print("\nAtendimento interrompido pelo usuário.")
-                self.voice_output.speak("Atendimento interrompido.")
+                self.voice_output.cancel()
+                self.voice_output.speak(INTERRUPTED_PROMPT)
                 break
                 
             except Exception as e:
@@ -203,7 +283,17 @@ class CLIApp:
                 if settings.DEBUG:
                     import traceback
                     traceback.print_exc()
-                self.voice_output.speak("Desculpe, ocorreu um erro inesperado.")
+                self.voice_output.speak_async(UNEXPECTED_ERROR_PROMPT, SpeechPriority.URGENT, preempt=True)
+        
+        self.voice_input.close()
+        self.voice_output.close()
+        self.services.close()
+
+
+def _warn_speech_failure(future: Future) -> None:
+    """Avisa sobre uma frase agendada que não pôde ser falada."""
+    if not future.cancelled() and future.exception() is not None:
+        print(f"⚠️  Não foi possível falar a frase: {str(future.exception())}")
 
 
 def main():
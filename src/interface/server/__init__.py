@@ -0,0 +1 @@
+"""Módulo que contém o servidor HTTP/WebSocket do sistema."""
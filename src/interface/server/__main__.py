@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+"""Ponto de entrada do servidor HTTP/WebSocket (python -m src.interface.server)."""
+import sys
+
+from .server import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,509 @@
+"""Módulo que contém o servidor HTTP/WebSocket das conversas.
+
+O servidor usa apenas o asyncio da biblioteca padrão: cada conexão é uma
+corrotina no mesmo loop de eventos, de modo que muitos turnos de conversa
+esperam o provedor de IA ao mesmo tempo sem uma thread por chamador.
+
+Rotas:
+    GET    /health                  vivacidade do processo
+    GET    /ready                   prontidão (provedor disponível e servidor aceitando turnos)
+    GET    /metrics                 métricas no formato de texto do Prometheus
+    GET    /sessions/{id}           histórico da sessão
+    DELETE /sessions/{id}           descarta a sessão
+    POST   /sessions/{id}/messages  turno completo em JSON: {"message": "..."}
+    GET    /sessions/{id}/stream    WebSocket: envia {"message": "..."}, recebe trechos da resposta
+"""
+import asyncio
+import functools
+import re
+import signal
+import weakref
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from ...domain.entities.message import Message
+from ...domain.services.prompt_builder import PromptBuilder
+from ...domain.services.session_manager import SessionManager
+from ...domain.use_cases.process_message import ProcessMessageInput, ProcessMessageUseCase
+from ...infrastructure.adapters.message_codec import dumps, loads
+from ...infrastructure.config.settings import settings
+from ...infrastructure.metrics.registry import metrics
+from ..bootstrap import AppServices, new_prompt_builder
+from .websocket import CLOSE_GOING_AWAY, CLOSE_NORMAL, WebSocket, WebSocketClosed, accept_key
+
+SESSION_PATH = re.compile(r"^/sessions/([A-Za-z0-9_.:-]{1,128})(/messages|/stream)?$")
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    426: "Upgrade Required",
+    431: "Request Header Fields Too Large",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    """Erro que vira uma resposta HTTP com o status e a mensagem informados."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class HttpRequest:
+    """Requisição HTTP já lida da conexão."""
+    method: str
+    path: str
+    headers: Dict[str, str]
+    body: bytes
+    keep_alive: bool
+
+    @property
+    def is_websocket(self) -> bool:
+        """Indica se a requisição pede a troca para o protocolo WebSocket."""
+        return self.headers.get("upgrade", "").lower() == "websocket"
+
+
+class ConversationServer:
+    """Servidor HTTP/WebSocket que atende turnos de conversa com o ProcessMessageUseCase.
+
+    Os turnos de uma mesma sessão são atendidos em ordem (um por vez); turnos
+    de sessões diferentes correm em paralelo no loop de eventos.
+    """
+
+    def __init__(
+        self,
+        use_case: ProcessMessageUseCase,
+        session_manager: SessionManager,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        readiness: Optional[Callable[[], bool]] = None,
+        model_kwargs: Optional[dict] = None,
+        prompt_builder_factory: Optional[Callable[[], PromptBuilder]] = None,
+        max_body_bytes: int = 64 * 1024,
+        evict_interval: float = 60.0
+    ):
+        """Inicializa o servidor.
+
+        Args:
+            use_case: Caso de uso que processa cada turno.
+            session_manager: Gerenciador das sessões de conversa.
+            host: Endereço em que o servidor escuta.
+            port: Porta em que o servidor escuta (0 escolhe uma porta livre).
+            readiness: Função que indica se há provedor de IA disponível (para /ready).
+            model_kwargs: Parâmetros padrão do modelo (ex.: max_tokens, temperature).
+            prompt_builder_factory: Cria o montador de prompt de cada sessão.
+            max_body_bytes: Tamanho máximo do corpo de uma requisição ou mensagem WebSocket.
+            evict_interval: Intervalo, em segundos, entre despejos de sessões ociosas (0 desativa).
+        """
+        self.use_case = use_case
+        self.session_manager = session_manager
+        self.host = host
+        self.readiness = readiness
+        self.model_kwargs = model_kwargs or {}
+        self.prompt_builder_factory = prompt_builder_factory
+        self.max_body_bytes = max_body_bytes
+        self.evict_interval = evict_interval
+
+        self._port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+        self._session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self._evict_task: Optional[asyncio.Task] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._active_turns = 0
+        self._draining = False
+
+    @property
+    def port(self) -> int:
+        """Porta em que o servidor escuta (a escolhida pelo sistema, se a configurada era 0)."""
+        return self._port
+
+    async def start(self) -> None:
+        """Começa a aceitar conexões."""
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._draining = False
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self._port)
+        self._port = self._server.sockets[0].getsockname()[1]
+        if self.evict_interval > 0:
+            self._evict_task = asyncio.ensure_future(self._evict_periodically())
+
+    async def stop(self, grace: float = 10.0) -> None:
+        """Para de aceitar turnos, espera os que estão em andamento e fecha as conexões.
+
+        Args:
+            grace: Tempo máximo, em segundos, de espera pelos turnos em andamento.
+        """
+        if self._server is None:
+            return
+        self._draining = True
+        self._server.close()
+        if self._evict_task is not None:
+            self._evict_task.cancel()
+            self._evict_task = None
+        try:
+            await asyncio.wait_for(self._idle.wait(), grace)
+        except asyncio.TimeoutError:
+            pass
+        connections = list(self._connections)
+        for task in connections:
+            task.cancel()
+        if connections:
+            await asyncio.gather(*connections, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+
+    async def serve_forever(self) -> None:
+        """Atende até receber SIGINT/SIGTERM e então encerra com elegância."""
+        await self.start()
+        print(f"🌐 Servidor ouvindo em http://{self.host}:{self.port}")
+        stopped = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, stopped.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows: o KeyboardInterrupt encerra o loop
+        try:
+            await stopped.wait()
+        finally:
+            print("Encerrando o servidor...")
+            await self.stop()
+
+    # Conexões HTTP
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Atende as requisições de uma conexão (HTTP/1.1 com keep-alive)."""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while not self._draining:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as e:
+                    await self._respond(writer, e.status, {"error": e.message}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                if request.is_websocket:
+                    await self._serve_websocket(request, reader, writer)
+                    break
+                status, body = await self._dispatch(request)
+                keep_alive = request.keep_alive and not self._draining
+                await self._respond(writer, status, body, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[HttpRequest]:
+        """Lê a próxima requisição da conexão.
+
+        Returns:
+            A requisição, ou None se o cliente fechou a conexão.
+
+        Raises:
+            HttpError: Se a requisição for inválida ou grande demais.
+        """
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(431, "Cabeçalhos grandes demais")
+
+        lines = head.decode("latin-1").split("\r\n")
+        request_line = lines[0].split(" ")
+        if len(request_line) != 3 or not request_line[2].startswith("HTTP/"):
+            raise HttpError(400, "Linha de requisição inválida")
+        method, target, version = request_line
+
+        headers = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, separator, value = line.partition(":")
+            if not separator:
+                raise HttpError(400, "Cabeçalho inválido")
+            headers[name.strip().lower()] = value.strip()
+
+        body = b""
+        if method in ("POST", "PUT", "PATCH"):
+            length = headers.get("content-length")
+            if length is None or not length.isdigit():
+                raise HttpError(411, "Content-Length obrigatório")
+            if int(length) > self.max_body_bytes:
+                raise HttpError(413, f"Corpo maior que o limite de {self.max_body_bytes} bytes")
+            body = await reader.readexactly(int(length))
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return HttpRequest(method, target.split("?", 1)[0], headers, body, keep_alive)
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, body: Any, keep_alive: bool) -> None:
+        """Escreve uma resposta JSON (ou texto, se o corpo for uma string)."""
+        if isinstance(body, str):
+            payload, content_type = body.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            payload, content_type = dumps(body), "application/json"
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("ascii") + payload)
+        await writer.drain()
+
+    async def _dispatch(self, request: HttpRequest) -> Tuple[int, Any]:
+        """Encaminha a requisição para a rota correspondente.
+
+        Returns:
+            Tupla (status, corpo da resposta).
+        """
+        try:
+            if request.path == "/health":
+                self._require_method(request, "GET")
+                return 200, {"status": "ok"}
+            if request.path == "/ready":
+                self._require_method(request, "GET")
+                return self._ready()
+            if request.path == "/metrics":
+                self._require_method(request, "GET")
+                return 200, metrics.to_prometheus()
+
+            match = SESSION_PATH.match(request.path)
+            if match is None:
+                raise HttpError(404, "Rota não encontrada")
+            session_id, action = match.groups()
+            if action is None:
+                self._require_method(request, "GET", "DELETE")
+                if request.method == "GET":
+                    return 200, await self._get_session(session_id)
+                return 200, await self._delete_session(session_id)
+            if action == "/messages":
+                self._require_method(request, "POST")
+                return 200, await self._post_message(session_id, request.body)
+            raise HttpError(426, "Esta rota exige uma conexão WebSocket")
+        except HttpError as e:
+            return e.status, {"error": e.message}
+
+    @staticmethod
+    def _require_method(request: HttpRequest, *methods: str) -> None:
+        if request.method not in methods:
+            raise HttpError(405, f"Método {request.method} não permitido nesta rota")
+
+    # Rotas
+
+    def _ready(self) -> Tuple[int, Any]:
+        """Prontidão: falha durante o encerramento ou sem provedor de IA disponível."""
+        if self._draining:
+            status = "draining"
+        elif self.readiness is not None and not self.readiness():
+            status = "unavailable"
+        else:
+            status = "ready"
+        return (200 if status == "ready" else 503), {"status": status, "active_turns": self._active_turns}
+
+    async def _get_session(self, session_id: str) -> Dict[str, Any]:
+        session = await self._call_sessions(self.session_manager.find, session_id)
+        if session is None:
+            raise HttpError(404, f"Sessão {session_id} não encontrada")
+        return {
+            "session_id": session.session_id,
+            "history": Message.to_dicts(session.history),
+            "summary": session.summary,
+            "preferred_provider": session.preferred_provider,
+        }
+
+    async def _delete_session(self, session_id: str) -> Dict[str, Any]:
+        async with self._session_lock(session_id):
+            await self._call_sessions(self.session_manager.delete, session_id)
+        return {"session_id": session_id, "deleted": True}
+
+    async def _post_message(self, session_id: str, body: bytes) -> Dict[str, Any]:
+        message, model_kwargs = self._parse_turn(body)
+        try:
+            response = await self._run_turn(session_id, message, model_kwargs)
+        except HttpError:
+            raise
+        except Exception as e:
+            raise HttpError(502, f"Erro ao processar a mensagem: {str(e)}")
+        return {"session_id": session_id, "response": response}
+
+    async def _serve_websocket(
+        self,
+        request: HttpRequest,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """Conclui o aperto de mão WebSocket e atende turnos com a resposta em trechos.
+
+        Cada mensagem recebida ({"message": "..."}) gera mensagens
+        {"type": "delta", "text": ...} à medida que o modelo responde e, ao
+        final, {"type": "done", "response": ...} ou {"type": "error", "error": ...}.
+        """
+        match = SESSION_PATH.match(request.path)
+        key = request.headers.get("sec-websocket-key")
+        if request.method != "GET" or match is None or match.group(2) != "/stream":
+            await self._respond(writer, 404, {"error": "Rota WebSocket não encontrada"}, keep_alive=False)
+            return
+        if not key or request.headers.get("sec-websocket-version") != "13":
+            await self._respond(writer, 400, {"error": "Aperto de mão WebSocket inválido"}, keep_alive=False)
+            return
+
+        writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept_key(key)}\r\n\r\n"
+        ).encode("ascii"))
+        await writer.drain()
+
+        websocket = WebSocket(reader, writer, max_message_bytes=self.max_body_bytes)
+        session_id = match.group(1)
+
+        async def send(event: Dict[str, Any]) -> None:
+            await websocket.send_text(dumps(event).decode("utf-8"))
+
+        async def send_delta(text: str) -> None:
+            await send({"type": "delta", "text": text})
+
+        try:
+            while not self._draining:
+                text = await websocket.receive_text()
+                if text is None:
+                    break
+                try:
+                    message, model_kwargs = self._parse_turn(text.encode("utf-8"))
+                    response = await self._run_turn(session_id, message, model_kwargs, send_delta)
+                except WebSocketClosed:
+                    raise
+                except HttpError as e:
+                    await send({"type": "error", "error": e.message})
+                except Exception as e:
+                    await send({"type": "error", "error": f"Erro ao processar a mensagem: {str(e)}"})
+                else:
+                    await send({"type": "done", "response": response})
+        except WebSocketClosed:
+            pass
+        finally:
+            await websocket.close(CLOSE_GOING_AWAY if self._draining else CLOSE_NORMAL)
+
+    # Turnos
+
+    def _parse_turn(self, body: bytes) -> Tuple[str, dict]:
+        """Extrai a mensagem do usuário e os parâmetros do modelo do corpo JSON."""
+        try:
+            data = loads(body)
+        except ValueError:
+            raise HttpError(400, "Corpo JSON inválido")
+        if not isinstance(data, dict):
+            raise HttpError(400, "O corpo deve ser um objeto JSON")
+        message = data.get("message")
+        if not isinstance(message, str) or not message.strip():
+            raise HttpError(400, "Campo 'message' obrigatório")
+        model_kwargs = dict(self.model_kwargs)
+        for name in ("max_tokens", "temperature"):
+            if name in data:
+                if not isinstance(data[name], (int, float)) or isinstance(data[name], bool):
+                    raise HttpError(400, f"Campo '{name}' deve ser numérico")
+                model_kwargs[name] = data[name]
+        return message.strip(), model_kwargs
+
+    async def _run_turn(
+        self,
+        session_id: str,
+        message: str,
+        model_kwargs: dict,
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> str:
+        """Processa um turno da sessão e acrescenta as mensagens ao histórico.
+
+        Raises:
+            HttpError: Se o servidor estiver encerrando.
+        """
+        async with self._session_lock(session_id):
+            if self._draining:
+                raise HttpError(503, "Servidor em encerramento")
+            self._active_turns += 1
+            self._idle.clear()
+            try:
+                session = await self._call_sessions(self.session_manager.get, session_id)
+                if session.prompt_builder is None and self.prompt_builder_factory is not None:
+                    session.prompt_builder = self.prompt_builder_factory()
+                input_data = ProcessMessageInput(
+                    user_message=message,
+                    conversation_history=session.history,
+                    prompt_builder=session.prompt_builder,
+                    session=session,
+                    model_kwargs=model_kwargs
+                )
+                if on_delta is None:
+                    output = await self.use_case.aexecute(input_data)
+                else:
+                    output = await self.use_case.aexecute_streaming(input_data, on_delta)
+
+                await self._call_sessions(
+                    self.session_manager.append, session_id, output.user_message, output.assistant_message
+                )
+                return output.response
+            finally:
+                self._active_turns -= 1
+                if self._active_turns == 0:
+                    self._idle.set()
+
+    def _session_lock(self, session_id: str) -> asyncio.Lock:
+        """Trava dos turnos da sessão; descartada quando nenhum turno a usa."""
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = self._session_locks[session_id] = asyncio.Lock()
+        return lock
+
+    async def _call_sessions(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Chama o gerenciador de sessões; com armazenamento em disco, fora do loop de eventos."""
+        if self.session_manager.store is None:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args))
+
+    async def _evict_periodically(self) -> None:
+        """Despeja periodicamente as sessões ociosas."""
+        while True:
+            await asyncio.sleep(self.evict_interval)
+            await self._call_sessions(self.session_manager.evict_idle)
+
+
+def main() -> int:
+    """Função principal que inicia o servidor."""
+    services = AppServices()
+    server = ConversationServer(
+        services.process_message_use_case,
+        services.session_manager,
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        readiness=services.is_ready,
+        model_kwargs={
+            "max_tokens": settings.OPENAI_MAX_TOKENS,
+            "temperature": settings.OPENAI_TEMPERATURE
+        },
+        prompt_builder_factory=new_prompt_builder
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\nServidor interrompido pelo usuário.")
+    finally:
+        services.close()
+    return 0
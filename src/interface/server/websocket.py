@@ -0,0 +1,251 @@
+"""Módulo que contém uma implementação mínima do protocolo WebSocket (RFC 6455) sobre asyncio."""
+import asyncio
+import base64
+import hashlib
+import os
+import struct
+from typing import Optional, Tuple
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OPCODE_CONTINUATION = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+CLOSE_NORMAL = 1000
+CLOSE_GOING_AWAY = 1001
+CLOSE_PROTOCOL_ERROR = 1002
+CLOSE_INVALID_DATA = 1007
+CLOSE_TOO_BIG = 1009
+
+
+class WebSocketClosed(Exception):
+    """A conexão WebSocket foi encerrada."""
+
+
+class WebSocketProtocolError(Exception):
+    """O outro lado violou o protocolo WebSocket."""
+
+
+def accept_key(client_key: str) -> str:
+    """Calcula o valor de Sec-WebSocket-Accept para a chave enviada pelo cliente."""
+    digest = hashlib.sha1((client_key + WEBSOCKET_GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def encode_frame(opcode: int, payload: bytes, mask: bool = False) -> bytes:
+    """Monta um quadro WebSocket final (FIN=1).
+
+    Args:
+        opcode: Tipo do quadro.
+        payload: Conteúdo do quadro.
+        mask: Se True, mascara o conteúdo (obrigatório para quadros enviados pelo cliente).
+    """
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    length = len(payload)
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 65536:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", length)
+    if mask:
+        key = os.urandom(4)
+        header += key
+        payload = _apply_mask(payload, key)
+    return bytes(header) + payload
+
+
+def _apply_mask(payload: bytes, key: bytes) -> bytes:
+    """Aplica (ou remove) a máscara XOR de 4 bytes."""
+    if not payload:
+        return payload
+    repeated = (key * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(len(payload), "big")
+
+
+async def read_frame(
+    reader: asyncio.StreamReader,
+    max_size: int,
+    masked: Optional[bool] = None
+) -> Tuple[bool, int, bytes]:
+    """Lê um quadro WebSocket.
+
+    Args:
+        reader: Stream de leitura da conexão.
+        max_size: Tamanho máximo do conteúdo do quadro.
+        masked: Se informado, exige (True) ou proíbe (False) a máscara no quadro;
+            o servidor só aceita quadros mascarados e o cliente, sem máscara.
+
+    Returns:
+        Tupla (fin, opcode, conteúdo já sem máscara).
+
+    Raises:
+        WebSocketClosed: Se a conexão terminar no meio do quadro.
+        WebSocketProtocolError: Se a máscara do quadro não for a esperada.
+        ValueError: Se o quadro passar de max_size bytes.
+    """
+    try:
+        first, second = await reader.readexactly(2)
+        if masked is not None and bool(second & 0x80) != masked:
+            raise WebSocketProtocolError("Quadro WebSocket com máscara inválida para este lado da conexão")
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", await reader.readexactly(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", await reader.readexactly(8))
+        if length > max_size:
+            raise ValueError(f"Quadro WebSocket maior que o limite de {max_size} bytes")
+        key = await reader.readexactly(4) if second & 0x80 else None
+        payload = await reader.readexactly(length)
+    except (asyncio.IncompleteReadError, ConnectionError) as e:
+        raise WebSocketClosed(str(e))
+    if key is not None:
+        payload = _apply_mask(payload, key)
+    return bool(first & 0x80), first & 0x0F, payload
+
+
+class WebSocket:
+    """Ponta WebSocket sobre um par de streams do asyncio.
+
+    Responde a pings automaticamente, junta mensagens fragmentadas e conclui
+    o aperto de mão de encerramento.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        mask_outgoing: bool = False,
+        max_message_bytes: int = 1024 * 1024
+    ):
+        """Inicializa a ponta WebSocket.
+
+        Args:
+            reader: Stream de leitura da conexão.
+            writer: Stream de escrita da conexão.
+            mask_outgoing: True do lado do cliente (quadros enviados precisam de máscara).
+            max_message_bytes: Tamanho máximo de uma mensagem recebida.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.mask_outgoing = mask_outgoing
+        self.max_message_bytes = max_message_bytes
+        self.closed = False
+        self._write_lock = asyncio.Lock()
+
+    async def receive_text(self) -> Optional[str]:
+        """Recebe a próxima mensagem de texto.
+
+        Violações do protocolo encerram a conexão com o código correspondente
+        (1002 para quadro sem a máscara exigida, 1007 para texto que não é
+        UTF-8 válido, 1009 para mensagem grande demais).
+
+        Returns:
+            O texto, ou None quando a conexão é encerrada.
+        """
+        parts = []
+        size = 0
+        while not self.closed:
+            try:
+                fin, opcode, payload = await read_frame(
+                    self.reader, self.max_message_bytes, masked=not self.mask_outgoing
+                )
+            except WebSocketClosed:
+                self.closed = True
+                return None
+            except WebSocketProtocolError:
+                await self.close(CLOSE_PROTOCOL_ERROR)
+                return None
+            except ValueError:
+                await self.close(CLOSE_TOO_BIG)
+                return None
+
+            if opcode == OPCODE_PING:
+                await self._send(OPCODE_PONG, payload)
+            elif opcode == OPCODE_PONG:
+                continue
+            elif opcode == OPCODE_CLOSE:
+                await self.close(CLOSE_NORMAL)
+                return None
+            elif opcode in (OPCODE_TEXT, OPCODE_BINARY, OPCODE_CONTINUATION):
+                size += len(payload)
+                if size > self.max_message_bytes:
+                    await self.close(CLOSE_TOO_BIG)
+                    return None
+                parts.append(payload)
+                if fin:
+                    try:
+                        return b"".join(parts).decode("utf-8")
+                    except UnicodeDecodeError:
+                        await self.close(CLOSE_INVALID_DATA)
+                        return None
+            else:
+                await self.close(CLOSE_PROTOCOL_ERROR)
+                return None
+        return None
+
+    async def send_text(self, text: str) -> None:
+        """Envia uma mensagem de texto.
+
+        Raises:
+            WebSocketClosed: Se a conexão já foi encerrada.
+        """
+        if self.closed:
+            raise WebSocketClosed("Conexão WebSocket encerrada")
+        await self._send(OPCODE_TEXT, text.encode("utf-8"))
+
+    async def close(self, code: int = CLOSE_NORMAL) -> None:
+        """Envia o quadro de encerramento e fecha a conexão."""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            await self._send(OPCODE_CLOSE, struct.pack("!H", code))
+        except ConnectionError:
+            pass
+        self.writer.close()
+
+    async def _send(self, opcode: int, payload: bytes) -> None:
+        """Escreve um quadro, um de cada vez."""
+        async with self._write_lock:
+            self.writer.write(encode_frame(opcode, payload, mask=self.mask_outgoing))
+            await self.writer.drain()
+
+
+async def connect(host: str, port: int, path: str) -> WebSocket:
+    """Abre uma conexão WebSocket de cliente (usada em testes e ferramentas locais).
+
+    Raises:
+        ConnectionError: Se o servidor não aceitar a conexão WebSocket.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    writer.write((
+        f"GET {path} HTTP/1.1\r\n"
+        f"Host: {host}:{port}\r\n"
+        "Upgrade: websocket\r\n"
+        "Connection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\n"
+        "Sec-WebSocket-Version: 13\r\n\r\n"
+    ).encode("ascii"))
+    await writer.drain()
+
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    status = lines[0].split(" ")
+    if len(status) < 2 or status[1] != "101" or headers.get("sec-websocket-accept") != accept_key(key):
+        writer.close()
+        raise ConnectionError(f"O servidor recusou o WebSocket: {lines[0]}")
+    return WebSocket(reader, writer, mask_outgoing=True)
@@ -0,0 +1,121 @@
+"""Testes de integração para as variantes assíncronas dos adaptadores."""
+import asyncio
+import json
+import httpx
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from src.domain.use_cases.process_message import AIModel, ProcessMessageUseCase, ProcessMessageInput
+from src.infrastructure.adapters.deepseek_adapter import DeepSeekModel
+from src.infrastructure.adapters.http_transport import HttpTransport
+from src.infrastructure.adapters.ollama_adapter import OllamaModel
+from src.infrastructure.adapters.smart_ai_adapter import SmartAIModel
+
+
+def mock_transport(handler):
+    """Cria um transporte HTTP cujo cliente assíncrono responde usando o handler."""
+    return HttpTransport(async_transport=httpx.MockTransport(handler))
+
+
+class TestDeepSeekAsync:
+    """Testes para o DeepSeek assíncrono."""
+    
+    def test_agenerate_response_success(self):
+        """Testa a geração assíncrona bem-sucedida."""
+        # Arrange
+        def handler(request):
+            body = json.loads(request.content)
+            assert body["model"] == "deepseek-chat"
+            assert request.headers["Authorization"] == "Bearer test_key"
+            return httpx.Response(200, json={"choices": [{"message": {"content": " Olá! "}}]})
+        
+        adapter = DeepSeekModel(api_key="test_key", transport=mock_transport(handler))
+        
+        # Act
+        response = asyncio.run(adapter.agenerate_response([{"role": "user", "content": "Oi"}]))
+        
+        # Assert
+        assert response == "Olá!"
+    
+    def test_agenerate_response_http_error(self):
+        """Testa o tratamento de erro HTTP na geração assíncrona."""
+        # Arrange
+        handler = lambda request: httpx.Response(429, json={"error": "rate limit"})
+        adapter = DeepSeekModel(api_key="test_key", transport=mock_transport(handler))
+        
+        # Act & Assert
+        with pytest.raises(Exception) as exc_info:
+            asyncio.run(adapter.agenerate_response([{"role": "user", "content": "Oi"}]))
+        
+        assert "429" in str(exc_info.value)
+
+
+class TestOllamaAsync:
+    """Testes para o Ollama assíncrono."""
+    
+    def test_agenerate_response_success(self):
+        """Testa a geração assíncrona bem-sucedida."""
+        # Arrange
+        def handler(request):
+            body = json.loads(request.content)
+            assert body["stream"] is False
+            return httpx.Response(200, json={"message": {"content": "Resposta local"}})
+        
+        adapter = OllamaModel(transport=mock_transport(handler))
+        
+        # Act
+        response = asyncio.run(adapter.agenerate_response([{"role": "user", "content": "Oi"}]))
+        
+        # Assert
+        assert response == "Resposta local"
+
+
+class TestSmartAIAsync:
+    """Testes para o fallback assíncrono do SmartAIModel."""
+    
+    @patch('src.infrastructure.adapters.smart_ai_adapter.OllamaModel')
+    @patch('src.infrastructure.adapters.smart_ai_adapter.DeepSeekModel')
+    @patch('src.infrastructure.adapters.smart_ai_adapter.OpenAIModel')
+    def test_agenerate_response_fallback(self, mock_openai, mock_deepseek, mock_ollama):
+        """Testa o fallback assíncrono após erro de quota."""
+        # Arrange
+        mock_openai.return_value.agenerate_response = AsyncMock(side_effect=Exception("insufficient_quota"))
+        mock_deepseek.return_value.agenerate_response = AsyncMock(return_value="Resposta DeepSeek")
+        model = SmartAIModel(openai_api_key="a", deepseek_api_key="b")
+        
+        # Act
+        response = asyncio.run(model.agenerate_response([{"role": "user", "content": "Oi"}]))
+        
+        # Assert
+        assert response == "Resposta DeepSeek"
+        assert model.current_model == "deepseek"
+
+
+def test_aexecute_runs_many_conversations_concurrently():
+    """Testa que várias execuções assíncronas compartilham o mesmo loop."""
+    # Arrange
+    in_flight = {"current": 0, "max": 0}
+    
+    class SlowAsyncModel(AIModel):
+        async def agenerate_response(self, messages, **kwargs):
+            in_flight["current"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["current"])
+            await asyncio.sleep(0.01)
+            in_flight["current"] -= 1
+            return f"eco: {messages[-1]['content']}"
+    
+    model = SlowAsyncModel()
+    use_case = ProcessMessageUseCase(ai_model=model)
+    
+    async def run_all():
+        return await asyncio.gather(*[
+            use_case.aexecute(ProcessMessageInput(user_message=f"msg {i}", conversation_history=[]))
+            for i in range(20)
+        ])
+    
+    # Act
+    outputs = asyncio.run(run_all())
+    
+    # Assert
+    assert [output.response for output in outputs] == [f"eco: msg {i}" for i in range(20)]
+    assert in_flight["max"] == 20
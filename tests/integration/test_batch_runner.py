@@ -0,0 +1,118 @@
+"""Testes de integração para o processamento em lote de conversas."""
+import json
+import threading
+import time
+
+from src.domain.use_cases.process_message import AIModel, ProcessMessageUseCase
+from src.infrastructure.adapters.concurrency_limit import ConcurrencyLimitedModel
+from src.interface.batch.batch_runner import BatchRunner
+
+
+class EchoModel(AIModel):
+    """Modelo falso que devolve a última pergunta, com uma espera opcional."""
+
+    def __init__(self, delay=0.0, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_response(self, messages, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        question = messages[-1]["content"]
+        if question == self.fail_on:
+            raise Exception("provedor indisponível")
+        return f"eco: {question} ({len(messages)} mensagens)"
+
+
+def write_input(path, conversations):
+    path.write_text("".join(json.dumps(c) + "\n" for c in conversations), encoding="utf-8")
+    return str(path)
+
+
+def read_output(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_writes_answers_in_input_order_with_history(tmp_path):
+    """Testa que a saída segue a ordem da entrada e cada turno vê os anteriores."""
+    # Arrange
+    source = write_input(tmp_path / "in.jsonl", [
+        {"id": "a", "turns": ["oi", "tudo bem?"]},
+        {"id": "b", "message": "horário"},
+        {"id": "c", "turns": "não é lista"},
+    ])
+    output = tmp_path / "out.jsonl"
+    runner = BatchRunner(ProcessMessageUseCase(ai_model=EchoModel()), workers=3, progress_every=0)
+
+    # Act
+    stats = runner.run(source, str(output))
+
+    # Assert
+    records = read_output(output)
+    assert [r["id"] for r in records] == ["a", "b", "c"]
+    assert records[0]["answers"] == ["eco: oi (2 mensagens)", "eco: tudo bem? (4 mensagens)"]
+    assert records[1]["answers"] == ["eco: horário (2 mensagens)"]
+    assert records[2]["error"] is not None
+    assert stats["processed"] == 3
+    assert stats["failed"] == 1
+
+
+def test_resume_skips_answered_lines_and_drops_partial_record(tmp_path):
+    """Testa a retomada a partir da saída de uma execução interrompida."""
+    # Arrange
+    source = write_input(tmp_path / "in.jsonl", [{"id": str(i), "message": f"p{i}"} for i in range(4)])
+    output = tmp_path / "out.jsonl"
+    output.write_bytes(
+        b'{"line":1,"id":"0","answers":["antiga"],"error":null}\n{"line":2,"id":"1","ans'
+    )
+    model = EchoModel()
+    runner = BatchRunner(ProcessMessageUseCase(ai_model=model), workers=2, progress_every=0)
+
+    # Act
+    stats = runner.run(source, str(output), resume=True)
+
+    # Assert
+    records = read_output(output)
+    assert [r["id"] for r in records] == ["0", "1", "2", "3"]
+    assert records[0]["answers"] == ["antiga"]
+    assert stats["skipped"] == 1
+    assert model.calls == 3
+
+
+def test_failed_turn_keeps_previous_answers(tmp_path):
+    """Testa que um erro no meio da conversa preserva as respostas anteriores."""
+    # Arrange
+    source = write_input(tmp_path / "in.jsonl", [{"id": "a", "turns": ["oi", "falha", "tchau"]}])
+    output = tmp_path / "out.jsonl"
+    runner = BatchRunner(ProcessMessageUseCase(ai_model=EchoModel(fail_on="falha")), progress_every=0)
+
+    # Act
+    runner.run(source, str(output))
+
+    # Assert
+    record = read_output(output)[0]
+    assert record["answers"] == ["eco: oi (2 mensagens)"]
+    assert "provedor indisponível" in record["error"]
+
+
+def test_throughput_scales_with_workers_up_to_provider_limit(tmp_path):
+    """Testa o paralelismo do lote e o limite de concorrência do provedor."""
+    # Arrange
+    source = write_input(tmp_path / "in.jsonl", [{"id": str(i), "message": "oi"} for i in range(8)])
+    limited = ConcurrencyLimitedModel(EchoModel(delay=0.05), max_concurrency=4)
+
+    def elapsed(model, workers):
+        runner = BatchRunner(ProcessMessageUseCase(ai_model=model), workers=workers, progress_every=0)
+        return runner.run(source, str(tmp_path / f"out-{workers}.jsonl"))["elapsed"]
+
+    # Act
+    serial = elapsed(EchoModel(delay=0.05), 1)
+    parallel = elapsed(limited, 8)
+
+    # Assert
+    assert parallel < serial / 2
+    assert limited.get_stats()["peak"] == 4
+    assert limited.get_stats()["waits"] > 0
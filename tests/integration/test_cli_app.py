@@ -177,3 +177,29 @@ class TestCLIApp:
         
         # Assert
         app.voice_output.speak.assert_called_with("Atendimento interrompido.")
+    
+    @patch.dict('os.environ', {"DEEPSEEK_API_KEY": "test-key"})
+    @patch('src.interface.cli.cli_app.VoiceInputAdapter')
+    @patch('src.interface.cli.cli_app.VoiceOutputAdapter')
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_streamed_sentences_are_scheduled_without_blocking(self, mock_stdout, mock_voice_output, mock_voice_input):
+        """Testa que as frases da resposta em streaming são agendadas no worker de fala."""
+        # Arrange
+        app = CLIApp()
+        app.session_manager = MagicMock()
+        
+        def execute_streaming(input_data, on_delta):
+            on_delta("Olá! Tudo bem?")
+            return MagicMock()
+        
+        app.process_message_use_case = MagicMock()
+        app.process_message_use_case.execute_streaming.side_effect = execute_streaming
+        
+        # Act
+        with patch('src.interface.cli.cli_app.settings.VOICE_STREAMING', True):
+            app.process_user_message("Oi")
+        
+        # Assert
+        spoken = [call.args[0] for call in app.voice_output.speak_async.call_args_list]
+        assert spoken == ["Olá!", "Tudo bem?"]
+        app.voice_output.speak.assert_not_called()
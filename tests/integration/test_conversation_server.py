@@ -0,0 +1,205 @@
+"""Testes de integração para o servidor HTTP/WebSocket das conversas."""
+import asyncio
+import json
+import time
+
+from src.domain.services.session_manager import SessionManager
+from src.domain.use_cases.process_message import AIModel, ProcessMessageUseCase
+from src.interface.server.server import ConversationServer
+from src.interface.server.websocket import connect
+
+
+class SlowEchoModel(AIModel):
+    """Modelo falso assíncrono que espera um pouco e devolve a pergunta em trechos."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def generate_response(self, messages, **kwargs):
+        raise AssertionError("o servidor deve usar a API assíncrona")
+
+    async def agenerate_response(self, messages, **kwargs):
+        await asyncio.sleep(self.delay)
+        return f"eco: {messages[-1]['content']}"
+
+    async def astream_response(self, messages, **kwargs):
+        for part in ("eco", ": ", messages[-1]["content"]):
+            await asyncio.sleep(self.delay)
+            yield part
+
+
+async def request(port, method, path, body=None):
+    """Faz uma requisição HTTP/1.1 simples e devolve (status, corpo JSON)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = json.dumps(body).encode("utf-8") if body is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+    if body is not None or method == "POST":
+        head += f"Content-Length: {len(payload)}\r\n"
+    writer.write(head.encode("ascii") + b"\r\n" + payload)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    status_line, _, rest = raw.partition(b"\r\n")
+    _, _, response_body = rest.partition(b"\r\n\r\n")
+    return int(status_line.split(b" ")[1]), json.loads(response_body)
+
+
+def run_with_server(scenario, model=None, readiness=None):
+    """Sobe o servidor numa porta livre, executa o cenário e encerra o servidor."""
+    async def main():
+        server = ConversationServer(
+            ProcessMessageUseCase(ai_model=model or SlowEchoModel()),
+            SessionManager(),
+            port=0,
+            readiness=readiness
+        )
+        await server.start()
+        try:
+            return await scenario(server)
+        finally:
+            await server.stop(grace=1.0)
+    return asyncio.run(main())
+
+
+def test_health_and_readiness():
+    """Testa as rotas de vivacidade e prontidão."""
+    # Arrange
+    async def scenario(server):
+        return (
+            await request(server.port, "GET", "/health"),
+            await request(server.port, "GET", "/ready"),
+        )
+
+    # Act
+    health, ready = run_with_server(scenario, readiness=lambda: False)
+
+    # Assert
+    assert health == (200, {"status": "ok"})
+    assert ready == (503, {"status": "unavailable", "active_turns": 0})
+
+
+def test_metrics_endpoint_exports_prometheus_text():
+    """Testa que /metrics devolve as métricas no formato de texto do Prometheus."""
+    # Arrange
+    async def scenario(server):
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        raw = await reader.read()
+        writer.close()
+        return raw
+
+    # Act
+    raw = run_with_server(scenario)
+
+    # Assert
+    head, _, body = raw.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200")
+    assert b"Content-Type: text/plain; version=0.0.4" in head
+    assert b"# TYPE atendimento_llm_request_duration_seconds histogram" in body
+
+
+def test_post_message_and_read_history():
+    """Testa um turno por HTTP e a leitura do histórico da sessão."""
+    # Arrange
+    async def scenario(server):
+        turn = await request(server.port, "POST", "/sessions/abc/messages", {"message": "Olá"})
+        history = await request(server.port, "GET", "/sessions/abc")
+        return turn, history
+
+    # Act
+    turn, (status, session) = run_with_server(scenario)
+
+    # Assert
+    assert turn == (200, {"session_id": "abc", "response": "eco: Olá"})
+    assert status == 200
+    assert [(m["role"], m["content"]) for m in session["history"]] == [
+        ("user", "Olá"), ("assistant", "eco: Olá")
+    ]
+
+
+def test_invalid_requests():
+    """Testa os erros de sessão inexistente, JSON inválido e rota desconhecida."""
+    # Arrange
+    async def scenario(server):
+        return (
+            await request(server.port, "GET", "/sessions/nada"),
+            await request(server.port, "POST", "/sessions/abc/messages", {"texto": "Olá"}),
+            await request(server.port, "GET", "/outra"),
+        )
+
+    # Act
+    missing, invalid, unknown = run_with_server(scenario)
+
+    # Assert
+    assert missing[0] == 404
+    assert invalid[0] == 400
+    assert unknown[0] == 404
+
+
+def test_websocket_streams_deltas():
+    """Testa o turno por WebSocket, com a resposta enviada em trechos."""
+    # Arrange
+    async def scenario(server):
+        websocket = await connect("127.0.0.1", server.port, "/sessions/ws/stream")
+        await websocket.send_text(json.dumps({"message": "Oi"}))
+        events = []
+        while not events or events[-1]["type"] == "delta":
+            events.append(json.loads(await websocket.receive_text()))
+        await websocket.close()
+        return events
+
+    # Act
+    events = run_with_server(scenario)
+
+    # Assert
+    assert [e["text"] for e in events[:-1]] == ["eco", ": ", "Oi"]
+    assert events[-1] == {"type": "done", "response": "eco: Oi"}
+
+
+def test_sessions_are_served_concurrently():
+    """Testa que turnos de sessões diferentes correm em paralelo no mesmo loop."""
+    # Arrange
+    delay = 0.2
+
+    async def scenario(server):
+        started = time.perf_counter()
+        results = await asyncio.gather(*[
+            request(server.port, "POST", f"/sessions/s{index}/messages", {"message": "Oi"})
+            for index in range(5)
+        ])
+        return results, time.perf_counter() - started
+
+    # Act
+    results, elapsed = run_with_server(scenario, model=SlowEchoModel(delay=delay))
+
+    # Assert
+    assert all(status == 200 for status, _ in results)
+    assert elapsed < delay * 3
+
+
+def test_websocket_closes_on_invalid_utf8_and_unmasked_frames():
+    """Testa que texto inválido fecha com 1007 e quadro do cliente sem máscara fecha com 1002."""
+    # Arrange
+    import struct
+    from src.interface.server.websocket import OPCODE_CLOSE, OPCODE_TEXT, encode_frame, read_frame
+
+    async def close_code_after(server, frame):
+        websocket = await connect("127.0.0.1", server.port, "/sessions/ws/stream")
+        websocket.writer.write(frame)
+        await websocket.writer.drain()
+        _, opcode, payload = await read_frame(websocket.reader, 1024)
+        websocket.writer.close()
+        return opcode, struct.unpack("!H", payload)[0]
+
+    async def scenario(server):
+        invalid_text = await close_code_after(server, encode_frame(OPCODE_TEXT, b"\xff\xfe", mask=True))
+        unmasked = await close_code_after(server, encode_frame(OPCODE_TEXT, b'{"message": "Oi"}'))
+        return invalid_text, unmasked
+
+    # Act
+    invalid_text, unmasked = run_with_server(scenario)
+
+    # Assert
+    assert invalid_text == (OPCODE_CLOSE, 1007)
+    assert unmasked == (OPCODE_CLOSE, 1002)
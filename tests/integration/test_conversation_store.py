@@ -0,0 +1,284 @@
+"""Testes de integração para o armazenamento de conversas em segmentos JSONL."""
+import json
+import os
+import time
+
+from src.domain.entities.message import Message, MessageRole
+from src.domain.entities.session import ConversationSession
+from src.domain.services.session_manager import SessionManager
+from src.infrastructure.adapters.conversation_store import JsonlConversationStore
+
+
+def user(content):
+    return Message(content=content, role=MessageRole.USER)
+
+
+def assistant(content):
+    return Message(content=content, role=MessageRole.ASSISTANT)
+
+
+def contents(messages):
+    return [message.content for message in messages]
+
+
+def test_appends_are_written_in_batches_and_reloaded_after_restart(tmp_path):
+    """Testa a gravação em lote e a reconstrução do índice ao reabrir."""
+    # Arrange
+    store = JsonlConversationStore(str(tmp_path), flush_interval=60)
+    store.append("a", [user("olá"), assistant("Como posso ajudar?")])
+    store.append("b", [user("meu pedido atrasou")])
+
+    # Act
+    pending_before_flush = store.get_stats()["pending"]
+    store.flush()
+    stats = store.get_stats()
+    store.close()
+    reopened = JsonlConversationStore(str(tmp_path))
+    session = reopened.load("a")
+    reopened.close()
+
+    # Assert
+    assert pending_before_flush == 3
+    assert stats["batches_written"] == 1
+    assert stats["records_written"] == 3
+    assert contents(session.history) == ["olá", "Como posso ajudar?"]
+
+
+def test_writer_thread_flushes_without_explicit_call(tmp_path):
+    """Testa que a thread de gravação grava o buffer sozinha após o intervalo."""
+    # Arrange
+    store = JsonlConversationStore(str(tmp_path), flush_interval=0.01)
+
+    # Act
+    store.append("a", [user("olá")])
+    deadline = time.monotonic() + 2
+    while store.get_stats()["batches_written"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # Assert
+    with open(os.path.join(str(tmp_path), "segment-000001.jsonl"), encoding="utf-8") as file:
+        assert '"m":["u","olá",' in file.read()
+    store.close()
+
+
+def test_save_writes_only_new_messages_and_changed_metadata(tmp_path):
+    """Testa que salvar a sessão grava apenas o que mudou."""
+    # Arrange
+    store = JsonlConversationStore(str(tmp_path), flush_interval=60)
+    session = ConversationSession(session_id="a", history=[user("oi")])
+    store.save(session)
+    store.flush()
+    written_before = store.get_stats()["records_written"]
+
+    # Act
+    session.history.append(assistant("Olá!"))
+    session.preferred_provider = "deepseek"
+    store.save(session)
+    store.save(session)
+    store.flush()
+    loaded = store.load("a")
+    store.close()
+
+    # Assert
+    assert store.get_stats()["records_written"] - written_before == 2
+    assert contents(loaded.history) == ["oi", "Olá!"]
+    assert loaded.preferred_provider == "deepseek"
+
+
+def test_tail_reads_last_messages_and_delete_removes_session(tmp_path):
+    """Testa a leitura do final do histórico e a remoção de uma sessão."""
+    # Arrange
+    store = JsonlConversationStore(str(tmp_path), flush_interval=60)
+    store.save(ConversationSession(session_id="a", history=[user("1"), user("2")]))
+    store.append("a", [user("3"), user("4")])
+    store.append("b", [user("x")])
+
+    # Act
+    tail = store.tail("a", 3)
+    store.delete("b")
+    missing = store.load("b")
+    ids = store.session_ids()
+    store.close()
+
+    # Assert
+    assert contents(tail) == ["2", "3", "4"]
+    assert missing is None
+    assert ids == ["a"]
+
+
+def test_rotates_and_compacts_segments(tmp_path):
+    """Testa a rotação de segmentos e a compactação em um retrato por sessão."""
+    # Arrange
+    store = JsonlConversationStore(
+        str(tmp_path), flush_interval=60, max_segment_bytes=1, compact_after_segments=3
+    )
+
+    # Act
+    for turn in range(5):
+        store.append("a", [user(f"pergunta {turn}")])
+        store.flush()
+    store.append("b", [user("oi")])
+    store.delete("b")
+    store.compact()
+    stats = store.get_stats()
+    sessions = store.load_all()
+    store.close()
+
+    # Assert
+    assert stats["segments"] == 1
+    assert stats["compactions"] >= 1
+    assert len(os.listdir(str(tmp_path))) == 1
+    assert [session.session_id for session in sessions] == ["a"]
+    assert contents(sessions[0].history) == [f"pergunta {turn}" for turn in range(5)]
+
+
+def test_session_manager_persists_turns_and_reloads_evicted_sessions(tmp_path):
+    """Testa o gerenciador de sessões usando o armazenamento JSONL."""
+    # Arrange
+    store = JsonlConversationStore(str(tmp_path), flush_interval=60)
+    manager = SessionManager(max_sessions=1, store=store)
+    manager.append("a", user("oi"), assistant("Olá!"))
+
+    # Act
+    manager.get("b")
+    reloaded = manager.get("a")
+    manager.delete("a")
+    manager.append("a", user("recomeço"))
+    store.close()
+    restarted = JsonlConversationStore(str(tmp_path))
+    after_restart = restarted.load("a")
+    restarted.close()
+
+    # Assert
+    assert contents(reloaded.history) == ["oi", "Olá!"]
+    assert contents(after_restart.history) == ["recomeço"]
+
+
+def test_reads_combine_disk_and_buffer_without_forcing_a_write(tmp_path):
+    """Testa que as leituras respondem com o buffer e o índice, sem gravar o lote pendente."""
+    # Arrange
+    store = JsonlConversationStore(str(tmp_path), flush_interval=60)
+    store.append("a", [user("olá"), assistant("Como posso ajudar?")])
+    store.flush()
+    store.append("a", [user("meu pedido atrasou")])
+    store.append("b", [user("segunda via")])
+    store.delete("b")
+
+    # Act
+    missing = store.load("nova-chamada")
+    session = store.load("a")
+    tail = store.tail("a", 2)
+    everything = store.load_all()
+    ids = store.session_ids()
+    stats = store.get_stats()
+    store.close()
+
+    # Assert
+    assert missing is None
+    assert contents(session.history) == ["olá", "Como posso ajudar?", "meu pedido atrasou"]
+    assert contents(tail) == ["Como posso ajudar?", "meu pedido atrasou"]
+    assert [s.session_id for s in everything] == ["a"]
+    assert ids == ["a"]
+    assert stats["batches_written"] == 1
+    assert stats["pending"] == 3
+
+
+def test_reads_segments_written_with_message_dicts(tmp_path):
+    """Testa que registros de mensagem no formato de to_dict (segmentos antigos) continuam legíveis."""
+    # Arrange
+    legacy = {"op": "message", "session_id": "a", "message": user("olá").to_dict()}
+    with open(os.path.join(str(tmp_path), "segment-000001.jsonl"), "w", encoding="utf-8") as file:
+        file.write(json.dumps(legacy, ensure_ascii=False) + "\n")
+    store = JsonlConversationStore(str(tmp_path), flush_interval=60)
+
+    # Act
+    store.append("a", [assistant("Como posso ajudar?")])
+    session = store.load("a")
+    store.close()
+
+    # Assert
+    assert contents(session.history) == ["olá", "Como posso ajudar?"]
+    assert session.history[0].role == MessageRole.USER
+
+
+class HalfWriteFile:
+    """Segmento falso que grava metade do lote e falha (ex.: disco cheio)."""
+
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, data):
+        self.file.write(data[:len(data) // 2])
+        self.file.flush()
+        raise OSError("Sem espaço no dispositivo")
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+
+def test_failed_batch_leaves_no_partial_bytes_behind(tmp_path):
+    """Testa que um lote que falha no meio é descartado do segmento antes da nova tentativa."""
+    # Arrange
+    store = JsonlConversationStore(str(tmp_path), flush_interval=60)
+    store.append("a", [user("olá")])
+    store.flush()
+    store._active = HalfWriteFile(store._active)
+    store.append("a", [assistant("Como posso ajudar?"), user("meu pedido atrasou")])
+
+    # Act
+    try:
+        store.flush()
+    except OSError:
+        pass
+    store.flush()
+    store.append("a", [assistant("Vou verificar.")])
+    store.flush()
+    loaded = store.load("a")
+    last = store.tail("a", 2)
+    store.close()
+
+    # Assert
+    assert contents(loaded.history) == ["olá", "Como posso ajudar?", "meu pedido atrasou", "Vou verificar."]
+    assert contents(last) == ["meu pedido atrasou", "Vou verificar."]
+
+
+def test_compaction_does_not_block_reads_or_lose_concurrent_writes(tmp_path):
+    """Testa que load e flush seguem durante a compactação e que o gravado nela sobrevive."""
+    # Arrange
+    import threading
+
+    store = JsonlConversationStore(str(tmp_path), flush_interval=60, max_segment_bytes=1)
+    for turn in range(3):
+        store.append("a", [user(f"pergunta {turn}")])
+        store.flush()
+    during = {}
+    original_read = store._read_all_sessions
+
+    def read_while_compacting(segments):
+        def reader():
+            during["loaded"] = contents(store.load("a").history)
+            store.append("a", [assistant("resposta durante a compactação")])
+            store.flush()
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        thread.join(timeout=2)
+        during["finished"] = not thread.is_alive()
+        return original_read(segments)
+
+    store._read_all_sessions = read_while_compacting
+
+    # Act
+    store.compact()
+    store._read_all_sessions = original_read
+    after = store.load("a")
+    store.close()
+    reopened = JsonlConversationStore(str(tmp_path))
+    restarted = reopened.load("a")
+    reopened.close()
+
+    # Assert
+    expected = ["pergunta 0", "pergunta 1", "pergunta 2", "resposta durante a compactação"]
+    assert during == {"loaded": expected[:3], "finished": True}
+    assert contents(after.history) == expected
+    assert contents(restarted.history) == expected
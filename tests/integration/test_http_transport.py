@@ -0,0 +1,132 @@
+"""Testes de integração para o transporte HTTP compartilhado."""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from src.infrastructure.adapters.http_transport import HttpTransport
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Handler HTTP/1.1 mínimo que mantém as conexões abertas."""
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    """Sobe um servidor HTTP local em uma porta livre."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_sync_requests_reuse_connection(local_server):
+    """Testa que requisições seguidas reaproveitam a mesma conexão keep-alive."""
+    # Arrange
+    transport = HttpTransport()
+    
+    # Act
+    for _ in range(5):
+        response = transport.request("GET", f"{local_server}/api/tags")
+        assert response.status_code == 200
+    stats = transport.get_stats()
+    transport.close()
+    
+    # Assert
+    host_stats = stats[local_server]
+    assert host_stats["requests"] == 5
+    assert host_stats["handshakes"] == 1
+    assert host_stats["idle"] == 1
+    assert host_stats["in_use"] == 0
+
+
+def test_stream_holds_connection_in_use(local_server):
+    """Testa que uma resposta em streaming aberta conta como conexão em uso."""
+    # Arrange
+    transport = HttpTransport()
+    
+    # Act
+    with transport.stream("GET", f"{local_server}/") as response:
+        during = transport.get_stats()[local_server]
+        response.read()
+    after = transport.get_stats()[local_server]
+    transport.close()
+    
+    # Assert
+    assert during["in_use"] == 1
+    assert after["in_use"] == 0
+    assert after["idle"] == 1
+
+
+def test_async_requests_share_pool(local_server):
+    """Testa que requisições assíncronas no mesmo loop compartilham o pool."""
+    # Arrange
+    transport = HttpTransport(max_connections=2)
+    
+    async def run():
+        client = transport.async_client()
+        responses = await asyncio.gather(*[
+            transport.arequest("GET", f"{local_server}/") for _ in range(6)
+        ])
+        same_client = transport.async_client() is client
+        await transport.aclose()
+        return responses, same_client
+    
+    # Act
+    responses, same_client = asyncio.run(run())
+    stats = transport.get_stats()[local_server]
+    
+    # Assert
+    assert all(response.status_code == 200 for response in responses)
+    assert same_client
+    assert stats["requests"] == 6
+    assert stats["handshakes"] <= 2
+
+
+def test_separate_connect_and_read_timeouts():
+    """Testa a configuração de timeouts separados de conexão e leitura."""
+    # Arrange
+    transport = HttpTransport(connect_timeout=2.0, read_timeout=45.0)
+    
+    # Act
+    default_timeout = transport.timeout()
+    custom_timeout = transport.timeout(read_timeout=5)
+    
+    # Assert
+    assert default_timeout.connect == 2.0
+    assert default_timeout.read == 45.0
+    assert custom_timeout.connect == 2.0
+    assert custom_timeout.read == 5
+
+
+def test_mock_transport_counts_requests_without_pool():
+    """Testa as estatísticas com um transporte que não expõe pool de conexões."""
+    # Arrange
+    transport = HttpTransport(transport=httpx.MockTransport(lambda request: httpx.Response(204)))
+    
+    # Act
+    transport.request("GET", "https://api.deepseek.com/v1/models")
+    stats = transport.get_stats()
+    
+    # Assert
+    assert stats == {
+        "https://api.deepseek.com:443": {
+            "in_use": 0, "idle": 0, "handshakes": 0, "tls_handshakes": 0, "requests": 1
+        }
+    }
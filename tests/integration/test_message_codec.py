@@ -0,0 +1,63 @@
+"""Testes de integração para a codificação JSON rápida de mensagens."""
+import json
+from datetime import datetime
+
+from src.domain.entities.message import Message, MessageRole
+from src.domain.services.prompt_builder import PromptBuilder
+from src.infrastructure.adapters import message_codec
+from src.infrastructure.adapters.ollama_adapter import to_ollama_message
+
+
+def test_encode_and_decode_messages_round_trip():
+    """Testa a ida e volta das mensagens pelo formato compacto."""
+    # Arrange
+    messages = [
+        Message(role=MessageRole.USER, content="Qual o horário?", timestamp=datetime(2023, 1, 1, 12, 0, 0, 42)),
+        Message(role=MessageRole.ASSISTANT, content="Das 8h às 18h."),
+    ]
+    
+    # Act
+    encoded = message_codec.encode_messages(messages)
+    decoded = message_codec.decode_messages(encoded)
+    
+    # Assert
+    assert decoded == messages
+    assert decoded[0].timestamp == datetime(2023, 1, 1, 12, 0, 0, 42)
+    assert "às".encode("utf-8") in encoded
+
+
+def test_dumps_and_loads_without_orjson(monkeypatch):
+    """Testa o caminho com o módulo json da biblioteca padrão."""
+    # Arrange
+    monkeypatch.setattr(message_codec, "orjson", None)
+    record = {"op": "message", "content": "olá"}
+    
+    # Act
+    encoded = message_codec.dumps(record)
+    
+    # Assert
+    assert encoded == '{"op":"message","content":"olá"}'.encode("utf-8")
+    assert message_codec.loads(encoded) == record
+
+
+def test_encode_payload_splices_prompt_builder_messages():
+    """Testa que o corpo montado com o PromptBuilder é igual ao da lista comum, já no formato do Ollama."""
+    # Arrange
+    history = [
+        Message(role=MessageRole.USER, content="Meu pedido atrasou"),
+        Message(role=MessageRole.ASSISTANT, content="Qual o número do pedido?"),
+    ]
+    builder = PromptBuilder(encoder=message_codec.dumps)
+    prompt = builder.build(history, [{"role": "system", "content": "Seja breve."}], 0, {"role": "user", "content": "123"})
+    payload = {"model": "llama2", "messages": prompt, "stream": False}
+    
+    # Act
+    body = message_codec.encode_payload(payload, to_ollama_message)
+    plain_body = message_codec.encode_payload(dict(payload, messages=list(prompt)), to_ollama_message)
+    
+    # Assert
+    assert json.loads(body) == json.loads(plain_body)
+    decoded = json.loads(body)
+    assert decoded["model"] == "llama2"
+    assert decoded["messages"][0] == {"role": "user", "content": "Instrução do sistema: Seja breve."}
+    assert decoded["messages"][1:] == list(prompt)[1:]
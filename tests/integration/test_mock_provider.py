@@ -0,0 +1,118 @@
+"""Testes de integração dos adaptadores contra o servidor local que emula os provedores."""
+import asyncio
+import threading
+
+import pytest
+
+from benchmarks.mock_provider import FaultProfile, MockProviderServer
+from src.infrastructure.adapters.circuit_breaker import CircuitBreaker
+from src.infrastructure.adapters.deepseek_adapter import DeepSeekModel
+from src.infrastructure.adapters.http_transport import HttpTransport
+from src.infrastructure.adapters.ollama_adapter import OllamaModel
+from src.infrastructure.adapters.smart_ai_adapter import SmartAIModel
+
+MESSAGES = [{"role": "user", "content": "qual o horário?"}]
+
+
+@pytest.fixture
+def mock_server():
+    """Sobe o servidor simulado numa thread com o seu próprio loop de eventos."""
+    loop = asyncio.new_event_loop()
+    server = MockProviderServer(port=0, seed=7)
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait(5)
+    yield server
+    asyncio.run_coroutine_threadsafe(server.stop(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+@pytest.fixture
+def transport():
+    transport = HttpTransport(read_timeout=5)
+    yield transport
+    transport.close()
+
+
+def test_deepseek_adapter_generates_and_streams_over_sse(mock_server, transport):
+    """Testa o protocolo chat-completions, com e sem streaming (SSE)."""
+    # Arrange
+    mock_server.profiles["deepseek"] = FaultProfile(latency_ms=1, tokens_per_second=500)
+    model = DeepSeekModel(api_key="x", transport=transport, base_url=mock_server.base_url("deepseek"))
+
+    # Act
+    complete = model.generate_response(MESSAGES)
+    deltas = list(model.stream_response(MESSAGES))
+
+    # Assert
+    assert complete == "Resposta simulada para: qual o horário?"
+    assert len(deltas) == 6
+    assert "".join(deltas) == complete
+    assert mock_server.stats["deepseek"].completed == 2
+
+
+def test_ollama_adapter_streams_ndjson_and_reads_tags(mock_server, transport):
+    """Testa o protocolo do Ollama (/api/chat em NDJSON e /api/tags)."""
+    # Arrange
+    model = OllamaModel(transport=transport, base_url=mock_server.base_url("ollama"))
+
+    # Act
+    healthy, models = model.check_health()
+    text = "".join(model.stream_response(MESSAGES))
+
+    # Assert
+    assert healthy
+    assert models == ["llama2:latest"]
+    assert text == "Resposta simulada para: qual o horário?"
+
+
+def test_rate_limit_and_dropped_stream_surface_as_errors(mock_server, transport):
+    """Testa a injeção de 429 com Retry-After e a queda da conexão no meio do streaming."""
+    # Arrange
+    url = mock_server.base_url("deepseek")
+    mock_server.profiles["deepseek"] = FaultProfile(latency_ms=0, rate_limit_rate=1.0, retry_after=3)
+
+    # Act
+    response = transport.request("POST", f"{url}/chat/completions", json={"messages": MESSAGES})
+    mock_server.profiles["deepseek"] = FaultProfile(latency_ms=0, drop_rate=1.0)
+    model = DeepSeekModel(api_key="x", transport=transport, base_url=url)
+    with pytest.raises(Exception):
+        list(model.stream_response(MESSAGES))
+
+    # Assert
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+    assert mock_server.stats["deepseek"].dropped == 1
+
+
+def test_smart_model_fails_over_across_the_network(mock_server, transport):
+    """Testa o fallback do SmartAIModel quando o primeiro provedor devolve 5xx."""
+    # Arrange
+    mock_server.profiles["openai"] = FaultProfile(latency_ms=0, error_rate=1.0)
+    mock_server.profiles["deepseek"] = FaultProfile(latency_ms=0, reply="resposta do deepseek")
+    smart = SmartAIModel(
+        openai_api_key="x",
+        deepseek_api_key="x",
+        transport=transport,
+        breakers={"openai": CircuitBreaker(min_calls=1)},
+        base_urls={name: mock_server.base_url(name) for name in ("openai", "deepseek", "ollama")}
+    )
+    smart.openai_model.client = smart.openai_model.client.with_options(max_retries=0)
+
+    # Act
+    response = smart.generate_response(MESSAGES)
+
+    # Assert
+    assert response == "resposta do deepseek"
+    assert smart.current_model == "deepseek"
+    assert mock_server.stats["openai"].errors == 1
@@ -0,0 +1,126 @@
+"""Testes de integração para o monitor de saúde do Ollama."""
+import time
+
+import httpx
+import pytest
+
+from src.infrastructure.adapters.direct_ollama_adapter import DirectOllamaModel
+from src.infrastructure.adapters.http_transport import HttpTransport
+from src.infrastructure.adapters.ollama_adapter import OllamaModel
+from src.infrastructure.adapters.ollama_health import OllamaHealthMonitor
+
+
+class FakeClock:
+    """Relógio controlado manualmente nos testes."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class FakeOllamaServer:
+    """Servidor Ollama falso que conta as requisições por caminho."""
+    
+    def __init__(self):
+        self.paths = []
+        self.down = False
+    
+    def handler(self, request):
+        self.paths.append(request.url.path)
+        if self.down:
+            raise httpx.ConnectError("connection refused", request=request)
+        if request.url.path == "/api/tags":
+            return httpx.Response(200, json={"models": [{"name": "llama2"}, {"name": "mistral"}]})
+        return httpx.Response(200, json={"message": {"role": "assistant", "content": "Olá!"}})
+    
+    def tags_requests(self):
+        return self.paths.count("/api/tags")
+
+
+@pytest.fixture
+def server():
+    return FakeOllamaServer()
+
+
+@pytest.fixture
+def transport(server):
+    return HttpTransport(transport=httpx.MockTransport(server.handler))
+
+
+def test_health_is_cached_within_ttl(server, transport):
+    """Testa que a saúde é consultada uma vez e reaproveitada dentro do TTL."""
+    # Arrange
+    clock = FakeClock()
+    monitor = OllamaHealthMonitor(OllamaModel(transport=transport), ttl=10, clock=clock)
+    
+    # Act
+    first = monitor.is_available()
+    models = monitor.get_available_models()
+    clock.now = 9.0
+    second = monitor.is_available()
+    
+    # Assert
+    assert first is True and second is True
+    assert models == ["llama2", "mistral"]
+    assert server.tags_requests() == 1
+    
+    # Depois do TTL, uma nova consulta é feita
+    clock.now = 10.0
+    monitor.is_available()
+    assert server.tags_requests() == 2
+
+
+def test_generation_does_not_check_health_every_turn(server, transport):
+    """Testa que gerações consecutivas não repetem o GET em /api/tags."""
+    # Arrange
+    model = DirectOllamaModel(transport=transport)
+    messages = [{"role": "user", "content": "Oi"}]
+    
+    # Act
+    responses = [model.generate_response(messages) for _ in range(3)]
+    status = model.get_status()
+    
+    # Assert
+    assert responses == ["Olá!"] * 3
+    assert status == "Ollama funcionando. Modelos disponíveis: llama2, mistral"
+    assert server.tags_requests() == 1
+    assert server.paths.count("/api/chat") == 3
+
+
+def test_connection_error_invalidates_cache(server, transport):
+    """Testa que um erro de conexão na geração invalida o estado em cache."""
+    # Arrange
+    model = DirectOllamaModel(transport=transport)
+    messages = [{"role": "user", "content": "Oi"}]
+    model.generate_response(messages)
+    
+    # Act
+    server.down = True
+    with pytest.raises(Exception) as exc_info:
+        model.generate_response(messages)
+    
+    # Assert
+    assert "Erro de conexão com Ollama" in str(exc_info.value)
+    assert model.is_available() is False
+    assert server.tags_requests() == 2
+
+
+def test_background_refresh(server, transport):
+    """Testa a renovação periódica em segundo plano."""
+    # Arrange
+    monitor = OllamaHealthMonitor(OllamaModel(transport=transport), refresh_interval=0.01)
+    
+    # Act
+    monitor.start()
+    try:
+        deadline = time.monotonic() + 2.0
+        while server.tags_requests() < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        monitor.stop()
+    
+    # Assert
+    assert server.tags_requests() >= 3
+    assert monitor.get_health().available is True
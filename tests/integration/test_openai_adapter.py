@@ -123,3 +123,29 @@ def test_missing_api_key_raises_error():
         OpenAIModel(api_key="")
     
     assert "A chave da API da OpenAI" in str(exc_info.value)
+
+
+def test_stream_response_yields_deltas(mock_openai_client):
+    """Testa se o streaming entrega cada delta recebido da API."""
+    # Arrange
+    def make_chunk(content):
+        chunk = MagicMock()
+        chunk.choices = [MagicMock()]
+        chunk.choices[0].delta.content = content
+        return chunk
+    
+    mock_client_instance = MagicMock()
+    mock_client_instance.chat.completions.create.return_value = iter([
+        make_chunk("Olá"), make_chunk(None), make_chunk(", tudo bem?")
+    ])
+    mock_openai_client.return_value = mock_client_instance
+    
+    adapter = OpenAIModel(api_key="test_key")
+    
+    # Act
+    deltas = list(adapter.stream_response(messages=[{"role": "user", "content": "Olá"}]))
+    
+    # Assert
+    assert deltas == ["Olá", ", tudo bem?"]
+    call_args = mock_client_instance.chat.completions.create.call_args[1]
+    assert call_args["stream"] is True
@@ -0,0 +1,178 @@
+"""Testes de integração para o cache de respostas em camadas."""
+import asyncio
+
+from src.domain.use_cases.process_message import AIModel
+from src.infrastructure.adapters.response_cache import (
+    CachedAIModel,
+    MemoryLRUCache,
+    SQLiteResponseStore,
+    make_cache_key,
+)
+
+
+class FakeClock:
+    """Relógio controlado manualmente nos testes."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class CountingModel(AIModel):
+    """Modelo falso que conta quantas vezes foi chamado."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def generate_response(self, messages, **kwargs):
+        self.calls += 1
+        return f"Resposta {self.calls}"
+    
+    def stream_response(self, messages, **kwargs):
+        self.calls += 1
+        yield "Atendemos "
+        yield "das 8h às 18h."
+
+
+QUESTION = [{"role": "user", "content": "Qual o horário de atendimento?"}]
+
+
+def test_repeated_question_is_served_from_memory():
+    """Testa que a pergunta repetida não chama o modelo de novo."""
+    # Arrange
+    model = CountingModel()
+    cached = CachedAIModel(model)
+    
+    # Act
+    first = cached.generate_response(QUESTION)
+    second = cached.generate_response([{"role": "user", "content": "  qual o horário   de atendimento? "}])
+    
+    # Assert
+    assert first == second == "Resposta 1"
+    assert model.calls == 1
+    stats = cached.get_stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_kwargs_are_part_of_the_key():
+    """Testa que argumentos de geração diferentes geram chaves diferentes."""
+    assert make_cache_key(QUESTION, {"temperature": 0.1}) != make_cache_key(QUESTION, {"temperature": 0.9})
+    assert make_cache_key(QUESTION, {"a": 1, "b": 2}) == make_cache_key(QUESTION, {"b": 2, "a": 1})
+
+
+def test_lru_eviction_and_ttl():
+    """Testa o descarte da entrada menos usada e a expiração pelo TTL."""
+    # Arrange
+    clock = FakeClock()
+    cache = MemoryLRUCache(max_entries=2, ttl=10, clock=clock)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    
+    # Act
+    cache.set("c", "3")
+    clock.now = 10.0
+    expired = cache.get("a")
+    
+    # Assert
+    assert cache.evictions == 1
+    assert expired is None
+    assert cache.expirations == 1
+    assert cache.get("b") is None
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    """Testa que o arquivo SQLite mantém as respostas entre instâncias."""
+    # Arrange
+    path = str(tmp_path / "cache" / "respostas.sqlite3")
+    model = CountingModel()
+    CachedAIModel(model, store=SQLiteResponseStore(path)).generate_response(QUESTION)
+    
+    # Act
+    restarted = CachedAIModel(model, store=SQLiteResponseStore(path))
+    response = restarted.generate_response(QUESTION)
+    again = restarted.generate_response(QUESTION)
+    
+    # Assert
+    assert response == again == "Resposta 1"
+    assert model.calls == 1
+    stats = restarted.get_stats()
+    assert stats["disk_hits"] == 1
+    assert stats["memory_hits"] == 1
+
+
+def test_stream_is_cached_after_completion():
+    """Testa que uma resposta em streaming completa é guardada no cache."""
+    # Arrange
+    model = CountingModel()
+    cached = CachedAIModel(model)
+    
+    # Act
+    streamed = list(cached.stream_response(QUESTION))
+    replay = list(cached.stream_response(QUESTION))
+    
+    # Assert
+    assert streamed == ["Atendemos ", "das 8h às 18h."]
+    assert replay == ["Atendemos das 8h às 18h."]
+    assert model.calls == 1
+
+
+def test_async_generation_uses_cache():
+    """Testa o uso do cache no caminho assíncrono."""
+    # Arrange
+    model = CountingModel()
+    cached = CachedAIModel(model)
+    cached.generate_response(QUESTION)
+    
+    # Act
+    response = asyncio.run(cached.agenerate_response(QUESTION))
+    
+    # Assert
+    assert response == "Resposta 1"
+    assert model.calls == 1
+
+
+def test_invalidate_entry(tmp_path):
+    """Testa a invalidação de uma entrada em todas as camadas."""
+    # Arrange
+    model = CountingModel()
+    cached = CachedAIModel(model, store=SQLiteResponseStore(str(tmp_path / "c.sqlite3")))
+    cached.generate_response(QUESTION)
+    
+    # Act
+    removed = cached.invalidate(QUESTION)
+    response = cached.generate_response(QUESTION)
+    
+    # Assert
+    assert removed is True
+    assert response == "Resposta 2"
+    assert cached.invalidate([{"role": "user", "content": "outra"}]) is False
+
+
+def test_async_store_io_runs_off_the_event_loop(tmp_path):
+    """Testa que, no caminho assíncrono, o SQLite é acessado fora da thread do laço de eventos."""
+    # Arrange
+    import threading
+
+    model = CountingModel()
+    store = SQLiteResponseStore(str(tmp_path / "c.sqlite3"))
+    threads = []
+    original_get, original_set = store.get, store.set
+    store.get = lambda key: (threads.append(threading.current_thread()), original_get(key))[1]
+    store.set = lambda key, value: (threads.append(threading.current_thread()), original_set(key, value))[1]
+    cached = CachedAIModel(model, store=store)
+
+    async def turn():
+        return await cached.agenerate_response(QUESTION), threading.current_thread()
+
+    # Act
+    response, loop_thread = asyncio.run(turn())
+
+    # Assert
+    assert response == "Resposta 1"
+    assert len(threads) == 2
+    assert all(thread is not loop_thread for thread in threads)
+    assert store.get(make_cache_key(QUESTION, {})) == "Resposta 1"
@@ -0,0 +1,146 @@
+"""Testes de integração para o cache semântico de respostas."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.domain.use_cases.process_message import ProcessMessageUseCase, ProcessMessageInput, AIModel
+from src.infrastructure.adapters.semantic_cache import (
+    HashingEmbedder,
+    SemanticResponseCache,
+    VectorIndex,
+)
+
+
+class CountingModel(AIModel):
+    """Modelo falso que conta quantas vezes foi chamado."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def generate_response(self, messages, **kwargs):
+        self.calls += 1
+        return "Para cancelar, acesse Meus Pedidos."
+
+
+def test_embeddings_are_normalized_and_accent_insensitive():
+    """Testa que os vetores têm norma 1 e ignoram acentos e caixa."""
+    # Arrange
+    embedder = HashingEmbedder(dimensions=256)
+    
+    # Act
+    vectors = embedder.embed(["Qual o horário?", "qual o HORARIO", ""])
+    
+    # Assert
+    assert vectors.shape == (3, 256)
+    assert np.linalg.norm(vectors[0]) == pytest.approx(1.0, abs=1e-5)
+    assert float(vectors[0] @ vectors[1]) == pytest.approx(1.0, abs=1e-5)
+    assert not vectors[2].any()
+
+
+def test_near_duplicate_question_hits_cache():
+    """Testa que, no limite padrão, uma variação da pergunta reaproveita a resposta guardada."""
+    # Arrange
+    cache = SemanticResponseCache()
+    cache.store("Como faço para cancelar meu pedido?", "Acesse Meus Pedidos.")
+    
+    # Act
+    hit = cache.lookup("como eu faço pra cancelar o meu pedido agora")
+    other_intent = cache.lookup("Como faço para rastrear meu pedido?")
+    miss = cache.lookup("Vocês entregam aos sábados?")
+    
+    # Assert
+    assert hit == "Acesse Meus Pedidos."
+    assert other_intent is None
+    assert miss is None
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_hashing_embedder_does_not_match_paraphrases():
+    """Testa que paráfrases com outras palavras ficam abaixo do limite padrão."""
+    # Arrange
+    cache = SemanticResponseCache()
+    cache.store("que horas vocês abrem", "Às 8h.")
+    
+    # Act
+    result = cache.lookup("qual o horário de abertura")
+    
+    # Assert
+    assert result is None
+
+
+def test_index_evicts_least_recently_used():
+    """Testa o descarte da entrada usada há mais tempo quando o índice enche."""
+    # Arrange
+    embedder = HashingEmbedder(dimensions=128)
+    index = VectorIndex(128, max_entries=2)
+    vectors = embedder.embed(["boleto vencido", "troca de produto", "rastrear entrega"])
+    index.add(vectors[0], "boleto vencido", "A")
+    index.add(vectors[1], "troca de produto", "B")
+    index.touch(0)
+    
+    # Act
+    evicted = index.add(vectors[2], "rastrear entrega", "C")
+    
+    # Assert
+    assert evicted is True
+    assert index.questions == ["boleto vencido", "rastrear entrega"]
+
+
+def test_persistence_round_trip(tmp_path):
+    """Testa que o cache gravado em disco é recarregado em uma nova instância."""
+    # Arrange
+    path = str(tmp_path / "semantico.npz")
+    cache = SemanticResponseCache(path=path)
+    cache.store("Qual o horário de atendimento?", "Das 8h às 18h.")
+    cache.save()
+    
+    # Act
+    restored = SemanticResponseCache(path=path)
+    
+    # Assert
+    assert restored.lookup("qual o horario de atendimento") == "Das 8h às 18h."
+    assert restored.get_stats()["entries"] == 1
+
+
+def test_use_case_skips_model_on_semantic_hit():
+    """Testa que o caso de uso não chama o modelo quando o cache semântico acerta."""
+    # Arrange
+    model = CountingModel()
+    use_case = ProcessMessageUseCase(ai_model=model, answer_cache=SemanticResponseCache())
+    
+    # Act
+    first = use_case.execute(ProcessMessageInput(user_message="Como faço para cancelar meu pedido?", conversation_history=[]))
+    second = use_case.execute(ProcessMessageInput(user_message="como faço pra cancelar o meu pedido", conversation_history=[]))
+    
+    # Assert
+    assert first.response == second.response
+    assert model.calls == 1
+
+
+def test_autosave_writes_off_the_calling_thread(tmp_path, monkeypatch):
+    """Testa que a gravação automática roda na thread de gravação, e não em quem guardou a resposta."""
+    # Arrange
+    import threading
+    from src.infrastructure.adapters import semantic_cache
+    
+    writer_threads = []
+    original_write = semantic_cache.write_snapshot
+    
+    def recording_write(path, snapshot):
+        writer_threads.append(threading.current_thread())
+        original_write(path, snapshot)
+    
+    monkeypatch.setattr(semantic_cache, "write_snapshot", recording_write)
+    path = str(tmp_path / "semantico.npz")
+    cache = SemanticResponseCache(path=path, autosave_every=1)
+    
+    # Act
+    cache.store("Qual o horário de atendimento?", "Das 8h às 18h.")
+    cache.save()
+    
+    # Assert
+    assert len(writer_threads) == 2
+    assert threading.current_thread() not in writer_threads
+    assert SemanticResponseCache(path=path).get_stats()["entries"] == 1
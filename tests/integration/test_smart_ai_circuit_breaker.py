@@ -0,0 +1,185 @@
+"""Testes de integração para os circuit breakers do SmartAIModel."""
+from unittest.mock import patch
+
+import pytest
+
+from src.domain.use_cases.process_message import AIModel
+from src.infrastructure.adapters.circuit_breaker import CircuitBreaker, CircuitState
+from src.infrastructure.adapters.smart_ai_adapter import SmartAIModel, MODEL_SEQUENCE
+
+
+class FakeClock:
+    """Relógio controlado manualmente nos testes."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class ScriptedModel(AIModel):
+    """Modelo falso que responde ou falha conforme um roteiro."""
+    
+    def __init__(self, name):
+        self.name = name
+        self.error = None
+        self.calls = 0
+    
+    def generate_response(self, messages, **kwargs):
+        self.calls += 1
+        if self.error is not None:
+            raise Exception(self.error)
+        return f"resposta do {self.name}"
+
+
+def build_model(clock, **breaker_kwargs):
+    """Cria um SmartAIModel com modelos falsos e circuitos com relógio controlado."""
+    breakers = {name: CircuitBreaker(clock=clock, **breaker_kwargs) for name in MODEL_SEQUENCE}
+    with patch('src.infrastructure.adapters.smart_ai_adapter.OpenAIModel'), \
+         patch('src.infrastructure.adapters.smart_ai_adapter.DeepSeekModel'), \
+         patch('src.infrastructure.adapters.smart_ai_adapter.OllamaModel'):
+        model = SmartAIModel(openai_api_key="a", deepseek_api_key="b", breakers=breakers)
+    model.openai_model = ScriptedModel("openai")
+    model.deepseek_model = ScriptedModel("deepseek")
+    model.ollama_model = ScriptedModel("ollama")
+    return model
+
+
+def test_quota_error_opens_circuit_and_recovers():
+    """Testa que após um erro de quota o OpenAI é pulado e volta a ser usado depois da sonda."""
+    # Arrange
+    clock = FakeClock()
+    model = build_model(clock, open_seconds=30)
+    model.openai_model.error = "Error code: 429 - insufficient_quota"
+    messages = [{"role": "user", "content": "Oi"}]
+    
+    # Act & Assert: o erro de quota abre o circuito e o DeepSeek responde
+    assert model.generate_response(messages) == "resposta do deepseek"
+    assert model.current_model == "deepseek"
+    assert model.get_breaker_states()["openai"]["state"] == CircuitState.OPEN
+    
+    # Enquanto o circuito está aberto, o OpenAI nem é chamado
+    clock.now = 10.0
+    assert model.generate_response(messages) == "resposta do deepseek"
+    assert model.openai_model.calls == 1
+    
+    # Depois do período aberto, a sonda volta ao OpenAI recuperado
+    model.openai_model.error = None
+    clock.now = 31.0
+    assert model.generate_response(messages) == "resposta do openai"
+    assert model.current_model == "openai"
+    assert model.get_breaker_states()["openai"]["state"] == CircuitState.CLOSED
+
+
+def test_failure_rate_opens_circuit():
+    """Testa que falhas comuns só abrem o circuito ao atingir a taxa configurada."""
+    # Arrange
+    clock = FakeClock()
+    model = build_model(clock, min_calls=3, failure_rate_threshold=0.5)
+    model.openai_model.error = "timeout"
+    messages = [{"role": "user", "content": "Oi"}]
+    
+    # Act
+    for _ in range(4):
+        model.generate_response(messages)
+    
+    # Assert
+    assert model.openai_model.calls == 3
+    assert model.fallback_count == 3
+    assert model.get_breaker_states()["openai"]["state"] == CircuitState.OPEN
+
+
+def test_all_circuits_open_fails_fast():
+    """Testa a falha imediata quando todos os circuitos estão abertos."""
+    # Arrange
+    clock = FakeClock()
+    model = build_model(clock)
+    for breaker in model.breakers.values():
+        breaker.trip()
+    
+    # Act & Assert
+    with pytest.raises(Exception) as exc_info:
+        model.generate_response([{"role": "user", "content": "Oi"}])
+    assert "todos os circuitos estão abertos" in str(exc_info.value)
+    assert model.openai_model.calls == 0
+
+
+def test_current_model_info_shows_breakers():
+    """Testa que o estado dos circuitos aparece em get_current_model_info."""
+    # Arrange
+    clock = FakeClock()
+    model = build_model(clock, open_seconds=30)
+    model.breakers["deepseek"].trip()
+    clock.now = 12.0
+    
+    # Act
+    info = model.get_current_model_info()
+    
+    # Assert
+    assert "OPENAI: fechado" in info
+    assert "DEEPSEEK: aberto (sonda em 18s)" in info
+    assert "OLLAMA: fechado" in info
+
+
+def test_reset_fallback_closes_all_circuits():
+    """Testa que reset_fallback fecha todos os circuitos."""
+    # Arrange
+    clock = FakeClock()
+    model = build_model(clock)
+    model.breakers["openai"].trip()
+    
+    # Act
+    model.reset_fallback()
+    
+    # Assert
+    assert model.generate_response([{"role": "user", "content": "Oi"}]) == "resposta do openai"
+
+
+def test_context_budget_follows_available_provider():
+    """Testa que o orçamento de tokens é o do primeiro provedor com circuito disponível."""
+    # Arrange
+    clock = FakeClock()
+    model = build_model(clock)
+    model.context_budgets = {"openai": 3000, "deepseek": 2000}
+    
+    # Act
+    budget_openai = model.context_budget()
+    model.breakers["openai"].trip()
+    budget_deepseek = model.context_budget()
+    model.breakers["deepseek"].trip()
+    budget_ollama = model.context_budget()
+    
+    # Assert
+    assert budget_openai == 3000
+    assert budget_deepseek == 2000
+    assert budget_ollama is None
+
+
+def test_session_preferred_provider_is_tried_first_and_follows_failover():
+    """Testa que o provedor preferido da sessão é o primeiro candidato e muda após o fallback."""
+    # Arrange
+    from src.domain.entities.session import ConversationSession
+    from src.domain.use_cases.process_message import session_scope
+
+    model = build_model(FakeClock())
+    messages = [{"role": "user", "content": "Oi"}]
+    pinned = ConversationSession(session_id="a", preferred_provider="deepseek")
+    other = ConversationSession(session_id="b")
+    
+    # Act
+    with session_scope(pinned):
+        first = model.generate_response(messages)
+    with session_scope(other):
+        second = model.generate_response(messages)
+    model.deepseek_model.error = "timeout"
+    with session_scope(pinned):
+        third = model.generate_response(messages)
+    
+    # Assert
+    assert first == "resposta do deepseek"
+    assert second == "resposta do openai"
+    assert other.preferred_provider == "openai"
+    assert third == "resposta do openai"
+    assert pinned.preferred_provider == "openai"
+    assert model.openai_model.calls == 2
@@ -0,0 +1,121 @@
+"""Testes de integração para o modo hedged do SmartAIModel."""
+import asyncio
+import time
+from unittest.mock import patch
+
+from src.domain.use_cases.process_message import AIModel
+from src.infrastructure.adapters.hedging import HedgingPolicy
+from src.infrastructure.adapters.smart_ai_adapter import SmartAIModel
+
+
+class DelayedStreamModel(AIModel):
+    """Modelo falso que espera um tempo antes de produzir os trechos."""
+    
+    def __init__(self, deltas, first_token_delay):
+        self.deltas = deltas
+        self.first_token_delay = first_token_delay
+        self.calls = 0
+        self.async_cancelled = False
+    
+    def stream_response(self, messages, **kwargs):
+        self.calls += 1
+        time.sleep(self.first_token_delay)
+        for delta in self.deltas:
+            yield delta
+    
+    async def astream_response(self, messages, **kwargs):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.first_token_delay)
+        except asyncio.CancelledError:
+            self.async_cancelled = True
+            raise
+        for delta in self.deltas:
+            yield delta
+
+
+def build_model(openai, deepseek, ollama=None, policy=None):
+    """Cria um SmartAIModel com modelos falsos no lugar dos provedores."""
+    with patch('src.infrastructure.adapters.smart_ai_adapter.OpenAIModel'), \
+         patch('src.infrastructure.adapters.smart_ai_adapter.DeepSeekModel'), \
+         patch('src.infrastructure.adapters.smart_ai_adapter.OllamaModel'):
+        model = SmartAIModel(openai_api_key="a", deepseek_api_key="b", hedging_policy=policy)
+    model.openai_model = openai
+    model.deepseek_model = deepseek
+    model.ollama_model = ollama or DelayedStreamModel(["local"], 5.0)
+    return model
+
+
+def test_slow_primary_is_hedged_sync():
+    """Testa que um primário lento perde para o hedge no modo síncrono."""
+    # Arrange
+    openai = DelayedStreamModel(["lento"], 1.0)
+    deepseek = DelayedStreamModel(["rápido", "!"], 0.0)
+    policy = HedgingPolicy(initial_delay=0.05)
+    model = build_model(openai, deepseek, policy=policy)
+    
+    # Act
+    started = time.monotonic()
+    response = model.generate_response([{"role": "user", "content": "Oi"}])
+    elapsed = time.monotonic() - started
+    
+    # Assert
+    assert response == "rápido!"
+    assert elapsed < 0.8
+    stats = model.get_hedging_stats()
+    assert stats["hedged"] == 1
+    assert stats["hedge_wins"] == 1
+    assert stats["wins"] == {"deepseek": 1}
+    assert "Hedges: 1/1" in model.get_current_model_info()
+
+
+def test_fast_primary_does_not_hedge_sync():
+    """Testa que nenhum hedge é disparado quando o primário responde a tempo."""
+    # Arrange
+    openai = DelayedStreamModel(["Olá"], 0.0)
+    deepseek = DelayedStreamModel(["reserva"], 0.0)
+    model = build_model(openai, deepseek, policy=HedgingPolicy(initial_delay=0.5))
+    
+    # Act
+    deltas = list(model.stream_response([{"role": "user", "content": "Oi"}]))
+    
+    # Assert
+    assert deltas == ["Olá"]
+    assert deepseek.calls == 0
+    assert model.get_hedging_stats()["hedged"] == 0
+
+
+def test_slow_primary_is_cancelled_async():
+    """Testa que o perdedor é cancelado no modo assíncrono."""
+    # Arrange
+    openai = DelayedStreamModel(["lento"], 5.0)
+    deepseek = DelayedStreamModel(["rápido"], 0.0)
+    model = build_model(openai, deepseek, policy=HedgingPolicy(initial_delay=0.05))
+    
+    async def run():
+        response = await model.agenerate_response([{"role": "user", "content": "Oi"}])
+        await asyncio.sleep(0)
+        return response
+    
+    # Act
+    started = time.monotonic()
+    response = asyncio.run(run())
+    elapsed = time.monotonic() - started
+    
+    # Assert
+    assert response == "rápido"
+    assert elapsed < 1.0
+    assert openai.async_cancelled is True
+    assert model.get_hedging_stats()["hedge_wins"] == 1
+
+
+def test_hedging_disabled_by_default():
+    """Testa que o modo hedged fica desativado sem política."""
+    # Arrange
+    model = build_model(DelayedStreamModel(["Olá"], 0.0), DelayedStreamModel(["x"], 0.0))
+    
+    # Act & Assert
+    assert model.get_hedging_stats() is None
+    info = model.get_current_model_info()
+    assert info.startswith("Modelo atual: OPENAI, Fallbacks: 0")
+    assert "Hedges" not in info
@@ -0,0 +1,132 @@
+"""Testes de integração para o streaming dos adaptadores DeepSeek, Ollama e SmartAI."""
+import json
+import httpx
+import pytest
+from unittest.mock import patch
+
+from src.infrastructure.adapters.deepseek_adapter import DeepSeekModel
+from src.infrastructure.adapters.http_transport import HttpTransport
+from src.infrastructure.adapters.ollama_adapter import OllamaModel
+from src.infrastructure.adapters.smart_ai_adapter import SmartAIModel
+
+
+def make_streaming_transport(lines, requests_seen):
+    """Cria um transporte HTTP falso cuja resposta devolve as linhas informadas."""
+    def handler(request):
+        requests_seen.append(request)
+        body = "".join(line + "\n" for line in lines)
+        return httpx.Response(200, content=body.encode("utf-8"))
+    
+    return HttpTransport(transport=httpx.MockTransport(handler))
+
+
+class TestDeepSeekStreaming:
+    """Testes para o streaming SSE do DeepSeek."""
+    
+    def test_stream_response_parses_sse(self):
+        """Testa a leitura de eventos SSE até o marcador [DONE]."""
+        # Arrange
+        requests_seen = []
+        event = lambda text: "data: " + json.dumps({"choices": [{"delta": {"content": text}}]})
+        transport = make_streaming_transport([
+            ": keep-alive",
+            event("Bom"),
+            "",
+            event(" dia"),
+            "data: [DONE]",
+            event("ignorado"),
+        ], requests_seen)
+        adapter = DeepSeekModel(api_key="test_key", transport=transport)
+        
+        # Act
+        deltas = list(adapter.stream_response([{"role": "user", "content": "Oi"}]))
+        
+        # Assert
+        assert deltas == ["Bom", " dia"]
+        assert json.loads(requests_seen[0].content)["stream"] is True
+        assert requests_seen[0].headers["Authorization"] == "Bearer test_key"
+
+
+class TestOllamaStreaming:
+    """Testes para o streaming NDJSON do Ollama."""
+    
+    def test_stream_response_parses_ndjson(self):
+        """Testa a leitura das linhas NDJSON até o objeto final."""
+        # Arrange
+        requests_seen = []
+        transport = make_streaming_transport([
+            json.dumps({"message": {"role": "assistant", "content": "Olá"}, "done": False}),
+            "",
+            json.dumps({"message": {"role": "assistant", "content": "!"}, "done": False}),
+            json.dumps({"message": {"role": "assistant", "content": ""}, "done": True}),
+        ], requests_seen)
+        adapter = OllamaModel(transport=transport)
+        
+        # Act
+        deltas = list(adapter.stream_response([
+            {"role": "system", "content": "Seja breve."},
+            {"role": "user", "content": "Oi"},
+        ]))
+        
+        # Assert
+        assert deltas == ["Olá", "!"]
+        payload = json.loads(requests_seen[0].content)
+        assert payload["stream"] is True
+        assert payload["messages"][0]["role"] == "user"
+    
+    def test_stream_response_error_line(self):
+        """Testa o tratamento de uma linha de erro no meio do fluxo."""
+        # Arrange
+        transport = make_streaming_transport([json.dumps({"error": "model not found"})], [])
+        adapter = OllamaModel(transport=transport)
+        
+        # Act & Assert
+        with pytest.raises(Exception) as exc_info:
+            list(adapter.stream_response([{"role": "user", "content": "Oi"}]))
+        
+        assert "model not found" in str(exc_info.value)
+
+
+class TestSmartAIStreaming:
+    """Testes para o streaming com fallback do SmartAIModel."""
+    
+    @patch('src.infrastructure.adapters.smart_ai_adapter.OllamaModel')
+    @patch('src.infrastructure.adapters.smart_ai_adapter.DeepSeekModel')
+    @patch('src.infrastructure.adapters.smart_ai_adapter.OpenAIModel')
+    def test_stream_falls_back_before_first_token(self, mock_openai, mock_deepseek, mock_ollama):
+        """Testa o fallback quando o primário falha por quota antes do primeiro trecho."""
+        # Arrange
+        mock_openai.return_value.stream_response.side_effect = Exception("Error code: 429 - insufficient_quota")
+        mock_deepseek.return_value.stream_response.return_value = iter(["Oi", "!"])
+        model = SmartAIModel(openai_api_key="a", deepseek_api_key="b")
+        
+        # Act
+        deltas = list(model.stream_response([{"role": "user", "content": "Oi"}]))
+        
+        # Assert
+        assert deltas == ["Oi", "!"]
+        assert model.current_model == "deepseek"
+        assert model.fallback_count == 1
+    
+    @patch('src.infrastructure.adapters.smart_ai_adapter.OllamaModel')
+    @patch('src.infrastructure.adapters.smart_ai_adapter.DeepSeekModel')
+    @patch('src.infrastructure.adapters.smart_ai_adapter.OpenAIModel')
+    def test_stream_does_not_fall_back_after_first_token(self, mock_openai, mock_deepseek, mock_ollama):
+        """Testa que um erro depois do primeiro trecho é propagado sem fallback."""
+        # Arrange
+        def broken_stream(*args, **kwargs):
+            yield "Olá"
+            raise Exception("429 rate_limit")
+        
+        mock_openai.return_value.stream_response.side_effect = broken_stream
+        model = SmartAIModel(openai_api_key="a", deepseek_api_key="b")
+        received = []
+        
+        # Act & Assert
+        with pytest.raises(Exception):
+            for delta in model.stream_response([{"role": "user", "content": "Oi"}]):
+                received.append(delta)
+        
+        assert received == ["Olá"]
+        assert model.current_model == "openai"
+        mock_deepseek.return_value.stream_response.assert_not_called()
@@ -199,3 +199,268 @@ class TestVoiceOutputAdapter:
         assert voices[1]["name"] == "Voz 2"
         assert voices[1]["languages"] == ["en_US"]
         assert voices[1]["gender"] == "male"
+
+
+class TestVoiceInputAdapterVad:
+    """Testes para a captura com detecção de atividade de voz."""
+
+    def test_vad_falls_back_to_energy_without_numpy(self):
+        """Testa que, sem o NumPy, o modo vad cai para o detector por energia."""
+        # Arrange
+        import speech_recognition as sr
+
+        with patch.object(sr, "Microphone", return_value=MagicMock()), \
+                patch.object(sr, "Recognizer", return_value=MagicMock()), \
+                patch("src.infrastructure.adapters.voice_activity.np", None):
+            # Act
+            adapter = VoiceInputAdapter(endpointer="vad")
+
+        # Assert
+        assert adapter.endpointer == "energy"
+
+    def test_listen_with_vad_endpointer(self):
+        """Testa que o modo vad lê o microfone diretamente e entrega só a fala ao reconhecedor."""
+        # Arrange
+        import numpy as np
+        import speech_recognition as sr
+
+        t = np.arange(8000) / 16000
+        speech = 0.2 * sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 6))
+        silence = np.random.default_rng(0).normal(0.0, 0.002, 32000)
+        pcm = (np.clip(np.concatenate([silence[:8000], speech, silence]), -1, 1) * 32767).astype("<i2").tobytes()
+        chunks = [pcm[i:i + 2048] for i in range(0, len(pcm), 2048)]
+
+        source = MagicMock(SAMPLE_RATE=16000, SAMPLE_WIDTH=2, CHUNK=1024)
+        source.stream.read.side_effect = chunks
+        microphone = MagicMock()
+        microphone.__enter__.return_value = source
+        recognizer = MagicMock()
+        recognizer.recognize_google.return_value = "Olá"
+
+        with patch.object(sr, "Microphone", return_value=microphone), \
+                patch.object(sr, "Recognizer", return_value=recognizer):
+            adapter = VoiceInputAdapter(endpointer="vad")
+
+            # Act
+            success, text = adapter.listen()
+
+        # Assert
+        assert (success, text) == (True, "Olá")
+        recognizer.listen.assert_not_called()
+        audio = recognizer.recognize_google.call_args[0][0]
+        assert isinstance(audio, sr.AudioData)
+        assert len(audio.frame_data) < len(pcm) / 2
+        assert source.stream.read.call_count < len(chunks)
+        assert adapter._noise_db is not None
+
+    def test_listen_with_offline_speech_recognizer(self):
+        """Testa que o adaptador usa o mecanismo de reconhecimento configurado em vez do Google."""
+        # Arrange
+        import speech_recognition as sr
+        from src.infrastructure.adapters.speech_recognizer import ScriptedSpeechRecognizer
+
+        recognizer = MagicMock()
+        recognizer.listen.return_value = sr.AudioData(b"\x00\x00" * 160, 16000, 2)
+        with patch.object(sr, "Microphone", return_value=MagicMock()), \
+                patch.object(sr, "Recognizer", return_value=recognizer):
+            adapter = VoiceInputAdapter(speech_recognizer=ScriptedSpeechRecognizer(["Olá", ""]))
+
+            # Act
+            first = adapter.listen()
+            second = adapter.listen()
+
+        # Assert
+        assert first == (True, "Olá")
+        assert second == (False, "Não foi possível entender o áudio")
+        recognizer.recognize_google.assert_not_called()
+
+    def test_listen_with_persistent_capture(self):
+        """Testa que, com a captura contínua, o microfone fica aberto entre as escutas."""
+        # Arrange
+        import time
+        import numpy as np
+        import speech_recognition as sr
+        from src.infrastructure.adapters.speech_recognizer import ScriptedSpeechRecognizer
+
+        t = np.arange(8000) / 16000
+        speech = 0.2 * sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 6))
+        silence = np.random.default_rng(0).normal(0.0, 0.002, 24000)
+        utterance = (np.clip(np.concatenate([silence[:4000], speech, silence]), -1, 1) * 32767).astype("<i2").tobytes()
+        chunks = [utterance[i:i + 2048] for i in range(0, len(utterance), 2048)] * 2
+
+        def read(frames):
+            # Simula o ritmo do microfone (mais rápido que o tempo real)
+            time.sleep(0.002)
+            return chunks.pop(0) if chunks else utterance[-2048:]
+
+        source = MagicMock(SAMPLE_RATE=16000, SAMPLE_WIDTH=2, CHUNK=1024)
+        source.stream.read.side_effect = read
+        microphone = MagicMock(SAMPLE_RATE=16000, SAMPLE_WIDTH=2, CHUNK=1024)
+        microphone.__enter__.return_value = source
+
+        with patch.object(sr, "Microphone", return_value=microphone), \
+                patch.object(sr, "Recognizer", return_value=MagicMock()):
+            adapter = VoiceInputAdapter(
+                endpointer="vad",
+                speech_recognizer=ScriptedSpeechRecognizer(["primeira", "segunda"]),
+                persistent_capture=True,
+                capture_preroll=0.5
+            )
+
+            # Act
+            results = [adapter.listen(), adapter.listen()]
+            adapter.close()
+
+        # Assert
+        assert results == [(True, "primeira"), (True, "segunda")]
+        # Uma abertura para a calibração e uma para a captura contínua
+        assert microphone.__enter__.call_count == 2
+        assert microphone.__exit__.call_count == 2
+
+    def test_listen_stream_yields_partials_before_final(self):
+        """Testa que o streaming produz parciais crescentes durante a fala e a final no fim."""
+        # Arrange
+        import numpy as np
+        import speech_recognition as sr
+        from src.infrastructure.adapters.speech_recognizer import ScriptedSpeechRecognizer
+
+        t = np.arange(16000) / 16000
+        speech = 0.2 * sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 6))
+        silence = np.random.default_rng(0).normal(0.0, 0.002, 24000)
+        pcm = (np.clip(np.concatenate([silence[:4000], speech, silence]), -1, 1) * 32767).astype("<i2").tobytes()
+        chunks = [pcm[i:i + 2048] for i in range(0, len(pcm), 2048)]
+
+        source = MagicMock(SAMPLE_RATE=16000, SAMPLE_WIDTH=2, CHUNK=1024)
+        source.stream.read.side_effect = chunks
+        microphone = MagicMock()
+        microphone.__enter__.return_value = source
+
+        with patch.object(sr, "Microphone", return_value=microphone), \
+                patch.object(sr, "Recognizer", return_value=MagicMock()):
+            adapter = VoiceInputAdapter(
+                endpointer="vad",
+                speech_recognizer=ScriptedSpeechRecognizer(["qual o horário de atendimento"], seconds_per_word=0.2)
+            )
+
+            # Act
+            transcripts = list(adapter.listen_stream())
+
+        # Assert
+        partials = [t.text for t in transcripts if not t.final]
+        assert partials[:2] == ["qual", "qual o"]
+        assert transcripts[-1].final is True
+        assert transcripts[-1].text == "qual o horário de atendimento"
+        assert sum(t.final for t in transcripts) == 1
+
+    def test_listen_stream_raises_when_no_speech(self):
+        """Testa que o streaming sem fala gera VoiceInputError."""
+        # Arrange
+        import numpy as np
+        import speech_recognition as sr
+        from src.infrastructure.adapters.speech_recognizer import ScriptedSpeechRecognizer
+
+        silence = (np.random.default_rng(0).normal(0.0, 0.002, 16000 * 6) * 32767).astype("<i2").tobytes()
+        source = MagicMock(SAMPLE_RATE=16000, SAMPLE_WIDTH=2, CHUNK=1024)
+        source.stream.read.side_effect = [silence[i:i + 2048] for i in range(0, len(silence), 2048)]
+        microphone = MagicMock()
+        microphone.__enter__.return_value = source
+
+        with patch.object(sr, "Microphone", return_value=microphone), \
+                patch.object(sr, "Recognizer", return_value=MagicMock()):
+            adapter = VoiceInputAdapter(endpointer="vad", speech_recognizer=ScriptedSpeechRecognizer(["olá"]))
+
+            # Act / Assert
+            with pytest.raises(VoiceInputError, match="Nenhuma fala"):
+                list(adapter.listen_stream())
+
+
+class TestVoiceOutputAudioCache:
+    """Testes para o cache de áudio da saída de voz."""
+
+    @patch('src.infrastructure.adapters.voice_output.pyttsx3')
+    def test_prerendered_prompt_plays_from_cache(self, mock_pyttsx3, tmp_path):
+        """Testa que uma frase pré-renderizada é tocada do cache, sem nova síntese."""
+        # Arrange
+        from src.infrastructure.adapters.tts_cache import SpeechAudioCache
+
+        mock_engine = MagicMock()
+        mock_pyttsx3.init.return_value = mock_engine
+        mock_engine.getProperty.side_effect = lambda name: [] if name == 'voices' else f"{name}-atual"
+
+        def save_to_file(text, path):
+            with open(path, "wb") as file:
+                file.write(text.encode("utf-8"))
+
+        mock_engine.save_to_file.side_effect = save_to_file
+        played = []
+        adapter = VoiceOutputAdapter(audio_cache=SpeechAudioCache(str(tmp_path)), player=played.append)
+
+        # Act
+        for future in adapter.prerender(["Bem-vindo!", ""]):
+            future.result()
+        adapter.speak("Bem-vindo!")
+        adapter.speak("Outra frase")
+
+        # Assert
+        assert len(played) == 1
+        with open(played[0], "rb") as file:
+            assert file.read() == "Bem-vindo!".encode("utf-8")
+        mock_engine.say.assert_called_once_with("Outra frase")
+
+    @patch('src.infrastructure.adapters.voice_output.pyttsx3')
+    def test_repeated_text_is_cached_and_playback_failure_falls_back(self, mock_pyttsx3, tmp_path):
+        """Testa que um texto repetido vai para o cache e que uma falha ao tocar volta à síntese."""
+        # Arrange
+        from src.infrastructure.adapters.tts_cache import SpeechAudioCache
+
+        mock_engine = MagicMock()
+        mock_pyttsx3.init.return_value = mock_engine
+        mock_engine.getProperty.side_effect = lambda name: [] if name == 'voices' else name
+
+        def save_to_file(text, path):
+            with open(path, "wb") as file:
+                file.write(b"audio")
+
+        mock_engine.save_to_file.side_effect = save_to_file
+
+        def broken_player(path):
+            raise OSError("sem saída de áudio")
+
+        cache = SpeechAudioCache(str(tmp_path))
+        adapter = VoiceOutputAdapter(audio_cache=cache, player=broken_player)
+
+        # Act
+        adapter.speak("Qual o horário?")
+        adapter.speak("Qual o horário?")
+        adapter.flush()
+        adapter.speak("Qual o horário?")
+
+        # Assert
+        assert len(cache) == 1
+        assert mock_engine.say.call_count == 3
+
+    @patch('src.infrastructure.adapters.voice_output.pyttsx3')
+    def test_speak_async_returns_before_speech_ends(self, mock_pyttsx3):
+        """Testa que speak_async não bloqueia e que flush aguarda o fim da fala."""
+        # Arrange
+        import threading
+
+        mock_engine = MagicMock()
+        mock_pyttsx3.init.return_value = mock_engine
+        mock_engine.getProperty.return_value = []
+        release = threading.Event()
+        mock_engine.runAndWait.side_effect = lambda: release.wait(5)
+        adapter = VoiceOutputAdapter()
+
+        # Act
+        future = adapter.speak_async("Resposta longa")
+        pending = future.done()
+        release.set()
+        flushed = adapter.flush(timeout=5)
+
+        # Assert
+        assert pending is False
+        assert flushed is True
+        assert future.result() is True
+        mock_engine.say.assert_called_once_with("Resposta longa")
+        adapter.close()
@@ -0,0 +1,114 @@
+"""Testes para a captura contínua do microfone e o buffer circular."""
+import threading
+import time
+
+import pytest
+
+from src.infrastructure.adapters.audio_capture import AudioRingBuffer, CaptureReader, MicrophoneCapture
+
+
+class FakeMicrophone:
+    """Microfone falso que produz trechos numerados (2 bytes por amostra)."""
+
+    SAMPLE_RATE = 1000
+    SAMPLE_WIDTH = 2
+    CHUNK = 10
+
+    def __init__(self):
+        self.opened = 0
+        self.closed = 0
+        self.counter = 0
+        self.stream = self
+
+    def __enter__(self):
+        self.opened += 1
+        return self
+
+    def __exit__(self, *args):
+        self.closed += 1
+
+    def read(self, frames):
+        time.sleep(0.001)
+        self.counter += 1
+        return bytes([self.counter % 256]) * (frames * 2)
+
+
+def test_ring_buffer_wraps_and_skips_overrun():
+    """Testa a leitura sem cópia através da volta do buffer e o salto de um leitor atrasado."""
+    # Arrange
+    ring = AudioRingBuffer(8)
+    ring.write(b"abcdef")
+    views, position = ring.read(0, 4)
+    assert b"".join(views) == b"abcd"
+
+    # Act
+    ring.write(b"ghij")
+    wrapped, end = ring.read(position, 10)
+    # As views apontam para o próprio buffer: são consumidas antes da próxima volta
+    wrapped_data = [bytes(view) for view in wrapped]
+    ring.write(b"klmnopqrstuv")
+    late, late_end = ring.read(end, 4)
+
+    # Assert
+    assert wrapped_data == [b"efgh", b"ij"]
+    assert all(isinstance(view, memoryview) for view in wrapped)
+    assert end == 10
+    assert b"".join(late) == b"opqr"
+    assert late_end == ring.oldest() + 4
+
+
+def test_reader_waits_for_writer_and_returns_exact_frames():
+    """Testa que o leitor espera a captura e devolve exatamente o número de amostras pedido."""
+    # Arrange
+    ring = AudioRingBuffer(64)
+    reader = CaptureReader(ring, 0, frame_bytes=2)
+
+    def writer():
+        for index in range(5):
+            time.sleep(0.005)
+            ring.write(bytes([index]) * 4)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+
+    # Act
+    data = reader.read(8)
+    thread.join()
+
+    # Assert
+    assert data == b"\x00" * 4 + b"\x01" * 4 + b"\x02" * 4 + b"\x03" * 4
+
+
+def test_reader_fails_when_capture_stops():
+    """Testa que o leitor não fica preso quando a captura termina."""
+    # Arrange
+    ring = AudioRingBuffer(16)
+    reader = CaptureReader(ring, 0, frame_bytes=2, timeout=1.0)
+    ring.close()
+
+    # Act / Assert
+    with pytest.raises(OSError):
+        reader.read(1)
+
+
+def test_microphone_capture_keeps_stream_open_with_preroll():
+    """Testa que o microfone é aberto uma vez e que a escuta inclui o áudio anterior (pré-roll)."""
+    # Arrange
+    microphone = FakeMicrophone()
+    capture = MicrophoneCapture(microphone, buffer_seconds=1.0)
+    capture.start()
+    while capture.ring.written < 200:
+        time.sleep(0.001)
+
+    # Act
+    first = capture.source(preroll=0.05).stream.read(50)
+    second = capture.source(preroll=0.0).stream.read(10)
+    capture.stop()
+
+    # Assert
+    assert microphone.opened == 1
+    assert microphone.closed == 1
+    assert len(first) == 100 and len(second) == 20
+    # O pré-roll começa em trechos já gravados antes do pedido
+    assert first[0] < second[0]
+    assert not capture.running
@@ -0,0 +1,144 @@
+"""Testes para o circuit breaker dos provedores de IA."""
+from src.infrastructure.adapters.circuit_breaker import CircuitBreaker, CircuitState
+
+
+class FakeClock:
+    """Relógio controlado manualmente nos testes."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def test_starts_closed():
+    """Testa que o circuito começa fechado e libera requisições."""
+    # Arrange
+    breaker = CircuitBreaker()
+    
+    # Act & Assert
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request() is True
+
+
+def test_opens_when_failure_rate_reaches_threshold():
+    """Testa a abertura do circuito pela taxa de falhas da janela."""
+    # Arrange
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, window_size=4, min_calls=4)
+    
+    # Act
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_success()
+    state_before = breaker.state
+    breaker.record_failure()
+    
+    # Assert
+    assert state_before == CircuitState.CLOSED
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.allow_request() is False
+
+
+def test_min_calls_before_opening():
+    """Testa que poucas chamadas não abrem o circuito."""
+    # Arrange
+    breaker = CircuitBreaker(min_calls=5)
+    
+    # Act
+    for _ in range(4):
+        breaker.record_failure()
+    
+    # Assert
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_sliding_window_forgets_old_failures():
+    """Testa que falhas antigas saem da janela deslizante."""
+    # Arrange
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, window_size=4, min_calls=4)
+    breaker.record_failure()
+    breaker.record_failure()
+    
+    # Act
+    for _ in range(4):
+        breaker.record_success()
+    breaker.record_failure()
+    
+    # Assert
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.snapshot()["failure_rate"] == 0.25
+
+
+def test_half_open_probe_success_closes():
+    """Testa a recuperação: após o período aberto, uma sonda bem-sucedida fecha o circuito."""
+    # Arrange
+    clock = FakeClock()
+    breaker = CircuitBreaker(open_seconds=30, clock=clock)
+    breaker.trip()
+    
+    # Act
+    clock.now = 29.0
+    allowed_while_open = breaker.allow_request()
+    clock.now = 30.0
+    probe = breaker.allow_request()
+    second_request = breaker.allow_request()
+    breaker.record_success()
+    
+    # Assert
+    assert allowed_while_open is False
+    assert probe is True
+    assert second_request is False
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.snapshot()["calls"] == 1
+
+
+def test_half_open_probe_failure_reopens():
+    """Testa que uma sonda com falha reabre o circuito por mais um período."""
+    # Arrange
+    clock = FakeClock()
+    breaker = CircuitBreaker(open_seconds=10, clock=clock)
+    breaker.trip()
+    clock.now = 10.0
+    assert breaker.allow_request() is True
+    
+    # Act
+    breaker.record_failure()
+    
+    # Assert
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.snapshot()["reopen_in"] == 10.0
+    assert breaker.snapshot()["times_opened"] == 2
+
+
+def test_release_probe_allows_new_probe():
+    """Testa que uma sonda cancelada pode ser substituída por outra."""
+    # Arrange
+    clock = FakeClock()
+    breaker = CircuitBreaker(open_seconds=1, clock=clock)
+    breaker.trip()
+    clock.now = 1.0
+    breaker.allow_request()
+    
+    # Act
+    breaker.release_probe()
+    
+    # Assert
+    assert breaker.is_available() is True
+    assert breaker.allow_request() is True
+
+
+def test_reset_closes_circuit():
+    """Testa que o reset fecha o circuito e descarta o histórico."""
+    # Arrange
+    breaker = CircuitBreaker()
+    breaker.record_failure()
+    breaker.trip()
+    
+    # Act
+    breaker.reset()
+    
+    # Assert
+    snapshot = breaker.snapshot()
+    assert snapshot["state"] == CircuitState.CLOSED
+    assert snapshot["calls"] == 0
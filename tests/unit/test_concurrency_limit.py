@@ -0,0 +1,82 @@
+"""Testes para o limite de requisições simultâneas a um provedor."""
+import asyncio
+
+import pytest
+
+from src.domain.use_cases.process_message import AIModel
+from src.infrastructure.adapters.concurrency_limit import ConcurrencyLimitedModel
+
+
+class SleepyModel(AIModel):
+    """Modelo falso assíncrono que demora um pouco para responder."""
+
+    health_monitor = "monitor"
+
+    async def agenerate_response(self, messages, **kwargs):
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def astream_response(self, messages, **kwargs):
+        await asyncio.sleep(0.02)
+        yield "ok"
+
+
+def test_async_calls_respect_limit():
+    """Testa que as chamadas assíncronas não passam do limite e liberam as vagas."""
+    # Arrange
+    model = ConcurrencyLimitedModel(SleepyModel(), max_concurrency=2)
+
+    async def scenario():
+        async def stream():
+            return [delta async for delta in model.astream_response([])]
+        return await asyncio.gather(*[model.agenerate_response([]) for _ in range(4)], stream())
+
+    # Act
+    results = asyncio.run(scenario())
+
+    # Assert
+    assert results[:4] == ["ok"] * 4
+    assert results[4] == ["ok"]
+    stats = model.get_stats()
+    assert stats["peak"] == 2
+    assert stats["in_flight"] == 0
+
+
+def test_delegates_attributes_and_rejects_invalid_limit():
+    """Testa o repasse de atributos do modelo real e a validação do limite."""
+    # Act
+    model = ConcurrencyLimitedModel(SleepyModel(), max_concurrency=1)
+
+    # Assert
+    assert model.health_monitor == "monitor"
+    with pytest.raises(ValueError):
+        ConcurrencyLimitedModel(SleepyModel(), max_concurrency=0)
+
+
+def test_cancelled_waiters_do_not_leak_slots_or_executor_threads():
+    """Testa que esperar por vaga não usa o executor e que um cancelamento não perde a vaga."""
+    # Arrange
+    model = ConcurrencyLimitedModel(SleepyModel(), max_concurrency=1)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor = None  # qualquer uso do executor falharia
+        holder = asyncio.ensure_future(model.agenerate_response([]))
+        await asyncio.sleep(0)
+        waiters = [asyncio.ensure_future(model.agenerate_response([])) for _ in range(20)]
+        await asyncio.sleep(0)
+        for waiter in waiters[:-1]:
+            waiter.cancel()
+        await holder
+        last = await waiters[-1]
+        again = await model.agenerate_response([])
+        return last, again, sum(waiter.cancelled() for waiter in waiters)
+
+    # Act
+    last, again, cancelled = asyncio.run(scenario())
+
+    # Assert
+    assert (last, again, cancelled) == ("ok", "ok", 19)
+    stats = model.get_stats()
+    assert stats["in_flight"] == 0
+    assert stats["waits"] == 20
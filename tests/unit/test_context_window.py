@@ -0,0 +1,88 @@
+"""Testes para a janela de contexto limitada por tokens."""
+from src.domain.services.context_window import ApproximateTokenizer, ContextWindow, Tokenizer
+
+
+class WordTokenizer(Tokenizer):
+    """Contador de tokens que conta palavras, para testes previsíveis."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def count(self, text):
+        self.calls += 1
+        return len(text.split())
+
+
+def message(role, words):
+    """Cria uma mensagem com a quantidade de palavras informada."""
+    return {"role": role, "content": " ".join(["palavra"] * words)}
+
+
+def test_approximate_tokenizer():
+    """Testa a contagem aproximada de palavras e pontuação."""
+    # Arrange
+    tokenizer = ApproximateTokenizer(chars_per_token=4)
+    
+    # Act & Assert
+    assert tokenizer.count("") == 0
+    assert tokenizer.count("Olá, tudo bem?") == 5
+    assert tokenizer.count("atendimento") == 3
+
+
+def test_fit_fills_newest_first_within_budget():
+    """Testa que o histórico é preenchido da mensagem mais recente para a mais antiga."""
+    # Arrange
+    window = ContextWindow(WordTokenizer(), per_message_overhead=0, reply_overhead=0)
+    system = [message("system", 5)]
+    history = [message("user", 10), message("assistant", 3), message("user", 4)]
+    current = message("user", 2)
+    
+    # Act
+    prompt = window.fit(system, history, current, budget=15)
+    
+    # Assert
+    assert prompt == system + history[1:] + [current]
+    assert window.count_messages(prompt) == 14
+
+
+def test_fit_stops_at_first_message_that_does_not_fit():
+    """Testa que mensagens mais antigas não pulam uma mensagem longa (o histórico fica contíguo)."""
+    # Arrange
+    window = ContextWindow(WordTokenizer(), per_message_overhead=0, reply_overhead=0)
+    history = [message("user", 1), message("assistant", 50), message("user", 1)]
+    
+    # Act
+    prompt = window.fit([], history, message("user", 1), budget=10)
+    
+    # Assert
+    assert prompt == [history[2], message("user", 1)]
+
+
+def test_fit_always_keeps_system_and_current():
+    """Testa que o prompt de sistema e a mensagem atual entram mesmo acima do orçamento."""
+    # Arrange
+    window = ContextWindow(WordTokenizer())
+    system = [message("system", 20)]
+    current = message("user", 20)
+    
+    # Act
+    prompt = window.fit(system, [message("user", 1)], current, budget=5)
+    
+    # Assert
+    assert prompt == system + [current]
+
+
+def test_counts_are_cached():
+    """Testa que cada conteúdo é tokenizado uma única vez."""
+    # Arrange
+    tokenizer = WordTokenizer()
+    window = ContextWindow(tokenizer)
+    history = [message("user", 3), message("assistant", 4)]
+    
+    # Act
+    for _ in range(5):
+        window.fit([], history, message("user", 1), budget=100)
+    
+    # Assert
+    assert tokenizer.calls == 3
+    assert window.cache_info().hits > 0
@@ -0,0 +1,125 @@
+"""Testes para a política de requisições hedged."""
+import pytest
+
+from src.infrastructure.adapters.hedging import HedgingPolicy, HedgedRace
+
+
+def test_initial_delay_until_enough_samples():
+    """Testa o uso do atraso inicial enquanto há poucas amostras."""
+    # Arrange
+    policy = HedgingPolicy(initial_delay=0.8, min_samples=5)
+    for _ in range(4):
+        policy.record_first_token("openai", 0.1)
+    
+    # Act & Assert
+    assert policy.hedge_delay("openai") == 0.8
+
+
+def test_percentile_delay():
+    """Testa o atraso calculado pelo percentil do tempo até o primeiro token."""
+    # Arrange
+    policy = HedgingPolicy(percentile=90, min_samples=10, min_delay=0.0)
+    for i in range(1, 11):
+        policy.record_first_token("openai", i / 10)
+    
+    # Act
+    delay = policy.hedge_delay("openai")
+    
+    # Assert
+    assert delay == pytest.approx(0.9)
+
+
+def test_delay_is_clamped():
+    """Testa os limites mínimo e máximo do atraso."""
+    # Arrange
+    policy = HedgingPolicy(min_samples=1, min_delay=0.2, max_delay=2.0)
+    policy.record_first_token("rapido", 0.01)
+    policy.record_first_token("lento", 30.0)
+    
+    # Act & Assert
+    assert policy.hedge_delay("rapido") == 0.2
+    assert policy.hedge_delay("lento") == 2.0
+
+
+def test_invalid_percentile():
+    """Testa a validação do percentil."""
+    with pytest.raises(ValueError):
+        HedgingPolicy(percentile=0)
+
+
+def test_stats_report_hedge_rate_and_wins():
+    """Testa as estatísticas de taxa de hedge e vitórias."""
+    # Arrange
+    policy = HedgingPolicy()
+    
+    # Act
+    policy.record_outcome("openai", "openai", hedged=False)
+    policy.record_outcome("openai", "deepseek", hedged=True)
+    policy.record_outcome("openai", "openai", hedged=True)
+    policy.record_outcome("openai", "deepseek", hedged=False)
+    stats = policy.get_stats()
+    
+    # Assert
+    assert stats["requests"] == 4
+    assert stats["hedged"] == 2
+    assert stats["hedge_rate"] == 0.5
+    assert stats["hedge_wins"] == 1
+    assert stats["wins"] == {"openai": 2, "deepseek": 2}
+
+
+def test_race_hedges_on_timeout_and_first_delta_wins():
+    """Testa a corrida: hedge disparado no timeout e vitória do primeiro trecho."""
+    # Arrange
+    policy = HedgingPolicy(initial_delay=0.5)
+    race = HedgedRace(policy, ["openai", "deepseek", "ollama"])
+    
+    # Act
+    primary = race.start(now=0.0)
+    timeout = race.wait_timeout(now=0.2)
+    hedge = race.on_timeout(now=0.5)
+    deliver_hedge = race.on_delta("deepseek", now=0.7)
+    deliver_primary = race.on_delta("openai", now=0.9)
+    race.finish()
+    
+    # Assert
+    assert primary == "openai"
+    assert timeout == pytest.approx(0.3)
+    assert hedge == "deepseek"
+    assert deliver_hedge is True
+    assert deliver_primary is False
+    assert race.losers() == ["openai"]
+    assert race.wait_timeout(now=1.0) is None
+    assert policy.get_stats()["hedge_wins"] == 1
+
+
+def test_losing_primary_is_recorded_as_a_lower_bound():
+    """Testa que o primário que perde para o hedge entra nas amostras com o tempo esperado até a vitória."""
+    # Arrange
+    policy = HedgingPolicy(initial_delay=0.5, min_samples=1, min_delay=0.0)
+    race = HedgedRace(policy, ["openai", "deepseek"])
+    race.start(now=0.0)
+    race.on_timeout(now=0.5)
+    
+    # Act
+    race.on_delta("deepseek", now=0.7)
+    race.on_delta("openai", now=0.9)
+    
+    # Assert
+    assert policy.hedge_delay("openai") == pytest.approx(0.7)
+    assert policy.hedge_delay("deepseek") == pytest.approx(0.2)
+
+
+def test_race_all_failed():
+    """Testa a falha de todos os provedores da corrida."""
+    # Arrange
+    race = HedgedRace(HedgingPolicy(), ["deepseek", "ollama"])
+    race.start(now=0.0)
+    
+    # Act
+    next_model = race.on_error("deepseek", Exception("erro 1"), now=0.1)
+    
+    # Assert
+    assert next_model == "ollama"
+    with pytest.raises(Exception) as exc_info:
+        race.on_error("ollama", Exception("erro 2"), now=0.2)
+    assert "Todos os modelos falharam" in str(exc_info.value)
@@ -0,0 +1,149 @@
+"""Testes para o resumidor incremental do histórico."""
+from src.domain.entities.message import Message, MessageRole
+from src.domain.services.history_summarizer import HistorySummarizer
+from src.domain.use_cases.process_message import AIModel, ProcessMessageInput, ProcessMessageUseCase
+
+
+class RecordingModel(AIModel):
+    """Modelo falso que registra as requisições recebidas."""
+    
+    def __init__(self, prefix="Resposta"):
+        self.prefix = prefix
+        self.requests = []
+    
+    def generate_response(self, messages, **kwargs):
+        self.requests.append(messages)
+        return f"{self.prefix} {len(self.requests)}"
+
+
+def make_history(turns):
+    """Cria um histórico com a quantidade de trocas informada."""
+    history = []
+    for i in range(turns):
+        history.append(Message(role=MessageRole.USER, content=f"pergunta {i}"))
+        history.append(Message(role=MessageRole.ASSISTANT, content=f"resposta {i}"))
+    return history
+
+
+def test_schedule_summarizes_in_background_and_caches_by_prefix():
+    """Testa o resumo em segundo plano e o cache pelo prefixo do histórico."""
+    # Arrange
+    model = RecordingModel("Resumo")
+    summarizer = HistorySummarizer(model)
+    history = make_history(3)
+    
+    # Act
+    summarizer.schedule(history, 4).result(timeout=5)
+    repeated = summarizer.schedule(history, 4)
+    summary, covered = summarizer.lookup(history)
+    
+    # Assert
+    assert repeated is None
+    assert (summary, covered) == ("Resumo 1", 4)
+    assert "Cliente: pergunta 0" in model.requests[0][1]["content"]
+    assert summarizer.lookup(make_history(1)) == (None, 0)
+    summarizer.shutdown()
+
+
+def test_summary_is_incremental():
+    """Testa que um novo resumo parte do anterior e só envia as falas novas."""
+    # Arrange
+    model = RecordingModel("Resumo")
+    summarizer = HistorySummarizer(model)
+    history = make_history(4)
+    summarizer.summarize(history[:2])
+    
+    # Act
+    summary = summarizer.summarize(history[:6])
+    
+    # Assert
+    assert summary == "Resumo 2"
+    prompt = model.requests[1][1]["content"]
+    assert "Resumo anterior: Resumo 1" in prompt
+    assert "pergunta 0" not in prompt
+    assert "Cliente: pergunta 1" in prompt and "Atendente: resposta 2" in prompt
+    summarizer.shutdown()
+
+
+def test_use_case_sends_summary_instead_of_old_turns():
+    """Testa que o caso de uso troca as mensagens antigas pelo resumo e agenda o próximo."""
+    # Arrange
+    summarizer = HistorySummarizer(RecordingModel("Resumo"))
+    history = make_history(5)
+    summarizer.summarize(history[:4])
+    model = RecordingModel()
+    use_case = ProcessMessageUseCase(ai_model=model, history_compactor=summarizer)
+    
+    # Act
+    output = use_case.execute(ProcessMessageInput(user_message="nova", conversation_history=history, max_history=3))
+    summarizer.shutdown(wait=True)
+    
+    # Assert
+    prompt = model.requests[0]
+    assert prompt[1] == {"role": "system", "content": "Resumo da conversa até aqui: Resumo 1"}
+    assert [message["content"] for message in prompt[2:]] == [
+        "pergunta 2", "resposta 2", "pergunta 3", "resposta 3", "pergunta 4", "resposta 4", "nova"
+    ]
+    next_history = history + [output.user_message, output.assistant_message]
+    assert summarizer.lookup(next_history)[1] == 6
+
+
+def test_session_keeps_summary_across_summarizer_restart():
+    """Testa que o resumo fica na sessão e volta ao cache de um resumidor novo (sessão recarregada)."""
+    # Arrange
+    from src.domain.entities.session import ConversationSession
+
+    history = make_history(5)
+    session = ConversationSession(session_id="chamada-1", history=list(history))
+    first = HistorySummarizer(RecordingModel("Resumo"))
+    first.summarize(history[:4])
+    use_case = ProcessMessageUseCase(ai_model=RecordingModel(), history_compactor=first)
+    use_case.execute(ProcessMessageInput(user_message="nova", conversation_history=history, max_history=3, session=session))
+    first.shutdown(wait=True)
+    reloaded = ConversationSession.from_dict(session.to_dict())
+    model = RecordingModel()
+    summary_model = RecordingModel("Outro")
+    restarted = HistorySummarizer(summary_model)
+    
+    # Act
+    ProcessMessageUseCase(ai_model=model, history_compactor=restarted).execute(
+        ProcessMessageInput(user_message="de novo", conversation_history=history, max_history=3, session=reloaded)
+    )
+    restarted.shutdown(wait=True)
+    
+    # Assert
+    assert (session.summary, session.summary_covers) == ("Resumo 1", 4)
+    assert model.requests[0][1] == {"role": "system", "content": "Resumo da conversa até aqui: Resumo 1"}
+    assert "Resumo anterior: Resumo 1" in summary_model.requests[0][1]["content"]
+    assert restarted.lookup(history)[1] == 6
+
+
+def test_prefix_hashes_only_hash_new_messages():
+    """Testa que, com o histórico só crescendo, cada chamada hasheia apenas as mensagens novas."""
+    # Arrange
+    summarizer = HistorySummarizer(RecordingModel())
+    history = make_history(3)
+    first = summarizer.prefix_hashes(history)
+    hashed = []
+    
+    class CountingList(list):
+        """Lista que registra as fatias lidas (as mensagens a hashear)."""
+        
+        def __getitem__(self, index):
+            item = super().__getitem__(index)
+            if isinstance(index, slice):
+                hashed.extend(item)
+            return item
+    
+    history.append(Message(role=MessageRole.USER, content="pergunta nova"))
+    
+    # Act
+    grown = summarizer.prefix_hashes(CountingList(history))
+    edited = summarizer.prefix_hashes(history[:3] + [Message(role=MessageRole.USER, content="outra")])
+    
+    # Assert
+    assert grown[:-1] == first
+    assert grown == HistorySummarizer(RecordingModel()).prefix_hashes(history)
+    assert [message.content for message in hashed] == ["pergunta nova"]
+    assert edited[:4] == first[:4]
+    assert edited[4] != first[4]
@@ -1,6 +1,6 @@
 """Testes para a entidade Message."""
 import pytest
-from datetime import datetime
+from datetime import datetime, timezone
 from src.domain.entities.message import Message, MessageRole
 
 
@@ -136,3 +136,65 @@ def test_message_repr():
     assert "role=MessageRole.USER" in result
     assert "content='Olá'" in result
     assert "timestamp=datetime.datetime(2023, 1, 1, 12, 0)" in result
+
+
+def test_message_uses_slots_and_interns_role():
+    """Testa que a mensagem não tem __dict__ e que o papel em texto vira o membro do enum."""
+    # Arrange & Act
+    message = Message(role="user", content="Oi")
+    
+    # Assert
+    assert not hasattr(message, "__dict__")
+    assert message.role is MessageRole.USER
+
+
+def test_message_keeps_microseconds_and_timezone():
+    """Testa que o horário guardado em microssegundos preserva a precisão e o fuso."""
+    # Arrange
+    naive = datetime(2023, 1, 1, 12, 0, 0, 123456)
+    aware = datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    
+    # Act
+    naive_message = Message(role=MessageRole.USER, content="Oi", timestamp=naive)
+    aware_message = Message(role=MessageRole.USER, content="Oi", timestamp=aware)
+    
+    # Assert
+    assert naive_message.timestamp == naive
+    assert naive_message.to_dict()["timestamp"] == "2023-01-01T12:00:00.123456"
+    assert aware_message.to_dict()["timestamp"] == "2023-01-01T12:00:00+00:00"
+
+
+def test_bulk_serialization_matches_to_dict_and_from_dict():
+    """Testa que to_dicts/from_dicts produzem o mesmo resultado das versões unitárias."""
+    # Arrange
+    messages = [
+        Message(role=MessageRole.USER, content="Oi", timestamp=datetime(2023, 1, 1, 12, 0, 0)),
+        Message(role=MessageRole.ASSISTANT, content="Olá!", timestamp=datetime(2023, 1, 1, 12, 0, 0, 500)),
+        Message(role=MessageRole.USER, content="Tchau", timestamp=datetime(2023, 1, 1, 12, 0, 1, tzinfo=timezone.utc)),
+    ]
+    
+    # Act
+    dicts = Message.to_dicts(messages)
+    restored = Message.from_dicts(dicts)
+    
+    # Assert
+    assert dicts == [message.to_dict() for message in messages]
+    assert restored == [Message.from_dict(data) for data in dicts]
+    assert restored == messages
+
+
+def test_from_dicts_falls_back_to_fromisoformat_outside_the_fast_format():
+    """Testa que horários fora do formato de isoformat() sem fuso são lidos como em from_dict."""
+    # Arrange
+    dicts = [
+        {"role": "user", "content": "Oi", "timestamp": "2024-01-01T00:00:00.12345Z"},
+        {"role": "user", "content": "Oi", "timestamp": "2024-01-01 00:00:00"},
+        {"role": "user", "content": "Oi", "timestamp": "2024-01-01T00:00:00.123"},
+    ]
+    
+    # Act
+    restored = Message.from_dicts(dicts)
+    
+    # Assert
+    assert restored == [Message.from_dict(data) for data in dicts]
+    assert restored[0].timestamp == datetime(2024, 1, 1, 0, 0, 0, 123450, tzinfo=timezone.utc)
@@ -0,0 +1,103 @@
+"""Testes para o registro de métricas e a exportação no formato do Prometheus."""
+import random
+
+import pytest
+
+from src.infrastructure.metrics.registry import MetricsRegistry, StreamTimer
+
+
+def test_histogram_percentiles_within_bucket_error():
+    """Testa que os percentis ficam dentro do erro relativo dos baldes log-lineares."""
+    # Arrange
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latencia_seconds", "Latência").labels()
+    rng = random.Random(7)
+    samples = sorted(rng.lognormvariate(-2.0, 1.0) for _ in range(5000))
+    for sample in samples:
+        histogram.observe(sample)
+
+    # Act
+    p50, p99 = histogram.percentile(50), histogram.percentile(99)
+
+    # Assert
+    exact_p50, exact_p99 = samples[2499], samples[4949]
+    assert exact_p50 <= p50 <= exact_p50 * (1 + 1 / 8)
+    assert exact_p99 <= p99 <= exact_p99 * (1 + 1 / 8)
+    assert histogram.count == 5000
+    assert histogram.max == samples[-1]
+
+
+def test_prometheus_export_format():
+    """Testa baldes acumulados, soma, contagem e escape dos rótulos na exportação."""
+    # Arrange
+    registry = MetricsRegistry(namespace="teste")
+    duration = registry.histogram("duracao_seconds", "Duração\nda chamada", ("provider",))
+    errors = registry.counter("erros_total", "Erros", ("provider",))
+    for value in (0.003, 0.02, 0.02, 0.7, 40.0):
+        duration.labels("openai").observe(value)
+    errors.labels('a"b').inc(2)
+
+    # Act
+    text = registry.to_prometheus()
+
+    # Assert
+    assert "# HELP teste_duracao_seconds Duração\\nda chamada" in text
+    assert "# TYPE teste_duracao_seconds histogram" in text
+    assert 'teste_duracao_seconds_bucket{provider="openai",le="0.005"} 1' in text
+    assert 'teste_duracao_seconds_bucket{provider="openai",le="0.025"} 3' in text
+    assert 'teste_duracao_seconds_bucket{provider="openai",le="1.0"} 4' in text
+    assert 'teste_duracao_seconds_bucket{provider="openai",le="30.0"} 4' in text
+    assert 'teste_duracao_seconds_bucket{provider="openai",le="+Inf"} 5' in text
+    assert 'teste_duracao_seconds_count{provider="openai"} 5' in text
+    assert 'teste_erros_total{provider="a\\"b"} 2' in text
+    assert text.endswith("\n")
+
+
+def test_prometheus_buckets_count_samples_at_or_just_below_the_bound():
+    """Testa que amostras no limite (ou logo abaixo) entram no balde desse limite, e não no seguinte."""
+    # Arrange
+    registry = MetricsRegistry(namespace="teste")
+    duration = registry.histogram("duracao_seconds", "Duração")
+    for value in (0.0049, 0.005, 0.0051, 0.1):
+        duration.labels().observe(value)
+
+    # Act
+    text = registry.to_prometheus()
+
+    # Assert
+    assert 'teste_duracao_seconds_bucket{le="0.005"} 2' in text
+    assert 'teste_duracao_seconds_bucket{le="0.01"} 3' in text
+    assert 'teste_duracao_seconds_bucket{le="0.1"} 4' in text
+
+
+def test_stream_timer_records_first_token_once():
+    """Testa que o tempo até o primeiro trecho é registrado uma única vez por streaming."""
+    # Arrange
+    registry = MetricsRegistry()
+    first_token = registry.histogram("ttft_seconds", "TTFT").labels()
+    duration = registry.histogram("duracao_seconds", "Duração").labels()
+    timer = StreamTimer(first_token, duration)
+
+    # Act
+    for _ in range(3):
+        timer.token()
+    timer.done()
+
+    # Assert
+    assert first_token.count == 1
+    assert duration.count == 1
+    assert duration.sum >= first_token.sum
+
+
+def test_registration_mismatch_and_label_count():
+    """Testa que redeclarar com outro tipo ou usar rótulos errados gera ValueError."""
+    # Arrange
+    registry = MetricsRegistry()
+    family = registry.counter("chamadas_total", "Chamadas", ("provider",))
+
+    # Act / Assert
+    assert registry.counter("chamadas_total", "Chamadas", ("provider",)) is family
+    with pytest.raises(ValueError):
+        registry.histogram("chamadas_total", "Chamadas", ("provider",))
+    with pytest.raises(ValueError):
+        family.labels("openai", "extra")
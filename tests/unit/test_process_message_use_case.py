@@ -1,4 +1,5 @@
 """Testes para o caso de uso de processamento de mensagens."""
+import asyncio
 import pytest
 from unittest.mock import Mock
 from datetime import datetime
@@ -9,6 +10,7 @@ from src.domain.use_cases.process_message import (
     ProcessMessageInput,
     ProcessMessageOutput,
     AIModel,
+    AnswerCache,
 )
 
 
@@ -163,3 +165,184 @@ def test_process_message_error_handling():
         use_case.execute(input_data)
     
     assert "Erro na API" in str(exc_info.value)
+
+
+def test_ai_model_default_stream_response():
+    """Testa se o streaming padrão entrega a resposta completa em um único trecho."""
+    # Arrange
+    mock_ai_model = MockAIModel(response="Resposta completa")
+    
+    # Act
+    deltas = list(mock_ai_model.stream_response([{"role": "user", "content": "Olá"}], temperature=0.5))
+    
+    # Assert
+    assert deltas == ["Resposta completa"]
+    assert mock_ai_model.last_kwargs == {"temperature": 0.5}
+
+
+def test_execute_streaming_delivers_deltas():
+    """Testa a execução em streaming, com callback por trecho e saída completa."""
+    # Arrange
+    class StreamingMockAIModel(MockAIModel):
+        def stream_response(self, messages, **kwargs):
+            self.last_messages = messages
+            yield "Olá, "
+            yield "como vai? "
+    
+    mock_ai_model = StreamingMockAIModel()
+    use_case = ProcessMessageUseCase(ai_model=mock_ai_model)
+    received = []
+    
+    input_data = ProcessMessageInput(user_message="Oi", conversation_history=[])
+    
+    # Act
+    output = use_case.execute_streaming(input_data, received.append)
+    
+    # Assert
+    assert received == ["Olá, ", "como vai? "]
+    assert output.response == "Olá, como vai?"
+    assert output.assistant_message.content == "Olá, como vai?"
+    assert mock_ai_model.last_messages[-1] == {"role": "user", "content": "Oi"}
+
+
+def test_aexecute_with_sync_model():
+    """Testa a execução assíncrona com um modelo que só implementa a API síncrona."""
+    # Arrange
+    mock_ai_model = MockAIModel(response="Resposta assíncrona")
+    use_case = ProcessMessageUseCase(ai_model=mock_ai_model)
+    
+    input_data = ProcessMessageInput(
+        user_message="Olá",
+        conversation_history=[],
+        model_kwargs={"temperature": 0.2}
+    )
+    
+    # Act
+    output = asyncio.run(use_case.aexecute(input_data))
+    
+    # Assert
+    assert output.response == "Resposta assíncrona"
+    assert mock_ai_model.last_kwargs == {"temperature": 0.2}
+    assert len(mock_ai_model.last_messages) == 2
+
+
+class DictAnswerCache(AnswerCache):
+    """Cache de respostas em dicionário para testes."""
+    
+    def __init__(self):
+        self.answers = {}
+    
+    def lookup(self, question):
+        return self.answers.get(question)
+    
+    def store(self, question, answer):
+        self.answers[question] = answer
+
+
+def test_answer_cache_hit_skips_model():
+    """Testa que um acerto no cache de respostas dispensa o modelo."""
+    # Arrange
+    cache = DictAnswerCache()
+    cache.answers["Qual o horário?"] = "Das 8h às 18h."
+    mock_ai_model = MockAIModel()
+    use_case = ProcessMessageUseCase(ai_model=mock_ai_model, answer_cache=cache)
+    deltas = []
+    
+    # Act
+    output = use_case.execute_streaming(
+        ProcessMessageInput(user_message="Qual o horário?", conversation_history=[]),
+        deltas.append
+    )
+    
+    # Assert
+    assert output.response == "Das 8h às 18h."
+    assert deltas == ["Das 8h às 18h."]
+    assert mock_ai_model.last_messages is None
+
+
+def test_answer_cache_stores_generated_response():
+    """Testa que a resposta gerada é guardada no cache de respostas."""
+    # Arrange
+    cache = DictAnswerCache()
+    use_case = ProcessMessageUseCase(ai_model=MockAIModel("Resposta nova"), answer_cache=cache)
+    
+    # Act
+    asyncio.run(use_case.aexecute(ProcessMessageInput(user_message="Oi", conversation_history=[])))
+    
+    # Assert
+    assert cache.answers == {"Oi": "Resposta nova"}
+
+
+def test_answer_cache_is_not_shared_between_conversations():
+    """Testa que a resposta de um turno com histórico não vaza para outra conversa."""
+    # Arrange
+    cache = DictAnswerCache()
+    cancel_model = MockAIModel("Plano cancelado.")
+    hire_model = MockAIModel("Plano premium contratado.")
+    conversation_a = [
+        Message(role=MessageRole.USER, content="Quero cancelar meu plano"),
+        Message(role=MessageRole.ASSISTANT, content="Confirma o cancelamento?"),
+    ]
+    conversation_b = [
+        Message(role=MessageRole.USER, content="Quero contratar o plano premium"),
+        Message(role=MessageRole.ASSISTANT, content="Confirma a contratação?"),
+    ]
+    
+    # Act
+    ProcessMessageUseCase(ai_model=cancel_model, answer_cache=cache).execute(
+        ProcessMessageInput(user_message="sim", conversation_history=conversation_a)
+    )
+    output = ProcessMessageUseCase(ai_model=hire_model, answer_cache=cache).execute(
+        ProcessMessageInput(user_message="sim", conversation_history=conversation_b)
+    )
+    
+    # Assert
+    assert output.response == "Plano premium contratado."
+    assert hire_model.last_messages is not None
+    assert cache.answers == {}
+
+
+class BudgetAIModel(MockAIModel):
+    """Mock do modelo de IA com orçamento de tokens do provedor."""
+    
+    def __init__(self, budget):
+        super().__init__()
+        self.budget = budget
+    
+    def context_budget(self):
+        return self.budget
+
+
+def test_token_budget_replaces_max_history():
+    """Testa que, com orçamento de tokens, o histórico é limitado por tokens e não por mensagens."""
+    # Arrange
+    history = [
+        Message(role=MessageRole.USER, content="mensagem antiga " * 50),
+        Message(role=MessageRole.ASSISTANT, content="curta"),
+        Message(role=MessageRole.USER, content="outra curta"),
+    ]
+    mock_ai_model = BudgetAIModel(budget=60)
+    use_case = ProcessMessageUseCase(ai_model=mock_ai_model)
+    input_data = ProcessMessageInput(user_message="Oi", conversation_history=history, max_history=1)
+    
+    # Act
+    use_case.execute(input_data)
+    
+    # Assert
+    contents = [message["content"] for message in mock_ai_model.last_messages]
+    assert contents[1:] == ["curta", "outra curta", "Oi"]
+
+
+def test_input_budget_overrides_provider_budget():
+    """Testa que max_prompt_tokens da entrada tem prioridade sobre o orçamento do provedor."""
+    # Arrange
+    history = [Message(role=MessageRole.USER, content="histórico")]
+    mock_ai_model = BudgetAIModel(budget=1000)
+    use_case = ProcessMessageUseCase(ai_model=mock_ai_model)
+    input_data = ProcessMessageInput(user_message="Oi", conversation_history=history, max_prompt_tokens=10)
+    
+    # Act
+    use_case.execute(input_data)
+    
+    # Assert
+    assert [message["content"] for message in mock_ai_model.last_messages][1:] == ["Oi"]
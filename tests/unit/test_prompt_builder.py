@@ -0,0 +1,126 @@
+"""Testes para o montador incremental de prompts."""
+import json
+
+from src.domain.entities.message import Message, MessageRole
+from src.domain.services.prompt_builder import PromptBuilder, PromptMessages
+from src.domain.use_cases.process_message import AIModel, ProcessMessageInput, ProcessMessageUseCase
+
+SYSTEM = [{"role": "system", "content": "Seja breve."}]
+
+
+def make_history(turns):
+    history = []
+    for turn in range(turns):
+        history.append(Message(role=MessageRole.USER, content=f"pergunta {turn}"))
+        history.append(Message(role=MessageRole.ASSISTANT, content=f"resposta {turn}"))
+    return history
+
+
+def as_wire(history):
+    return [{"role": m.role.value, "content": m.content} for m in history]
+
+
+def shout(message):
+    return {"role": message["role"], "content": message["content"].upper()}
+
+
+class RecordingModel(AIModel):
+    """Modelo falso que guarda as mensagens recebidas."""
+
+    def __init__(self):
+        self.last_messages = None
+
+    def generate_response(self, messages, **kwargs):
+        self.last_messages = messages
+        return "ok"
+
+
+def test_build_converts_only_new_messages():
+    """Testa que cada turno converte apenas as mensagens acrescentadas."""
+    # Arrange
+    builder = PromptBuilder()
+    history = make_history(3)
+    current = {"role": "user", "content": "nova"}
+
+    # Act
+    first = builder.build(history, SYSTEM, 0, current)
+    history.extend(make_history(1))
+    second = builder.build(history, SYSTEM, 2, current)
+
+    # Assert
+    assert isinstance(second, PromptMessages)
+    assert list(first) == SYSTEM + as_wire(history[:6]) + [current]
+    assert list(second) == SYSTEM + as_wire(history[2:]) + [current]
+    assert builder.get_stats()["converted"] == 8
+
+
+def test_encode_matches_json_and_reuses_prefix():
+    """Testa que a serialização incremental é igual à serialização completa."""
+    # Arrange
+    builder = PromptBuilder()
+    history = make_history(2)
+    current = {"role": "user", "content": "olá"}
+    builder.build(history, SYSTEM, 0, current).encode()
+
+    # Act
+    history.extend(make_history(1))
+    prompt = builder.build(history, SYSTEM, 0, current)
+    encoded = prompt.encode()
+    transformed = prompt.encode(shout)
+
+    # Assert
+    assert json.loads(encoded) == list(prompt)
+    assert json.loads(transformed) == [shout(m) for m in prompt]
+    assert builder.get_stats()["reused"] == 4
+
+
+def test_restarts_when_history_is_replaced():
+    """Testa que o montador recomeça quando o histórico não é continuação do anterior."""
+    # Arrange
+    builder = PromptBuilder()
+    current = {"role": "user", "content": "olá"}
+    old_prompt = builder.build(make_history(2), SYSTEM, 0, current)
+
+    # Act
+    new_history = make_history(1)
+    new_prompt = builder.build(new_history, SYSTEM, 0, current)
+
+    # Assert
+    assert list(new_prompt) == SYSTEM + as_wire(new_history) + [current]
+    assert json.loads(new_prompt.encode()) == list(new_prompt)
+    assert json.loads(old_prompt.encode()) == list(old_prompt)
+    assert builder.get_stats()["generation"] == 1
+
+
+def test_messages_older_than_ring_are_converted_on_demand():
+    """Testa o acesso a mensagens que já saíram do buffer circular."""
+    # Arrange
+    builder = PromptBuilder(capacity=4)
+    history = make_history(5)
+
+    # Act
+    wire = builder.wire(history, 0)
+
+    # Assert
+    assert wire == as_wire(history)
+
+
+def test_use_case_with_builder_sends_same_prompt():
+    """Testa que o caso de uso monta o mesmo prompt com e sem o montador."""
+    # Arrange
+    history = make_history(6)
+    plain_model, built_model = RecordingModel(), RecordingModel()
+
+    # Act
+    ProcessMessageUseCase(ai_model=plain_model).execute(
+        ProcessMessageInput(user_message="Oi", conversation_history=history, max_history=2)
+    )
+    ProcessMessageUseCase(ai_model=built_model).execute(
+        ProcessMessageInput(
+            user_message="Oi", conversation_history=history, max_history=2, prompt_builder=PromptBuilder()
+        )
+    )
+
+    # Assert
+    assert isinstance(built_model.last_messages, PromptMessages)
+    assert list(built_model.last_messages) == plain_model.last_messages
@@ -0,0 +1,136 @@
+"""Testes para o segmentador incremental de frases."""
+from src.domain.services.sentence_segmenter import SentenceSegmenter
+
+
+def feed_char_by_char(segmenter, text):
+    """Alimenta o segmentador um caractere por vez, como em um streaming."""
+    sentences = []
+    for char in text:
+        sentences.extend(segmenter.feed(char))
+    return sentences
+
+
+def test_split_simple_sentences():
+    """Testa a divisão de frases terminadas em pontuação final."""
+    # Arrange
+    segmenter = SentenceSegmenter()
+    
+    # Act
+    sentences = feed_char_by_char(segmenter, "Olá! Como posso ajudar? Estamos abertos. Até")
+    
+    # Assert
+    assert sentences == ["Olá!", "Como posso ajudar?", "Estamos abertos."]
+    assert segmenter.flush() == "Até"
+
+
+def test_abbreviations_do_not_split():
+    """Testa que abreviações comuns em português não encerram a frase."""
+    # Arrange
+    segmenter = SentenceSegmenter()
+    
+    # Act
+    sentences = feed_char_by_char(
+        segmenter,
+        "O Sr. Silva e a Dra. Ana atendem na Av. Paulista, nº. 100. Fim"
+    )
+    
+    # Assert
+    assert sentences == ["O Sr. Silva e a Dra. Ana atendem na Av. Paulista, nº. 100."]
+
+
+def test_units_and_months_end_sentences_before_uppercase():
+    """Testa que unidades e meses abreviados só seguram a frase antes de minúscula ou número."""
+    # Arrange
+    segmenter = SentenceSegmenter()
+    
+    # Act
+    sentences = feed_char_by_char(
+        segmenter,
+        "São 3,5 km. Chegue cedo. Vale até 15 jan. 2025 ou 10 km. de distância. Fim"
+    )
+    
+    # Assert
+    assert sentences == [
+        "São 3,5 km.",
+        "Chegue cedo.",
+        "Vale até 15 jan. 2025 ou 10 km. de distância.",
+    ]
+
+
+def test_numbers_and_list_markers():
+    """Testa números com separadores e marcadores de lista."""
+    # Arrange
+    segmenter = SentenceSegmenter()
+    
+    # Act
+    sentences = feed_char_by_char(
+        segmenter,
+        "O valor é R$ 1.500,00 em 3.5 parcelas. 1. Acesse o site. 2. Faça login. Ok"
+    )
+    
+    # Assert
+    assert sentences == [
+        "O valor é R$ 1.500,00 em 3.5 parcelas.",
+        "1. Acesse o site.",
+        "2. Faça login.",
+    ]
+
+
+def test_lowercase_after_period_does_not_split():
+    """Testa que um ponto seguido de minúscula não encerra a frase."""
+    # Arrange
+    segmenter = SentenceSegmenter()
+    
+    # Act
+    sentences = segmenter.feed("Leva aprox. dez minutos. Pronto ")
+    
+    # Assert
+    assert sentences == ["Leva aprox. dez minutos."]
+
+
+def test_sentence_final_abbreviation():
+    """Testa "etc." encerrando a frase apenas antes de maiúscula."""
+    # Arrange
+    segmenter = SentenceSegmenter()
+    
+    # Act
+    sentences = segmenter.feed("Aceitamos Pix, cartão etc. e boleto etc. Mais algo? Sim")
+    
+    # Assert
+    assert sentences == ["Aceitamos Pix, cartão etc. e boleto etc.", "Mais algo?"]
+
+
+def test_ellipsis_split_across_deltas():
+    """Testa reticências recebidas em trechos diferentes."""
+    # Arrange
+    segmenter = SentenceSegmenter()
+    
+    # Act
+    first = segmenter.feed("Deixe-me ver..")
+    second = segmenter.feed(". Encontrei")
+    
+    # Assert
+    assert first == []
+    assert second == ["Deixe-me ver..."]
+
+
+def test_long_text_without_punctuation_is_soft_split():
+    """Testa a quebra de trechos longos na última vírgula."""
+    # Arrange
+    segmenter = SentenceSegmenter(max_chars=40)
+    
+    # Act
+    sentences = segmenter.feed("Para consultar o saldo, acesse o aplicativo e toque em extrato")
+    
+    # Assert
+    assert sentences[0] == "Para consultar o saldo,"
+    assert all(len(sentence) <= 40 for sentence in sentences)
+
+
+def test_flush_empty_buffer():
+    """Testa o flush sem texto pendente."""
+    # Arrange
+    segmenter = SentenceSegmenter()
+    
+    # Act & Assert
+    assert segmenter.flush() is None
@@ -0,0 +1,51 @@
+"""Testes para o pipeline de fala por frases."""
+import threading
+import pytest
+
+from src.interface.adapters.sentence_speech_pipeline import SentenceSpeechPipeline
+
+
+def test_speaks_each_sentence_before_generation_ends():
+    """Testa que a primeira frase é falada antes do fim da geração."""
+    # Arrange
+    spoken = []
+    first_spoken = threading.Event()
+    
+    def speak(sentence):
+        spoken.append(sentence)
+        first_spoken.set()
+    
+    def produce(on_delta):
+        on_delta("Olá! Tudo ")
+        # A geração só continua depois que a primeira frase foi falada
+        assert first_spoken.wait(timeout=2)
+        on_delta("bem? Sim")
+        return "resultado"
+    
+    pipeline = SentenceSpeechPipeline(speak=speak)
+    
+    # Act
+    result = pipeline.run(produce)
+    
+    # Assert
+    assert result == "resultado"
+    assert spoken == ["Olá!", "Tudo bem?", "Sim"]
+
+
+def test_generation_error_is_raised_after_spoken_sentences():
+    """Testa a propagação do erro de geração depois das frases já concluídas."""
+    # Arrange
+    spoken = []
+    
+    def produce(on_delta):
+        on_delta("Primeira frase. Segunda")
+        raise Exception("Erro na API")
+    
+    pipeline = SentenceSpeechPipeline(speak=spoken.append)
+    
+    # Act & Assert
+    with pytest.raises(Exception) as exc_info:
+        pipeline.run(produce)
+    
+    assert "Erro na API" in str(exc_info.value)
+    assert spoken == ["Primeira frase."]
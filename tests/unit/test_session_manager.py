@@ -0,0 +1,167 @@
+"""Testes para o gerenciador de sessões de conversa."""
+from src.domain.entities.message import Message, MessageRole
+from src.domain.entities.session import ConversationSession
+from src.domain.services.session_manager import SessionManager, SessionStore
+
+
+class FakeClock:
+    """Relógio controlado manualmente nos testes."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class DictSessionStore(SessionStore):
+    """Armazenamento em dicionário, serializando as sessões como um armazenamento real."""
+
+    def __init__(self):
+        self.data = {}
+        self.loads = 0
+
+    def save(self, session):
+        self.data[session.session_id] = session.to_dict()
+
+    def load(self, session_id):
+        self.loads += 1
+        data = self.data.get(session_id)
+        return ConversationSession.from_dict(data) if data is not None else None
+
+    def delete(self, session_id):
+        self.data.pop(session_id, None)
+
+
+def user(content):
+    return Message(content=content, role=MessageRole.USER)
+
+
+def test_get_creates_session_and_append_tracks_size():
+    """Testa a criação da sessão e a contabilidade de caracteres."""
+    # Arrange
+    manager = SessionManager()
+
+    # Act
+    session = manager.get("a")
+    manager.append("a", user("olá"), user("tudo bem?"))
+
+    # Assert
+    assert manager.get("a") is session
+    assert [m.content for m in session.history] == ["olá", "tudo bem?"]
+    stats = manager.get_stats()
+    assert stats["sessions"] == 1
+    assert stats["created"] == 1
+    assert stats["total_chars"] == len("olá") + len("tudo bem?")
+
+
+def test_evicts_least_recently_used_when_over_session_limit():
+    """Testa o despejo LRU quando o número de sessões passa do limite."""
+    # Arrange
+    evicted = []
+    manager = SessionManager(max_sessions=2, on_evict=lambda s: evicted.append(s.session_id))
+    manager.get("a")
+    manager.get("b")
+    manager.get("a")
+
+    # Act
+    manager.get("c")
+
+    # Assert
+    assert evicted == ["b"]
+    assert "a" in manager and "c" in manager and "b" not in manager
+
+
+def test_evicts_when_over_character_limit_but_keeps_current_session():
+    """Testa o despejo pelo total de caracteres, preservando a sessão em uso."""
+    # Arrange
+    manager = SessionManager(max_total_chars=10)
+    manager.append("a", user("12345"))
+
+    # Act
+    manager.append("b", user("1234567890"))
+
+    # Assert
+    assert "a" not in manager
+    assert "b" in manager
+    assert manager.get_stats()["total_chars"] == 10
+
+
+def test_evict_idle_removes_expired_sessions():
+    """Testa o despejo das sessões ociosas além do TTL."""
+    # Arrange
+    clock = FakeClock()
+    manager = SessionManager(idle_ttl=60, clock=clock)
+    manager.get("a")
+    clock.now = 50
+    manager.get("b")
+
+    # Act
+    clock.now = 70
+    removed = manager.evict_idle()
+
+    # Assert
+    assert removed == 1
+    assert "a" not in manager
+    assert "b" in manager
+    assert manager.get_stats()["evicted"] == 1
+
+
+def test_evicted_session_is_spilled_and_reloaded_lazily():
+    """Testa que a sessão despejada vai para o armazenamento e volta no próximo acesso."""
+    # Arrange
+    store = DictSessionStore()
+    manager = SessionManager(max_sessions=1, store=store)
+    session = manager.append("a", user("meu pedido é 123"))
+    session.preferred_provider = "deepseek"
+
+    # Act
+    manager.get("b")
+    reloaded = manager.get("a")
+
+    # Assert
+    assert "a" in store.data
+    assert reloaded is not session
+    assert [m.content for m in reloaded.history] == ["meu pedido é 123"]
+    assert reloaded.preferred_provider == "deepseek"
+    stats = manager.get_stats()
+    assert stats["reloaded"] == 1
+    assert stats["created"] == 2
+
+
+def test_close_spills_session_and_delete_removes_it_everywhere():
+    """Testa o encerramento e a remoção de sessões."""
+    # Arrange
+    store = DictSessionStore()
+    manager = SessionManager(store=store)
+    manager.append("a", user("oi"))
+    manager.append("b", user("oi"))
+
+    # Act
+    manager.close("a")
+    manager.delete("b")
+
+    # Assert
+    assert len(manager) == 0
+    assert "a" in store.data
+    assert "b" not in store.data
+    assert manager.get_stats()["total_chars"] == 0
+
+
+def test_find_does_not_create_missing_session():
+    """Testa que find recarrega sessões gravadas, mas não cria sessões novas."""
+    # Arrange
+    store = DictSessionStore()
+    manager = SessionManager(max_sessions=1, store=store)
+    manager.append("a", user("oi"))
+    manager.get("b")
+
+    # Act
+    found = manager.find("a")
+    missing = manager.find("c")
+
+    # Assert
+    assert [m.content for m in found.history] == ["oi"]
+    assert missing is None
+    assert "c" not in manager
+    assert manager.get_stats()["created"] == 2
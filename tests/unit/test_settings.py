@@ -23,6 +23,10 @@ class TestSettings:
         assert settings.VOICE_LANGUAGE == "pt-BR"
         assert settings.SPEECH_ENERGY_THRESHOLD == 300
         assert settings.SPEECH_PAUSE_THRESHOLD == 0.8
+        assert settings.SPEECH_ENDPOINTER == "energy"
+        assert settings.SPEECH_VAD_HANGOVER_MS == 600
+        assert settings.ASR_BACKEND == "google"
+        assert settings.SPEECH_PERSISTENT_CAPTURE is True
         assert settings.APP_NAME == "Atendimento IA"
         assert settings.APP_VERSION == "0.1.0"
         assert settings.DEBUG is False
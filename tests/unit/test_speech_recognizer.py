@@ -0,0 +1,113 @@
+"""Testes para os mecanismos de reconhecimento de fala."""
+import os
+import stat
+import sys
+
+import pytest
+import speech_recognition as sr
+
+from src.infrastructure.adapters import speech_recognizer
+from src.infrastructure.adapters.speech_recognizer import (
+    GoogleSpeechRecognizer,
+    ScriptedSpeechRecognizer,
+    SpeechRecognizer,
+    WhisperCppSpeechRecognizer,
+    create_speech_recognizer,
+)
+
+AUDIO = sr.AudioData(b"\x00\x00" * 1600, 16000, 2)
+
+
+def write_script(tmp_path, body, name="whisper-cli"):
+    """Cria um executável falso do whisper.cpp."""
+    path = tmp_path / name
+    path.write_text(f"#!{sys.executable}\n{body}\n")
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+def test_scripted_recognizer_returns_transcripts_in_order():
+    """Testa que o mecanismo falso é determinístico e trata vazio como fala não entendida."""
+    # Arrange
+    recognizer = ScriptedSpeechRecognizer(["olá", "", "tchau"])
+
+    # Act / Assert
+    assert recognizer.recognize(AUDIO, "pt-BR") == "olá"
+    with pytest.raises(sr.UnknownValueError):
+        recognizer.recognize(AUDIO, "pt-BR")
+    assert recognizer.recognize(AUDIO, "pt-BR") == "tchau"
+    with pytest.raises(sr.UnknownValueError):
+        recognizer.recognize(AUDIO, "pt-BR")
+
+
+def test_whispercpp_runs_binary_with_wav_and_language(tmp_path):
+    """Testa que o whisper.cpp recebe um WAV de 16 kHz e o idioma, e que a saída vira o texto."""
+    # Arrange
+    binary = write_script(tmp_path, (
+        "import sys, wave\n"
+        "args = sys.argv[1:]\n"
+        "with wave.open(args[args.index('-f') + 1]) as w:\n"
+        "    rate = w.getframerate()\n"
+        "print(f'  lang={args[args.index(\"-l\") + 1]} rate={rate}  ')"
+    ))
+    recognizer = WhisperCppSpeechRecognizer(binary, "modelo.bin")
+
+    # Act
+    text = recognizer.recognize(sr.AudioData(b"\x00\x00" * 4410, 44100, 2), "pt-BR")
+
+    # Assert
+    assert text == "lang=pt rate=16000"
+
+
+def test_whispercpp_failures_map_to_speech_recognition_errors(tmp_path):
+    """Testa que falhas do executável viram RequestError e saída vazia vira UnknownValueError."""
+    # Arrange
+    failing = WhisperCppSpeechRecognizer(write_script(tmp_path, "import sys; sys.exit(3)", "falha"), "modelo.bin")
+    missing = WhisperCppSpeechRecognizer(str(tmp_path / "inexistente"), "modelo.bin")
+    silent = WhisperCppSpeechRecognizer(write_script(tmp_path, "print('   ')", "mudo"), "modelo.bin")
+
+    # Act / Assert
+    with pytest.raises(sr.RequestError):
+        failing.recognize(AUDIO, "pt-BR")
+    with pytest.raises(sr.RequestError):
+        missing.recognize(AUDIO, "pt-BR")
+    with pytest.raises(sr.UnknownValueError):
+        silent.recognize(AUDIO, "pt-BR")
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".wav")]
+
+
+def test_create_speech_recognizer(monkeypatch):
+    """Testa a escolha do mecanismo pela configuração."""
+    # Arrange
+    monkeypatch.setattr(speech_recognizer, "vosk", None)
+
+    # Act / Assert
+    assert isinstance(create_speech_recognizer("google"), GoogleSpeechRecognizer)
+    assert isinstance(create_speech_recognizer("fake"), ScriptedSpeechRecognizer)
+    assert create_speech_recognizer("whispercpp", whispercpp_model="m.bin").model_path == "m.bin"
+    with pytest.raises(ImportError):
+        create_speech_recognizer("vosk", vosk_model_path="modelo")
+    with pytest.raises(ValueError):
+        create_speech_recognizer("desconhecido")
+
+
+def test_buffered_stream_recognizes_at_finish():
+    """Testa que mecanismos sem streaming acumulam o áudio e só reconhecem no fim."""
+    # Arrange
+    received = []
+
+    class RecordingRecognizer(SpeechRecognizer):
+        def recognize(self, audio, language):
+            received.append(audio.get_raw_data())
+            return "tudo certo"
+
+    stream = RecordingRecognizer().start_stream(16000, 2, "pt-BR")
+
+    # Act
+    partials = [stream.accept(b"\x01\x00" * 10), stream.accept(memoryview(b"\x02\x00" * 5))]
+    text = stream.finish()
+
+    # Assert
+    assert partials == [None, None]
+    assert text == "tudo certo"
+    assert received == [b"\x01\x00" * 10 + b"\x02\x00" * 5]
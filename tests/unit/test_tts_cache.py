@@ -0,0 +1,100 @@
+"""Testes para o cache em disco do áudio sintetizado."""
+import os
+
+from src.infrastructure.adapters.tts_cache import SpeechAudioCache, make_speech_key
+
+
+def writer(content):
+    """Função de renderização falsa que grava content no caminho recebido."""
+    def render(path):
+        with open(path, "wb") as file:
+            file.write(content)
+    return render
+
+
+def test_speech_key_depends_on_voice_parameters():
+    """Testa que a chave muda com o texto, a voz, a velocidade e o volume."""
+    # Arrange
+    base = make_speech_key("Olá", "voz-pt", 150, 0.9)
+
+    # Act / Assert
+    assert base == make_speech_key("Olá", "voz-pt", 150, 0.9)
+    assert base != make_speech_key("Olá!", "voz-pt", 150, 0.9)
+    assert base != make_speech_key("Olá", "voz-en", 150, 0.9)
+    assert base != make_speech_key("Olá", "voz-pt", 180, 0.9)
+    assert base != make_speech_key("Olá", "voz-pt", 150, 1.0)
+
+
+def test_put_and_get_and_failed_render(tmp_path):
+    """Testa que o áudio gerado é encontrado depois e que uma renderização vazia não é guardada."""
+    # Arrange
+    cache = SpeechAudioCache(str(tmp_path))
+
+    # Act
+    path = cache.put("a", writer(b"RIFF-audio"))
+    missing = cache.put("b", writer(b""))
+
+    # Assert
+    assert cache.get("a") == path
+    with open(path, "rb") as file:
+        assert file.read() == b"RIFF-audio"
+    assert missing is None
+    assert cache.get("b") is None
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_size_bound_evicts_least_recently_used_and_survives_restart(tmp_path):
+    """Testa o descarte por tamanho (o menos usado sai primeiro) e a reindexação ao reabrir."""
+    # Arrange
+    cache = SpeechAudioCache(str(tmp_path), max_bytes=250)
+    cache.put("a", writer(b"x" * 100))
+    cache.put("b", writer(b"x" * 100))
+    cache.get("a")
+
+    # Act
+    cache.put("c", writer(b"x" * 100))
+    reopened = SpeechAudioCache(str(tmp_path), max_bytes=250)
+
+    # Assert
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.total_bytes == 200
+    assert cache.evictions == 1
+    assert len(reopened) == 2
+    assert reopened.total_bytes == 200
+
+
+def test_wav_player_reuses_one_pyaudio_instance(tmp_path):
+    """Testa que o reprodutor inicia o PyAudio uma vez, abre um stream por arquivo e respeita stop."""
+    # Arrange
+    import threading
+    import wave
+    from unittest.mock import MagicMock, patch
+
+    from src.infrastructure.adapters.tts_cache import WavPlayer
+
+    path = str(tmp_path / "prompt.wav")
+    with wave.open(path, "wb") as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(16000)
+        file.writeframes(b"\x00\x01" * 4096)
+    fake_pyaudio = MagicMock()
+    stream = fake_pyaudio.PyAudio.return_value.open.return_value
+    stop = threading.Event()
+    stop.set()
+    player = WavPlayer(chunk_frames=1024)
+
+    # Act
+    with patch("src.infrastructure.adapters.tts_cache.pyaudio", fake_pyaudio):
+        player.play(path)
+        writes_first = stream.write.call_count
+        player.play(path, stop=stop)
+        player.close()
+
+    # Assert
+    assert fake_pyaudio.PyAudio.call_count == 1
+    assert fake_pyaudio.PyAudio.return_value.open.call_count == 2
+    assert writes_first == 4
+    assert stream.write.call_count == 4
+    fake_pyaudio.PyAudio.return_value.terminate.assert_called_once()
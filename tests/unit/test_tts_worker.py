@@ -0,0 +1,181 @@
+"""Testes para a thread de síntese de fala com fila de prioridade."""
+import threading
+
+import pytest
+
+from src.infrastructure.adapters.tts_worker import SpeechPriority, SpeechWorker
+
+
+class FakeEngine:
+    """Motor falso: cada fala registra o texto e bloqueia até ser liberada ou interrompida."""
+
+    def __init__(self):
+        self.spoken = []
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.stopped = 0
+
+    def speak(self, text, block=False):
+        self.spoken.append(text)
+        self.started.set()
+        if block:
+            self.release.wait(5)
+
+    def stop(self):
+        self.stopped += 1
+        self.release.set()
+
+
+def speak(text, block=False):
+    """Trabalho que fala o texto no motor recebido."""
+    return lambda engine: engine.speak(text, block)
+
+
+@pytest.fixture
+def worker():
+    worker = SpeechWorker(FakeEngine)
+    yield worker
+    worker.engine.release.set()
+    worker.close()
+
+
+def test_jobs_run_by_priority_then_arrival(worker):
+    """Testa que os trabalhos na fila rodam por prioridade e, empatados, na ordem de chegada."""
+    # Arrange
+    first = worker.submit(speak("resposta", block=True))
+    worker.engine.started.wait(5)
+
+    # Act
+    worker.submit(speak("cache"), SpeechPriority.BACKGROUND)
+    worker.submit(speak("frase 1"))
+    worker.submit(speak("frase 2"))
+    worker.submit(speak("erro"), SpeechPriority.URGENT)
+    worker.engine.release.set()
+    flushed = worker.flush(timeout=5)
+
+    # Assert
+    assert flushed is True
+    assert first.done()
+    assert worker.engine.spoken == ["resposta", "erro", "frase 1", "frase 2", "cache"]
+
+
+def test_preempt_interrupts_lower_priority_job(worker):
+    """Testa que um trabalho urgente com preempt interrompe a fala em andamento."""
+    # Arrange
+    normal = worker.submit(lambda engine: (engine.speak("resposta", True), worker.interrupted.is_set())[1])
+    worker.engine.started.wait(5)
+
+    # Act
+    urgent = worker.submit(speak("erro"), SpeechPriority.URGENT, preempt=True)
+
+    # Assert
+    assert normal.result(timeout=5) is True
+    assert urgent.result(timeout=5) is None
+    assert worker.engine.stopped == 1
+    assert worker.engine.spoken == ["resposta", "erro"]
+    assert not worker.interrupted.is_set()
+
+
+def test_preempt_does_not_interrupt_higher_priority_job(worker):
+    """Testa que preempt não interrompe um trabalho de prioridade igual ou maior."""
+    # Arrange
+    worker.submit(speak("erro", block=True), SpeechPriority.URGENT)
+    worker.engine.started.wait(5)
+
+    # Act
+    worker.submit(speak("resposta"), preempt=True)
+
+    # Assert
+    assert worker.engine.stopped == 0
+    worker.engine.release.set()
+    assert worker.flush(timeout=5) is True
+
+
+def test_cancel_discards_queue_and_interrupts(worker):
+    """Testa que cancel descarta os trabalhos pendentes e interrompe o atual."""
+    # Arrange
+    current = worker.submit(speak("resposta", block=True))
+    worker.engine.started.wait(5)
+    queued = [worker.submit(speak(f"frase {index}")) for index in range(3)]
+
+    # Act
+    cancelled = worker.cancel()
+
+    # Assert
+    assert cancelled == 3
+    assert all(future.cancelled() for future in queued)
+    current.result(timeout=5)
+    assert worker.flush(timeout=5) is True
+    assert worker.engine.spoken == ["resposta"]
+    assert worker.engine.stopped == 1
+
+
+def test_job_exception_is_delivered_through_future(worker):
+    """Testa que o erro de um trabalho chega pelo Future sem derrubar o worker."""
+    # Arrange
+    def broken(engine):
+        raise OSError("sem saída de áudio")
+
+    # Act
+    failed = worker.submit(broken)
+    after = worker.call(lambda engine: "ok")
+
+    # Assert
+    with pytest.raises(OSError, match="sem saída"):
+        failed.result(timeout=5)
+    assert after == "ok"
+
+
+def test_call_runs_inline_on_worker_thread(worker):
+    """Testa que call feito de dentro de um trabalho não trava esperando a própria fila."""
+    # Act
+    result = worker.call(lambda engine: worker.call(lambda inner: threading.current_thread().name))
+
+    # Assert
+    assert result == "tts-worker"
+
+
+def test_engine_startup_error_and_closed_worker():
+    """Testa que o erro ao criar o motor é repassado e que o worker encerrado recusa trabalhos."""
+    # Arrange
+    def broken_factory():
+        raise RuntimeError("sem driver de voz")
+
+    worker = SpeechWorker(FakeEngine)
+    worker.close()
+
+    # Act / Assert
+    with pytest.raises(RuntimeError, match="sem driver"):
+        SpeechWorker(broken_factory)
+    with pytest.raises(RuntimeError, match="encerrado"):
+        worker.submit(speak("olá"))
+
+
+def test_late_preempt_never_interrupts_the_urgent_job(worker):
+    """Testa que, se o trabalho atual termina durante o preempt, a interrupção não atinge o urgente."""
+    # Arrange
+    import time
+
+    urgent_started = threading.Event()
+    original_interrupt = worker._interrupt
+
+    def slow_interrupt():
+        # O trabalho atual termina sozinho enquanto o preempt ainda decide
+        worker.engine.release.set()
+        urgent_started.wait(0.2)
+        original_interrupt()
+
+    worker._interrupt = slow_interrupt
+    worker.submit(speak("resposta", block=True))
+    worker.engine.started.wait(5)
+
+    def urgent(engine):
+        urgent_started.set()
+        time.sleep(0.05)
+        return worker.interrupted.is_set()
+
+    # Act
+    future = worker.submit(urgent, SpeechPriority.URGENT, preempt=True)
+
+    # Assert
+    assert future.result(timeout=5) is False
@@ -0,0 +1,80 @@
+"""Testes para a detecção de atividade de voz e do fim da fala."""
+import numpy as np
+
+from src.infrastructure.adapters.voice_activity import SpeechEndpointer
+
+SAMPLE_RATE = 16000
+CHUNK_BYTES = 2048
+
+
+def noise(seconds, level=0.002, seed=0):
+    """Ruído de fundo fraco."""
+    return np.random.default_rng(seed).normal(0.0, level, int(SAMPLE_RATE * seconds))
+
+
+def voiced(seconds):
+    """Sinal sonoro com harmônicos (parecido com uma vogal) sobre o ruído de fundo."""
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    tone = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 6))
+    return 0.2 * tone + noise(seconds, seed=1)
+
+
+def to_pcm(signal):
+    return (np.clip(signal, -1, 1) * 32767).astype("<i2").tobytes()
+
+
+def feed_until_done(endpointer, pcm):
+    """Entrega o áudio aos trechos e devolve quantos segundos foram consumidos até o fim."""
+    for offset in range(0, len(pcm), CHUNK_BYTES):
+        if endpointer.feed(pcm[offset:offset + CHUNK_BYTES]):
+            return (offset + CHUNK_BYTES) / 2 / SAMPLE_RATE
+    return None
+
+
+def test_endpoint_reported_soon_after_speech_and_leading_silence_trimmed():
+    """Testa que o fim vem logo após a fala (sem esperar o silêncio todo) e sem o silêncio inicial."""
+    # Arrange
+    signal = np.concatenate([noise(0.5), voiced(0.6), noise(0.15, seed=2), voiced(0.4), noise(2.0, seed=3)])
+    endpointer = SpeechEndpointer(SAMPLE_RATE, hangover_ms=600, preroll_ms=200, tail_ms=100)
+    speech_end = 0.5 + 0.6 + 0.15 + 0.4
+
+    # Act
+    consumed = feed_until_done(endpointer, to_pcm(signal))
+
+    # Assert
+    assert endpointer.speech_detected is True
+    assert consumed is not None
+    # Silêncio claro encerra na metade do hangover (mais a granularidade dos trechos)
+    assert consumed - speech_end < 0.45
+    duration = len(endpointer.audio()) / 2 / SAMPLE_RATE
+    assert 1.3 <= duration <= 1.5
+
+
+def test_short_pause_does_not_end_speech():
+    """Testa que uma pausa curta entre palavras não encerra a fala."""
+    # Arrange
+    signal = np.concatenate([voiced(0.4), noise(0.2, seed=2), voiced(0.4), noise(1.0, seed=3)])
+    endpointer = SpeechEndpointer(SAMPLE_RATE)
+
+    # Act
+    feed_until_done(endpointer, to_pcm(signal))
+
+    # Assert
+    duration = len(endpointer.audio()) / 2 / SAMPLE_RATE
+    assert duration >= 1.0
+
+
+def test_stationary_hiss_is_not_speech():
+    """Testa que um chiado (espectro plano) não é confundido com fala."""
+    # Arrange
+    signal = np.concatenate([noise(0.3), noise(2.0, level=0.05, seed=4)])
+    endpointer = SpeechEndpointer(SAMPLE_RATE, no_speech_timeout=1.5)
+
+    # Act
+    consumed = feed_until_done(endpointer, to_pcm(signal))
+
+    # Assert
+    assert endpointer.speech_detected is False
+    assert endpointer.timed_out is True
+    assert consumed is not None and consumed < 2.0
+    assert endpointer.audio() == b""